@@ -15,6 +15,8 @@ from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
 from condor.archived_pnl import calculate_pnl_from_trades
+from condor.archived_trades import fetch_archived_trades
+from condor.chart_render import render_png
 from config_manager import get_client
 from routines.base import RoutineResult
 
@@ -42,7 +44,6 @@ MAX_CONCURRENT_PROBES = 10
 # A detail run pages through every fill. Past this the report stops being
 # readable long before the fetch stops being cheap, so we cut it and say so.
 MAX_TRADES = 50_000
-TRADES_PAGE = 500
 
 
 class Config(BaseModel):
@@ -210,27 +211,8 @@ async def _get_summary(client, db_path: str) -> dict | None:
 
 
 async def _fetch_all_trades(client, db_path: str) -> tuple[list[dict], bool]:
-    """Page through every fill. Returns (trades, truncated)."""
-    all_trades: list[dict] = []
-    offset = 0
-    while True:
-        try:
-            resp = await client.archived_bots.get_database_trades(
-                db_path, limit=TRADES_PAGE, offset=offset
-            )
-        except Exception:  # noqa: BLE001 — keep the fills we already have
-            logger.debug("Trade page failed at offset %s", offset, exc_info=True)
-            break
-        trades = (resp or {}).get("trades", [])
-        if not trades:
-            break
-        all_trades.extend(trades)
-        if len(trades) < TRADES_PAGE:
-            break
-        if len(all_trades) >= MAX_TRADES:
-            return all_trades[:MAX_TRADES], True
-        offset += TRADES_PAGE
-    return all_trades, False
+    """Every fill, several pages at a time. Returns (trades, truncated)."""
+    return await fetch_archived_trades(client, db_path, max_trades=MAX_TRADES)
 
 
 async def _gather_bounded(coro_factories) -> list:
@@ -279,7 +261,7 @@ async def _latest_healthy_markdown(client, entries: list[tuple[str, str]]) -> st
 
     trades, truncated = await _fetch_all_trades(client, path)
     if trades:
-        pnl = calculate_pnl_from_trades(trades)
+        pnl = await asyncio.to_thread(calculate_pnl_from_trades, trades)
         buys = sum(1 for t in trades if t.get("trade_type", "").upper() == "BUY")
         rows += [
             ("PnL", _usd(pnl.get("total_pnl", 0))),
@@ -500,7 +482,7 @@ async def _mode_detail(client, db_path: str) -> ModeOutput:
     if not trades:
         return ModeOutput(text=f"{bot_name}: no trade data found.")
 
-    pnl = calculate_pnl_from_trades(trades)
+    pnl = await asyncio.to_thread(calculate_pnl_from_trades, trades)
     total_pnl = pnl.get("total_pnl", 0)
     total_fees = pnl.get("total_fees", 0)
     total_volume = pnl.get("total_volume", 0)
@@ -623,9 +605,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> RoutineResu
 
     chart_image = None
     if output.figure is not None:
-        buf = io.BytesIO()
-        output.figure.write_image(buf, format="png", scale=2)
-        chart_image = buf.getvalue()
+        chart_image = await render_png(output.figure)
 
     return RoutineResult(
         text=output.text,
@@ -13,6 +13,7 @@ from plotly.subplots import make_subplots
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor import chart_render
 from condor.backtesting import run_and_save
 from config_manager import get_client
 from routines.base import RoutineResult
@@ -661,7 +662,7 @@ def _add_position_held(fig, position_held_ts: list[dict], row=3, col=1):
     fig.add_hline(y=0, line_dash="dot", line_color="#555", row=row, col=col)
 
 
-def generate_chart(
+async def generate_chart(
     candle_df: pd.DataFrame,
     executors: list[dict],
     pnl_ts: list[dict],
@@ -788,10 +789,7 @@ def generate_chart(
     if not render_png:
         return None, fig
 
-    buf = io.BytesIO()
-    fig.write_image(buf, format="png", scale=2)
-    buf.seek(0)
-    return buf, fig
+    return io.BytesIO(await chart_render.render_png(fig)), fig
 
 
 # One row per run, so N runs of this routine concatenate into a table an agent can
@@ -1047,7 +1045,7 @@ async def _render(
     chart_bytes = None
     fig = None
     try:
-        buf, fig = generate_chart(
+        buf, fig = await generate_chart(
             candle_df,
             executors,
             pnl_ts,
@@ -9,6 +9,7 @@ import aiohttp
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
 from config_manager import get_client
 
 logger = logging.getLogger(__name__)
@@ -186,7 +187,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     start_ms = now_ms - config.lookback_hours * 3600 * 1000
 
     # ── 1. Fetch candles (parallel) + metaAndAssetCtxs (3 calls total) ───────
-    async with aiohttp.ClientSession() as session:
+    async with pooled_session() as session:
         candles_a_raw, candles_b_raw, meta_ctxs = await asyncio.gather(
             _fetch_candles(session, coin_a, config.interval, start_ms, now_ms),
             _fetch_candles(session, coin_b, config.interval, start_ms, now_ms),
@@ -9,6 +9,7 @@ import aiohttp
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
 from config_manager import get_client
 
 logger = logging.getLogger(__name__)
@@ -687,7 +688,7 @@ async def _run_pair_mode(config: Config) -> str:
     start_ms = now_ms - config.lookback_days * 24 * 3600 * 1000
 
     # ── 1. Fetch candles for both legs in parallel ────────────────────────────
-    async with aiohttp.ClientSession() as session:
+    async with pooled_session() as session:
         long_candles, short_candles = await asyncio.gather(
             _fetch_candles(session, long_coin, config.interval, start_ms, now_ms),
             _fetch_candles(session, short_coin, config.interval, start_ms, now_ms),
@@ -997,7 +998,7 @@ async def _run_universe_mode(config: Config, context) -> str:
 
     # ── 1. Universe ────────────────────────────────────────────────────────────
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 HL_URL,
                 json={"type": "metaAndAssetCtxs", "dex": issuer},
@@ -1069,7 +1070,7 @@ async def _run_universe_mode(config: Config, context) -> str:
             )
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             candle_lists = await asyncio.gather(*[_bounded(session, c) for c in coins])
     except Exception as e:
         return f"Candle fetch failed: {e}"
@@ -1112,7 +1113,7 @@ async def _run_universe_mode(config: Config, context) -> str:
     funding_included = False
     if config.include_funding:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 fund_results = await asyncio.gather(
                     *[
                         _fetch_funding_history(session, coin, start_ms)
@@ -8,6 +8,7 @@ import aiohttp
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
 from config_manager import get_client
 
 logger = logging.getLogger(__name__)
@@ -99,7 +100,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     # ── 1. Fetch universe + contexts from Hyperliquid public API ──────────────
     payload = {"type": "metaAndAssetCtxs", "dex": issuer}
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.post(
                 HL_URL, json=payload, timeout=aiohttp.ClientTimeout(total=10)
             ) as resp:
@@ -198,7 +199,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     candidates = prelim[: config.depth_check_top_k]
     if candidates:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 depths = await asyncio.gather(
                     *[
                         _fetch_book_depth(
@@ -21,6 +21,8 @@ import aiohttp
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
+
 logger = logging.getLogger(__name__)
 
 CATEGORY = "Analysis"
@@ -84,7 +86,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
         params["query"] = config.query
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.get(
                 DAMM_V2_API, params=params, timeout=aiohttp.ClientTimeout(total=20)
             ) as resp:
@@ -22,6 +22,8 @@ import aiohttp
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
+
 logger = logging.getLogger(__name__)
 
 CATEGORY = "Analysis"
@@ -66,7 +68,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.get(
                 DAMM_V2_API, params=params, timeout=aiohttp.ClientTimeout(total=25)
             ) as resp:
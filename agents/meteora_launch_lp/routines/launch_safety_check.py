@@ -19,6 +19,8 @@ import aiohttp
 from pydantic import BaseModel, Field, field_validator
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
+
 logger = logging.getLogger(__name__)
 
 CATEGORY = "Analysis"
@@ -79,7 +81,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
 
     # 1. Pool + token metadata from the Meteora DAMM v2 API.
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             async with session.get(
                 DAMM_V2_API,
                 params={"query": config.pool_address, "page_size": 1},
@@ -140,7 +142,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
 
     # 2. On-chain gates via RPC: mint authority + top-holder concentration.
     try:
-        async with aiohttp.ClientSession() as session:
+        async with pooled_session() as session:
             if config.require_mint_renounced:
                 info = await _rpc(
                     session,
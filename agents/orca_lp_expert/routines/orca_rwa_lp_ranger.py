@@ -17,7 +17,7 @@ from plotly.subplots import make_subplots
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
-from condor.pool_data import fetch_ohlcv
+from condor.pool_data import GeckoPriority, fetch_ohlcv, gecko_priority
 from condor.reports import ReportBuilder
 from routines.base import RoutineResult
 
@@ -207,17 +207,19 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> RoutineResu
     # ── Step 2: Fetch 5m candles ──────────────────────────────────────────────
     # Through pool_data, not a raw URL: GeckoTerminal's ~30 req/min is per *IP*,
     # shared with the dashboard and the candle poll loop. fetch_ohlcv carries the
-    # rate gate, the circuit breaker and the single-flight, so no manual pacing.
+    # rate gate, the circuit breaker and the single-flight, so no manual pacing;
+    # the background lane keeps this scan behind anyone watching a chart.
     candle_data: dict[str, list] = {}
     for pool in top4:
         addr = pool["address"]
-        ohlcv, err = await fetch_ohlcv(
-            addr,
-            "solana",
-            timeframe="5m",
-            currency="usd",
-            limit=config.candle_limit,
-        )
+        with gecko_priority(GeckoPriority.BACKGROUND):
+            ohlcv, err = await fetch_ohlcv(
+                addr,
+                "solana",
+                timeframe="5m",
+                currency="usd",
+                limit=config.candle_limit,
+            )
         if err or not ohlcv:
             logger.warning("GeckoTerminal candles for %s failed: %s", addr, err)
             candle_data[addr] = []
@@ -96,10 +96,11 @@ async def _gecko_json(path: str, params: dict | None = None) -> "dict | None":
     shared with the dashboard; CoinGecko keeps the plain fetcher. Returns None on
     any failure, like its sibling — a tick must never raise.
     """
-    from condor.pool_data import gecko_request
+    from condor.pool_data import GeckoPriority, gecko_priority, gecko_request
 
     try:
-        return await gecko_request("GET", path, params=params)
+        with gecko_priority(GeckoPriority.BACKGROUND):
+            return await gecko_request("GET", path, params=params)
     except Exception as exc:  # never raise into a tick
         logger.warning("flow: gecko %s failed: %s", path, type(exc).__name__)
         return None
@@ -380,6 +380,7 @@ async def fetch_agent_performance_batch(
                 _extract_executors_list,
                 page_size=PAGE_SIZE,
                 max_items=MAX_PAGES * PAGE_SIZE,
+                read_ahead=1,
             ):
                 for ex in page:
                     if isinstance(ex, dict):
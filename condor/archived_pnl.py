@@ -8,13 +8,25 @@ Telegram UI package to get it.
 
 ``handlers.bots.archived_chart`` re-exports :func:`calculate_pnl_from_trades`
 and :func:`parse_timestamp`, so existing handler imports keep working.
+
+Two implementations compute the same numbers. The per-trade walk
+(``_walk_trades``) is the contract the characterization tests pin. The columnar
+engine (:func:`compute_pnl`) is what a long trade history goes through: one
+pass to pull the rows into NumPy columns, then each pair's inventory, cost
+basis and realized PnL as prefix scans over them. It can also carry on from a
+:class:`PnlCheckpoint`, so trades appended to a history cost only themselves.
+The two agree to float rounding, not bit for bit: the scans add in a different
+order from the walk.
 """
 
 import logging
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, NamedTuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +89,8 @@ def calculate_pnl_from_trades(trades: list[dict[str, Any]]) -> dict[str, Any]:
             "cumulative_pnl": [],
             "total_volume": 0,
         }
+    if len(trades) >= COLUMNAR_MIN_TRADES:
+        return compute_pnl(trades)[0].as_dict()
 
     # Detect if this is OPEN/CLOSE mode or NIL mode (market making)
     position_types = set(t.get("position", "").upper() for t in trades)
@@ -367,3 +381,366 @@ def _calculate_pnl_average_cost(trades: list[dict[str, Any]]) -> dict[str, Any]:
 def _calculate_pnl_open_close(trades: list[dict[str, Any]]) -> dict[str, Any]:
     """Calculate PnL using OPEN/CLOSE position tracking for perpetual futures."""
     return _walk_trades(trades, _OpenClosePositionAccounting())
+
+
+# ── Columnar engine ──────────────────────────────────────────────────────────
+
+# From this many trades ``calculate_pnl_from_trades`` goes through the columnar
+# engine. Below it the per-trade walk is already quick, and it is the contract.
+COLUMNAR_MIN_TRADES = 5_000
+
+_SIDES = {"BUY": 1, "SELL": -1}
+_OPEN, _CLOSE, _NIL = 1, 2, 3
+_POSITIONS = {"OPEN": _OPEN, "CLOSE": _CLOSE, "NIL": _NIL}
+
+# The epoch seconds ``datetime.fromtimestamp`` accepts: years 1 to 9999.
+_EPOCH_MIN, _EPOCH_MAX = -62135596800.0, 253402300800.0
+
+
+class CheckpointMismatch(ValueError):
+    """Trades that cannot continue a checkpoint: compute the history again.
+
+    Either they sort before the trade the checkpoint stopped at, or they change
+    which accounting mode the whole history is read in.
+    """
+
+
+@dataclass
+class PnlCheckpoint:
+    """Where a PnL computation stopped: enough to continue it with later trades.
+
+    Per pair, ``held`` is the inventory (or open position) and ``cost`` its
+    total cost. ``last_key`` is the sort key of the last trade seen. Plain
+    values throughout, so :meth:`to_dict` can be stored as JSON.
+    """
+
+    has_nil: bool = False
+    has_open_close: bool = False
+    trades: int = 0
+    running_pnl: float = 0.0
+    total_fees: float = 0.0
+    total_volume: float = 0.0
+    pnl_by_pair: dict[str, float] = field(default_factory=dict)
+    held: dict[str, float] = field(default_factory=dict)
+    cost: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    last_key: tuple | None = None
+
+    @property
+    def nil_mode(self) -> bool:
+        return self.has_nil and not self.has_open_close
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {
+            name: dict(value) if isinstance(value, dict) else value
+            for name, value in self.__dict__.items()
+        }
+        data["last_key"] = list(self.last_key) if self.last_key else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PnlCheckpoint":
+        data = dict(data)
+        if data.get("last_key") is not None:
+            data["last_key"] = tuple(data["last_key"])
+        return cls(**data)
+
+
+class ArchivedPnl(NamedTuple):
+    """The columnar engine's answer: totals, and the cumulative series as arrays.
+
+    ``point_epoch`` and ``point_pnl`` are the series, one point per trade with
+    a timestamp, in time order. ``point_pair`` indexes ``pairs``.
+    """
+
+    total_pnl: float
+    total_fees: float
+    total_volume: float
+    pnl_by_pair: dict[str, float]
+    pairs: tuple[str, ...]
+    point_epoch: np.ndarray
+    point_pnl: np.ndarray
+    point_pair: np.ndarray
+    # The parsed timestamp of each point whose raw one was not a number, or
+    # ``None`` when every one was; ``as_dict`` hands those out unchanged.
+    point_stamps: list | None
+    buy_count: int
+    sell_count: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """The result in ``calculate_pnl_from_trades``' shape."""
+        stamps = self.point_stamps
+        if stamps is None:
+            stamps = [datetime.fromtimestamp(ts) for ts in self.point_epoch.tolist()]
+        cumulative = [
+            {"timestamp": ts, "pnl": pnl, "pair": self.pairs[code]}
+            for ts, pnl, code in zip(
+                stamps, self.point_pnl.tolist(), self.point_pair.tolist()
+            )
+        ]
+        return {
+            "total_pnl": self.total_pnl,
+            "total_fees": self.total_fees,
+            "pnl_by_pair": dict(self.pnl_by_pair),
+            "cumulative_pnl": cumulative,
+            "total_volume": self.total_volume,
+        }
+
+
+def _codes(
+    trades: list[dict[str, Any]], name: str, table: dict[str, int]
+) -> np.ndarray:
+    """A text column as codes from ``table``, 0 for anything else; any case."""
+    raw = [t.get(name) for t in trades]
+    lookup = {value: table.get(str(value or "").upper(), 0) for value in set(raw)}
+    return np.array([lookup[value] for value in raw], dtype=np.int8)
+
+
+def _floats(trades: list[dict[str, Any]], name: str) -> np.ndarray:
+    # NumPy parses numeric strings itself, as ``float()`` does.
+    return np.array([t.get(name, 0) for t in trades], dtype=float)
+
+
+def _timestamp_columns(
+    trades: list[dict[str, Any]],
+) -> tuple[np.ndarray, np.ndarray, list | None, list]:
+    """Time order, epoch seconds (NaN where unparseable) and sort keys.
+
+    A history of numeric timestamps, the archive's own shape, is ordered and
+    converted as arrays. Anything else goes row by row through
+    ``_timestamp_sort_key`` and ``parse_timestamp``, and also returns the parsed
+    datetimes. The order is the one ``sorted(trades, key=_timestamp_sort_key)``
+    gives.
+    """
+    raw = [t.get("timestamp") for t in trades]
+    if all(type(ts) is int or type(ts) is float for ts in raw):
+        num = np.array(raw, dtype=float)
+        order = np.argsort(num, kind="stable")
+        epoch = np.where(num > 1e12, num / 1000, num)
+        epoch[~((epoch > _EPOCH_MIN) & (epoch < _EPOCH_MAX))] = np.nan
+        keys = [(0, float(num[order[0]]), ""), (0, float(num[order[-1]]), "")]
+        return order, epoch, None, keys
+
+    sort_keys = [_timestamp_sort_key(t) for t in trades]
+    texts = [k[2] for k in sort_keys]
+    _, text_rank = np.unique(np.array(texts, dtype=object), return_inverse=True)
+    order = np.lexsort(
+        (
+            text_rank,
+            np.array([k[1] for k in sort_keys], dtype=float),
+            np.array([k[0] for k in sort_keys]),
+        )
+    )
+    stamps = [parse_timestamp(ts) for ts in raw]
+    epoch = np.array(
+        [ts.timestamp() if ts is not None else np.nan for ts in stamps], dtype=float
+    )
+    keys = [sort_keys[order[0]], sort_keys[order[-1]]]
+    return order, epoch, stamps, keys
+
+
+def _clamped_cumsum(step: np.ndarray, start: float) -> np.ndarray:
+    """``held_k = max(held_{k-1} + step_k, 0)`` from ``start``, for every k at once.
+
+    The running sum less its lowest point so far, or plus ``start`` while
+    that is higher: an inventory that a sell can empty but never take short.
+    """
+    total = np.cumsum(step)
+    return total + np.maximum(start, -np.minimum.accumulate(total))
+
+
+def _affine_scan(scale: np.ndarray, shift: np.ndarray, start: float) -> np.ndarray:
+    """``x_k = scale_k * x_{k-1} + shift_k`` from ``start``, for every k at once.
+
+    A Hillis-Steele scan: log2(n) passes, each composing every step with the
+    one ``2**i`` before it. ``scale`` stays within [0, 1] here, so the products
+    only shrink and nothing overflows.
+    """
+    scale = scale.copy()
+    shift = shift.copy()
+    if len(shift):
+        shift[0] += scale[0] * start
+    if (scale == 1.0).all():
+        return np.cumsum(shift)
+    span = 1
+    while span < len(shift):
+        shift[span:] = scale[span:] * shift[:-span] + shift[span:]
+        scale[span:] = scale[span:] * scale[:-span]
+        span *= 2
+    return shift
+
+
+def _realize(
+    nil_mode: bool,
+    side: np.ndarray,
+    position: np.ndarray,
+    amount: np.ndarray,
+    price: np.ndarray,
+    fee: np.ndarray,
+    held0: float,
+    cost0: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float, float]:
+    """One pair's trades, in time order, through its accounting mode.
+
+    The same rules as ``_AverageCostAccounting`` (``nil_mode``) and
+    ``_OpenClosePositionAccounting``, as arrays. Returns each trade's change to
+    the running PnL, which trades realized against a holding, which added to
+    it, which took from it, and the holding and its cost after the last trade.
+    """
+    if nil_mode:
+        adds, takes = side == 1, side == -1
+    else:
+        adds, takes = position == _OPEN, position == _CLOSE
+    held = _clamped_cumsum(np.where(adds, amount, np.where(takes, -amount, 0.0)), held0)
+    before = np.concatenate(([held0], held[:-1]))
+    matched = takes & (before > 0)
+    emptied = matched & (amount >= before)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(emptied, 0.0, np.where(matched, 1.0 - amount / before, 1.0))
+        cost = _affine_scan(scale, np.where(adds, amount * price, 0.0), cost0)
+        average = np.concatenate(([cost0], cost[:-1])) / before
+
+    if nil_mode:
+        realized = (price - average) * np.minimum(amount, before) - fee
+        running = np.where(matched, realized, np.where(takes, -fee, 0.0))
+    else:
+        spread = np.where(side == -1, price - average, average - price)
+        running = np.where(matched, spread * amount - fee, 0.0)
+    end_held = 0.0 if emptied[-1] else float(held[-1])
+    return running, matched, adds, takes, end_held, float(cost[-1])
+
+
+def compute_pnl(
+    trades: list[dict[str, Any]], checkpoint: PnlCheckpoint | None = None
+) -> tuple[ArchivedPnl, PnlCheckpoint]:
+    """Realized PnL of ``trades``, computed over columns; and where it stopped.
+
+    Given a ``checkpoint``, ``trades`` are the ones that follow it. The totals
+    then cover the whole history, and the series only the new trades. Raises
+    :class:`CheckpointMismatch` when the new trades cannot follow it.
+    """
+    previous = checkpoint or PnlCheckpoint()
+    state = PnlCheckpoint.from_dict(previous.to_dict())
+    n = len(trades)
+
+    position = _codes(trades, "position", _POSITIONS)
+    state.has_nil |= bool((position == _NIL).any())
+    state.has_open_close |= bool(((position == _OPEN) | (position == _CLOSE)).any())
+    if previous.trades and state.nil_mode != previous.nil_mode:
+        raise CheckpointMismatch("the new trades change the accounting mode")
+    if not n:
+        empty = np.empty(0)
+        return (
+            ArchivedPnl(
+                state.running_pnl,
+                state.total_fees,
+                state.total_volume,
+                dict(state.pnl_by_pair),
+                (),
+                empty,
+                empty,
+                np.empty(0, dtype=np.int64),
+                None,
+                0,
+                0,
+            ),
+            state,
+        )
+
+    order, epoch, stamps, (first_key, last_key) = _timestamp_columns(trades)
+    if previous.last_key is not None and first_key < previous.last_key:
+        raise CheckpointMismatch("the new trades start before the checkpoint")
+
+    codes: dict[str, int] = {}
+    pair = np.array(
+        [codes.setdefault(t.get("trading_pair", "Unknown"), len(codes)) for t in trades]
+    )[order]
+    pairs = tuple(codes)
+    side = _codes(trades, "trade_type", _SIDES)[order]
+    position = position[order]
+    amount = _floats(trades, "amount")[order]
+    price = _floats(trades, "price")[order]
+    fee = _floats(trades, "trade_fee_in_quote")[order]
+    epoch = epoch[order]
+
+    running = np.zeros(n)
+    matched = np.zeros(n, dtype=bool)
+    adds = takes = 0
+    by_pair = np.argsort(pair, kind="stable")
+    bounds = np.cumsum(np.bincount(pair, minlength=len(pairs)))
+    for code, (lo, hi) in enumerate(zip(np.concatenate(([0], bounds[:-1])), bounds)):
+        rows = by_pair[lo:hi]
+        name = pairs[code]
+        result = _realize(
+            state.nil_mode,
+            side[rows],
+            position[rows],
+            amount[rows],
+            price[rows],
+            fee[rows],
+            state.held.get(name, 0.0),
+            state.cost.get(name, 0.0),
+        )
+        running[rows], matched[rows] = result[0], result[1]
+        adds += int(result[2].sum())
+        takes += int(result[3].sum())
+        state.held[name], state.cost[name] = result[4], result[5]
+
+    # Sequential sums, like the walk's running totals, not NumPy's pairwise.
+    running_pnl = np.cumsum(np.concatenate(([state.running_pnl], running)))[1:]
+    state.running_pnl = float(running_pnl[-1])
+    state.total_fees = float(np.cumsum(np.concatenate(([state.total_fees], fee)))[-1])
+    state.total_volume = float(
+        np.cumsum(np.concatenate(([state.total_volume], amount * price)))[-1]
+    )
+    realized = np.flatnonzero(matched)
+    first_realized = {}
+    for row in realized[np.unique(pair[realized], return_index=True)[1]]:
+        first_realized[pairs[pair[row]]] = row
+    for name in sorted(first_realized, key=first_realized.get):
+        rows = realized[pair[realized] == codes[name]]
+        start = state.pnl_by_pair.get(name, 0.0)
+        state.pnl_by_pair[name] = float(
+            np.cumsum(np.concatenate(([start], running[rows])))[-1]
+        )
+
+    counts = state.counts
+    counts["adds"] = counts.get("adds", 0) + adds
+    counts["takes"] = counts.get("takes", 0) + takes
+    counts["matched"] = counts.get("matched", 0) + len(realized)
+    state.trades += n
+    state.last_key = tuple(last_key)
+
+    dated = ~np.isnan(epoch)
+    if stamps is not None:
+        stamps = [stamps[i] for i in order[dated].tolist()]
+    buys = int((side == 1).sum())
+    logger.info(
+        "PnL calculation (columnar, %s): %d trades, %d %s, %d %s, %d realized, "
+        "total_pnl=$%.4f",
+        "avg cost" if state.nil_mode else "open/close",
+        n,
+        adds,
+        "BUY" if state.nil_mode else "OPEN",
+        takes,
+        "SELL" if state.nil_mode else "CLOSE",
+        len(realized),
+        state.running_pnl,
+    )
+    return (
+        ArchivedPnl(
+            total_pnl=state.running_pnl,
+            total_fees=state.total_fees,
+            total_volume=state.total_volume,
+            pnl_by_pair=dict(state.pnl_by_pair),
+            pairs=pairs,
+            point_epoch=epoch[dated],
+            point_pnl=running_pnl[dated],
+            point_pair=pair[dated],
+            point_stamps=stamps,
+            buy_count=buys,
+            sell_count=n - buys,
+        ),
+        state,
+    )
@@ -0,0 +1,188 @@
+"""Archived-bot trades: downloaded several pages at a time, and kept on disk.
+
+Every archived flow (the web performance view, the Telegram detail, charts and
+report, the archived analyzer routine) paged through a database's trades 500 at
+a time, one request after another. A market maker's archive is hundreds of
+round trips before any PnL shows, and every view paid them again.
+
+:func:`fetch_archived_trades` walks the pages with
+``condor.fetchers._pagination.collect_offset_pages``: a bounded, adaptive
+window of concurrent requests reassembled in offset order.
+
+An archived database never changes, so a trade set downloaded in full is kept
+under ``data/archived_trades/``. It is stored as one ``.npz`` file per server
+and database path, one array per trade field. The next analysis of the same
+archive reads it back without a request. A download that was cut short (at a
+cap, or by a page that failed twice) is never stored. Every store failure is
+logged and swallowed, and a client with no ``base_url`` (a test double) cannot
+be told apart from another server's, so it is never stored either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from condor.fetchers._pagination import collect_offset_pages
+from condor.fsutil import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# Anchored at the repo root like the other stores under ``data/``.
+_DIR = Path(__file__).resolve().parents[1] / "data" / "archived_trades"
+
+TRADES_PAGE = 500
+_UNCAPPED = 1 << 62
+_FORMAT = 1
+
+
+def _server_key(client: Any) -> str:
+    return str(getattr(client, "base_url", "") or "")
+
+
+def _trade_rows(resp: Any) -> list:
+    return (resp.get("trades") or []) if isinstance(resp, dict) else []
+
+
+def _path(server: str, db_path: str) -> Path:
+    digest = hashlib.sha256(f"{server}|{db_path}".encode()).hexdigest()
+    return _DIR / f"{digest}.npz"
+
+
+def _column(values: list) -> tuple[str, np.ndarray]:
+    """One field's values as an array, and how to read them back.
+
+    Numbers and text keep their type; a field of mixed or nested values is
+    kept as the JSON of each value.
+    """
+    kinds = {type(value) for value in values}
+    if kinds == {int}:
+        try:
+            return "plain", np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+    if kinds == {float}:
+        return "plain", np.array(values, dtype=float)
+    if kinds == {str}:
+        return "plain", np.array(values, dtype=str)
+    return "json", np.array([json.dumps(value) for value in values], dtype=str)
+
+
+def _encode(trades: list[dict]) -> bytes:
+    fields: dict[str, None] = {}
+    for trade in trades:
+        fields.update(dict.fromkeys(trade))
+    arrays: dict[str, np.ndarray] = {}
+    columns = []
+    for n, name in enumerate(fields):
+        present = [name in trade for trade in trades]
+        kind, arrays[f"c{n}"] = _column([t[name] for t in trades if name in t])
+        partial_column = not all(present)
+        if partial_column:
+            arrays[f"p{n}"] = np.array(present, dtype=bool)
+        columns.append([name, kind, partial_column])
+    meta = {"format": _FORMAT, "rows": len(trades), "columns": columns}
+    arrays["meta"] = np.array(json.dumps(meta))
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _decode(data: np.lib.npyio.NpzFile) -> list[dict] | None:
+    meta = json.loads(data["meta"].item())
+    if meta.get("format") != _FORMAT:
+        return None
+    trades: list[dict] = [{} for _ in range(meta["rows"])]
+    for n, (name, kind, partial_column) in enumerate(meta["columns"]):
+        values = data[f"c{n}"].tolist()
+        if kind == "json":
+            values = [json.loads(value) for value in values]
+        rows = (
+            [t for t, present in zip(trades, data[f"p{n}"].tolist()) if present]
+            if partial_column
+            else trades
+        )
+        for trade, value in zip(rows, values):
+            trade[name] = value
+    return trades
+
+
+def _load(path: Path) -> list[dict] | None:
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return _decode(data)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("archived trades read failed %s: %s", path.name[:12], e)
+        return None
+
+
+def _store(path: Path, trades: list[dict]) -> None:
+    try:
+        atomic_write_bytes(path, _encode(trades), fsync=False)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("archived trades write failed %s: %s", path.name[:12], e)
+
+
+async def fetch_archived_trades(
+    client: Any,
+    db_path: str,
+    *,
+    max_trades: int | None = None,
+    total: int | None = None,
+    on_error: Callable[[int, BaseException], None] | None = None,
+) -> tuple[list[dict], bool]:
+    """Every trade of an archived database, in order. Returns (trades, truncated).
+
+    ``max_trades`` caps the download; ``None`` takes every trade there is.
+    ``total`` is the summary's ``total_trades``, when the caller has it. It lets
+    the download request exactly the pages there are. A failed page ends the
+    download with the trades in front of it, as the sequential walks did;
+    ``on_error`` is then called with its offset and the exception, and may
+    raise to fail the download instead.
+    """
+    server = _server_key(client)
+    path = _path(server, db_path) if server else None
+    if path is not None:
+        stored = await asyncio.to_thread(_load, path)
+        if stored is not None:
+            if max_trades is not None and len(stored) > max_trades:
+                return stored[:max_trades], True
+            return stored, False
+
+    truncated = failed = False
+
+    def _truncated() -> None:
+        nonlocal truncated
+        truncated = True
+
+    def _failed(offset: int, error: BaseException) -> None:
+        nonlocal failed
+        failed = True
+        logger.warning(
+            "Trade page failed at offset %s for %s: %s", offset, db_path, error
+        )
+        if on_error is not None:
+            on_error(offset, error)
+
+    trades = await collect_offset_pages(
+        partial(client.archived_bots.get_database_trades, db_path),
+        _trade_rows,
+        page_size=TRADES_PAGE,
+        max_items=max_trades if max_trades is not None else _UNCAPPED,
+        total=total,
+        on_truncated=_truncated,
+        on_error=_failed,
+    )
+    if path is not None and not (truncated or failed):
+        await asyncio.to_thread(_store, path, trades)
+    return trades, truncated
@@ -0,0 +1,283 @@
+"""Local on-disk candle store shared by every candle consumer in the process.
+
+Candle history is immutable once a candle closes, yet every chart backfill,
+REST candle request and GeckoTerminal pool chart used to fetch its whole window
+upstream — and everything was lost on restart, so the first dashboard load
+after a deploy paid for dozens of 3-day backfills at once. This store keeps
+closed candles on disk and, per series, the time ranges it has already
+fetched, so a range request only goes upstream for the gaps.
+
+A **series** is one candle feed: ``(source, venue, pair, interval)``, where
+``source`` is ``"hb"`` (the Hummingbot API, ``venue`` is the connector) or
+``"gecko"`` (GeckoTerminal, ``venue`` is ``connector/pool``). Server is not
+part of the key: two API servers report the same exchange's candles.
+
+Only *closed* candles mark a range covered. The forming candle is stored too
+(the next fetch overwrites it), but the range it sits in stays a gap, so a
+live chart keeps asking upstream for the tail and never freezes on a stale
+last candle.
+
+SQLite (WAL mode) rather than flat files: a range query plus upsert is what
+this store does all day, and the MCP subprocesses read the same file the main
+process writes. Every store failure degrades to a plain upstream fetch — the
+store is a cache, never a reason for a chart to fail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Anchored at the repo root like the other stores under ``data/``: the main
+# process and the MCP subprocesses must agree on the file.
+_DB_PATH = Path(__file__).resolve().parents[1] / "data" / "candles.sqlite"
+
+# Per-series cap, applied whenever a series is written: about five weeks of 1m
+# candles. Counted rather than aged, so an old executor's window still caches.
+MAX_CANDLES_PER_SERIES = 50_000
+
+_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    series TEXT NOT NULL,
+    ts REAL NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume REAL NOT NULL,
+    PRIMARY KEY (series, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    series TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_series ON coverage (series, start);
+"""
+
+# Paths whose schema this process has already ensured.
+_ready: set[Path] = set()
+_ready_lock = threading.Lock()
+
+Fetch = Callable[[float, float], Awaitable[list[dict]]]
+
+
+def series_key(source: str, venue: str, pair: str, interval: str) -> str:
+    """The store key for one candle feed."""
+    return f"{source}|{venue}|{pair}|{interval}"
+
+
+def _connect() -> sqlite3.Connection:
+    path = _DB_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0)
+    if path not in _ready:
+        with _ready_lock:
+            if path not in _ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                _ready.add(path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def read(series: str, start: float, end: float, interval_sec: int) -> list[dict]:
+    """Stored candles of ``series`` overlapping ``[start, end]``, ascending."""
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT ts, open, high, low, close, volume FROM candles "
+            "WHERE series = ? AND ts > ? AND ts <= ? ORDER BY ts",
+            (series, start - interval_sec, end),
+        ).fetchall()
+    return [dict(zip(_FIELDS, row)) for row in rows]
+
+
+def gaps(series: str, start: float, end: float) -> list[tuple[float, float]]:
+    """The sub-ranges of ``[start, end]`` this store has not covered yet."""
+    with closing(_connect()) as conn:
+        covered = conn.execute(
+            "SELECT start, end FROM coverage "
+            "WHERE series = ? AND end > ? AND start < ? ORDER BY start",
+            (series, start, end),
+        ).fetchall()
+    missing: list[tuple[float, float]] = []
+    cursor = start
+    for lo, hi in covered:
+        if lo > cursor:
+            missing.append((cursor, min(lo, end)))
+        cursor = max(cursor, hi)
+        if cursor >= end:
+            break
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
+
+
+def write(
+    series: str, candles: list[dict], covered: tuple[float, float] | None
+) -> None:
+    """Upsert ``candles`` and mark ``covered`` (if any) as fetched.
+
+    ``covered`` is merged with every range it overlaps or touches, so a series
+    read in pieces ends up as one range. Past ``MAX_CANDLES_PER_SERIES`` the
+    oldest candles (and the coverage they backed) are pruned in the same
+    transaction.
+    """
+    with closing(_connect()) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO candles "
+            "(series, ts, open, high, low, close, volume) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(series, *(float(c[f]) for f in _FIELDS)) for c in candles],
+        )
+        if covered is not None and covered[1] > covered[0]:
+            lo, hi = covered
+            overlapping = conn.execute(
+                "SELECT rowid, start, end FROM coverage "
+                "WHERE series = ? AND end >= ? AND start <= ?",
+                (series, lo, hi),
+            ).fetchall()
+            for rowid, s, e in overlapping:
+                lo, hi = min(lo, s), max(hi, e)
+                conn.execute("DELETE FROM coverage WHERE rowid = ?", (rowid,))
+            conn.execute(
+                "INSERT INTO coverage (series, start, end) VALUES (?, ?, ?)",
+                (series, lo, hi),
+            )
+        _prune(conn, series)
+
+
+def _prune(conn: sqlite3.Connection, series: str) -> None:
+    row = conn.execute(
+        "SELECT ts FROM candles WHERE series = ? ORDER BY ts DESC LIMIT 1 OFFSET ?",
+        (series, MAX_CANDLES_PER_SERIES),
+    ).fetchone()
+    if row is None:
+        return
+    cutoff = row[0]
+    conn.execute("DELETE FROM candles WHERE series = ? AND ts <= ?", (series, cutoff))
+    conn.execute("DELETE FROM coverage WHERE series = ? AND end <= ?", (series, cutoff))
+    conn.execute(
+        "UPDATE coverage SET start = ? WHERE series = ? AND start < ?",
+        (cutoff, series, cutoff),
+    )
+
+
+async def fetch_range(
+    series: str,
+    interval_sec: int,
+    start: float,
+    end: float,
+    fetch: Fetch,
+) -> list[dict]:
+    """Candles of ``series`` over ``[start, end]``, fetching only what is missing.
+
+    ``fetch(gap_start, gap_end)`` returns normalized candle dicts for one gap
+    and may raise; the error propagates, exactly as an uncached fetch would.
+    A gap that came back empty is not marked covered (an empty answer is as
+    likely a hiccup as a market with no trades), so it is asked again next time.
+    Nor is the part of a gap the answer did not reach: a capped upstream
+    (GeckoTerminal returns at most 1000 candles, the newest) covers only the
+    span its candles run over, and the rest stays a gap.
+    """
+    try:
+        missing = await asyncio.to_thread(gaps, series, start, end)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Candle store unavailable (%s), fetching upstream", e)
+        return _merge_sorted(await fetch(start, end))
+
+    # Only ranges that end in a closed candle count as covered (see module doc).
+    closed_until = (time.time() // interval_sec - 1) * interval_sec
+    fetched: list[dict] = []
+    for lo, hi in missing:
+        candles = await fetch(lo, hi)
+        if not candles:
+            continue
+        fetched.extend(candles)
+        covered_lo, covered_hi = _answered_span(candles, lo, hi, interval_sec)
+        covered_hi = min(covered_hi, closed_until)
+        try:
+            await asyncio.to_thread(
+                write,
+                series,
+                candles,
+                (covered_lo, covered_hi) if covered_hi > covered_lo else None,
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Candle store write failed for %s: %s", series, e)
+
+    try:
+        stored = await asyncio.to_thread(read, series, start, end, interval_sec)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Candle store read failed for %s: %s", series, e)
+        stored = []
+    # What upstream just answered is returned as it came (a venue that pads
+    # the window with a candle either side keeps doing so); the store fills in
+    # the parts that were already covered.
+    return _merge_sorted(stored + fetched)
+
+
+async def historical_candles(
+    client,
+    connector: str,
+    trading_pair: str,
+    interval: str,
+    interval_sec: int,
+    start: float,
+    end: float,
+) -> list[dict]:
+    """``fetch_historical_candles`` over ``[start, end]``, through the store.
+
+    No ``get_candles`` fallback: an empty result is for the caller to handle
+    with whatever window it would have fallen back to.
+    """
+    from condor.fetchers.market_data import fetch_historical_candles
+
+    async def fetch(lo: float, hi: float) -> list[dict]:
+        return await fetch_historical_candles(
+            client,
+            connector,
+            trading_pair,
+            interval,
+            start_time=int(lo),
+            end_time=int(hi),
+        )
+
+    return await fetch_range(
+        series_key("hb", connector, trading_pair, interval),
+        interval_sec,
+        start,
+        end,
+        fetch,
+    )
+
+
+def _answered_span(
+    candles: list[dict], lo: float, hi: float, interval_sec: int
+) -> tuple[float, float]:
+    """The part of the gap ``[lo, hi]`` that ``candles`` actually span.
+
+    An edge the answer reaches to within one candle counts as reached (the gap
+    is rarely aligned to the interval); one it stops short of is left a gap.
+    """
+    stamps = [c["timestamp"] for c in candles]
+    first, last = min(stamps), max(stamps)
+    covered_lo = lo if first - interval_sec < lo else first
+    covered_hi = hi if last + interval_sec > hi else last
+    return covered_lo, covered_hi
+
+
+def _merge_sorted(candles: list[dict]) -> list[dict]:
+    """Dedupe by timestamp (later entries win) and sort ascending."""
+    by_ts = {c["timestamp"]: c for c in candles}
+    return [by_ts[ts] for ts in sorted(by_ts)]
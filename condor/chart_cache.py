@@ -0,0 +1,183 @@
+"""Rendered chart images, kept by what they are a picture of.
+
+Much of what ``condor.chart_render`` renders it has rendered before. Someone
+re-opens an archived bot's chart. A scheduled ``technical_analysis`` run draws
+the same candle window again. A grid or PMM config preview is redrawn for every
+message in its wizard, even when no parameter changed. Each of those was a full
+Chromium round trip for a PNG that already existed.
+
+An image is stored under the SHA-256 of what determines it: the figure's JSON
+(data, layout and template) and the size and scale it was rendered at. The
+same figure always gets the same key, and any change to it gets a new one, so
+an entry is never stale and nothing expires for correctness' sake. Two tiers:
+
+- **Memory**: an LRU bounded by ``MEMORY_BYTES`` of PNG.
+- **Disk**: one file per image under ``data/chart_cache/``, bounded by
+  ``DISK_BYTES`` and ``DISK_RETENTION``, least recently used first. It
+  survives a restart, and the MCP subprocesses share it with the bot.
+
+The cache sits behind ``render_png``, so every Telegram handler, routine and
+report that renders through it shares it. Every disk failure is logged and
+swallowed: the cache is a shortcut, never a reason for a chart to fail.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from condor.fsutil import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# Anchored at the repo root like the other stores under ``data/``.
+_DIR = Path(__file__).resolve().parents[1] / "data" / "chart_cache"
+
+# A chart is 50-400 KB of PNG at scale 2: a few hundred recent ones in memory.
+MEMORY_BYTES = 48 * 1024 * 1024
+DISK_BYTES = 512 * 1024 * 1024
+# An image unused for this long is dropped from disk whatever the room left.
+DISK_RETENTION = 7 * 86400
+# The disk tier is swept after this many writes, not on every one.
+_SWEEP_EVERY = 64
+
+_memory: "OrderedDict[str, bytes]" = OrderedDict()
+_memory_bytes = 0
+_writes_since_sweep = 0
+_stats: Dict[str, int] = {
+    "memory_hits": 0,
+    "disk_hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evicted": 0,
+}
+
+
+def chart_key(
+    spec: str, width: Optional[int], height: Optional[int], scale: float
+) -> str:
+    """The cache key of a figure, as Plotly JSON, rendered at a size and scale."""
+    digest = hashlib.sha256(spec.encode())
+    digest.update(f"|{width}|{height}|{float(scale)}".encode())
+    return digest.hexdigest()
+
+
+def _path(key: str) -> Path:
+    return _DIR / key[:2] / f"{key}.png"
+
+
+def _remember(key: str, png: bytes) -> None:
+    global _memory_bytes
+    if len(png) > MEMORY_BYTES:
+        return
+    old = _memory.pop(key, None)
+    if old is not None:
+        _memory_bytes -= len(old)
+    _memory[key] = png
+    _memory_bytes += len(png)
+    while _memory_bytes > MEMORY_BYTES:
+        _, dropped = _memory.popitem(last=False)
+        _memory_bytes -= len(dropped)
+        _stats["evicted"] += 1
+
+
+def _read(key: str) -> Optional[bytes]:
+    path = _path(key)
+    try:
+        png = path.read_bytes()
+        os.utime(path)  # last used, which the sweep orders by
+        return png
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("chart cache read failed %s: %s", key[:12], e)
+        return None
+
+
+def _write(key: str, png: bytes) -> None:
+    try:
+        atomic_write_bytes(_path(key), png, fsync=False)
+    except OSError as e:
+        logger.warning("chart cache write failed %s: %s", key[:12], e)
+
+
+def _sweep() -> None:
+    """Drop the disk tier's least recently used images past its bounds."""
+    try:
+        files = []
+        for path in _DIR.glob("*/*.png"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+    except OSError as e:
+        logger.warning("chart cache sweep failed: %s", e)
+        return
+    files.sort()
+    total = sum(size for _, size, _ in files)
+    cutoff = time.time() - DISK_RETENTION
+    for used_at, size, path in files:
+        if total <= DISK_BYTES and used_at >= cutoff:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+async def get_chart(key: str) -> Optional[bytes]:
+    """The image stored under ``key``, from memory or disk, or ``None``."""
+    png = _memory.get(key)
+    if png is not None:
+        _memory.move_to_end(key)
+        _stats["memory_hits"] += 1
+        return png
+    png = await asyncio.to_thread(_read, key)
+    if png is None:
+        _stats["misses"] += 1
+        return None
+    _stats["disk_hits"] += 1
+    _remember(key, png)
+    return png
+
+
+async def put_chart(key: str, png: bytes) -> None:
+    """Store a rendered image under its key, in both tiers."""
+    global _writes_since_sweep
+    _remember(key, png)
+    _stats["stores"] += 1
+    await asyncio.to_thread(_write, key, png)
+    _writes_since_sweep += 1
+    if _writes_since_sweep >= _SWEEP_EVERY:
+        _writes_since_sweep = 0
+        await asyncio.to_thread(_sweep)
+
+
+def chart_cache_stats() -> Dict[str, Any]:
+    """Hits per tier, misses and what the memory tier holds."""
+    hits = _stats["memory_hits"] + _stats["disk_hits"]
+    lookups = hits + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+        "memory_entries": len(_memory),
+        "memory_bytes": _memory_bytes,
+    }
+
+
+def reset_chart_cache() -> None:
+    """Forget the memory tier and the counters; the disk tier stays. For tests."""
+    global _memory_bytes, _writes_since_sweep
+    _memory.clear()
+    _memory_bytes = 0
+    _writes_since_sweep = 0
+    for key in _stats:
+        _stats[key] = 0
@@ -0,0 +1,277 @@
+"""Chart rendering off the event loop, in a pool of warm Kaleido workers.
+
+Every chart the bot sends is a Plotly figure turned into a PNG by Kaleido, which
+drives a headless Chromium. Called as ``fig.write_image`` inside an async
+handler, that conversion held the event loop for hundreds of milliseconds to
+seconds per chart. Every other user and the server data poller waited on it, and
+a cold process paid Chromium's start-up on top.
+
+:func:`render_png` is now the only way a figure becomes a PNG. It hands the
+figure, as JSON, to a pool of ``RENDER_WORKERS`` worker processes. Each worker
+starts Kaleido's persistent browser when it starts and renders a throwaway
+figure, so the first real chart finds it warm. The loop only waits.
+
+- At most ``RENDER_WORKERS`` figures are with the pool at a time. The rest wait
+  their turn on the loop, and that wait is the queue depth.
+- A render that takes longer than ``RENDER_TIMEOUT`` raises
+  :class:`ChartRenderError` and restarts the pool: a worker that stopped
+  answering cannot be cancelled, only killed.
+- A worker that dies (a Chromium crash, the OOM killer) breaks the pool. It is
+  replaced, and the render retried once.
+
+:func:`render_stats` reports the queue, the counts, the render time and the
+image cache's hits, and the admin API serves it. :func:`close_chart_renderer`
+stops the workers at shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from condor.chart_cache import chart_cache_stats, chart_key, get_chart, put_chart
+
+logger = logging.getLogger(__name__)
+
+# Each worker holds a Chromium of its own, ~150 MB resident, and a chart is one
+# CPU-bound render: two keeps a second chart from queueing behind a slow first.
+RENDER_WORKERS = 2
+# Longer than the slowest chart the bot draws (a 1400x950 backtest at scale 2,
+# a few seconds) by enough to mean the worker is stuck rather than busy.
+RENDER_TIMEOUT = 30.0
+
+
+class ChartRenderError(RuntimeError):
+    """A chart could not be rendered: the worker timed out or kept dying."""
+
+
+def _render_figure(
+    spec: str, width: Optional[int], height: Optional[int], scale: float
+) -> bytes:
+    """One figure, as Plotly JSON, to PNG bytes. Runs in a worker."""
+    import plotly.io as pio
+
+    fig = pio.from_json(spec, skip_invalid=True)
+    return pio.to_image(fig, format="png", width=width, height=height, scale=scale)
+
+
+def _warm() -> None:
+    """Start Kaleido's persistent browser in a new worker, and use it once.
+
+    A worker that cannot start it still renders, starting a browser per chart,
+    and whatever is wrong surfaces as that render's error.
+    """
+    try:
+        import kaleido
+        import plotly.graph_objects as go
+
+        # Finds the browser without starting it. Kaleido's server thread dies on
+        # a missing browser and leaves every later render waiting on it for good.
+        kaleido.Kaleido()
+        kaleido.start_sync_server(silence_warnings=True)
+        # Plotly passes per-call browser options the server has no use for.
+        warnings.filterwarnings("ignore", message="The kopts argument is ignored")
+        _render_figure(go.Figure().to_json(), 16, 16, 1)
+    except Exception as e:  # noqa: BLE001 - reported by the first real render
+        logging.getLogger(__name__).warning("chart worker warm-up failed: %s", e)
+
+
+# What the pool runs, by reference: module-level so a worker can import it.
+_worker_render = _render_figure
+_worker_init = _warm
+
+_pool: Optional[ProcessPoolExecutor] = None
+# A semaphore belongs to the loop it first waits on; one per loop, as the web
+# app's single loop and a routine's ``asyncio.run`` are different loops.
+_slots: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+# (loop, chart key) → the render of that chart under way, for callers to share.
+_inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Task[bytes]"] = {}
+_stats: Dict[str, Any] = {
+    "waiting": 0,
+    "rendering": 0,
+    "max_waiting": 0,
+    "rendered": 0,
+    "failed": 0,
+    "timeouts": 0,
+    "joined": 0,
+    "restarts": 0,
+    "render_seconds": 0.0,
+    "max_render_seconds": 0.0,
+}
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # Spawned, not forked: a fork would copy the bot's threads and open
+        # sockets into a process that only ever renders.
+        _pool = ProcessPoolExecutor(
+            max_workers=RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+        )
+    return _pool
+
+
+def _stop(pool: ProcessPoolExecutor) -> None:
+    """Shut a pool down without waiting on it, killing workers that hang.
+
+    Renders still queued on it are failed as a broken pool, not cancelled, so
+    their callers retry them on the next one.
+    """
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False)
+    for process in processes:
+        if process.is_alive():
+            process.kill()
+
+
+def _restart(reason: str) -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        _stats["restarts"] += 1
+        logger.warning("restarting chart workers: %s", reason)
+        _stop(pool)
+
+
+def _slot() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slot = _slots.get(loop)
+    if slot is None:
+        for stale in [other for other in _slots if other.is_closed()]:
+            _slots.pop(stale, None)
+        slot = _slots[loop] = asyncio.Semaphore(RENDER_WORKERS)
+    return slot
+
+
+def _spec(
+    fig: Any, width: Optional[int], height: Optional[int], scale: float
+) -> Tuple[str, str]:
+    spec = fig.to_json()
+    return spec, chart_key(spec, width, height, scale)
+
+
+def _retrieve(task: "asyncio.Task[bytes]") -> None:
+    # A render whose every caller was cancelled still finishes and is cached;
+    # its error, if it had one, has nobody left to raise to.
+    if not task.cancelled():
+        task.exception()
+
+
+async def render_png(
+    fig: Any,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    scale: float = 2,
+    timeout: float = RENDER_TIMEOUT,
+) -> bytes:
+    """Render a Plotly figure to PNG bytes in a worker process.
+
+    ``width`` and ``height`` override the figure's layout, as in
+    ``fig.write_image``. A figure rendered before at the same size is answered
+    from ``condor.chart_cache``, and callers asking for one already being
+    rendered share that render. Raises :class:`ChartRenderError` on a timeout
+    or a worker that died twice, and whatever the render itself raised
+    otherwise.
+    """
+    spec, key = await asyncio.to_thread(_spec, fig, width, height, scale)
+    png = await get_chart(key)
+    if png is not None:
+        return png
+
+    flight = (asyncio.get_running_loop(), key)
+    task = _inflight.get(flight)
+    if task is None:
+        task = asyncio.ensure_future(_render(key, spec, width, height, scale, timeout))
+        _inflight[flight] = task
+        task.add_done_callback(lambda _: _inflight.pop(flight, None))
+        task.add_done_callback(_retrieve)
+    else:
+        _stats["joined"] += 1
+    return await asyncio.shield(task)
+
+
+async def _render(
+    key: str,
+    spec: str,
+    width: Optional[int],
+    height: Optional[int],
+    scale: float,
+    timeout: float,
+) -> bytes:
+    """Render one figure in the pool, in turn, and store the image."""
+    slot = _slot()
+    _stats["waiting"] += 1
+    _stats["max_waiting"] = max(_stats["max_waiting"], _stats["waiting"])
+    try:
+        await slot.acquire()
+    finally:
+        _stats["waiting"] -= 1
+
+    _stats["rendering"] += 1
+    try:
+        for attempt in range(2):
+            started = time.perf_counter()
+            try:
+                future = _executor().submit(_worker_render, spec, width, height, scale)
+                png = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                _stats["timeouts"] += 1
+                _stats["failed"] += 1
+                _restart(f"a render ran past {timeout:.0f}s")
+                raise ChartRenderError(f"chart render timed out after {timeout:.0f}s")
+            except BrokenProcessPool as e:
+                _restart("a worker died")
+                if attempt:
+                    _stats["failed"] += 1
+                    raise ChartRenderError("chart worker died twice") from e
+                continue
+            except Exception:
+                _stats["failed"] += 1
+                raise
+            seconds = time.perf_counter() - started
+            _stats["rendered"] += 1
+            _stats["render_seconds"] += seconds
+            _stats["max_render_seconds"] = max(_stats["max_render_seconds"], seconds)
+            await put_chart(key, png)
+            return png
+    finally:
+        _stats["rendering"] -= 1
+        slot.release()
+
+
+def render_stats() -> Dict[str, Any]:
+    """The render queue and what the workers have done since start."""
+    rendered = _stats["rendered"]
+    return {
+        "workers": RENDER_WORKERS,
+        "running": _pool is not None,
+        **_stats,
+        "mean_render_seconds": (
+            _stats["render_seconds"] / rendered if rendered else None
+        ),
+        "cache": chart_cache_stats(),
+    }
+
+
+def close_chart_renderer() -> None:
+    """Stop the workers. At shutdown, and between tests."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        _stop(pool)
+    _slots.clear()
+    _inflight.clear()
+
+
+def reset_render_stats() -> None:
+    """Zero the counters. For tests."""
+    for key, value in _stats.items():
+        _stats[key] = 0.0 if isinstance(value, float) else 0
@@ -93,24 +93,21 @@ async def _resolve_pool(connector: str, trading_pair: str) -> tuple[str, str]:
 
     ``("", "base")`` when the pair names nothing GeckoTerminal can resolve — a
     ticker pair on a network whose bases are addresses, for instance, where a
-    lookup would only spend a request to fail.
+    lookup would only spend a request to fail. Otherwise the answer is the pair's
+    route in ``condor.pool_routes``, which costs no request once it is known.
     """
-    from condor.pool_data import (
-        fetch_pair_top_pool,
-        fetch_token_top_pool,
-        uses_symbol_pairs,
-    )
-
-    base, quote = split_pair(trading_pair)
+    from condor.pool_data import uses_symbol_pairs
+    from condor.pool_routes import route_pair
 
-    if ADDRESS_RE.match(base):
-        return await fetch_token_top_pool(base, connector, quote), "base"
+    base, _quote = split_pair(trading_pair)
 
-    if uses_symbol_pairs(connector):
-        address, inverted = await fetch_pair_top_pool(base, quote, connector)
-        return address, ("quote" if inverted else "base")
+    if not ADDRESS_RE.match(base) and not uses_symbol_pairs(connector):
+        return "", "base"
 
-    return "", "base"
+    route = await route_pair(connector, trading_pair)
+    if route is None:
+        return "", "base"
+    return route.address, route.token
 
 
 async def fetch_dex_candles(
@@ -135,9 +132,51 @@ async def fetch_dex_candles(
     Note the volume column is USD (GeckoTerminal reports ``volume_usd``) while the
     CEX path reports base units.
 
+    A pool-pinned request for a time range goes through the local candle store
+    (:mod:`condor.candle_store`), so only the part of the window not already on
+    disk is asked of GeckoTerminal. Unpinned pairs skip it: the pool they resolve
+    to can change between calls, and one series must not mix two pools.
+
     Returns candle dicts (``timestamp``/``open``/``high``/``low``/``close``/
     ``volume``), ascending.
     """
+    from condor.pool_data import normalize_timeframe, timeframe_seconds
+
+    if pool_address and start_time is not None:
+        from condor import candle_store
+
+        timeframe = normalize_timeframe(interval)
+
+        async def fetch(lo: float, hi: float) -> list[dict]:
+            return await _fetch_dex_window(
+                connector, pool_address, trading_pair, interval, lo, hi, use_cache
+            )
+
+        return await candle_store.fetch_range(
+            candle_store.series_key(
+                "gecko", f"{connector}/{pool_address}", trading_pair, timeframe
+            ),
+            timeframe_seconds(timeframe),
+            start_time,
+            end_time if end_time is not None else time.time(),
+            fetch,
+        )
+
+    return await _fetch_dex_window(
+        connector, pool_address, trading_pair, interval, start_time, end_time, use_cache
+    )
+
+
+async def _fetch_dex_window(
+    connector: str,
+    pool_address: str | None,
+    trading_pair: str,
+    interval: str,
+    start_time: float | None,
+    end_time: float | None,
+    use_cache: bool,
+) -> list[dict]:
+    """One GeckoTerminal OHLCV window for :func:`fetch_dex_candles`, uncached."""
     from condor.pool_data import candles_needed, normalize_timeframe, timeframe_seconds
 
     timeframe = normalize_timeframe(interval)
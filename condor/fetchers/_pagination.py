@@ -21,11 +21,27 @@ A walk ends on any of four conditions, and all four are load-bearing:
 The cap is on *rows accumulated*, never on iterations: the four conditions above
 already end a stalled walk, so the cap only exists to bound a genuinely enormous
 history. Each caller keeps its own cap — they are separate budget decisions.
+
+A consumer with work to do on each page can ask :func:`walk_pages` to read
+ahead: the next page is requested as soon as its cursor is known, and its round
+trip overlaps the consumer's work instead of following it.
+
+Offset-addressed endpoints (the archived-bot trades and orders) need no cursor
+to find the next page, so :func:`collect_offset_pages` requests several at once.
+It reassembles them in offset order and ends on the same empty-page and
+short-page conditions.
 """
 
+import asyncio
+import math
 from collections.abc import AsyncIterator, Awaitable, Callable
+from functools import partial
 from typing import Any
 
+# Pages of one offset walk in flight at once, at most. The window starts at two
+# and only grows while pages keep coming back at the pace of the fastest.
+OFFSET_MAX_CONCURRENCY = 8
+
 
 def next_cursor(result: Any) -> str | None:
     """The cursor for the following page, or ``None`` when there is none.
@@ -53,6 +69,8 @@ async def walk_pages(
     max_items: int,
     first_page_size: int | None = None,
     on_truncated: Callable[[], None] | None = None,
+    read_ahead: int = 0,
+    deadline: float | None = None,
 ) -> AsyncIterator[list]:
     """Yield each page of rows in turn, walking the cursor to exhaustion.
 
@@ -73,17 +91,97 @@ async def walk_pages(
         max_items: Stop once this many rows have been yielded.
         first_page_size: A smaller budget for the first request only, for
             consumers that want something on screen before the long pages land.
-        on_truncated: Called when the *cap* is what ended the walk, as opposed to
-            the history genuinely running out. Callers that must not report a
-            truncated result as a complete one log from here.
+        on_truncated: Called when the *cap* or the *deadline* is what ended the
+            walk, as opposed to the history genuinely running out. Callers that
+            must not report a truncated result as a complete one log from here.
+        read_ahead: Pages to request ahead of the one the consumer holds. At 0
+            the next page is requested only when the consumer asks for it. At 1
+            it is requested as soon as the current page's cursor is known, so
+            its round trip overlaps the consumer's work on the current page.
+            Each page still needs the cursor of the one before, so the requests
+            themselves stay one at a time.
+        deadline: Seconds the whole walk may take. No request is started past
+            it; the first page is always requested.
     """
+    stop_at = None
+    if deadline is not None:
+        stop_at = asyncio.get_running_loop().time() + deadline
+    walk = partial(
+        _walk,
+        extract_rows=extract_rows,
+        page_size=page_size,
+        max_items=max_items,
+        first_page_size=first_page_size,
+        on_truncated=on_truncated,
+        stop_at=stop_at,
+    )
+    if read_ahead <= 0:
+        async for page in walk(fetch_page):
+            yield page
+        return
+
+    # The consumer holds one page and at most ``read_ahead`` more are requested
+    # or waiting: a request takes a slot, and a page the consumer is done with
+    # gives its slot back.
+    slots = asyncio.Semaphore(read_ahead + 1)
+    ready: asyncio.Queue = asyncio.Queue()
+    failure: list[BaseException] = []
+
+    async def gated(**kwargs: Any) -> Any:
+        await slots.acquire()
+        return await fetch_page(**kwargs)
+
+    async def produce() -> None:
+        try:
+            async for page in walk(gated):
+                ready.put_nowait(page)
+        except Exception as e:
+            failure.append(e)
+        finally:
+            ready.put_nowait(_END)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            page = await ready.get()
+            if page is _END:
+                if failure:
+                    raise failure[0]
+                return
+            yield page
+            slots.release()
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+# Ends a read-ahead walk's queue of pages.
+_END = object()
+
+
+async def _walk(
+    fetch_page: Callable[..., Awaitable[Any]],
+    extract_rows: Callable[[Any], list],
+    *,
+    page_size: int,
+    max_items: int,
+    first_page_size: int | None,
+    on_truncated: Callable[[], None] | None,
+    stop_at: float | None,
+) -> AsyncIterator[list]:
+    """The cursor walk itself; :func:`walk_pages` documents it."""
     fetched = 0
     page_num = 0
     cursor: str | None = None
 
     while True:
         remaining = max_items - fetched
-        if remaining <= 0:
+        out_of_time = (
+            page_num > 0
+            and stop_at is not None
+            and asyncio.get_running_loop().time() >= stop_at
+        )
+        if remaining <= 0 or out_of_time:
             if on_truncated is not None:
                 on_truncated()
             return
@@ -118,11 +216,12 @@ async def collect_pages(
     max_items: int,
     first_page_size: int | None = None,
     on_truncated: Callable[[], None] | None = None,
+    deadline: float | None = None,
 ) -> list:
     """Walk every page and return the accumulated rows.
 
     The whole-history form of :func:`walk_pages`, for callers with no per-page
-    work to do.
+    work to do — and so nothing for a read-ahead to overlap.
     """
     rows: list = []
     async for page in walk_pages(
@@ -132,6 +231,133 @@ async def collect_pages(
         max_items=max_items,
         first_page_size=first_page_size,
         on_truncated=on_truncated,
+        deadline=deadline,
     ):
         rows.extend(page)
     return rows
+
+
+async def collect_offset_pages(
+    fetch_page: Callable[..., Awaitable[Any]],
+    extract_rows: Callable[[Any], list],
+    *,
+    page_size: int,
+    max_items: int,
+    total: int | None = None,
+    max_concurrency: int = OFFSET_MAX_CONCURRENCY,
+    on_truncated: Callable[[], None] | None = None,
+    on_error: Callable[[int, BaseException], None] | None = None,
+) -> list:
+    """Fetch an offset-addressed listing several pages at a time, in order.
+
+    ``fetch_page`` is called as ``fetch_page(limit=..., offset=...)``. Pages
+    are requested in offset order through a window of concurrent requests and
+    returned as one list in offset order. The first empty or short page is the
+    end: pages requested past it are cancelled or dropped.
+
+    The window is adaptive. It starts at two and grows by one after each
+    window's worth of pages that came back within twice the fastest latency
+    seen. A slower page shrinks it by one and an error halves it.
+
+    A page that fails is retried once. If it fails again, the walk ends before
+    it, keeping the pages in front (as a sequential walk's ``break`` would), and
+    ``on_error`` is called with its offset and the exception. An ``on_error``
+    that raises fails the walk instead, for a caller that must not act on part
+    of a listing.
+
+    Args:
+        total: How many rows the listing holds, when the caller knows. Pages
+            past it are requested one at a time, only in case it was stale,
+            so an exact total costs no speculative requests.
+        on_truncated: Called when ``max_items`` is what ended the walk.
+
+    Cancelling the walk cancels every request in flight.
+    """
+    cap_pages = math.ceil(max_items / page_size)
+    expected = math.ceil(total / page_size) if total is not None else None
+    loop = asyncio.get_running_loop()
+
+    def limit_for(page: int) -> int:
+        return min(page_size, max_items - page * page_size)
+
+    async def fetch(page: int) -> tuple[list, float]:
+        started = loop.time()
+        result = await fetch_page(limit=limit_for(page), offset=page * page_size)
+        return extract_rows(result), loop.time() - started
+
+    pages: dict[int, list] = {}
+    running: dict[asyncio.Task, int] = {}
+    retries: list[int] = []
+    retried: set[int] = set()
+    next_page = 0
+    end: int | None = None  # the first page index past the listing
+    window = min(2, max_concurrency)
+    streak = 0
+    fastest = math.inf
+
+    try:
+        while True:
+            while len(running) < window:
+                if retries:
+                    page = retries.pop(0)
+                elif next_page < (cap_pages if end is None else end) and (
+                    expected is None or next_page < expected or not running
+                ):
+                    page = next_page
+                    next_page += 1
+                else:
+                    break
+                running[asyncio.ensure_future(fetch(page))] = page
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page = running.pop(task)
+                if end is not None and page >= end:
+                    if not task.cancelled():
+                        task.exception()  # past the end: nobody wants it
+                    continue
+                try:
+                    rows, seconds = task.result()
+                except Exception as e:
+                    window = max(1, window // 2)
+                    streak = 0
+                    if page in retried:
+                        if on_error is not None:
+                            on_error(page * page_size, e)
+                        end = page if end is None else min(end, page)
+                    else:
+                        retried.add(page)
+                        retries.append(page)
+                    continue
+
+                pages[page] = rows
+                if len(rows) < limit_for(page):
+                    end = page + 1 if end is None else min(end, page + 1)
+                fastest = min(fastest, seconds)
+                if seconds > 2 * fastest:
+                    window = max(1, window - 1)
+                    streak = 0
+                else:
+                    streak += 1
+                    if streak >= window:
+                        window = min(max_concurrency, window + 1)
+                        streak = 0
+
+            if end is not None:
+                for task, page in running.items():
+                    if page >= end:
+                        task.cancel()
+                retries = [page for page in retries if page < end]
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    if end is None:
+        end = cap_pages
+        if on_truncated is not None:
+            on_truncated()
+    return [row for page in range(end) for row in pages[page]]
@@ -0,0 +1,244 @@
+"""Where the shared GeckoTerminal budget goes, per caller.
+
+``pool_data.gecko_health`` answers "are we throttled?" with process totals:
+requests in the last minute, 429s, refused calls. When the budget runs dry that
+does not say who spent it, whether the candle loop, the pool browser, a routine
+or an agent's MCP tool. Nor do the totals say whether a cache's TTL is earning
+its keep.
+
+This module keeps the accounting. Code that spends the budget names itself
+with :func:`gecko_caller`, a context variable like ``gecko_priority`` and for
+the same reason: the request is made several calls below the code that knows
+who it is for. The outermost tag wins, so a routine that draws a chart is
+charged as the routine, not as the chart. ``gecko_call`` records each request
+against the current tag. For each caller that means a rolling hour of request
+times, outcomes (answered, failed, 429, or refused before sending, since this
+process's budget was spent) and a latency histogram. ``pool_data`` also
+records hits and misses per named cache and, per kind of key, how many
+single-flight fetches started and how many callers joined one already in the
+air.
+
+:func:`gecko_stats` is the snapshot the admin endpoint serves, and
+:func:`top_callers` the short form ``/servers/{name}/dex/upstream`` adds to its
+diagnostics. Everything is process-local: the MCP server runs as its own
+process and keeps its own counters, under the ``mcp`` tag.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# The tag charged when no caller named itself.
+UNTAGGED = "untagged"
+
+# How far back the rolling counts reach, and how many outcomes a caller keeps to
+# cover it. A refused call costs nothing upstream but can come in storms; past
+# the cap the oldest are dropped and the hour's counts undercount.
+WINDOW = 3600.0
+_MAX_EVENTS = 5_000
+
+# Upper bounds, in seconds, of the latency histogram's buckets; a last bucket
+# holds anything slower. A cached GeckoTerminal answer comes back in about a
+# hundred milliseconds, and a cold chain listing takes several seconds.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Request outcomes, as recorded by ``gecko_call``.
+OK, ERROR, RATE_LIMITED, REFUSED = "ok", "error", "rate_limited", "refused"
+_OUTCOMES = (OK, ERROR, RATE_LIMITED, REFUSED)
+
+_caller: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "gecko_caller", default=None
+)
+
+
+class _CallerStats:
+    """One caller's rolling outcomes, totals and latency histogram."""
+
+    __slots__ = ("events", "totals", "lanes", "latency", "latency_sum")
+
+    def __init__(self) -> None:
+        self.events: Deque[Tuple[float, str]] = deque(maxlen=_MAX_EVENTS)
+        self.totals = dict.fromkeys(_OUTCOMES, 0)
+        self.lanes: Dict[str, int] = {}
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+
+    def record(self, outcome: str, lane: str, seconds: Optional[float]) -> None:
+        now = time.time()
+        self.events.append((now, outcome))
+        while self.events and now - self.events[0][0] >= WINDOW:
+            self.events.popleft()
+        self.totals[outcome] += 1
+        if outcome == REFUSED:
+            return
+        self.lanes[lane] = self.lanes.get(lane, 0) + 1
+        if seconds is not None:
+            self.latency[_bucket(seconds)] += 1
+            self.latency_sum += seconds
+
+    def summary(self, now: float) -> Dict[str, Any]:
+        minute = {outcome: 0 for outcome in _OUTCOMES}
+        hour = {outcome: 0 for outcome in _OUTCOMES}
+        for at, outcome in self.events:
+            age = now - at
+            if age < WINDOW:
+                hour[outcome] += 1
+                if age < 60:
+                    minute[outcome] += 1
+        sent_minute = minute[OK] + minute[ERROR] + minute[RATE_LIMITED]
+        sent_hour = hour[OK] + hour[ERROR] + hour[RATE_LIMITED]
+        return {
+            "requests_last_minute": sent_minute,
+            "requests_last_hour": sent_hour,
+            "last_hour": hour,
+            "totals": dict(self.totals),
+            "lanes": dict(self.lanes),
+            "latency": _latency_summary(self.latency, self.latency_sum),
+        }
+
+
+def _bucket(seconds: float) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+def _latency_summary(counts: List[int], total: float) -> Dict[str, Any]:
+    """Count, mean and bucket-bound quantiles of one histogram."""
+    count = sum(counts)
+    labels = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+
+    def quantile(q: float) -> Optional[float]:
+        if not count:
+            return None
+        seen = 0
+        for i, n in enumerate(counts):
+            seen += n
+            if seen >= q * count:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else None
+        return None
+
+    return {
+        "count": count,
+        "mean": (total / count) if count else None,
+        "p50_at_most": quantile(0.5),
+        "p95_at_most": quantile(0.95),
+        "buckets": dict(zip(labels, counts)),
+    }
+
+
+_callers: Dict[str, _CallerStats] = {}
+# Cache name → [hits, misses].
+_caches: Dict[str, List[int]] = {}
+# Single-flight key kind → [started, joined].
+_flights: Dict[str, List[int]] = {}
+
+
+@contextmanager
+def gecko_caller(tag: str) -> Iterator[None]:
+    """Charge the GeckoTerminal requests made inside this block to ``tag``.
+
+    A block already charged to someone keeps its tag: the outermost caller is
+    the one spending the budget.
+    """
+    if _caller.get() is not None:
+        yield
+        return
+    token = _caller.set(tag)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def charge_task_to(tag: str) -> None:
+    """Charge the rest of the running task to ``tag``, unless it already is.
+
+    For a dependency that cannot wrap the code it runs before. Each web request
+    runs in its own task, so the tag ends with the request.
+    """
+    if _caller.get() is None:
+        _caller.set(tag)
+
+
+def current_caller() -> str:
+    return _caller.get() or UNTAGGED
+
+
+def record_request(
+    outcome: str, lane: str = "", seconds: Optional[float] = None
+) -> None:
+    """One GeckoTerminal request from the current caller, and how it went."""
+    tag = current_caller()
+    stats = _callers.get(tag)
+    if stats is None:
+        stats = _callers[tag] = _CallerStats()
+    stats.record(outcome, lane, seconds)
+
+
+def record_cache(name: str, hit: bool) -> None:
+    counts = _caches.setdefault(name, [0, 0])
+    counts[0 if hit else 1] += 1
+
+
+def record_flight(kind: str, joined: bool) -> None:
+    counts = _flights.setdefault(kind, [0, 0])
+    counts[1 if joined else 0] += 1
+
+
+def gecko_stats() -> Dict[str, Any]:
+    """Everything recorded so far: per caller, per cache and per flight kind."""
+    now = time.time()
+    callers = {tag: stats.summary(now) for tag, stats in _callers.items()}
+    caches = {
+        name: {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / (hits + misses)) if hits + misses else None,
+        }
+        for name, (hits, misses) in _caches.items()
+    }
+    flights = {
+        kind: {"started": started, "joined": joined}
+        for kind, (started, joined) in _flights.items()
+    }
+    return {
+        "window": WINDOW,
+        "callers": dict(
+            sorted(callers.items(), key=lambda kv: -kv[1]["requests_last_hour"])
+        ),
+        "caches": dict(sorted(caches.items())),
+        "single_flight": dict(sorted(flights.items())),
+    }
+
+
+def top_callers(limit: int = 5) -> List[Dict[str, Any]]:
+    """The callers that spent the most of the last hour, most first."""
+    now = time.time()
+    rows = []
+    for tag, stats in _callers.items():
+        summary = stats.summary(now)
+        rows.append(
+            {
+                "caller": tag,
+                "requests_last_minute": summary["requests_last_minute"],
+                "requests_last_hour": summary["requests_last_hour"],
+                "refused_last_hour": summary["last_hour"][REFUSED],
+            }
+        )
+    rows.sort(key=lambda r: (-r["requests_last_hour"], -r["refused_last_hour"]))
+    return [r for r in rows if r["requests_last_hour"] or r["refused_last_hour"]][
+        :limit
+    ]
+
+
+def reset_gecko_stats() -> None:
+    """Forget everything recorded. For tests."""
+    _callers.clear()
+    _caches.clear()
+    _flights.clear()
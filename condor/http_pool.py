@@ -0,0 +1,143 @@
+"""Pooled outbound HTTP for the third-party APIs Condor calls.
+
+Outbound HTTP used to be set up wherever it was needed. Routines opened a fresh
+``aiohttp.ClientSession`` per run, and often per request. The Telegram fallback
+bot built an ``httpx.AsyncClient`` per message. ``orca_api`` and the
+GeckoTerminal client each kept a client of their own. Every fresh session is a
+DNS lookup, a TCP connect and a TLS handshake before the first byte, and the
+busiest routines paid that on every call.
+
+This module keeps the pools instead, one set per event loop:
+
+- :func:`http_client` returns an ``httpx.AsyncClient`` per base URL and headers.
+  Its connections are kept alive, it speaks HTTP/2 when ``h2`` is installed,
+  and it shares the same timeouts and connection cap. One client per host is
+  what makes that cap a per-host one.
+- :func:`pooled_session` is for aiohttp code. It yields a session over a shared
+  ``TCPConnector``, which holds the keep-alive pool, the per-host cap and the
+  DNS cache. The session is cheap and is closed on exit; the connector is not.
+- :func:`close_http_pools` closes everything at shutdown.
+
+Pools are kept per loop for the reason ``orca_api`` first did: a pooled
+connection belongs to the loop that opened it, and reusing it from another one
+fails with "Event loop is closed" rather than reconnecting. The web app is one
+long-lived loop; a routine or a test driving code through ``asyncio.run`` is not.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import aiohttp
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Shared by every pooled client: a slow third party is better abandoned than held
+# open, and a caller with a longer job passes its own timeout per request.
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+_SESSION_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10)
+
+# Connections per host, in flight and kept alive. Above it requests queue for a
+# connection rather than opening more sockets against one API.
+PER_HOST_CONNECTIONS = 16
+_KEEPALIVE_EXPIRY = 30.0
+_DNS_TTL = 300
+
+# httpx speaks HTTP/2 only with the optional ``h2`` package installed.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Keyed by (loop, base URL, headers): a client belongs to the loop it was opened on.
+_clients: Dict[Tuple, httpx.AsyncClient] = {}
+_connectors: Dict[asyncio.AbstractEventLoop, aiohttp.TCPConnector] = {}
+
+
+def _headers_key(headers: Optional[Dict[str, str]]) -> Tuple:
+    return tuple(sorted((headers or {}).items()))
+
+
+def http_client(
+    base_url: str = "",
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+) -> httpx.AsyncClient:
+    """The pooled client for ``base_url`` and ``headers`` on the running loop.
+
+    Do not close it: it is shared, and :func:`close_http_pools` closes it at
+    shutdown. ``timeout`` is only applied when the client is built, so every
+    caller of one base URL should pass the same one.
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, base_url, _headers_key(headers))
+    client = _clients.get(key)
+    if client is not None and not client.is_closed:
+        return client
+    # A client of a loop that has closed holds connections that died with it.
+    # There is nothing left to close, so the reference is simply dropped.
+    for other in [k for k in _clients if k[0].is_closed()]:
+        _clients.pop(other, None)
+    client = httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        timeout=timeout or DEFAULT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=PER_HOST_CONNECTIONS,
+            max_keepalive_connections=PER_HOST_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY,
+        ),
+        http2=_HTTP2,
+    )
+    _clients[key] = client
+    return client
+
+
+def _connector() -> aiohttp.TCPConnector:
+    loop = asyncio.get_running_loop()
+    connector = _connectors.get(loop)
+    if connector is None or connector.closed:
+        for other in [l for l in _connectors if l.is_closed()]:
+            _connectors.pop(other, None)
+        connector = aiohttp.TCPConnector(
+            limit_per_host=PER_HOST_CONNECTIONS,
+            ttl_dns_cache=_DNS_TTL,
+            keepalive_timeout=_KEEPALIVE_EXPIRY,
+        )
+        _connectors[loop] = connector
+    return connector
+
+
+@asynccontextmanager
+async def pooled_session(**kwargs: Any) -> AsyncIterator[aiohttp.ClientSession]:
+    """An ``aiohttp.ClientSession`` over the loop's shared connector.
+
+    A drop-in for ``async with aiohttp.ClientSession(...)``. It takes the same
+    keyword arguments (headers, a default timeout, ...), but connections outlive
+    the block and are reused by the next one.
+    """
+    kwargs.setdefault("timeout", _SESSION_TIMEOUT)
+    session = aiohttp.ClientSession(
+        connector=_connector(), connector_owner=False, **kwargs
+    )
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def close_http_pools() -> None:
+    """Close the pooled clients and connectors opened on the running loop."""
+    loop = asyncio.get_running_loop()
+    for key, client in list(_clients.items()):
+        if key[0] is loop:
+            _clients.pop(key, None)
+            try:
+                await client.aclose()
+            except Exception:
+                logger.debug("closing pooled client failed", exc_info=True)
+    connector = _connectors.pop(loop, None)
+    if connector is not None:
+        await connector.close()
@@ -19,6 +19,8 @@ from urllib.parse import urlparse
 
 import aiohttp
 
+from condor.http_pool import pooled_session
+
 log = logging.getLogger(__name__)
 
 # Per-candidate budget. Candidates are probed concurrently, so this is also
@@ -289,7 +291,7 @@ async def fetch_models(base_url: str, api_key: str = "") -> tuple[str, list[str]
         candidates.append(f"{base_url}/v1")
 
     timeout = aiohttp.ClientTimeout(total=FETCH_TIMEOUT_SECONDS)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
+    async with pooled_session(timeout=timeout) as session:
         results = await asyncio.gather(
             *(_probe(session, candidate, headers) for candidate in candidates)
         )
@@ -16,6 +16,8 @@ from dataclasses import dataclass
 
 import aiohttp
 
+from condor.http_pool import pooled_session
+
 log = logging.getLogger(__name__)
 
 OPENROUTER_MODELS_URL = "https://openrouter.ai/api/v1/models"
@@ -61,7 +63,7 @@ async def fetch_models(force_refresh: bool = False) -> list[OpenRouterModel]:
 
     timeout = aiohttp.ClientTimeout(total=10)
     try:
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with pooled_session(timeout=timeout) as session:
             async with session.get(OPENROUTER_MODELS_URL) as resp:
                 resp.raise_for_status()
                 payload = await resp.json()
@@ -16,12 +16,13 @@ default-library User-Agent is answered 403, so one is always sent.
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
 import httpx
 
+from condor.http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 ORCA_API_BASE = "https://api.orca.so/v2/solana"
@@ -34,28 +35,15 @@ _USER_AGENT = "condor-dex-browser/1.0 (+https://github.com/hummingbot)"
 # from the stale cache than held open.
 _TIMEOUT = httpx.Timeout(15.0, connect=5.0)
 
-# One client, and so one connection pool — the same reason ``pool_data`` keeps a
-# single GeckoTerminal client. Kept with the loop it was built on: a pooled
-# connection belongs to that loop, and reusing it from another one fails with
-# "Event loop is closed" rather than reconnecting. The web app is one long-lived
-# loop, but a routine or a test driving this through ``asyncio.run`` is not.
-_client: Optional[httpx.AsyncClient] = None
-_client_loop: Optional[asyncio.AbstractEventLoop] = None
-
 
+# The pooled client for api.orca.so (``condor.http_pool``): kept alive across
+# requests, and rebuilt for a loop other than the one it was opened on.
 def _http() -> httpx.AsyncClient:
-    global _client, _client_loop
-    loop = asyncio.get_running_loop()
-    if _client is None or _client.is_closed or _client_loop is not loop:
-        # The previous client's connections died with its loop; there is nothing
-        # left to close, so the reference is simply dropped.
-        _client = httpx.AsyncClient(
-            base_url=ORCA_API_BASE,
-            timeout=_TIMEOUT,
-            headers={"User-Agent": _USER_AGENT, "Accept": "application/json"},
-        )
-        _client_loop = loop
-    return _client
+    return http_client(
+        ORCA_API_BASE,
+        headers={"User-Agent": _USER_AGENT, "Accept": "application/json"},
+        timeout=_TIMEOUT,
+    )
 
 
 async def _get(path: str, params: Dict[str, Any]) -> Any:
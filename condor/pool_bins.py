@@ -0,0 +1,289 @@
+"""CLMM liquidity bins as arrays, read from Gateway in bounded batches.
+
+A pool's bins used to travel as Gateway's list of dicts. They were cached as
+that list, walked field by field by every chart, and re-read in full once a
+minute by each caller separately: the aggregated chart opened one
+``get_pool_info`` per pool, all at once, around the shared cache.
+
+A :class:`BinSnapshot` holds one read of one pool as parallel NumPy arrays
+(bin id, price, base and quote amounts) sorted by bin id, with the pool's
+other fields beside them. It is what ``pool_data._pool_bins_cache`` now stores.
+Each snapshot carries a fingerprint of its arrays. It also records which bins
+changed since the snapshot it replaced, so a poller that already holds the
+previous read can be sent only the changes. A swap only moves the bins around
+the active one.
+
+:func:`fetch_bins_many` reads many pools in one call. Repeated pools are
+asked once, cached ones cost nothing, and the rest go to Gateway through
+``pool_data``'s shared bins gate, so no caller can open more than
+``_BINS_MAX_CONCURRENCY`` reads at once. :func:`aggregate_liquidity` buckets
+bins across pools with array operations, for the aggregated chart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from condor import pool_data
+
+# The outer bands of cumulative liquidity the aggregated chart leaves out.
+_TRIM = 0.025
+_MIN_BUCKETS, _MAX_BUCKETS = 30, 80
+# The pool info fields a bin's USD liquidity is priced with.
+_USD_PRICE_KEYS = ("base_token_price_usd", "quote_token_price_usd")
+
+
+def _column(bins: List[Dict[str, Any]], key: str) -> np.ndarray:
+    """One numeric field of every bin; NaN where it is missing or unparseable."""
+    values = [b.get(key) for b in bins]
+    try:
+        out = np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        parsed = [pool_data._finite(v) for v in values]
+        out = np.array([np.nan if v is None else v for v in parsed], dtype=float)
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+class BinSnapshot:
+    """One Gateway read of a pool's bins as arrays, sorted by bin id.
+
+    ``info`` is the rest of the pool info, without its ``bins``. Its token USD
+    prices, which price every bin's liquidity, are kept in ``usd_prices`` and
+    fingerprinted with the arrays. ``parent`` is the fingerprint of the
+    snapshot this one replaced. ``changed`` holds the positions whose amounts
+    differ from it or that it did not have (every position, when the USD
+    prices moved), and ``removed`` the prices of the bins it had that this
+    read does not. All three are ``None`` when there was no earlier read to
+    compare with.
+    """
+
+    __slots__ = (
+        "bin_id",
+        "price",
+        "base",
+        "quote",
+        "info",
+        "usd_prices",
+        "fingerprint",
+        "parent",
+        "changed",
+        "removed",
+    )
+
+    def __init__(
+        self,
+        bin_id: np.ndarray,
+        price: np.ndarray,
+        base: np.ndarray,
+        quote: np.ndarray,
+        info: Dict[str, Any],
+    ):
+        self.bin_id = bin_id
+        self.price = price
+        self.base = base
+        self.quote = quote
+        self.info = info
+        self.usd_prices = tuple(pool_data._finite(info.get(k)) for k in _USD_PRICE_KEYS)
+        digest = hashlib.blake2b(digest_size=16)
+        for column in (bin_id, price, base, quote):
+            digest.update(column.tobytes())
+        digest.update(repr(self.usd_prices).encode())
+        self.fingerprint = digest.hexdigest()
+        self.parent: Optional[str] = None
+        self.changed: Optional[np.ndarray] = None
+        self.removed: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @classmethod
+    def from_bins(
+        cls, bins: Iterable[Any], info: Optional[Dict[str, Any]] = None
+    ) -> "BinSnapshot":
+        """Gateway's bin dicts → arrays. A bin without a usable price is dropped;
+        a missing amount counts as zero, and a missing id as the bin's position."""
+        rows = [b for b in bins or () if isinstance(b, dict)]
+        price = _column(rows, "price")
+        keep = np.flatnonzero(~np.isnan(price))
+        bin_id = _column(rows, "bin_id")
+        if np.isnan(bin_id).any():
+            bin_id = np.arange(len(rows), dtype=float)
+        bin_id = bin_id[keep].astype(np.int64)
+        order = np.argsort(bin_id, kind="stable")
+        base = np.nan_to_num(_column(rows, "base_token_amount")[keep], nan=0.0)
+        quote = np.nan_to_num(_column(rows, "quote_token_amount")[keep], nan=0.0)
+        return cls(
+            bin_id[order], price[keep][order], base[order], quote[order], info or {}
+        )
+
+    @classmethod
+    def from_pool_info(
+        cls, pool_info: Dict[str, Any], previous: Optional["BinSnapshot"] = None
+    ) -> "BinSnapshot":
+        """A Gateway pool info → a snapshot, compared against ``previous``."""
+        info = {k: v for k, v in pool_info.items() if k != "bins"}
+        snapshot = cls.from_bins(pool_info.get("bins") or (), info)
+        if previous is not None:
+            snapshot._compare(previous)
+        return snapshot
+
+    def _compare(self, previous: "BinSnapshot") -> None:
+        if previous.fingerprint == self.fingerprint:
+            # Nothing moved: keep answering a poller one step behind.
+            self.parent = previous.parent
+            self.changed, self.removed = previous.changed, previous.removed
+            return
+        self.parent = previous.fingerprint
+        if self.usd_prices != previous.usd_prices:
+            # Every bin's USD liquidity moved with the token prices.
+            self.changed = np.arange(len(self))
+        else:
+            self.changed = np.flatnonzero(~self._same_as(previous))
+        self.removed = previous.price[~np.isin(previous.bin_id, self.bin_id)]
+
+    def _same_as(self, other: "BinSnapshot") -> np.ndarray:
+        """Per bin here: whether ``other`` has the same bin at the same amounts."""
+        if not len(other):
+            return np.zeros(len(self), dtype=bool)
+        at = np.minimum(np.searchsorted(other.bin_id, self.bin_id), len(other) - 1)
+        return (
+            (other.bin_id[at] == self.bin_id)
+            & (other.price[at] == self.price)
+            & (other.base[at] == self.base)
+            & (other.quote[at] == self.quote)
+        )
+
+    def bins(self, index: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """The bins (all, or those at ``index``) as the dicts Gateway returns."""
+        columns = (self.bin_id, self.price, self.base, self.quote)
+        if index is not None:
+            columns = tuple(c[index] for c in columns)
+        return [
+            {
+                "bin_id": bin_id,
+                "price": price,
+                "base_token_amount": base,
+                "quote_token_amount": quote,
+            }
+            for bin_id, price, base, quote in zip(*(c.tolist() for c in columns))
+        ]
+
+    def pool_info(self) -> Dict[str, Any]:
+        """A fresh pool info dict with its ``bins`` list, for the dict callers."""
+        info = dict(self.info)
+        info["bins"] = self.bins()
+        return info
+
+
+async def fetch_bins_many(
+    pools: Iterable[Tuple[str, str]],
+    network: str = "solana-mainnet-beta",
+    client=None,
+) -> Dict[Tuple[str, str], Tuple[Optional[BinSnapshot], Optional[str]]]:
+    """Snapshots for many ``(connector, pool_address)`` pairs at once.
+
+    Each distinct pool is read once through ``pool_data.fetch_bin_snapshot``, so
+    cached pools cost nothing, a pool another caller is already reading joins
+    that read, and the rest share the bins gate. Returns ``(snapshot, error)``
+    per pair, as ``fetch_bin_snapshot`` does for one.
+    """
+    keys = list(dict.fromkeys(pools))
+    results = await asyncio.gather(
+        *(
+            pool_data.fetch_bin_snapshot(address, connector, network, client)
+            for connector, address in keys
+        )
+    )
+    return dict(zip(keys, results))
+
+
+class LiquidityProfile(NamedTuple):
+    """Bucketed liquidity across pools, as the aggregated chart draws it."""
+
+    prices: List[float]
+    base_values: List[float]
+    quote_values: List[float]
+    avg_price: float
+    min_price: float
+    max_price: float
+    pools: int
+
+
+def _entry_snapshot(entry: Dict[str, Any]) -> BinSnapshot:
+    snapshot = entry.get("snapshot")
+    if snapshot is None:
+        snapshot = BinSnapshot.from_bins(entry.get("bins") or ())
+    return snapshot
+
+
+def aggregate_liquidity(pools_data: List[Dict[str, Any]]) -> Optional[LiquidityProfile]:
+    """Bucket the bins of many pools into one price profile.
+
+    ``pools_data`` entries carry ``pool``, ``pool_info`` and either ``bins`` or a
+    ``snapshot``. Bins are valued in quote, the outer 2.5% of cumulative value on
+    each side is trimmed (unless that leaves fewer than five), and what remains
+    is summed into 30–80 equal-width price buckets. The average price is the
+    pools' TVL-weighted price, or the mean bin price when no pool reports both.
+    """
+    valid = [
+        p
+        for p in pools_data
+        if p.get("bins") or (p.get("snapshot") is not None and len(p["snapshot"]))
+    ]
+    if not valid:
+        return None
+
+    total_tvl = weighted_price_sum = 0.0
+    prices, base_values, quotes = [], [], []
+    for entry in valid:
+        pool, info = entry.get("pool", {}), entry.get("pool_info", {})
+        tvl = float(pool.get("liquidity", 0) or info.get("liquidity", 0) or 0)
+        current = float(info.get("price", 0) or pool.get("current_price", 0) or 0)
+        if tvl > 0 and current > 0:
+            total_tvl += tvl
+            weighted_price_sum += current * tvl
+        snapshot = _entry_snapshot(entry)
+        prices.append(snapshot.price)
+        base_values.append(snapshot.base * snapshot.price)
+        quotes.append(snapshot.quote)
+
+    price = np.concatenate(prices)
+    base_value = np.concatenate(base_values)
+    quote = np.concatenate(quotes)
+    total = base_value + quote
+    keep = (price > 0) & (total > 0)
+    if not keep.any():
+        return None
+
+    order = np.argsort(price[keep], kind="stable")
+    price, base_value, quote = (c[keep][order] for c in (price, base_value, quote))
+    avg_price = weighted_price_sum / total_tvl if total_tvl > 0 else float(price.mean())
+
+    cumulative = np.cumsum(total[keep][order])
+    whole = cumulative[-1]
+    low = int(np.searchsorted(cumulative, whole * _TRIM))
+    high = min(int(np.searchsorted(cumulative, whole * (1 - _TRIM))), len(price) - 1)
+    if high - low + 1 >= 5:
+        price, base_value, quote = (
+            c[low : high + 1] for c in (price, base_value, quote)
+        )
+
+    min_price, max_price = float(price[0]), float(price[-1])
+    buckets = min(_MAX_BUCKETS, max(_MIN_BUCKETS, len(price) // 5))
+    width = (max_price - min_price) / buckets if max_price > min_price else 1
+    index = np.minimum(((price - min_price) / width).astype(np.int64), buckets - 1)
+    used = np.flatnonzero(np.bincount(index, minlength=buckets))
+    return LiquidityProfile(
+        prices=(min_price + (used + 0.5) * width).tolist(),
+        base_values=np.bincount(index, base_value, buckets)[used].tolist(),
+        quote_values=np.bincount(index, quote, buckets)[used].tolist(),
+        avg_price=avg_price,
+        min_price=min_price,
+        max_price=max_price,
+        pools=len(valid),
+    )
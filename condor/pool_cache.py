@@ -0,0 +1,193 @@
+"""On-disk backing for ``condor.pool_data``'s GeckoTerminal lookup caches.
+
+Token symbols, a token's top pool and pool metadata are answers that almost
+never change, yet they lived only in process memory: every restart began with
+an empty cache and spent the shared GeckoTerminal budget re-resolving mints
+the previous process had already resolved thousands of times. This store keeps
+them across restarts.
+
+One table, partitioned by **kind** (one kind per ``pool_data`` cache). Keys are
+the caches' tuple keys and values their cached answers, both as JSON. Each row
+carries when it was fetched (freshness is the caller's call, against its own
+TTL) and when it was last used, which is what eviction orders by: past a kind's
+row cap the least recently used rows go, not the oldest inserted.
+
+SQLite (WAL) like ``candle_store``: several processes on a host read the same
+file, and a keyed lookup is all this does. Every failure is logged and
+swallowed — the in-memory cache keeps working without it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Anchored at the repo root like the other stores under ``data/``.
+_DB_PATH = Path(__file__).resolve().parents[1] / "data" / "pool_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_used ON entries (kind, used_at);
+"""
+
+# Paths whose schema this process has already ensured.
+_ready: set[Path] = set()
+_ready_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    path = _DB_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0)
+    if path not in _ready:
+        with _ready_lock:
+            if path not in _ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+                _ready.add(path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _encode_key(key: tuple) -> str:
+    return json.dumps(list(key), separators=(",", ":"))
+
+
+def load(kind: str, key: tuple) -> Optional[Tuple[float, Any]]:
+    """``(stored_at, value)`` for one key, or None when absent or unreadable.
+
+    A read only: the caller records the use with :func:`touch`, batched and off
+    the event loop like every other write.
+    """
+    try:
+        with closing(_connect()) as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM entries WHERE kind = ? AND key = ?",
+                (kind, _encode_key(key)),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[1], json.loads(row[0])
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logger.debug("pool cache read failed kind=%s: %s", kind, e)
+        return None
+
+
+def store(
+    kind: str,
+    key: tuple,
+    value: Any,
+    stored_at: float,
+    restore: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """Write one answer through to disk.
+
+    A value that would not read back equal is skipped: one that is not JSON, or
+    whose tuples or non-string dict keys JSON would turn into lists and strings.
+    ``restore`` is what the reader rebuilds a value with (``tuple``, for a cache
+    of tuples), so such a value is judged as it will be read.
+    """
+    try:
+        encoded = json.dumps(value, separators=(",", ":"), allow_nan=False)
+        decoded = json.loads(encoded)
+        if restore is not None:
+            decoded = restore(decoded)
+    except (TypeError, ValueError):
+        return
+    if decoded != value:
+        logger.debug(
+            "pool cache skipped a value that does not round-trip kind=%s", kind
+        )
+        return
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(kind, key, value, stored_at, used_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, _encode_key(key), encoded, stored_at, time.time()),
+            )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("pool cache write failed kind=%s: %s", kind, e)
+
+
+def touch(kind: str, keys: Iterable[tuple], at: float) -> None:
+    """Record uses the in-memory cache served, so disk eviction sees them too."""
+    rows = [(at, kind, _encode_key(k)) for k in keys]
+    if not rows:
+        return
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE entries SET used_at = ? WHERE kind = ? AND key = ?", rows
+            )
+    except (sqlite3.Error, OSError) as e:
+        logger.debug("pool cache touch failed kind=%s: %s", kind, e)
+
+
+def prune(kind: str, max_age: float, max_rows: int) -> None:
+    """Drop rows older than ``max_age``, then the least recently used past ``max_rows``."""
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM entries WHERE kind = ? AND stored_at < ?",
+                (kind, time.time() - max_age),
+            )
+            conn.execute(
+                "DELETE FROM entries WHERE kind = ? AND key IN ("
+                "SELECT key FROM entries WHERE kind = ? "
+                "ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (kind, kind, max_rows),
+            )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("pool cache prune failed kind=%s: %s", kind, e)
+
+
+def drop(kind: str) -> None:
+    """Forget every row of one kind. A store that was never written stays absent."""
+    if not _DB_PATH.exists():
+        return
+    try:
+        with closing(_connect()) as conn, conn:
+            conn.execute("DELETE FROM entries WHERE kind = ?", (kind,))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("pool cache drop failed kind=%s: %s", kind, e)
+
+
+def recent(kind: str, limit: int, max_age: float) -> List[Tuple[tuple, float, Any]]:
+    """Up to ``limit`` rows fetched within ``max_age``, least recently used first.
+
+    What a process loads at boot: the rows its predecessor used most, in the
+    order an LRU should hold them.
+    """
+    try:
+        with closing(_connect()) as conn:
+            rows = conn.execute(
+                "SELECT key, stored_at, value FROM entries "
+                "WHERE kind = ? AND stored_at >= ? ORDER BY used_at DESC LIMIT ?",
+                (kind, time.time() - max_age, limit),
+            ).fetchall()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("pool cache load failed kind=%s: %s", kind, e)
+        return []
+    out: List[Tuple[tuple, float, Any]] = []
+    for key, stored_at, value in reversed(rows):
+        try:
+            out.append((tuple(json.loads(key)), stored_at, json.loads(value)))
+        except ValueError:
+            continue
+    return out
@@ -13,19 +13,39 @@ functions rather than building GeckoTerminal URLs themselves.
 """
 
 import asyncio
+import bisect
+import contextvars
 import logging
 import math
 import re
 import time
-from collections import deque
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import httpx
 from geckoterminal_py import GeckoTerminalAsyncClient
 from geckoterminal_py import constants as GECKO_CONSTANTS
 from glom import glom
 
-from condor import orca_api
+from condor import gecko_stats, orca_api, pool_cache
+from condor.gecko_stats import gecko_caller
+from condor.http_pool import http_client
+
+if TYPE_CHECKING:
+    from condor.pool_bins import BinSnapshot
+    from condor.pool_table import PoolTable
 
 logger = logging.getLogger(__name__)
 
@@ -159,8 +179,10 @@ DEX_TO_GECKO = {
 # Cache TTLs
 OHLCV_CACHE_TTL = 300  # 5 minutes
 BINS_CACHE_TTL = 60  # 1 minute
-TOKEN_SYMBOL_TTL = 24 * 3600  # a mint's ticker does not change
-TOKEN_POOL_TTL = 3600  # a token's main pool is stable over an hour
+# Both outlive a restart (see _LruCache), so these bound how long a rename or a
+# liquidity migration can linger, not how often a cold process re-asks.
+TOKEN_SYMBOL_TTL = 7 * 24 * 3600  # a mint's ticker does not change
+TOKEN_POOL_TTL = 6 * 3600  # a token's main pool is stable over hours
 # Pool *lists* are the pool browser's hot path and GeckoTerminal rate-limits per
 # IP across every dashboard viewer and every polling chart, so these are not an
 # optimization: an un-cached browser refetching per keystroke would starve the
@@ -244,25 +266,44 @@ def candles_needed(start: Optional[float], end: Optional[float], timeframe: str)
 
 
 # ── GeckoTerminal client ──
-# One client (and so one httpx connection pool) for the process. Constructing a
-# fresh GeckoTerminalAsyncClient per call leaks an unclosed httpx.AsyncClient
-# every time, which at chart-refresh rates exhausts sockets.
+# One client for the process. Constructing a fresh GeckoTerminalAsyncClient per
+# call leaks an unclosed httpx.AsyncClient every time, which at chart-refresh
+# rates exhausts sockets. Its requests go through the pooled client for gecko's
+# host (``condor.http_pool``), looked up per request so that each event loop
+# uses its own connections.
+class _PooledGeckoClient(GeckoTerminalAsyncClient):
+    """``GeckoTerminalAsyncClient`` over the running loop's pooled httpx client.
+
+    The library's constructor builds an ``httpx.AsyncClient`` of its own, which
+    nothing would ever close; this one never builds it.
+    """
+
+    def __init__(self) -> None:
+        pass
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # geckoterminal_py builds its httpx client with no timeout override, so
+        # a slow chain listing blocks for httpx's 5s default and then fails
+        # outright. A read timeout well above that is worth more than a fast
+        # empty table.
+        return http_client(
+            self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(_GECKO_TIMEOUT, connect=5.0),
+        )
+
+    async def close(self) -> None:
+        """Nothing to close: ``close_http_pools`` closes the shared client."""
+
+
 _gecko_client_instance: Optional[GeckoTerminalAsyncClient] = None
 
 
 def _gecko_client() -> GeckoTerminalAsyncClient:
     global _gecko_client_instance
     if _gecko_client_instance is None:
-        _gecko_client_instance = GeckoTerminalAsyncClient()
-        # geckoterminal_py builds its httpx client with no timeout override, so a
-        # slow chain listing blocks for httpx's 5s default and then fails outright.
-        # A read timeout well above that is worth more than a fast empty table.
-        try:
-            _gecko_client_instance._client.timeout = httpx.Timeout(
-                _GECKO_TIMEOUT, connect=5.0
-            )
-        except Exception:  # pragma: no cover - a library layout change, not an error
-            logger.debug("could not set gecko client timeout", exc_info=True)
+        _gecko_client_instance = _PooledGeckoClient()
     return _gecko_client_instance
 
 
@@ -275,7 +316,8 @@ def _gecko_client() -> GeckoTerminalAsyncClient:
 # * ``_acquire_rate_slot`` (rate) is the one that actually keeps us under the
 #   limit. A concurrency cap alone does not: four *fast* concurrent requests
 #   sustain well over 100/min, which is how the budget was being spent before
-#   anything looked like a burst.
+#   anything looked like a burst. It also decides *who* gets a slot: a live
+#   chart and a page load go ahead of a scanner, which cannot fill the window.
 # * ``_trip_breaker`` (circuit) stops calling at all for a moment once gecko has
 #   said 429. Every request sent during a throttled window is spent for nothing
 #   and keeps the window rolling, so the cheapest response is silence.
@@ -311,7 +353,101 @@ class GeckoRateLimited(RuntimeError):
 
 # Timestamps of the requests inside the current rolling window.
 _gecko_call_times: deque = deque()
-_gecko_rate_lock: Optional[asyncio.Lock] = None
+
+
+class GeckoPriority(IntEnum):
+    """Who a GeckoTerminal request is for; lower is more urgent.
+
+    ``LIVE`` is a chart someone is watching, ``INTERACTIVE`` a page load or bot
+    command with a person waiting on it (the default), ``BACKGROUND`` a routine or
+    scanner nobody is staring at, and ``PREFETCH`` a guess at what will be asked
+    next. Set for a block of code with :func:`gecko_priority`.
+    """
+
+    LIVE = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+    PREFETCH = 3
+
+
+# The share of the per-minute budget each lane may fill; what a lane may not
+# touch is held for the lanes above it. Background work stops at three quarters
+# so a page load always finds a slot behind a scanner, and a prefetch only runs on
+# a budget that is at most half spent — the idle budget, never the interactive one.
+_GECKO_LANE_SHARE = {
+    GeckoPriority.LIVE: 1.0,
+    GeckoPriority.INTERACTIVE: 1.0,
+    GeckoPriority.BACKGROUND: 0.75,
+    GeckoPriority.PREFETCH: 0.5,
+}
+
+# Background work is deferred rather than refused: nobody is waiting on it, so it
+# queues longer than a page load would. A prefetch never queues — by the time a
+# slot frees, the guess it acted on is stale.
+_GECKO_BACKGROUND_MAX_WAIT = 30.0
+
+
+class _GeckoLane:
+    """The priority a task's gecko requests go out at.
+
+    Mutable on purpose: a single-flight fetch started by a prefetch or a scanner is
+    promoted when a viewer joins it, rather than making the viewer wait (or be
+    dropped) at the starter's priority.
+    """
+
+    __slots__ = ("priority",)
+
+    def __init__(self, priority: GeckoPriority):
+        self.priority = priority
+
+
+_gecko_lane: contextvars.ContextVar[Optional[_GeckoLane]] = contextvars.ContextVar(
+    "gecko_lane", default=None
+)
+
+# Callers queued for a slot, by arrival number. The one first in line is the most
+# urgent, earliest arrival — re-read on every pass, since a lane can be promoted
+# while it waits.
+_gecko_waiters: Dict[int, _GeckoLane] = {}
+_gecko_wait_seq: int = 0
+
+
+def current_gecko_priority() -> GeckoPriority:
+    lane = _gecko_lane.get()
+    return lane.priority if lane is not None else GeckoPriority.INTERACTIVE
+
+
+@contextmanager
+def gecko_priority(priority: GeckoPriority) -> Iterator[None]:
+    """Send the GeckoTerminal requests made inside this block at ``priority``.
+
+    A context variable rather than an argument, because the request is made
+    several calls below the code that knows who it is for — a poll loop calling
+    ``fetch_dex_candles`` calling ``fetch_ohlcv`` calling ``gecko_call``.
+    """
+    token = _gecko_lane.set(_GeckoLane(priority))
+    try:
+        yield
+    finally:
+        _gecko_lane.reset(token)
+
+
+def _lane_capacity(priority: GeckoPriority) -> int:
+    return int(_GECKO_RATE_LIMIT * _GECKO_LANE_SHARE[priority])
+
+
+def _lane_max_wait(priority: GeckoPriority) -> float:
+    if priority is GeckoPriority.PREFETCH:
+        return 0.0
+    if priority is GeckoPriority.BACKGROUND:
+        return max(_GECKO_MAX_WAIT, _GECKO_BACKGROUND_MAX_WAIT)
+    return _GECKO_MAX_WAIT
+
+
+def _first_in_line(seq: int) -> bool:
+    head = min(_gecko_waiters.items(), key=lambda kv: (kv[1].priority, kv[0]))
+    return head[0] == seq
+
 
 # Circuit-breaker + health state. Process-wide, because the budget is per-IP:
 # one viewer's 429 is every viewer's 429, and there is no point rediscovering it
@@ -330,14 +466,6 @@ def _gecko_gate() -> asyncio.Semaphore:
     return _gecko_semaphore
 
 
-def _gecko_rate_gate() -> asyncio.Lock:
-    """The rate gate, built lazily for the same reason as the semaphore."""
-    global _gecko_rate_lock
-    if _gecko_rate_lock is None:
-        _gecko_rate_lock = asyncio.Lock()
-    return _gecko_rate_lock
-
-
 def _is_rate_limited(exc: BaseException) -> bool:
     if isinstance(exc, GeckoRateLimited):
         return True
@@ -362,16 +490,21 @@ def _trip_breaker() -> None:
 
 
 async def _acquire_rate_slot() -> None:
-    """Claim one request from the shared per-minute budget.
+    """Claim one request from the shared per-minute budget, by priority.
 
-    Waits for a slot up to ``_GECKO_MAX_WAIT``; raises ``GeckoRateLimited`` when
-    the budget is spent for longer than that, or while the breaker is open. The
-    wait happens under the lock so callers queue in arrival order instead of
-    stampeding the instant a slot frees.
+    Callers queue by :class:`GeckoPriority`, then arrival, and each lane may only
+    fill its share of the window (``_GECKO_LANE_SHARE``). Raises
+    ``GeckoRateLimited`` while the breaker is open, or when the lane's slot is
+    further off than the lane will wait — ``_GECKO_MAX_WAIT`` for a person,
+    longer for background work, not at all for a prefetch.
     """
-    global _gecko_throttled_calls
-    deadline = time.time() + _GECKO_MAX_WAIT
-    async with _gecko_rate_gate():
+    global _gecko_throttled_calls, _gecko_wait_seq
+    lane = _gecko_lane.get() or _GeckoLane(GeckoPriority.INTERACTIVE)
+    start = time.time()
+    _gecko_wait_seq += 1
+    seq = _gecko_wait_seq
+    _gecko_waiters[seq] = lane
+    try:
         while True:
             now = time.time()
 
@@ -387,19 +520,30 @@ async def _acquire_rate_slot() -> None:
             ):
                 _gecko_call_times.popleft()
 
-            if len(_gecko_call_times) < _GECKO_RATE_LIMIT:
+            capacity = _lane_capacity(lane.priority)
+            used = len(_gecko_call_times)
+            if used < capacity and _first_in_line(seq):
                 _gecko_call_times.append(now)
                 return
 
-            # Budget full: wait exactly until the oldest request ages out.
-            wait = _GECKO_RATE_WINDOW - (now - _gecko_call_times[0])
-            if now + wait > deadline:
+            # Either the lane's share is full — wait until enough of the window
+            # ages out — or a more urgent caller is ahead and takes the next slot.
+            if capacity <= 0:
+                wait = _GECKO_RATE_WINDOW
+            elif used >= capacity:
+                wait = _GECKO_RATE_WINDOW - (now - _gecko_call_times[used - capacity])
+            else:
+                wait = 0.0
+            if now + wait > start + _lane_max_wait(lane.priority):
                 _gecko_throttled_calls += 1
                 raise GeckoRateLimited(
-                    f"GeckoTerminal rate limit: {_GECKO_RATE_LIMIT} requests "
-                    f"already sent this minute, next slot in {wait:.1f}s"
+                    f"GeckoTerminal rate limit: {used} of {_GECKO_RATE_LIMIT} "
+                    f"requests already sent this minute, next "
+                    f"{lane.priority.name.lower()} slot in {wait:.1f}s"
                 )
-            await asyncio.sleep(min(wait, 0.25))
+            await asyncio.sleep(min(wait, 0.25) or 0.05)
+    finally:
+        _gecko_waiters.pop(seq, None)
 
 
 def gecko_health() -> Dict[str, Any]:
@@ -429,13 +573,15 @@ def reset_gecko_throttle() -> None:
     wall-clock minute and would otherwise throttle themselves.
     """
     global _gecko_cooldown_until, _gecko_last_429, _gecko_429_count
-    global _gecko_throttled_calls
+    global _gecko_throttled_calls, _bins_semaphore
     _gecko_call_times.clear()
+    _gecko_waiters.clear()
     _gecko_inflight.clear()
     _gecko_cooldown_until = 0.0
     _gecko_last_429 = 0.0
     _gecko_429_count = 0
     _gecko_throttled_calls = 0
+    _bins_semaphore = None  # bound to the loop it first queued on
     for cache in (
         _gecko_page_cache,
         _pool_by_address_cache,
@@ -446,10 +592,21 @@ def reset_gecko_throttle() -> None:
         _token_pool_cache,
         _pair_pool_cache,
         _ohlcv_cache,
+        _ohlcv_series,
         _pool_bins_cache,
+        _gecko_prefetched,
     ):
         cache.clear()
 
+    from condor.pool_index import reset_pool_index
+    from condor.pool_routes import reset_pool_routes
+    from condor.pool_snapshots import reset_pool_snapshots
+
+    reset_pool_index()
+    reset_pool_routes()
+    reset_pool_snapshots()
+    gecko_stats.reset_gecko_stats()
+
 
 async def gecko_call(method: str, *args: Any, **kwargs: Any) -> Any:
     """One GeckoTerminal client call, rate-gated and retried where that helps.
@@ -466,12 +623,33 @@ async def gecko_call(method: str, *args: Any, **kwargs: Any) -> Any:
     that is exhausted. It trips the breaker instead. A 404, or the 401 gecko
     answers past page 10, is a final answer and is raised on the first attempt.
     """
+    lane = current_gecko_priority().name.lower()
     for attempt in range(_GECKO_RETRIES + 1):
-        await _acquire_rate_slot()
+        try:
+            await _acquire_rate_slot()
+        except GeckoRateLimited:
+            gecko_stats.record_request(gecko_stats.REFUSED)
+            raise
+        started = None
         try:
             async with _gecko_gate():
-                return await getattr(_gecko_client(), method)(*args, **kwargs)
+                started = time.perf_counter()
+                result = await getattr(_gecko_client(), method)(*args, **kwargs)
+            gecko_stats.record_request(
+                gecko_stats.OK, lane, time.perf_counter() - started
+            )
+            return result
         except Exception as e:  # noqa: BLE001 - re-raised below when not retryable
+            if started is not None:
+                gecko_stats.record_request(
+                    (
+                        gecko_stats.RATE_LIMITED
+                        if _is_rate_limited(e)
+                        else gecko_stats.ERROR
+                    ),
+                    lane,
+                    time.perf_counter() - started,
+                )
             if _is_rate_limited(e):
                 if not isinstance(e, GeckoRateLimited):
                     _trip_breaker()
@@ -499,7 +677,7 @@ _GECKO_BACKOFF = (0.4, 1.0)
 # air, so every one of them misses the cache and opens its own gecko request — the
 # fastest way there is to spend the minute's budget. This collapses concurrent
 # callers of the same key onto one upstream request.
-_gecko_inflight: Dict[Tuple, "asyncio.Task"] = {}
+_gecko_inflight: Dict[Tuple, Tuple["asyncio.Task", _GeckoLane]] = {}
 
 
 async def _single_flight(key: Tuple, factory) -> Any:
@@ -508,17 +686,32 @@ async def _single_flight(key: Tuple, factory) -> Any:
     The work runs as a detached task and awaiters ``shield`` it, so the very thing
     that causes the stampede — a viewer navigating away and cancelling their
     request — cannot also cancel the fetch the remaining viewers are waiting on.
+
+    The task goes out at its starter's priority, raised to that of the most urgent
+    caller to join it: a viewer who asks for the page a prefetch is already
+    fetching must not wait in the prefetch's lane.
     """
-    task = _gecko_inflight.get(key)
-    if task is None or task.done():
-        task = asyncio.ensure_future(factory())
-        _gecko_inflight[key] = task
+    mine = current_gecko_priority()
+    flight = _gecko_inflight.get(key)
+    joining = flight is not None and not flight[0].done()
+    gecko_stats.record_flight(str(key[0]) if key else "", joining)
+    if not joining:
+        lane = _GeckoLane(mine)
+        context = contextvars.copy_context()
+        context.run(_gecko_lane.set, lane)
+        task = asyncio.get_running_loop().create_task(factory(), context=context)
+        _gecko_inflight[key] = (task, lane)
 
         def _clear(finished: "asyncio.Task", _key: Tuple = key) -> None:
-            if _gecko_inflight.get(_key) is finished:
+            current = _gecko_inflight.get(_key)
+            if current is not None and current[0] is finished:
                 _gecko_inflight.pop(_key, None)
 
         task.add_done_callback(_clear)
+    else:
+        task, lane = flight
+        if mine < lane.priority:
+            lane.priority = mine
     return await asyncio.shield(task)
 
 
@@ -526,31 +719,154 @@ async def _single_flight(key: Tuple, factory) -> Any:
 # These answers are process-wide (not per-user) and tiny. Capped so an unbounded
 # stream of distinct mints cannot grow them without limit.
 _TOKEN_CACHE_MAX = 512
-_token_symbol_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+# Flush the uses an in-memory cache served to disk in batches of this many, so
+# the store's eviction order sees hits without a write per render.
+_TOUCH_BATCH = 64
+# Prune a persisted kind on disk once per this many writes to it.
+_PRUNE_EVERY = 128
+
+
+class _LruCache(OrderedDict):
+    """A process-wide answer cache that evicts the least recently used entry.
+
+    Entries are ``(fetched_at, value)``; freshness is judged by the reader, per
+    call, against its own TTL. With a ``kind`` the cache is also written through
+    to :mod:`condor.pool_cache` and read back from there on a miss, so it
+    survives a restart: ``retention`` bounds how long a row is kept on disk,
+    ``max_rows`` how many. ``name`` (the ``kind`` by default) is what its hits
+    and misses are counted under in :mod:`condor.gecko_stats`; a cache with
+    neither is not counted. ``restore`` rebuilds a value read back from JSON
+    (``tuple`` for a cache of tuples); a value that would not read back equal
+    is kept in memory only.
+    """
+
+    def __init__(
+        self,
+        kind: Optional[str] = None,
+        retention: float = 0.0,
+        max_rows: int = 0,
+        name: Optional[str] = None,
+        restore: Optional[Callable[[Any], Any]] = None,
+    ):
+        super().__init__()
+        self.kind = kind
+        self.restore = restore
+        self.name = name or kind
+        self.retention = retention
+        self.max_rows = max_rows
+        self._touched: set = set()
+        self._writes = 0
+
+    def entry(self, key: tuple) -> Optional[Tuple[float, Any]]:
+        """The entry for ``key`` from memory, else from disk; marks it used."""
+        entry = self.get(key)
+        if entry is not None:
+            self.move_to_end(key)
+        elif self.kind:
+            entry = self.load(key)
+            if entry is None:
+                return None
+            self[key] = entry
+            self._evict()
+        else:
+            return None
+        if self.kind:
+            self._touched.add(key)
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched()
+        return entry
+
+    def load(self, key: tuple) -> Optional[Tuple[float, Any]]:
+        """``key``'s row from disk, its value rebuilt with ``restore``."""
+        loaded = pool_cache.load(self.kind, key)
+        if loaded is None or self.restore is None:
+            return loaded
+        try:
+            return loaded[0], self.restore(loaded[1])
+        except (TypeError, ValueError):
+            return None
+
+    def put(self, key: tuple, value: Any, sweep_after: float) -> None:
+        """Store a fresh answer, sweeping memory entries older than ``sweep_after``."""
+        now = time.time()
+        for k in [k for k, (ts, _) in self.items() if now - ts >= sweep_after]:
+            self.pop(k, None)
+        self[key] = (now, value)
+        self.move_to_end(key)
+        self._evict()
+        if not self.kind:
+            return
+        _off_loop(pool_cache.store, self.kind, key, value, now, self.restore)
+        self._flush_touched()
+        self._writes += 1
+        if self._writes % _PRUNE_EVERY == 0:
+            _off_loop(pool_cache.prune, self.kind, self.retention, self.max_rows)
+
+    def clear(self) -> None:
+        super().clear()
+        self._touched.clear()
+        if self.kind:
+            pool_cache.drop(self.kind)
+
+    def _evict(self) -> None:
+        while len(self) > _TOKEN_CACHE_MAX:
+            self.popitem(last=False)
+
+    def _flush_touched(self) -> None:
+        if self._touched:
+            _off_loop(pool_cache.touch, self.kind, self._touched, time.time())
+            self._touched = set()
+
+
+def _off_loop(fn, *args) -> None:
+    """Run a disk write in a worker thread when called from the event loop.
+
+    Writes are fire-and-forget — the in-memory answer is already in place — so a
+    slow fsync never holds up a render. A miss's keyed read stays inline: it is
+    one primary-key lookup, and the caller is about to wait on the network. The
+    use it records is batched with the memory hits' and written here.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        fn(*args)
+        return
+    loop.run_in_executor(None, fn, *args)
+
+
+_token_symbol_cache: Dict[Tuple[str, str], Tuple[float, str]] = _LruCache(
+    "token_symbol", TOKEN_SYMBOL_TTL, 20_000
+)
 # Both hold normalized pool dicts, and an empty dict for "asked, there is no such
 # pool" — a real answer worth caching, unlike a failed lookup, which is not cached
 # at all. The address-only forms (fetch_token_top_pool, fetch_pair_top_pool) read
 # these same entries.
-_token_pool_cache: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = {}
+_token_pool_cache: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = _LruCache(
+    "token_pool", TOKEN_POOL_TTL, 5_000
+)
 _pair_pool_cache: Dict[
     Tuple[str, str, str], Tuple[float, Tuple[Dict[str, Any], bool]]
-] = {}
+] = _LruCache("pair_pool", TOKEN_POOL_TTL, 2_000, restore=tuple)
 
 
-def _ttl_get(cache: dict, key: tuple, ttl: float) -> Optional[Any]:
-    entry = cache.get(key)
-    if entry and (time.time() - entry[0]) < ttl:
-        return entry[1]
-    return None
+def _ttl_get(
+    cache: _LruCache, key: tuple, ttl: float, count: bool = True
+) -> Optional[Any]:
+    """The cached value if it is younger than ``ttl``, else ``None``.
 
+    Counted as a hit or a miss of the cache unless ``count`` is off, for a probe
+    that is not a read on anyone's behalf.
+    """
+    entry = cache.entry(key)
+    fresh = bool(entry) and (time.time() - entry[0]) < ttl
+    if count and cache.name:
+        gecko_stats.record_cache(cache.name, fresh)
+    return entry[1] if fresh else None
 
-def _ttl_put(cache: dict, key: tuple, value: Any, ttl: float) -> None:
-    now = time.time()
-    for k in [k for k, (ts, _) in cache.items() if now - ts >= ttl]:
-        cache.pop(k, None)
-    cache[key] = (now, value)
-    while len(cache) > _TOKEN_CACHE_MAX:
-        cache.pop(next(iter(cache)))
+
+def _ttl_put(cache: _LruCache, key: tuple, value: Any, ttl: float) -> None:
+    cache.put(key, value, sweep_after=ttl)
 
 
 # ── Stale-tolerant cache, for upstreams that fail more often than they change ──
@@ -566,18 +882,13 @@ def _ttl_put(cache: dict, key: tuple, value: Any, ttl: float) -> None:
 _STALE_MAX_AGE = 15 * 60
 
 
-def _stale_put(cache: dict, key: tuple, value: Any) -> None:
-    cache[key] = (time.time(), value)
-    now = time.time()
-    for k in [k for k, (ts, _) in cache.items() if now - ts >= _STALE_MAX_AGE]:
-        cache.pop(k, None)
-    while len(cache) > _TOKEN_CACHE_MAX:
-        cache.pop(next(iter(cache)))
+def _stale_put(cache: _LruCache, key: tuple, value: Any) -> None:
+    cache.put(key, value, sweep_after=_STALE_MAX_AGE)
 
 
-def _stale_get(cache: dict, key: tuple) -> Tuple[Optional[Any], float]:
+def _stale_get(cache: _LruCache, key: tuple) -> Tuple[Optional[Any], float]:
     """The cached value regardless of freshness, with its age in seconds."""
-    entry = cache.get(key)
+    entry = cache.entry(key)
     if not entry:
         return None, 0.0
     return entry[1], time.time() - entry[0]
@@ -589,7 +900,7 @@ async def fetch_token_symbol(mint: str, network: str) -> str:
     Returns "" when the token is unknown or the lookup fails. An empty answer from
     a *successful* response is cached (a genuinely unlisted mint should not be
     re-queried on every render); a failed lookup is not, so one blip does not blank
-    the ticker for a day.
+    the ticker for a week.
     """
     gnet = get_gecko_network(network)
     key = (gnet, mint)
@@ -616,7 +927,7 @@ def _pool_quote_symbols(name: Any) -> List[str]:
 
 
 async def fetch_token_top_pool_info(
-    mint: str, network: str, quote: str
+    mint: str, network: str, quote: str, max_age: float = TOKEN_POOL_TTL
 ) -> Optional[Dict[str, Any]]:
     """The token's highest-volume pool **quoted in ``quote``**, normalized.
 
@@ -628,12 +939,13 @@ async def fetch_token_top_pool_info(
 
     ``None`` distinguishes "no answer yet" from "asked and there is none": a
     no-match *is* cached (as ``{}``), a failed lookup is not, so a GeckoTerminal
-    blip cannot pin an empty answer for the cache's full hour.
+    blip cannot pin an empty answer for the cache's full TTL. ``max_age`` bounds
+    how old a cached answer may be; ``0`` asks GeckoTerminal again.
     """
     gnet = get_gecko_network(network)
     want = (quote or "").strip().upper()
     key = (gnet, mint, want)
-    cached = _ttl_get(_token_pool_cache, key, TOKEN_POOL_TTL)
+    cached = _ttl_get(_token_pool_cache, key, max_age)
     if cached is not None:
         return cached or None
 
@@ -641,7 +953,7 @@ async def fetch_token_top_pool_info(
         pools = await gecko_call("get_top_pools_by_network_token", gnet, mint)
     except Exception as e:
         # Includes the KeyError geckoterminal_py raises post-processing an empty
-        # result set. Not cached — a transient failure must not pin "" for an hour.
+        # result set. Not cached — a transient failure must not pin "" for hours.
         logger.info("top-pool lookup failed mint=%s net=%s: %s", mint, gnet, e)
         return None
 
@@ -677,7 +989,7 @@ async def fetch_token_top_pool(mint: str, network: str, quote: str) -> str:
 
 
 async def fetch_pair_top_pool_info(
-    base: str, quote: str, network: str
+    base: str, quote: str, network: str, max_age: float = TOKEN_POOL_TTL
 ) -> Tuple[Optional[Dict[str, Any]], bool]:
     """Deepest pool trading ``base``/``quote`` on ``network``, found by *symbol*.
 
@@ -695,6 +1007,8 @@ async def fetch_pair_top_pool_info(
         and ``pool_info``'s pair fields are reported as the *caller* asked for
         them, not as the pool names them. ``(None, False)`` when nothing matches —
         an empty chart beats a chart drawn on the wrong pair.
+
+    ``max_age`` bounds how old a cached answer may be; ``0`` searches again.
     """
     gnet = get_gecko_network(network)
     b, q = (base or "").strip().upper(), (quote or "").strip().upper()
@@ -702,7 +1016,7 @@ async def fetch_pair_top_pool_info(
         return None, False
 
     key = (gnet, b, q)
-    cached = _ttl_get(_pair_pool_cache, key, TOKEN_POOL_TTL)
+    cached = _ttl_get(_pair_pool_cache, key, max_age)
     if cached is not None:
         return (cached[0] or None), cached[1]
 
@@ -713,7 +1027,7 @@ async def fetch_pair_top_pool_info(
             "GET", "search/pools", params={"query": f"{b} {q}", "network": gnet}
         )
     except Exception as e:
-        # Not cached — a blip must not pin "no pool" for the full hour.
+        # Not cached — a blip must not pin "no pool" for the full TTL.
         logger.info("pair-pool search failed %s-%s net=%s: %s", b, q, gnet, e)
         return None, False
 
@@ -824,20 +1138,24 @@ async def resolve_pool_info(
     Solana resolves here but not there (the chart stays blank while the panel
     still names a pool). Pointing ``_resolve_pool`` at this function would close
     that gap; it is a change to the candle path and deliberately not made here.
+
+    Both read the pair's route from ``condor.pool_routes``, so the panel and the
+    chart share one answer and neither pays for it twice.
     """
-    # Lazy, like dex_candles' own import of this module: one definition of what an
-    # on-chain address looks like, and no import cycle between the two.
-    from condor.dex_candles import ADDRESS_RE
+    # Lazy: pool_routes is built on this module.
+    from condor.pool_routes import route_pair
 
     base, _, quote = str(trading_pair or "").partition("-")
-    base, quote = base.strip(), quote.strip()
-    if not base or not quote:
+    if not base.strip() or not quote.strip():
         return None
 
-    if ADDRESS_RE.match(base):
-        return await fetch_token_top_pool_info(base, network, quote)
-
-    info, _inverted = await fetch_pair_top_pool_info(base, quote, network)
+    route = await route_pair(network, trading_pair)
+    if route is None:
+        return None
+    info = dict(route.info)
+    if "network" in info:
+        # Routes are shared per gecko chain; the pair fields name the network asked.
+        info["network"] = network
     return info
 
 
@@ -936,6 +1254,171 @@ def get_connector_for_dex(dex_id: str) -> Optional[str]:
     return None
 
 
+# ── Incremental OHLCV ──
+# One merged series per pool feed ``(network, pool, timeframe, currency, token)``,
+# kept in memory so repeat reads are sliced locally instead of re-downloaded. The
+# series holds *every* candle GeckoTerminal has from its first row to its newest
+# (gecko omits intervals with no trades, so that is a count, not a time grid); a
+# refresh asks only for the tail since the newest stored candle, which is the
+# still-forming one and gets revised in place.
+_OHLCV_SERIES_MAX = 128
+_OHLCV_SERIES_ROWS = 2 * GECKO_OHLCV_MAX
+
+
+class _OhlcvSeries:
+    """All candles of one pool feed from ``rows[0]`` on, ascending."""
+
+    __slots__ = ("rows", "stamps", "tf", "synced_at", "complete")
+
+    def __init__(self, tf: int):
+        self.rows: List[list] = []
+        self.stamps: List[float] = []
+        self.tf = tf
+        # When the tail was last fetched: every candle that had closed by then
+        # is final here.
+        self.synced_at = 0.0
+        # True once upstream answered short of a request, so nothing precedes
+        # rows[0] — a young pool's whole history.
+        self.complete = False
+
+    def window(
+        self, limit: int, before: Optional[int], max_age: Optional[float]
+    ) -> Optional[List]:
+        """The rows the upstream window would return, or None if not held here."""
+        if before is None:
+            if max_age is None or time.time() - self.synced_at >= max_age:
+                return None
+            end = len(self.rows)
+        else:
+            # Only candles already closed at the last sync are final.
+            if before > (self.synced_at // self.tf) * self.tf:
+                return None
+            end = bisect.bisect_left(self.stamps, before)
+        if end < limit and not self.complete:
+            return None
+        return self.rows[max(0, end - limit) : end]
+
+    def tail_limit(self) -> int:
+        """Candles since the newest stored one, inclusive; 0 when too many."""
+        if not self.rows:
+            return 0
+        n = int((time.time() - self.stamps[-1]) // self.tf) + 2
+        return n if n <= GECKO_OHLCV_MAX else 0
+
+    def merge_latest(self, rows: List, limit: int) -> None:
+        """Splice in an answer for the latest ``limit`` candles.
+
+        An empty answer leaves the series as it was: it is as likely a hiccup
+        as a pool with no candles, and the held rows are still right.
+        """
+        if not rows:
+            return
+        stamps = [float(r[0]) for r in rows]
+        if self.rows and stamps[0] <= self.stamps[-1]:
+            keep = bisect.bisect_left(self.stamps, stamps[0])
+            self.rows[keep:] = rows
+            self.stamps[keep:] = stamps
+            self.complete = self.complete or len(rows) < limit
+        else:
+            # The first answer, or one disjoint from what is held: start over.
+            self.rows, self.stamps = list(rows), stamps
+            self.complete = len(rows) < limit
+        self.synced_at = time.time()
+        self._trim()
+
+    def merge_before(self, rows: List, limit: int, before: int) -> None:
+        """Extend backwards with a closed window that reaches the held rows."""
+        if not self.rows or before < self.stamps[0]:
+            return
+        older = [r for r in rows if float(r[0]) < self.stamps[0]]
+        self.rows[:0] = older
+        self.stamps[:0] = [float(r[0]) for r in older]
+        self.complete = len(rows) < limit
+        self._trim()
+
+    def _trim(self) -> None:
+        if len(self.rows) > _OHLCV_SERIES_ROWS:
+            del self.rows[:-_OHLCV_SERIES_ROWS]
+            del self.stamps[:-_OHLCV_SERIES_ROWS]
+            self.complete = False
+
+
+_ohlcv_series: "OrderedDict[Tuple, _OhlcvSeries]" = OrderedDict()
+
+
+def _ohlcv_feed(feed: Tuple, tf: int) -> _OhlcvSeries:
+    series = _ohlcv_series.get(feed)
+    if series is None:
+        series = _ohlcv_series[feed] = _OhlcvSeries(tf)
+        while len(_ohlcv_series) > _OHLCV_SERIES_MAX:
+            _ohlcv_series.popitem(last=False)
+    _ohlcv_series.move_to_end(feed)
+    return series
+
+
+async def _gecko_ohlcv_rows(
+    gecko_network: str,
+    pool_address: str,
+    timeframe: str,
+    currency: str,
+    token: str,
+    limit: int,
+    before_timestamp: Optional[int],
+) -> Optional[List]:
+    # Pass all parameters explicitly:
+    # - currency="token" means price in quote token (not USD)
+    # - token="base" means OHLCV for the base token
+    result = await gecko_call(
+        "get_ohlcv",
+        gecko_network,
+        pool_address,
+        timeframe,
+        before_timestamp=before_timestamp,
+        currency=currency,
+        token=token,
+        limit=limit,
+    )
+
+    # Parse response - handle different formats
+    rows = None
+
+    try:
+        import pandas as pd
+
+        if isinstance(result, pd.DataFrame):
+            if not result.empty:
+                # Convert DataFrame to list format
+                rows = result.values.tolist()
+    except ImportError:
+        pass
+
+    if rows is None:
+        if isinstance(result, list):
+            rows = result
+        elif isinstance(result, dict):
+            # Try nested structure
+            data = result.get("data", result)
+            if isinstance(data, dict):
+                attrs = data.get("attributes", data)
+                rows = attrs.get("ohlcv_list", [])
+            elif isinstance(data, list):
+                rows = data
+
+    # Debug logging: show price range from OHLCV data
+    if rows:
+        try:
+            closes = [float(c[4]) for c in rows if len(c) > 4 and c[4]]
+            if closes:
+                logger.info(
+                    f"OHLCV {pool_address[:8]}... {timeframe} currency={currency}: "
+                    f"{len(rows)} candles, price range [{min(closes):.6f} - {max(closes):.6f}]"
+                )
+        except Exception as e:
+            logger.debug(f"Could not log OHLCV price range: {e}")
+
+    return rows
+
+
 async def fetch_ohlcv(
     pool_address: str,
     network: str,
@@ -950,7 +1433,9 @@ async def fetch_ohlcv(
 
     A pool's candles are global, not per-user, so the answer is cached once for
     the process; concurrent callers asking for the same upstream window share one
-    request.
+    request. Each pool's candles are also merged into one series (see
+    ``_OhlcvSeries``): a window inside it is sliced locally, and a refresh of the
+    latest candles asks upstream only for the tail since the newest one held.
 
     Args:
         pool_address: Pool contract address
@@ -965,9 +1450,9 @@ async def fetch_ohlcv(
             the series, for a venue pair quoted the other way round from the pool
             (``XRP-RLUSD`` against a ``RLUSD / XRP`` pool).
         use_cache: False skips the cache *read* — for a live poll that must see
-            the newest candle rather than one up to ``OHLCV_CACHE_TTL`` old. The
-            fresh answer is still written back, so cached readers only get newer
-            data out of it.
+            the newest candle rather than one up to ``OHLCV_CACHE_TTL`` old. It
+            still costs only the tail when the pool's series is held. The fresh
+            answer is written back, so cached readers only get newer data out of it.
 
     Returns:
         Tuple of (ohlcv_list, error_message)
@@ -978,86 +1463,61 @@ async def fetch_ohlcv(
         gecko_network = get_gecko_network(network)
         timeframe = normalize_timeframe(timeframe)
         limit = max(1, min(int(limit), GECKO_OHLCV_MAX))
+        feed = (gecko_network, pool_address, timeframe, currency, token)
+        series = _ohlcv_series.get(feed)
+
+        def _key(count: int, before: Optional[int]) -> Tuple:
+            # limit/before_timestamp belong to the key: the same pool charted over
+            # a historical window and over the live one are different answers.
+            # The same tuple keys the cache and the single-flight, so "one
+            # upstream window" is one entry everywhere.
+            return ("ohlcv",) + feed + (count, before or 0)
+
+        async def _fetch(count: int, before: Optional[int]) -> Optional[List]:
+            # Coalesce on the upstream window: a TTL cache only helps once an
+            # answer has landed, so concurrent callers of the same window (a
+            # cache-bypassing live poll racing a chart render, say) would each
+            # spend a request without this. A fetch that raises reaches every
+            # waiter and is cached by nobody. The rows are shared between
+            # callers: read-only.
+            return await _single_flight(
+                _key(count, before),
+                lambda: _gecko_ohlcv_rows(
+                    gecko_network,
+                    pool_address,
+                    timeframe,
+                    currency,
+                    token,
+                    count,
+                    before,
+                ),
+            )
 
-        # limit/before_timestamp belong to the key: the same pool charted over a
-        # historical window and over the live one are different answers. The same
-        # tuple keys the cache and the single-flight, so "one upstream window" is
-        # one entry everywhere.
-        cache_key = (
-            "ohlcv",
-            gecko_network,
-            pool_address,
-            timeframe,
-            currency,
-            token,
-            limit,
-            before_timestamp or 0,
-        )
+        if series is not None:
+            held = series.window(
+                limit, before_timestamp, OHLCV_CACHE_TTL if use_cache else None
+            )
+            deep_enough = series.complete or len(series.rows) >= limit
+            tail = series.tail_limit() if before_timestamp is None else 0
+            if held is None and tail and deep_enough:
+                series.merge_latest(await _fetch(tail, None) or [], tail)
+                held = series.window(limit, None, OHLCV_CACHE_TTL)
+            if held is not None:
+                return (held, None) if held else (None, "No OHLCV data available")
+
+        cache_key = _key(limit, before_timestamp)
         if use_cache:
             cached = _ttl_get(_ohlcv_cache, cache_key, OHLCV_CACHE_TTL)
             if cached is not None:
                 return cached, None
 
-        async def _fetch_upstream() -> Optional[List]:
-            # Pass all parameters explicitly:
-            # - currency="token" means price in quote token (not USD)
-            # - token="base" means OHLCV for the base token
-            result = await gecko_call(
-                "get_ohlcv",
-                gecko_network,
-                pool_address,
-                timeframe,
-                before_timestamp=before_timestamp,
-                currency=currency,
-                token=token,
-                limit=limit,
-            )
-
-            # Parse response - handle different formats
-            rows = None
+        ohlcv_list = await _fetch(limit, before_timestamp)
 
-            try:
-                import pandas as pd
-
-                if isinstance(result, pd.DataFrame):
-                    if not result.empty:
-                        # Convert DataFrame to list format
-                        rows = result.values.tolist()
-            except ImportError:
-                pass
-
-            if rows is None:
-                if isinstance(result, list):
-                    rows = result
-                elif isinstance(result, dict):
-                    # Try nested structure
-                    data = result.get("data", result)
-                    if isinstance(data, dict):
-                        attrs = data.get("attributes", data)
-                        rows = attrs.get("ohlcv_list", [])
-                    elif isinstance(data, list):
-                        rows = data
-
-            # Debug logging: show price range from OHLCV data
-            if rows:
-                try:
-                    closes = [float(c[4]) for c in rows if len(c) > 4 and c[4]]
-                    if closes:
-                        logger.info(
-                            f"OHLCV {pool_address[:8]}... {timeframe} currency={currency}: "
-                            f"{len(rows)} candles, price range [{min(closes):.6f} - {max(closes):.6f}]"
-                        )
-                except Exception as e:
-                    logger.debug(f"Could not log OHLCV price range: {e}")
-
-            return rows
-
-        # Coalesce on the upstream window: a TTL cache only helps once an answer
-        # has landed, so concurrent callers of the same window (a cache-bypassing
-        # live poll racing a chart render, say) would each spend a request without
-        # this. A fetch that raises reaches every waiter and is cached by nobody.
-        # The rows are shared between callers: read-only.
-        ohlcv_list = await _single_flight(cache_key, _fetch_upstream)
+        if before_timestamp is None:
+            series = _ohlcv_feed(feed, timeframe_seconds(timeframe))
+            series.merge_latest(ohlcv_list or [], limit)
+        elif ohlcv_list and series is not None:
+            series.merge_before(ohlcv_list, limit, before_timestamp)
 
         if not ohlcv_list:
             return None, "No OHLCV data available"
@@ -1066,6 +1526,11 @@ async def fetch_ohlcv(
 
         return ohlcv_list, None
 
+    except GeckoRateLimited as e:
+        # Refused before it left the process — a budget answer, not a failure
+        # worth a traceback.
+        logger.info("OHLCV %s... not fetched: %s", pool_address[:8], e)
+        return None, f"Failed to fetch OHLCV: {str(e)}"
     except Exception as e:
         logger.error(f"Error fetching OHLCV: {e}", exc_info=True)
         return None, f"Failed to fetch OHLCV: {str(e)}"
@@ -1076,9 +1541,29 @@ async def fetch_ohlcv(
 # so they are cached once for the process and every viewer (web dashboard, any
 # Telegram chat) shares one upstream call per window. Bins keep a one-minute TTL:
 # they move with every swap through the active bin, so a longer one would draw
-# liquidity that has already left.
-_ohlcv_cache: Dict[Tuple, Tuple[float, List]] = {}
-_pool_bins_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+# liquidity that has already left. They are held as ``pool_bins.BinSnapshot``
+# arrays and stored stale-tolerant: an expired snapshot is no longer served, but
+# it is kept as the base the next read's delta is taken against.
+_ohlcv_cache: Dict[Tuple, Tuple[float, List]] = _LruCache(name="ohlcv")
+_pool_bins_cache: Dict[Tuple[str, str], Tuple[float, "BinSnapshot"]] = _LruCache(
+    name="pool_bins"
+)
+
+# Gateway answers a bins read from chain state, one RPC round trip per pool, and
+# has no multi-pool call. A 30-pool aggregated chart used to open 30 at once;
+# this caps the reads in flight across every caller, and each is timed out on
+# its own so a stuck pool cannot hold a slot.
+_BINS_MAX_CONCURRENCY = 6
+_BINS_FETCH_TIMEOUT = 10.0
+_bins_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _bins_gate() -> asyncio.Semaphore:
+    """The bins concurrency gate, built lazily so it binds to the running loop."""
+    global _bins_semaphore
+    if _bins_semaphore is None:
+        _bins_semaphore = asyncio.Semaphore(_BINS_MAX_CONCURRENCY)
+    return _bins_semaphore
 
 
 async def fetch_liquidity_bins(
@@ -1104,80 +1589,117 @@ async def fetch_liquidity_bins(
         pool_info: Full pool info dict
         error_message: Error string if failed, None on success
     """
+    snapshot, error = await fetch_bin_snapshot(pool_address, connector, network, client)
+    if snapshot is None:
+        return None, None, error
+    pool_info = snapshot.pool_info()
+    return pool_info["bins"], pool_info, None
+
+
+async def fetch_bin_snapshot(
+    pool_address: str,
+    connector: str = "meteora",
+    network: str = "solana-mainnet-beta",
+    client=None,
+) -> Tuple[Optional["BinSnapshot"], Optional[str]]:
+    """A pool's bins as a ``BinSnapshot``, from the cache or one shared Gateway read.
+
+    Same gate, cache and fallbacks as ``fetch_liquidity_bins``, without turning
+    the arrays back into dicts. Returns ``(snapshot, error_message)``.
+    """
     try:
         if not can_fetch_liquidity(connector):
-            return None, None, f"Liquidity data not available for {connector}"
+            return None, f"Liquidity data not available for {connector}"
 
-        cached = _ttl_get(_pool_bins_cache, (connector, pool_address), BINS_CACHE_TTL)
+        key = (connector, pool_address)
+        cached = _ttl_get(_pool_bins_cache, key, BINS_CACHE_TTL)
         if cached is not None:
-            return cached.get("bins"), cached, None
+            return cached, None
 
         if not client:
-            return None, None, "Gateway client not available"
+            return None, "Gateway client not available"
 
-        pool_info = None
+        async def _read() -> Tuple[Optional["BinSnapshot"], Optional[str]]:
+            from condor.pool_bins import BinSnapshot
 
-        # First try get_pool_info (works for pools known to gateway)
-        try:
-            pool_info = await client.gateway_clmm.get_pool_info(
-                connector=connector, network=network, pool_address=pool_address
-            )
-        except Exception as e:
-            # If get_pool_info fails (e.g., pool not in gateway config or not a DLMM pool),
-            # try finding the pool via get_pools search
-            error_str = str(e)
-            if "validation error" in error_str.lower() or "Field required" in error_str:
-                logger.info(
-                    f"Pool {pool_address[:12]}... not found via get_pool_info, trying get_pools search"
-                )
+            async with _bins_gate():
                 try:
-                    # Search for pool by address using get_pools
-                    search_result = await client.gateway_clmm.get_pools(
-                        connector=connector, search_term=pool_address, limit=1
+                    pool_info, error = await asyncio.wait_for(
+                        _gateway_pool_bins(client, pool_address, connector, network),
+                        timeout=_BINS_FETCH_TIMEOUT,
                     )
-                    pools = search_result.get("pools", [])
-                    if pools:
-                        # Found the pool, but get_pools doesn't include bins
-                        # Return pool info without bins - caller can handle this
-                        pool_info = pools[0]
-                        pool_info["address"] = pool_address
-                        logger.info(
-                            f"Found pool via get_pools: {pool_info.get('trading_pair', 'Unknown')}"
-                        )
-                    else:
-                        # Pool not found in DLMM pools - might be an AMM pool or non-existent
-                        logger.info(
-                            f"Pool {pool_address[:12]}... not found in {connector} DLMM pools"
-                        )
-                        return (
-                            None,
-                            None,
-                            f"Pool not found in {connector} DLMM pools. This may be an AMM pool or not a {connector} pool.",
-                        )
-                except Exception as search_e:
-                    logger.warning(f"get_pools search also failed: {search_e}")
-                    return (
-                        None,
-                        None,
-                        f"Could not fetch pool info. Pool may not be a {connector} DLMM pool.",
-                    )
-
-            if pool_info is None:
-                # Re-raise with a cleaner message for non-validation errors
-                return None, None, f"Failed to fetch pool: {str(e)[:100]}"
+                except asyncio.TimeoutError:
+                    return None, "Timed out reading liquidity from Gateway"
+            if error:
+                return None, error
+            previous, _ = _stale_get(_pool_bins_cache, key)
+            snapshot = BinSnapshot.from_pool_info(pool_info, previous)
+            _stale_put(_pool_bins_cache, key, snapshot)
+            return snapshot, None
 
-        if not pool_info:
-            return None, None, "Pool not found"
+        return await _single_flight(("bins",) + key, _read)
 
-        bins = pool_info.get("bins", [])
+    except Exception as e:
+        logger.error(f"Error fetching liquidity bins: {e}", exc_info=True)
+        return None, f"Failed to fetch liquidity: {str(e)}"
 
-        _ttl_put(_pool_bins_cache, (connector, pool_address), pool_info, BINS_CACHE_TTL)
 
-        return bins, pool_info, None
+async def _gateway_pool_bins(
+    client, pool_address: str, connector: str, network: str
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """One Gateway read of a pool's info with its bins: ``(pool_info, error)``."""
+    pool_info = None
 
+    # First try get_pool_info (works for pools known to gateway)
+    try:
+        pool_info = await client.gateway_clmm.get_pool_info(
+            connector=connector, network=network, pool_address=pool_address
+        )
     except Exception as e:
-        logger.error(f"Error fetching liquidity bins: {e}", exc_info=True)
-        return None, None, f"Failed to fetch liquidity: {str(e)}"
+        # If get_pool_info fails (e.g., pool not in gateway config or not a DLMM pool),
+        # try finding the pool via get_pools search
+        error_str = str(e)
+        if "validation error" in error_str.lower() or "Field required" in error_str:
+            logger.info(
+                f"Pool {pool_address[:12]}... not found via get_pool_info, trying get_pools search"
+            )
+            try:
+                # Search for pool by address using get_pools
+                search_result = await client.gateway_clmm.get_pools(
+                    connector=connector, search_term=pool_address, limit=1
+                )
+                pools = search_result.get("pools", [])
+                if pools:
+                    # Found the pool, but get_pools doesn't include bins
+                    # Return pool info without bins - caller can handle this
+                    pool_info = pools[0]
+                    pool_info["address"] = pool_address
+                    logger.info(
+                        f"Found pool via get_pools: {pool_info.get('trading_pair', 'Unknown')}"
+                    )
+                else:
+                    # Pool not found in DLMM pools - might be an AMM pool or non-existent
+                    logger.info(
+                        f"Pool {pool_address[:12]}... not found in {connector} DLMM pools"
+                    )
+                    return (
+                        None,
+                        f"Pool not found in {connector} DLMM pools. This may be an AMM pool or not a {connector} pool.",
+                    )
+            except Exception as search_e:
+                logger.warning(f"get_pools search also failed: {search_e}")
+                return (
+                    None,
+                    f"Could not fetch pool info. Pool may not be a {connector} DLMM pool.",
+                )
+
+        if pool_info is None:
+            # Re-raise with a cleaner message for non-validation errors
+            return None, f"Failed to fetch pool: {str(e)[:100]}"
+
+    if not pool_info:
+        return None, "Pool not found"
+    return pool_info, None
 
 
 def _token_address_from_id(token_id: Any) -> str:
@@ -1471,12 +1993,26 @@ _GECKO_VIEW_PATHS = {
 # A chain's venues change on the order of weeks; the filter dropdown reads this.
 GECKO_DEXES_TTL = 6 * 3600
 
-_gecko_page_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = {}
-_gecko_dexes_cache: Dict[Tuple, Tuple[float, List[Dict[str, str]]]] = {}
-_gateway_pool_list_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = {}
-_orca_pool_list_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = {}
-_multi_pool_cache: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = {}
-_pool_by_address_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = {}
+# The gecko-backed ones are kept on disk too: after a restart, a throttled
+# listing or a starred pool still has its last good copy to fall back to.
+_gecko_page_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = _LruCache(
+    "gecko_page", _STALE_MAX_AGE, 500
+)
+_gecko_dexes_cache: Dict[Tuple, Tuple[float, List[Dict[str, str]]]] = _LruCache(
+    name="gecko_dexes"
+)
+_gateway_pool_list_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = _LruCache(
+    name="gateway_pool_list"
+)
+_orca_pool_list_cache: Dict[Tuple, Tuple[float, List[Dict[str, Any]]]] = _LruCache(
+    name="orca_pool_list"
+)
+_multi_pool_cache: Dict[Tuple[str, str], Tuple[float, List[Dict[str, Any]]]] = (
+    _LruCache("pool_batch", _STALE_MAX_AGE, 200)
+)
+_pool_by_address_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = _LruCache(
+    "pool", 24 * 3600, 2_000
+)
 
 # A pool list is a browser page, not a report: cap what an upstream can be asked
 # for so one query cannot drag a thousand rows through normalization.
@@ -1705,21 +2241,15 @@ async def _gecko_page_fetch(
 
 def _normalized_gecko_rows(
     rows: List[Dict[str, Any]], network: str, dexes: set
-) -> List[Dict[str, Any]]:
-    """Raw upstream rows → decorated pools, keeping only the venues asked for."""
-    pools: List[Dict[str, Any]] = []
-    for row in rows:
-        try:
-            pool = _normalize_gecko_pool(row, network)
-        except Exception as e:
-            logger.info("gecko pool row skipped net=%s: %s", network, e)
-            continue
-        if not pool.get("address"):
-            continue
-        if dexes and str(pool.get("dex_id") or "").strip().lower() not in dexes:
-            continue
-        pools.append(pool)
-    return pools
+) -> "PoolTable":
+    """Raw upstream rows → decorated pools, keeping only the venues asked for.
+
+    A columnar table rather than dicts: the walk only counts and slices these,
+    and a row becomes a dict once, if it makes the page (see ``pool_table``).
+    """
+    from condor.pool_table import PoolTable
+
+    return PoolTable.from_gecko_rows(rows, network).only_dexes(dexes)
 
 
 async def _scoped_top_page(
@@ -1735,13 +2265,18 @@ async def _scoped_top_page(
 
     Bounded by ``_GECKO_SCOPED_MAX_REQUESTS`` because the fan-out is one request
     per venue per page, and every one of them shares the chart loop's budget.
+    The chain's pool index answers without any when it read every venue deep
+    enough (see ``pool_index``).
     """
+    from condor.pool_index import scoped_top_rows
+
     skip = (page - 1) * limit
     pages_each = min(-(-(skip + limit) // GECKO_PAGE_SIZE), GECKO_MAX_PAGE)
     budget = _GECKO_SCOPED_MAX_REQUESTS
 
-    rows: List[Dict[str, Any]] = []
-    for venue in venues:
+    indexed = scoped_top_rows(gnet, venues, skip + limit)
+    rows: List[Dict[str, Any]] = indexed or []
+    for venue in venues if indexed is None else ():
         for upstream in range(1, pages_each + 1):
             if budget <= 0:
                 break
@@ -1753,14 +2288,181 @@ async def _scoped_top_page(
             if len(got) < GECKO_PAGE_SIZE:
                 break
 
-    pools = _normalized_gecko_rows(rows, network, set())
-    pools.sort(key=lambda p: p.get("volume_24h") or 0.0, reverse=True)
+    pools = _normalized_gecko_rows(rows, network, set()).ranked_by("volume_24h")
     return {
-        "pools": pools[skip : skip + limit],
+        "pools": pools.window(skip, skip + limit).records(),
         "has_more": len(pools) > skip + limit,
     }
 
 
+# ── Prefetch ──
+# A budget that sits idle between page loads is spent on what the browser will
+# most likely ask for next: the next page, and the charts of the top rows. Both
+# go out in the PREFETCH lane, so they only ever use the idle half of the window
+# and are dropped — never queued — the moment anyone else needs it.
+_PREFETCH_TOP_POOLS = 3
+# DexPool.tsx opens a pool on a 5m chart over three days. Warming that series in
+# the candle store means the click lands on candles already on disk.
+_PREFETCH_CHART_INTERVAL = "5m"
+_PREFETCH_CHART_LOOKBACK = 3 * 86400
+# One attempt per target per window: a browser paging back and forth must not
+# re-warm a chart tail on every load.
+_PREFETCH_TTL = OHLCV_CACHE_TTL
+_gecko_prefetched: Dict[Tuple, Tuple[float, bool]] = _LruCache()
+_gecko_prefetch_tasks: set = set()
+
+
+def _gecko_budget_idle() -> bool:
+    """Whether a prefetch would get a slot right now without taking anyone's."""
+    now = time.time()
+    used = sum(1 for t in _gecko_call_times if now - t < _GECKO_RATE_WINDOW)
+    return (
+        now >= _gecko_cooldown_until
+        and not _gecko_waiters
+        and used < _lane_capacity(GeckoPriority.PREFETCH)
+    )
+
+
+def _prefetch(key: Tuple, factory) -> None:
+    """Run ``factory()`` detached in the PREFETCH lane, once per key per TTL.
+
+    ``factory`` answers truthy when it fetched something; a prefetch that was
+    dropped for budget is forgotten, so the next idle moment can try it again.
+    """
+    if not _gecko_budget_idle():
+        return
+    if _ttl_get(_gecko_prefetched, key, _PREFETCH_TTL) is not None:
+        return
+    _ttl_put(_gecko_prefetched, key, True, _PREFETCH_TTL)
+
+    async def _run() -> None:
+        ok = False
+        with gecko_priority(GeckoPriority.PREFETCH):
+            try:
+                ok = bool(await factory())
+            except Exception as e:  # noqa: BLE001 - a guess that missed is not an error
+                logger.debug("gecko prefetch %s failed: %s", key, e)
+        if not ok:
+            _gecko_prefetched.pop(key, None)
+
+    task = asyncio.ensure_future(_run())
+    _gecko_prefetch_tasks.add(task)
+    task.add_done_callback(_gecko_prefetch_tasks.discard)
+
+
+def _prefetch_after_page(
+    gnet: str,
+    network: str,
+    view: str,
+    token: str,
+    next_upstream: Optional[int],
+    scope: Optional[str],
+    pools: List[Dict[str, Any]],
+) -> None:
+    """Queue the follow-ups to a pool-browser page: its successor, its top charts."""
+    from condor import dex_candles
+
+    if next_upstream is not None and next_upstream <= GECKO_MAX_PAGE:
+        page_key = (gnet, view, token, next_upstream, scope or "")
+        if _ttl_get(_gecko_page_cache, page_key, POOL_LIST_TTL, count=False) is None:
+            _prefetch(
+                ("page",) + page_key,
+                lambda: _gecko_page_rows(gnet, view, token, next_upstream, dex=scope),
+            )
+
+    for pool in pools[:_PREFETCH_TOP_POOLS]:
+        address, pair = pool.get("address"), pool.get("trading_pair")
+        if not (pool.get("tradable") and address and pair):
+            continue
+        # The pool page charts it under the row's Gateway network, as here.
+        connector = pool.get("gateway_network") or network
+
+        def _chart(connector=connector, address=address, pair=pair):
+            return dex_candles.fetch_dex_candles(
+                connector,
+                address,
+                pair,
+                _PREFETCH_CHART_INTERVAL,
+                time.time() - _PREFETCH_CHART_LOOKBACK,
+                None,
+            )
+
+        _prefetch(("chart", connector, address, _PREFETCH_CHART_INTERVAL), _chart)
+
+
+# ── Boot warm-up ──
+# How many of the previous process's most used rows each persisted cache loads
+# back into memory, and how many open-position tokens are resolved on top.
+_WARM_ROWS = _TOKEN_CACHE_MAX
+_WARM_POSITION_TOKENS = 20
+
+
+def _persisted_caches() -> List[_LruCache]:
+    return [
+        c
+        for c in (
+            _token_symbol_cache,
+            _token_pool_cache,
+            _pair_pool_cache,
+            _pool_by_address_cache,
+            _multi_pool_cache,
+            _gecko_page_cache,
+        )
+        if c.kind
+    ]
+
+
+async def warm_pool_caches(executors: Iterable[Dict[str, Any]] = ()) -> None:
+    """Fill the lookup caches at boot, so the first renders do not spend the budget.
+
+    Loads each persisted cache's most recently used rows from disk — the pools a
+    user starred live in their browser, but every reload of one was answered
+    through ``_multi_pool_cache`` and ``_pool_by_address_cache``, so those rows
+    are what the last process served them — then resolves the ticker and top pool
+    of the tokens in running executors that disk did not already answer. The
+    resolving goes out in the BACKGROUND lane, behind anyone actually waiting.
+    """
+    from condor.dex_candles import ADDRESS_RE, split_pair
+
+    for cache in _persisted_caches():
+        rows = await asyncio.to_thread(
+            pool_cache.recent, cache.kind, _WARM_ROWS, cache.retention
+        )
+        for key, stored_at, value in rows:
+            if key not in cache:
+                if cache.restore is not None:
+                    value = cache.restore(value)
+                cache[key] = (stored_at, value)
+        cache._evict()
+        await asyncio.to_thread(
+            pool_cache.prune, cache.kind, cache.retention, cache.max_rows
+        )
+
+    wanted: Dict[Tuple[str, str], str] = {}
+    for ex in executors:
+        if not isinstance(ex, dict) or ex.get("status") != "RUNNING":
+            continue
+        network = str(ex.get("connector_name") or "")
+        if network not in NETWORK_TO_GECKO:
+            continue
+        base, quote = split_pair(str(ex.get("trading_pair") or ""))
+        if ADDRESS_RE.match(base):
+            wanted.setdefault((network, base), quote)
+
+    with gecko_priority(GeckoPriority.BACKGROUND), gecko_caller("warmup"):
+        for (network, mint), quote in list(wanted.items())[:_WARM_POSITION_TOKENS]:
+            if time.time() < _gecko_cooldown_until:
+                # Gecko is pushing back; what is left resolves on demand.
+                break
+            # Both answer from cache when disk already had them.
+            await fetch_token_symbol(mint, network)
+            await fetch_token_top_pool_info(mint, network, quote)
+    logger.info(
+        "pool caches warmed: %s",
+        ", ".join(f"{c.kind}={len(c)}" for c in _persisted_caches()),
+    )
+
+
 async def list_gecko_pools_page(
     network: str,
     view: str = "trending",
@@ -1782,6 +2484,7 @@ async def list_gecko_pools_page(
     a Next that lands on nothing is worse than no Next at all.
     """
     from condor.dex_candles import ADDRESS_RE
+    from condor.pool_table import PoolTable
 
     gnet = get_gecko_network(network)
     view = (view or "trending").strip().lower()
@@ -1818,10 +2521,13 @@ async def list_gecko_pools_page(
         else GECKO_MAX_PAGE
     )
 
-    collected: List[Dict[str, Any]] = []
+    tables: List["PoolTable"] = []
+    collected = 0
     has_more = False
+    fetched_through = 0
     while upstream <= last_page:
         rows = await _gecko_page_rows(gnet, view, token, upstream, dex=scope)
+        fetched_through = upstream
         if rows is None:
             # An upstream failure is not an empty chain: say nothing rather than
             # claiming this view has no pools, and never cache the claim. Mid-walk
@@ -1830,18 +2536,19 @@ async def list_gecko_pools_page(
             if not collected:
                 return {"pools": [], "has_more": False}
             break
-        collected.extend(_normalized_gecko_rows(rows, network, wanted))
-        if len(collected) > local_skip + limit:
+        tables.append(_normalized_gecko_rows(rows, network, wanted))
+        collected += len(tables[-1])
+        if collected > local_skip + limit:
             has_more = True
             break
         if len(rows) < GECKO_PAGE_SIZE:
             break  # upstream has no more rows behind this page
         upstream += 1
-        if len(collected) >= local_skip + limit:
+        if collected >= local_skip + limit:
             has_more = upstream <= last_page
             break
 
-    pools = collected[local_skip : local_skip + limit]
+    pools = PoolTable.concat(tables).window(local_skip, local_skip + limit).records()
 
     # Trending and New have no venue-scoped form upstream, so a dex filter on them
     # is a scan of the chain-wide list — and a venue that simply has nothing
@@ -1853,7 +2560,17 @@ async def list_gecko_pools_page(
         if scoped["pools"]:
             return scoped
 
-    return {"pools": pools, "has_more": has_more and len(pools) == limit}
+    has_more = has_more and len(pools) == limit
+    _prefetch_after_page(
+        gnet,
+        network,
+        view,
+        token,
+        fetched_through + 1 if has_more else None,
+        scope,
+        pools,
+    )
+    return {"pools": pools, "has_more": has_more}
 
 
 async def list_gecko_pools(
@@ -1957,15 +2674,9 @@ async def fetch_pools_by_addresses(
             if stale is not None:
                 pools.extend(dict(row) for row in stale)
             continue
-        batch_pools: List[Dict[str, Any]] = []
-        for row in _coerce_pool_rows(result, len(batch)):
-            try:
-                pool = _normalize_gecko_pool(row, network)
-            except Exception as e:
-                logger.info("gecko pool row skipped net=%s: %s", gnet, e)
-                continue
-            if pool.get("address"):
-                batch_pools.append(pool)
+        batch_pools = _normalized_gecko_rows(
+            _coerce_pool_rows(result, len(batch)), network, set()
+        ).records()
         _stale_put(_multi_pool_cache, batch_key, batch_pools)
         pools.extend(dict(row) for row in batch_pools)
 
@@ -2056,12 +2767,41 @@ async def _fill_gateway_pool_gaps(pools: List[Dict[str, Any]], network: str) ->
             _estimate_pool_yield(pool)
 
 
+def _normalize_venue_rows(
+    rows: Iterable[Dict[str, Any]],
+    source: str,
+    network: str,
+    connector: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """A venue listing's raw rows, normalized and decorated, rows with no address
+    dropped.
+
+    Pure, and run through ``asyncio.to_thread`` by its callers: a 500-row Orca
+    snapshot is a few thousand dict walks, long enough to stall every other
+    request on the loop.
+    """
+    pools: List[Dict[str, Any]] = []
+    for row in rows:
+        row = dict(row)
+        if connector:
+            row.setdefault("connector", connector)
+        try:
+            pool = decorate_pool(normalize_pool_data(row, source=source), network)
+        except Exception as e:
+            logger.info("%s pool row skipped: %s", connector or source, e)
+            continue
+        if pool.get("address"):
+            pools.append(pool)
+    return pools
+
+
 async def list_gateway_pools(
     client: Any,
     connector: str,
     search: Optional[str] = None,
     limit: int = 20,
     page: int = 1,
+    max_age: float = GATEWAY_POOL_LIST_TTL,
 ) -> List[Dict[str, Any]]:
     """Gateway CLMM pools for a connector, optionally filtered by free text.
 
@@ -2071,7 +2811,8 @@ async def list_gateway_pools(
     instead of one parameter set with meaningless combinations.
 
     ``page`` is 1-based like every other page in the browser; Gateway counts from
-    zero, and that translation stays here rather than in the route.
+    zero, and that translation stays here rather than in the route. ``max_age``
+    is how old a cached listing may be; the snapshot refresher passes 0.
     """
     connector = (connector or "").strip().lower()
     if not connector:
@@ -2084,7 +2825,7 @@ async def list_gateway_pools(
         page = 1
 
     key = (connector, search or "", limit, page)
-    cached = _ttl_get(_gateway_pool_list_cache, key, GATEWAY_POOL_LIST_TTL)
+    cached = _ttl_get(_gateway_pool_list_cache, key, max_age, count=max_age > 0)
     if cached is not None:
         return [dict(row) for row in cached]
 
@@ -2102,17 +2843,13 @@ async def list_gateway_pools(
 
     raw = result.get("pools") if isinstance(result, dict) else result
     network = gateway_connector_network(connector)
-    pools: List[Dict[str, Any]] = []
-    for row in _coerce_pool_rows(raw, limit):
-        row = dict(row)
-        row.setdefault("connector", connector)
-        try:
-            pool = decorate_pool(normalize_pool_data(row, source="gateway"), network)
-        except Exception as e:
-            logger.info("gateway pool row skipped connector=%s: %s", connector, e)
-            continue
-        if pool.get("address"):
-            pools.append(pool)
+    pools = await asyncio.to_thread(
+        _normalize_venue_rows,
+        _coerce_pool_rows(raw, limit),
+        "gateway",
+        network,
+        connector,
+    )
 
     # Before the cache, so the extra upstream request is spent once per page and
     # not once per viewer of it.
@@ -2128,15 +2865,18 @@ async def list_gateway_pools(
 ORCA_SNAPSHOT_SIZE = 500
 
 
-async def _orca_snapshot(search: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+async def _orca_snapshot(
+    search: Optional[str], max_age: float = ORCA_POOL_LIST_TTL
+) -> Optional[List[Dict[str, Any]]]:
     """Every browsable Orca whirlpool, normalized and ranked by TVL.
 
     ``None`` — not ``[]`` — when the upstream failed and there is no stale copy:
     the caller falls back to the Gateway listing on that, and an empty table is
-    the wrong thing to show for a venue with thousands of pools.
+    the wrong thing to show for a venue with thousands of pools. ``max_age`` is
+    how old a cached snapshot may be; the snapshot refresher passes 0.
     """
     key = (search or "",)
-    cached = _ttl_get(_orca_pool_list_cache, key, ORCA_POOL_LIST_TTL)
+    cached = _ttl_get(_orca_pool_list_cache, key, max_age, count=max_age > 0)
     if cached is not None:
         return cached
 
@@ -2156,15 +2896,7 @@ async def _orca_snapshot(search: Optional[str]) -> Optional[List[Dict[str, Any]]
             return stale
 
         network = gateway_connector_network("orca")
-        pools: List[Dict[str, Any]] = []
-        for row in rows:
-            try:
-                pool = decorate_pool(normalize_pool_data(row, source="orca"), network)
-            except Exception as e:
-                logger.info("orca pool row skipped: %s", e)
-                continue
-            if pool.get("address"):
-                pools.append(pool)
+        pools = await asyncio.to_thread(_normalize_venue_rows, rows, "orca", network)
         _stale_put(_orca_pool_list_cache, key, pools)
         return pools
 
@@ -2233,7 +2965,11 @@ async def fetch_pool_by_address(
         )
     except Exception as e:
         logger.info("pool lookup failed net=%s pool=%s: %s", gnet, pool_address, e)
-        return None
+        # A reload of a starred pool while gecko is throttling (or right after a
+        # restart) still has its last good copy on disk; a pool's identity and
+        # tokens do not change, only its stats age.
+        stale, _age = _stale_get(_pool_by_address_cache, key)
+        return dict(stale) if stale else None
 
     rows = _coerce_pool_rows(result, 1)
     if not rows:
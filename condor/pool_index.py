@@ -0,0 +1,536 @@
+"""A local index of each chain's top pools, searched without an upstream request.
+
+Every search in the DEX explorer used to be a GeckoTerminal request: the web
+browser's token view, Telegram's token search, and the multi-venue Top page, which
+fans out one request per venue per page. All of them share the per-IP budget the
+charts poll on, and a symbol could not be searched at all, because gecko's
+listings are keyed by address.
+
+A :class:`PoolIndex` is one chain's pools, merged by address from:
+
+- the chain-wide Top listing (``pool_data._gecko_page_rows``),
+- each CLMM venue's own Top listing, the venues an ``lp_executor`` can open on,
+- Orca's whirlpool snapshot (``pool_data._orca_snapshot``) on Solana,
+- the Gateway CLMM listings, when the caller has a Gateway client to hand.
+
+A single refresher (:func:`run_pool_index`, started at boot) rebuilds the chains
+being searched in the BACKGROUND lane once their index is older than
+``INDEX_REFRESH_INTERVAL``, so a chain nobody searches costs nothing. A search
+matches symbols, names, mints and pool addresses by substring, filters by venue
+and sorts in memory. Upstream is asked only when the index cannot answer: a token
+address with fewer indexed pools than the page needs, or a chain not indexed yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from condor import pool_data
+from condor.pool_data import GeckoPriority, gecko_caller, gecko_priority
+
+logger = logging.getLogger(__name__)
+
+# A chain's top listings reshuffle over hours; five minutes keeps the index as
+# fresh as a browser tab left open, at a few background requests per rebuild.
+INDEX_REFRESH_INTERVAL = 300.0
+
+# Chain-wide Top pages (20 rows each), and pages of each CLMM venue's own Top.
+_INDEX_TOP_PAGES = 3
+_INDEX_VENUE_PAGES = 1
+
+# How long a search on a chain with no index yet waits for the first build before
+# answering from upstream (or empty). Rebuilds read the page cache the browser
+# already filled, so this is usually enough.
+_FIRST_BUILD_WAIT = 5.0
+
+# The fields a search can be sorted by, highest first. A pool missing the figure
+# sorts last, whichever field it is.
+INDEX_SORTS = ("volume_24h", "reserve_usd", "price_change_24h", "apr", "fdv_usd")
+
+# A chain nobody has searched for this long leaves the refresher's rounds.
+INDEX_IDLE_AFTER = 1800.0
+# How often the refresher looks for a stale index when no read wakes it.
+_INDEX_POLL = 60.0
+
+_indexes: Dict[str, "PoolIndex"] = {}
+# gecko network → (the network as asked for, a Gateway client, last read).
+_demand: Dict[str, Tuple[str, Any, float]] = {}
+# Set while ``run_pool_index`` runs: the event a stale read wakes it with.
+_wake: List[asyncio.Event] = []
+# Searches waiting on a chain's first build.
+_ready: Dict[str, asyncio.Event] = {}
+
+
+def _lower(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+class PoolIndex:
+    """One chain's pools, with what a search reads precomputed.
+
+    ``pools`` are decorated pool dicts in any of the browser's source shapes;
+    ``rows`` holds, for the pools GeckoTerminal listed, the flat row they were
+    normalized from (Telegram's explorer renders that shape), else ``None``.
+    ``venues`` records how deep each venue's own Top listing was read:
+    ``(rows, exhausted)``. The index is never mutated after construction.
+    """
+
+    __slots__ = (
+        "network",
+        "built_at",
+        "pools",
+        "rows",
+        "venues",
+        "_keys",
+        "_haystacks",
+        "_dex",
+        "_ranks",
+    )
+
+    def __init__(
+        self,
+        network: str,
+        pools: List[Dict[str, Any]],
+        rows: List[Optional[Dict[str, Any]]],
+        venues: Optional[Dict[str, Tuple[int, bool]]] = None,
+        built_at: Optional[float] = None,
+    ):
+        self.network = network
+        self.built_at = time.time() if built_at is None else built_at
+        self.pools = pools
+        self.rows = rows
+        self.venues = dict(venues or {})
+        # Symbols first, so an exact ticker outranks a pool that merely names it.
+        self._keys = [
+            tuple(
+                _lower(p.get(field))
+                for field in (
+                    "base_token_symbol",
+                    "quote_token_symbol",
+                    "address",
+                    "base_token_address",
+                    "quote_token_address",
+                    "name",
+                )
+            )
+            for p in pools
+        ]
+        # One string per pool so the common case — no match — is one ``in`` test.
+        self._haystacks = ["\n".join(keys) for keys in self._keys]
+        self._dex = [_lower(p.get("dex_id")) for p in pools]
+        self._ranks = {field: self._rank(field) for field in INDEX_SORTS}
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def _rank(self, field: str) -> np.ndarray:
+        """Each pool's position when sorted by ``field``, highest first."""
+        values = np.array(
+            [pool_data._finite(p.get(field)) for p in self.pools], dtype=float
+        )
+        values[np.isnan(values)] = -np.inf
+        order = np.argsort(-values, kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        return rank
+
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+    def search(
+        self,
+        query: str = "",
+        dexes: Iterable[str] = (),
+        sort: str = "volume_24h",
+    ) -> List[int]:
+        """Positions of the pools matching ``query`` on ``dexes``, best first.
+
+        An exact symbol or address outranks a prefix, and a prefix a substring;
+        within each, ``sort`` decides. An empty query matches every pool.
+        """
+        q = _lower(query)
+        wanted = {_lower(d) for d in dexes if _lower(d)}
+        rank = self._ranks.get(sort, self._ranks["volume_24h"])
+        if q:
+            hits = [i for i, hay in enumerate(self._haystacks) if q in hay]
+        else:
+            hits = list(range(len(self.pools)))
+        if wanted:
+            hits = [i for i in hits if self._dex[i] in wanted]
+
+        def tier(i: int) -> int:
+            keys = self._keys[i]
+            if not q or q in keys:
+                return 0
+            return 1 if any(k.startswith(q) for k in keys) else 2
+
+        hits.sort(key=lambda i: (tier(i), rank[i]))
+        return hits
+
+    def exact(self, address: str) -> Tuple[List[int], List[int]]:
+        """Pools at ``address``, and pools with it as a token: by position."""
+        a = _lower(address)
+        pools = [i for i, keys in enumerate(self._keys) if keys[2] == a]
+        tokens = [i for i, keys in enumerate(self._keys) if a in (keys[3], keys[4])]
+        return pools, tokens
+
+    def venue_rows(self, venues: Iterable[str], need: int) -> Optional[List[Dict]]:
+        """The raw Top rows of ``venues``, if each was read at least ``need`` deep.
+
+        ``None`` when any venue was not indexed that deep: the caller then asks
+        each venue's listing upstream, as it would with no index at all.
+        """
+        venues = [_lower(v) for v in venues]
+        for venue in venues:
+            depth = self.venues.get(venue)
+            if depth is None or (depth[0] < need and not depth[1]):
+                return None
+        wanted = set(venues)
+        return [
+            dict(row)
+            for row, dex in zip(self.rows, self._dex)
+            if row is not None and dex in wanted
+        ]
+
+
+def reset_pool_index() -> None:
+    """Forget every chain's index and who asked for it. For tests."""
+    _indexes.clear()
+    _demand.clear()
+    _ready.clear()
+
+
+def _cooling() -> bool:
+    return time.time() < pool_data._gecko_cooldown_until
+
+
+async def _gecko_top_rows(
+    gnet: str, pages: int, dex: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], bool, bool]:
+    """Top rows of a chain (or one venue on it): ``(rows, answered, exhausted)``."""
+    rows: List[Dict[str, Any]] = []
+    for page in range(1, pages + 1):
+        if _cooling():
+            return rows, page > 1, False
+        got = await pool_data._gecko_page_rows(gnet, "top", "", page, dex=dex)
+        if got is None:
+            return rows, page > 1, False
+        rows.extend(got)
+        if len(got) < pool_data.GECKO_PAGE_SIZE:
+            return rows, True, True
+    return rows, True, False
+
+
+async def _gateway_pools(
+    client: Any, gnet: str, skip: Iterable[str]
+) -> List[Dict[str, Any]]:
+    """The first page of every Gateway CLMM connector on this chain."""
+    pools: List[Dict[str, Any]] = []
+    skip = set(skip)
+    for connector, chain in pool_data.LIQUIDITY_SUPPORTED_DEXES.items():
+        if connector in skip or pool_data.get_gecko_network(chain) != gnet:
+            continue
+        pools.extend(
+            await pool_data.list_gateway_pools(
+                client, connector, limit=pool_data._POOL_LIST_MAX
+            )
+        )
+    return pools
+
+
+async def refresh_pool_index(network: str, client: Any = None) -> Optional[PoolIndex]:
+    """Rebuild one chain's index from its listings, in the BACKGROUND lane.
+
+    A source that fails is left out of this build; a build with nothing at all
+    keeps the previous index, since an empty index would answer every search
+    with "no pools".
+    """
+    gnet = pool_data.get_gecko_network(network)
+    # Rows carry the Gateway network a trade on them routes to, as in the browser.
+    net = pool_data.GECKO_TO_GATEWAY_NETWORK.get(gnet) or network
+    merged: Dict[str, Dict[str, Any]] = {}
+    raw: Dict[str, Dict[str, Any]] = {}
+    venues: Dict[str, Tuple[int, bool]] = {}
+
+    def add(pools: Iterable[Dict[str, Any]], rows: Optional[Dict] = None) -> None:
+        # The first source to list a pool wins; later ones only fill its blanks
+        # (Orca's fees and yield under a gecko row's price change).
+        for pool in pools:
+            address = str(pool.get("address") or "")
+            if not address:
+                continue
+            kept = merged.setdefault(address, dict(pool))
+            for key, value in pool.items():
+                if kept.get(key) is None:
+                    kept[key] = value
+            if rows and address in rows and address not in raw:
+                raw[address] = rows[address]
+
+    def gecko(rows: List[Dict[str, Any]]) -> None:
+        table = pool_data._normalized_gecko_rows(rows, net, set())
+        by_address = {
+            str(r.get("address") or str(r.get("id", "")).split("_")[-1]): r
+            for r in rows
+        }
+        add(table.records(), by_address)
+
+    with gecko_priority(GeckoPriority.BACKGROUND):
+        top, _, _ = await _gecko_top_rows(gnet, _INDEX_TOP_PAGES)
+        gecko(top)
+        for dex in await pool_data.list_gecko_dexes(net):
+            venue = _lower(dex.get("id"))
+            if not pool_data.lp_provider_for_dex(venue, net) or _cooling():
+                continue
+            rows, answered, exhausted = await _gecko_top_rows(
+                gnet, _INDEX_VENUE_PAGES, dex=venue
+            )
+            if answered:
+                venues[venue] = (len(rows), exhausted)
+                gecko(rows)
+
+        orca = None
+        if pool_data.gateway_connector_network("orca") == gnet:
+            orca = await pool_data._orca_snapshot(None)
+            add(orca or [])
+        if client is not None:
+            # Orca's own snapshot already holds what Gateway proxies for it.
+            add(await _gateway_pools(client, gnet, ["orca"] if orca else []))
+
+    if not merged:
+        logger.info("pool index for %s: no source answered, keeping the last", gnet)
+        return _indexes.get(gnet)
+
+    addresses = list(merged)
+    index = PoolIndex(
+        net,
+        [merged[a] for a in addresses],
+        [raw.get(a) for a in addresses],
+        venues,
+    )
+    _indexes[gnet] = index
+    logger.info(
+        "pool index for %s: %d pools (%d from gecko, venues %s)",
+        gnet,
+        len(index),
+        len(raw),
+        ",".join(sorted(venues)) or "-",
+    )
+    return index
+
+
+def indexed(network: str, client: Any = None) -> Optional[PoolIndex]:
+    """The chain's index as it stands, and a note that someone wants it.
+
+    ``None`` until the first build lands. Served stale while the refresher
+    rebuilds it: a five-minute-old ranking is still the answer to a search.
+    """
+    gnet = pool_data.get_gecko_network(network)
+    previous = _demand.get(gnet)
+    _demand[gnet] = (
+        network,
+        client if client is not None else previous and previous[1],
+        time.time(),
+    )
+    index = _indexes.get(gnet)
+    if (index is None or index.age() >= INDEX_REFRESH_INTERVAL) and _wake:
+        _wake[0].set()
+    return index
+
+
+async def _first_index(network: str, client: Any = None) -> Optional[PoolIndex]:
+    """The chain's index, waiting briefly for the refresher's first build."""
+    index = indexed(network, client)
+    if index is not None or not _wake:
+        return index
+    gnet = pool_data.get_gecko_network(network)
+    ready = _ready.setdefault(gnet, asyncio.Event())
+    try:
+        await asyncio.wait_for(ready.wait(), _FIRST_BUILD_WAIT)
+    except asyncio.TimeoutError:
+        logger.info("pool index for %s not ready after %.0fs", gnet, _FIRST_BUILD_WAIT)
+    return _indexes.get(gnet)
+
+
+async def run_pool_index(networks: Iterable[str] = ()) -> None:
+    """Keep the indexes of the chains being searched fresh. Runs for the process.
+
+    ``networks`` are indexed from the start, before anyone asks. Any other chain
+    is indexed once a read asks for it, and dropped from the rounds once nobody
+    has for ``INDEX_IDLE_AFTER``; its last index stays, aging, until then.
+    Rebuilds run one chain at a time, in the BACKGROUND lane.
+    """
+    wake = asyncio.Event()
+    _wake[:] = [wake]
+    for network in networks:
+        indexed(network)
+    try:
+        while True:
+            wake.clear()
+            now = time.time()
+            for gnet, (network, client, read_at) in list(_demand.items()):
+                if now - read_at >= INDEX_IDLE_AFTER:
+                    _demand.pop(gnet, None)
+                    continue
+                index = _indexes.get(gnet)
+                if index is not None and index.age() < INDEX_REFRESH_INTERVAL:
+                    continue
+                try:
+                    with gecko_caller("pool_index"):
+                        await refresh_pool_index(network, client)
+                except Exception as e:  # noqa: BLE001 - the next round retries
+                    logger.warning("pool index rebuild failed net=%s: %s", gnet, e)
+                ready = _ready.pop(gnet, None)
+                if ready is not None:
+                    ready.set()
+            try:
+                await asyncio.wait_for(wake.wait(), _INDEX_POLL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _wake.clear()
+
+
+def _local_hits(
+    index: PoolIndex,
+    query: str,
+    dexes: Iterable[str],
+    sort: str,
+    need: int,
+    token_only: bool = False,
+    keep: Optional[Callable[[int], bool]] = None,
+) -> Optional[List[int]]:
+    """The index's answer to ``query``, or ``None`` where upstream knows better.
+
+    An address is a pool's or a token's. A pool in the index is the answer,
+    unless ``token_only``. A token's pools are only trusted here when the index
+    holds ``need`` of them: the index is a chain's *top* pools, and a token's
+    smaller ones are not in it. ``keep`` narrows every answer to the pools the
+    caller can use, before that count.
+    """
+    from condor.dex_candles import ADDRESS_RE
+
+    query = (query or "").strip()
+    if query and ADDRESS_RE.match(query):
+        wanted = {_lower(d) for d in dexes if _lower(d)}
+
+        def usable(i: int) -> bool:
+            return (not wanted or index._dex[i] in wanted) and (keep is None or keep(i))
+
+        pools, tokens = index.exact(query)
+        if pools and not token_only:
+            return [i for i in pools if usable(i)]
+        tokens = [i for i in tokens if usable(i)]
+        if len(tokens) < need:
+            return None
+        return sorted(tokens, key=lambda i: index._ranks[sort][i])
+    hits = index.search(query, dexes, sort)
+    return hits if keep is None else [i for i in hits if keep(i)]
+
+
+async def search_pools(
+    network: str,
+    query: str = "",
+    dexes: Optional[List[str]] = None,
+    sort: str = "volume_24h",
+    limit: int = 20,
+    page: int = 1,
+    client: Any = None,
+    token_only: bool = False,
+) -> Dict[str, Any]:
+    """One page of a chain's pools matching ``query``, served from the index.
+
+    ``query`` is a symbol, a name, a mint or a pool address, matched by prefix
+    or substring. A token address the index cannot answer in full goes to
+    GeckoTerminal's listing for that token, and a pool address it does not hold
+    to the by-address lookup; free text has no upstream to ask. ``token_only``
+    reads an address as a token's alone, as the browser's token view does.
+
+    Only free text waits for a chain's first build. An address has an upstream
+    that answers it now, which beats holding the request for the index.
+    """
+    from condor.dex_candles import ADDRESS_RE
+
+    limit = pool_data._clamp_pool_limit(limit)
+    try:
+        page = max(1, int(page))
+    except (TypeError, ValueError):
+        page = 1
+    if sort not in INDEX_SORTS:
+        sort = "volume_24h"
+    dexes = [d for d in (dexes or []) if _lower(d)]
+    query = (query or "").strip()
+    skip = (page - 1) * limit
+    is_address = bool(ADDRESS_RE.match(query))
+
+    if is_address:
+        index = indexed(network, client)
+    else:
+        index = await _first_index(network, client)
+    hits = None
+    if index is not None:
+        hits = _local_hits(index, query, dexes, sort, skip + limit, token_only)
+    if hits is not None:
+        window = hits[skip : skip + limit]
+        return {
+            "pools": [dict(index.pools[i]) for i in window],
+            "has_more": len(hits) > skip + limit,
+            "indexed": True,
+        }
+
+    if not is_address:
+        return {"pools": [], "has_more": False, "indexed": False}
+    result = await pool_data.list_gecko_pools_page(
+        network, view="token", token=query, limit=limit, page=page, dexes=dexes
+    )
+    if not result["pools"] and page == 1 and not token_only:
+        pool = await pool_data.fetch_pool_by_address(network, query)
+        if pool is not None:
+            result = {"pools": [pool], "has_more": False}
+    return {**result, "indexed": False}
+
+
+async def search_gecko_rows(
+    network: str, query: str, limit: int = 10
+) -> Optional[List[Dict[str, Any]]]:
+    """Telegram's token search, as flat GeckoTerminal rows, from the index.
+
+    A symbol or name is answered here alone, as :func:`search_pools` answers
+    free text: GeckoTerminal's token lookup takes an address, so there is no
+    upstream to defer it to. An address is ``None`` when upstream should be
+    asked instead: no index yet, or a token the index cannot fill ``limit``
+    rows for. Only pools GeckoTerminal listed count, since the explorer's
+    detail view reads gecko's row shape: a token whose indexed pools are mostly
+    Orca's goes upstream.
+    """
+    from condor.dex_candles import ADDRESS_RE
+
+    query = (query or "").strip()
+    is_address = bool(ADDRESS_RE.match(query))
+    index = indexed(network) if is_address else await _first_index(network)
+    if index is None:
+        return None if is_address else []
+
+    def listed(i: int) -> bool:
+        return index.rows[i] is not None
+
+    hits = _local_hits(index, query, (), "volume_24h", limit, keep=listed)
+    if is_address and (not hits or (len(hits) < limit and not index.exact(query)[0])):
+        return None
+    return [dict(index.rows[i]) for i in (hits or [])[:limit]]
+
+
+def scoped_top_rows(gnet: str, venues: Iterable[str], need: int) -> Optional[List]:
+    """Several venues' Top rows from the index, for the multi-venue Top page.
+
+    Never triggers a build: the page falls back to its own fan-out when the
+    chain is not indexed, or is not indexed ``need`` rows deep on every venue.
+    """
+    index = _indexes.get(gnet)
+    if index is None or index.age() >= INDEX_REFRESH_INTERVAL:
+        return None
+    return index.venue_rows(venues, need)
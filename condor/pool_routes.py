@@ -0,0 +1,293 @@
+"""A persisted routing table from a trading pair to the pool its chart is drawn from.
+
+A DEX chart with no pinned pool found its pool on every candle fetch:
+``dex_candles._resolve_pool`` asked for the base token's top pools (a mint pair)
+or searched pools by symbol (an XRPL ticker pair). The answers were cached for a
+while, but the chart still paid a GeckoTerminal request whenever that cache had
+expired, and it never noticed when the pool it charted had been drained.
+
+A route is the answer to that question, kept as a row of a routing table keyed
+by ``(gecko network, base, quote)``. Each row holds the pool, the token side to
+read its series from, and the pool's USD liquidity when it was chosen. Rows go
+through ``pool_data``'s persisted LRU cache, so a restart starts with the table
+the last process built. :func:`route_pair` answers from the table. A stale route
+is still served while the refresher replaces it, so after a pair's first
+resolution, opening its chart costs no resolution calls at all.
+
+The refresher (:func:`run_pool_routes`, started at boot) keeps the routes of the
+pairs being charted fresh, in the BACKGROUND lane:
+
+- a route older than ``ROUTE_TTL`` is resolved again;
+- every ``_HEALTH_INTERVAL`` the chosen pools are re-read in one batch per
+  chain, and a pool whose liquidity has fallen below ``COLLAPSE_RATIO`` of what
+  it had when chosen is replaced by the pair's deepest pool now.
+
+A pair nobody has charted for ``ROUTE_IDLE_AFTER`` drops out of its rounds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from condor import pool_data
+from condor.pool_data import GeckoPriority, gecko_caller, gecko_priority
+
+logger = logging.getLogger(__name__)
+
+# As long as a token's main pool is trusted anywhere else in pool_data.
+ROUTE_TTL = pool_data.TOKEN_POOL_TTL
+# How long a route is kept at all, on disk, before the pair has to be resolved
+# from scratch again.
+ROUTE_RETENTION = 7 * 86400
+_ROUTE_MAX_ROWS = 5_000
+
+# A chosen pool left with less than this share of the liquidity it had when it was
+# chosen has been drained or abandoned, and its candles stop meaning much.
+COLLAPSE_RATIO = 0.25
+# How often the refresher re-reads the liquidity of the pools being charted.
+_HEALTH_INTERVAL = 900.0
+
+# A pair nobody has charted for this long leaves the refresher's rounds.
+ROUTE_IDLE_AFTER = 86400.0
+# How often the refresher looks for a stale route when no read wakes it.
+_ROUTE_POLL = 60.0
+
+# (gecko network, base, quote) → {"info", "token", "liquidity"}, as JSON.
+_routes = pool_data._LruCache("pool_route", ROUTE_RETENTION, _ROUTE_MAX_ROWS)
+# Route key → (the network as asked for, last read).
+_demand: Dict[Tuple[str, str, str], Tuple[str, float]] = {}
+# Gecko network → when its routes' liquidity was last checked.
+_checked_at: Dict[str, float] = {}
+# Set while ``run_pool_routes`` runs: the event a stale read wakes it with.
+_wake: List[asyncio.Event] = []
+
+
+class PoolRoute(NamedTuple):
+    """Where a pair's chart is drawn from.
+
+    ``token`` is the side of the pool whose series prices the pair: ``"quote"``
+    when the pool is quoted the other way round. ``liquidity`` is the pool's USD
+    reserve when it was chosen, 0 when GeckoTerminal did not report one.
+    """
+
+    address: str
+    token: str
+    liquidity: float
+    resolved_at: float
+    info: Dict[str, Any]
+
+    def age(self) -> float:
+        return time.time() - self.resolved_at
+
+
+def reset_pool_routes() -> None:
+    """Forget every route and who asked for it. For tests."""
+    _routes.clear()
+    _demand.clear()
+    _checked_at.clear()
+
+
+def route_key(network: str, trading_pair: str) -> Optional[Tuple[str, str, str]]:
+    """The table key for a pair, or ``None`` when it names nothing to look up.
+
+    A base that is an address is kept as it is, since addresses are
+    case-sensitive, and may come without a quote (its top pool in any quote).
+    Tickers and the quote are upper-cased, as the lookups behind them match them.
+    """
+    from condor.dex_candles import ADDRESS_RE, split_pair
+
+    base, quote = (part.strip() for part in split_pair(str(trading_pair or "")))
+    if not ADDRESS_RE.match(base):
+        if not base or not quote:
+            return None
+        base = base.upper()
+    return pool_data.get_gecko_network(network), base, quote.upper()
+
+
+def _route(entry: Optional[Tuple[float, Any]]) -> Optional[PoolRoute]:
+    if not entry or not isinstance(entry[1], dict):
+        return None
+    resolved_at, value = entry
+    info = value.get("info") or {}
+    address = str(info.get("address") or "")
+    if not address:
+        return None
+    return PoolRoute(
+        address=address,
+        token=str(value.get("token") or "base"),
+        liquidity=float(value.get("liquidity") or 0.0),
+        resolved_at=resolved_at,
+        info=info,
+    )
+
+
+async def _resolve(
+    network: str, key: Tuple[str, str, str], fresh: bool = False
+) -> Optional[PoolRoute]:
+    """Look the pair's deepest pool up and store it as the pair's route.
+
+    ``fresh`` asks GeckoTerminal again rather than the lookup's own cache.
+    Nothing is stored when there is no answer: a pair with no pool is cached as
+    such by the lookup itself, and a failed lookup must not replace a route.
+    """
+    from condor.dex_candles import ADDRESS_RE
+
+    _gnet, base, quote = key
+    ask = {"max_age": 0} if fresh else {}
+    if ADDRESS_RE.match(base):
+        info = await pool_data.fetch_token_top_pool_info(base, network, quote, **ask)
+        token = "base"
+    else:
+        info, inverted = await pool_data.fetch_pair_top_pool_info(
+            base, quote, network, **ask
+        )
+        token = "quote" if inverted else "base"
+    if not info or not info.get("address"):
+        return None
+
+    value = {
+        "info": info,
+        "token": token,
+        "liquidity": pool_data._finite(info.get("reserve_usd")) or 0.0,
+    }
+    _routes.put(key, value, sweep_after=ROUTE_RETENTION)
+    return _route((time.time(), value))
+
+
+async def route_pair(network: str, trading_pair: str) -> Optional[PoolRoute]:
+    """The pool ``trading_pair`` on ``network`` is charted from, or ``None``.
+
+    A base that is an address resolves through the token's top pools, a ticker
+    base through a symbol search. A route from the table is returned as it is,
+    even a stale one when the refresher is running to replace it; only a pair
+    with no route, or a stale one with no refresher, is resolved before
+    returning. ``None`` when the pair names no pool that can be found.
+    """
+    key = route_key(network, trading_pair)
+    if key is None:
+        return None
+    _demand[key] = (network, time.time())
+
+    route = _route(_routes.entry(key))
+    if route is not None and (route.age() < ROUTE_TTL or _wake):
+        if route.age() >= ROUTE_TTL:
+            _wake[0].set()
+        return route
+
+    try:
+        resolved = await pool_data._single_flight(
+            ("route",) + key, lambda: _resolve(network, key)
+        )
+    except Exception as e:  # noqa: BLE001 - the stale route is still an answer
+        logger.info("pool route lookup failed %s on %s: %s", key[1:], key[0], e)
+        resolved = None
+    return resolved or route
+
+
+async def _refresh(network: str, key: Tuple[str, str, str], why: str) -> None:
+    """Resolve one route again, asking upstream rather than any cached answer.
+
+    When that finds nothing, the route already held is stored again: it is still
+    the best answer there is, and it should not be asked about again before
+    another ``ROUTE_TTL`` has passed.
+    """
+    previous = _routes.entry(key)
+    try:
+        resolved = await pool_data._single_flight(
+            ("route",) + key, lambda: _resolve(network, key, fresh=True)
+        )
+    except Exception as e:  # noqa: BLE001 - the next round retries
+        logger.warning("pool route refresh failed %s on %s: %s", key[1:], key[0], e)
+        return
+    old = _route(previous)
+    if resolved is None:
+        if previous is not None:
+            _routes.put(key, previous[1], sweep_after=ROUTE_RETENTION)
+        return
+    if old is not None and old.address != resolved.address:
+        logger.info(
+            "pool route %s-%s on %s (%s): %s -> %s",
+            key[1],
+            key[2],
+            key[0],
+            why,
+            old.address,
+            resolved.address,
+        )
+
+
+async def _check_liquidity(network: str, keys: List[Tuple[str, str, str]]) -> None:
+    """Re-read the chosen pools of one chain and replace those that collapsed."""
+    routes = {}
+    for key in keys:
+        route = _route(_routes.entry(key))
+        if route is not None and route.liquidity > 0:
+            routes[key] = route
+    if not routes:
+        return
+    try:
+        pools = await pool_data.fetch_pools_by_addresses(
+            network, [route.address for route in routes.values()]
+        )
+    except Exception as e:  # noqa: BLE001 - the next round retries
+        logger.warning("pool route liquidity check failed net=%s: %s", network, e)
+        return
+    live = {
+        str(pool.get("address")): pool_data._finite(pool.get("reserve_usd"))
+        for pool in pools
+    }
+    for key, route in routes.items():
+        # A pool missing from the answer, or with no reserve, proves nothing.
+        reserve = live.get(route.address)
+        if reserve is not None and reserve < route.liquidity * COLLAPSE_RATIO:
+            await _refresh(
+                network, key, f"liquidity {route.liquidity:.0f}->{reserve:.0f}"
+            )
+
+
+async def _refresh_round() -> None:
+    now = time.time()
+    checks: Dict[str, Tuple[str, List[Tuple[str, str, str]]]] = {}
+    for key, (network, read_at) in list(_demand.items()):
+        if now - read_at >= ROUTE_IDLE_AFTER:
+            _demand.pop(key, None)
+            continue
+        route = _route(_routes.entry(key))
+        if route is None:
+            continue  # the next read resolves it
+        if route.age() >= ROUTE_TTL:
+            await _refresh(network, key, "expired")
+        elif now - _checked_at.get(key[0], 0.0) >= _HEALTH_INTERVAL:
+            checks.setdefault(key[0], (network, []))[1].append(key)
+    for gnet, (network, keys) in checks.items():
+        _checked_at[gnet] = now
+        await _check_liquidity(network, keys)
+
+
+async def run_pool_routes() -> None:
+    """Keep the routes of the pairs being charted fresh. Runs for the process.
+
+    A pair joins the rounds when its route is read, and leaves them once nobody
+    has read it for ``ROUTE_IDLE_AFTER``; its route stays in the table until
+    ``ROUTE_RETENTION``. Everything runs one route at a time, in the BACKGROUND
+    lane.
+    """
+    wake = asyncio.Event()
+    _wake[:] = [wake]
+    try:
+        while True:
+            wake.clear()
+            with gecko_priority(GeckoPriority.BACKGROUND), gecko_caller("pool_routes"):
+                try:
+                    await _refresh_round()
+                except Exception as e:  # noqa: BLE001 - keep the loop alive
+                    logger.warning("pool route round failed: %s", e)
+            try:
+                await asyncio.wait_for(wake.wait(), _ROUTE_POLL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _wake.clear()
@@ -0,0 +1,261 @@
+"""Precomputed Orca and Gateway pool listings, served by slicing.
+
+The pool browser's Orca tab pages through one whirlpool snapshot
+(``pool_data._orca_snapshot``), and its Gateway tab through a connector's
+listing (``pool_data.list_gateway_pools``, gaps filled from GeckoTerminal by
+``_fill_gateway_pool_gaps``). Both were fetched on the request path. The first
+view after the cache's TTL waited on a 500-row upstream call and its
+normalization, and for Gateway on a GeckoTerminal lookup on top.
+
+A :class:`VenueSnapshot` is one venue's unsearched listing, normalized, with
+its rows ranked in advance by every column the browser sorts these tabs on
+(``SNAPSHOT_SORTS``). A handler only slices it. Snapshots are immutable and
+replaced whole, by one dict assignment, so a reader never sees a half-built
+one.
+
+A single refresher (:func:`run_pool_snapshots`, started at boot) rebuilds the
+snapshots being browsed in the BACKGROUND lane before they expire, at
+``_REFRESH_AHEAD`` of their TTL, and builds their rankings off the event loop.
+Meanwhile an expired snapshot is still served, up to ``SNAPSHOT_MAX_AGE``, so
+the first page after an idle spell costs what a warm one does. A search is not
+snapshotted: it goes upstream through the listing it always did.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from condor import pool_data
+from condor.pool_data import GeckoPriority, gecko_caller, gecko_priority
+
+logger = logging.getLogger(__name__)
+
+# The columns a snapshot is ranked by, highest first: TVL, volume and yield.
+# ``None`` is the venue's own order.
+SNAPSHOT_SORTS = ("reserve_usd", "volume_24h", "apr")
+
+# How long a snapshot is current, per venue. Orca's API is not the shared
+# GeckoTerminal budget; a Gateway rebuild spends a request per 30 of its pools on
+# it, so it is rebuilt less often than the 30 seconds its page cache holds.
+SNAPSHOT_TTL = {"orca": pool_data.ORCA_POOL_LIST_TTL, "gateway": 120.0}
+# The share of its TTL after which the refresher rebuilds a snapshot, so a reader
+# does not meet an expired one while someone is browsing.
+_REFRESH_AHEAD = 0.8
+# Past this a snapshot is rebuilt before it is answered from rather than after.
+SNAPSHOT_MAX_AGE = 3600.0
+
+# How many rows a Gateway snapshot holds: its first page at the largest limit.
+# Orca's holds ``pool_data.ORCA_SNAPSHOT_SIZE``, the whole browsable set.
+GATEWAY_SNAPSHOT_ROWS = pool_data._POOL_LIST_MAX
+
+# A listing nobody has browsed for this long leaves the refresher's rounds.
+SNAPSHOT_IDLE_AFTER = 900.0
+# The longest the refresher sleeps when nothing falls due and no read wakes it.
+_SNAPSHOT_POLL = 60.0
+
+SnapshotKey = Tuple[str, str]  # ("orca", "") or ("gateway", connector)
+
+_snapshots: Dict[SnapshotKey, "VenueSnapshot"] = {}
+# Snapshot key → (the Gateway client to rebuild it with, last read).
+_demand: Dict[SnapshotKey, Tuple[Any, float]] = {}
+# Set while ``run_pool_snapshots`` runs: the event a stale read wakes it with.
+_wake: List[asyncio.Event] = []
+
+
+class VenueSnapshot:
+    """One venue listing's rows and their precomputed orders. Never mutated.
+
+    ``complete`` is whether the rows are the whole listing rather than its first
+    ``GATEWAY_SNAPSHOT_ROWS``: past the end of an incomplete one, a page in the
+    venue's own order is read upstream.
+    """
+
+    __slots__ = ("venue", "pools", "orders", "complete", "built_at")
+
+    def __init__(
+        self,
+        venue: str,
+        pools: Sequence[Dict[str, Any]],
+        complete: bool,
+        built_at: float,
+    ):
+        self.venue = venue
+        self.pools = tuple(dict(pool) for pool in pools)
+        self.orders = {field: self._order(field) for field in SNAPSHOT_SORTS}
+        self.complete = complete
+        self.built_at = built_at
+
+    def __len__(self) -> int:
+        return len(self.pools)
+
+    def _order(self, field: str) -> np.ndarray:
+        """Row positions, highest ``field`` first; a missing figure sorts as zero
+        and ties keep the venue's order, as ``PoolTable.ranked_by`` does."""
+        values = np.array(
+            [pool_data._finite(p.get(field)) or 0.0 for p in self.pools], dtype=float
+        )
+        return np.argsort(-values, kind="stable")
+
+    def age(self) -> float:
+        return time.time() - self.built_at
+
+    def page(
+        self, sort: Optional[str], page: int, limit: int
+    ) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """One page of rows (copies), with whether another follows.
+
+        ``None`` for a page in the venue's order that lies past an incomplete
+        snapshot. A ranked page cannot: the ranking covers the snapshot only.
+        """
+        start = (page - 1) * limit
+        stop = start + limit
+        if sort is None:
+            if not self.complete and stop > len(self.pools):
+                return None
+            rows = self.pools[start:stop]
+        else:
+            rows = [self.pools[i] for i in self.orders[sort][start:stop]]
+        more = len(self.pools) > stop or (sort is None and not self.complete)
+        return [dict(row) for row in rows], more
+
+
+def reset_pool_snapshots() -> None:
+    """Forget every snapshot and who asked for it. For tests."""
+    _snapshots.clear()
+    _demand.clear()
+
+
+async def _build(
+    key: SnapshotKey, client: Any, max_age: float
+) -> Optional[VenueSnapshot]:
+    """Read a venue's listing and store it as that venue's snapshot.
+
+    The listing is read through its own cache, no older than ``max_age``; the
+    snapshot is dated by the cache entry, so a failed read that fell back to a
+    stale copy leaves a snapshot the refresher still sees as due. Nothing is
+    stored when there are no rows, and the snapshot already held stays.
+    """
+    venue, connector = key
+    if venue == "orca":
+        pools = await pool_data._orca_snapshot(None, max_age=max_age)
+        entry = pool_data._orca_pool_list_cache.entry(("",))
+        complete = True
+    else:
+        pools = await pool_data.list_gateway_pools(
+            client, connector, limit=GATEWAY_SNAPSHOT_ROWS, max_age=max_age
+        )
+        entry = pool_data._gateway_pool_list_cache.entry(
+            (connector, "", GATEWAY_SNAPSHOT_ROWS, 1)
+        )
+        complete = len(pools) < GATEWAY_SNAPSHOT_ROWS
+    if not pools:
+        return _snapshots.get(key)
+
+    built_at = entry[0] if entry else time.time()
+    current = _snapshots.get(key)
+    if current is not None and current.built_at >= built_at:
+        return current
+    snapshot = await asyncio.to_thread(VenueSnapshot, venue, pools, complete, built_at)
+    _snapshots[key] = snapshot
+    return snapshot
+
+
+async def venue_page(
+    venue: str,
+    sort: Optional[str] = None,
+    limit: int = 20,
+    page: int = 1,
+    connector: str = "",
+    client: Any = None,
+) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+    """One page of a venue's unsearched listing, sliced out of its snapshot.
+
+    ``venue`` is ``"orca"`` or ``"gateway"`` (with its ``connector`` and a
+    ``client`` to read it with); ``sort`` one of ``SNAPSHOT_SORTS``, or ``None``
+    for the venue's own order. A snapshot is served at any age up to
+    ``SNAPSHOT_MAX_AGE`` while the refresher is running to replace it; only a
+    venue with none yet, or an expired one with no refresher, is read before
+    answering. ``None`` when there is nothing to serve, or when the page lies
+    past a partial snapshot: the caller reads it upstream.
+    """
+    key: SnapshotKey = (venue, (connector or "").strip().lower())
+    limit = pool_data._clamp_pool_limit(limit)
+    page = max(1, int(page))
+    _demand[key] = (client, time.time())
+
+    snapshot = _snapshots.get(key)
+    ttl = SNAPSHOT_TTL[venue]
+    if snapshot is None or snapshot.age() >= (SNAPSHOT_MAX_AGE if _wake else ttl):
+        try:
+            snapshot = await pool_data._single_flight(
+                ("snapshot",) + key, lambda: _build(key, client, ttl)
+            )
+        except Exception as e:  # noqa: BLE001 - the caller falls back upstream
+            logger.warning("pool snapshot %s failed: %s", "/".join(key), e)
+        if snapshot is None:
+            return None
+    elif snapshot.age() >= ttl * _REFRESH_AHEAD and _wake:
+        _wake[0].set()
+    return snapshot.page(sort, page, limit)
+
+
+async def _refresh_round() -> float:
+    """Rebuild the browsed snapshots that are due; seconds until the next one is."""
+    now = time.time()
+    wait = _SNAPSHOT_POLL
+    for key, (client, read_at) in list(_demand.items()):
+        if now - read_at >= SNAPSHOT_IDLE_AFTER:
+            _demand.pop(key, None)
+            continue
+        due_in = SNAPSHOT_TTL[key[0]] * _REFRESH_AHEAD
+        snapshot = _snapshots.get(key)
+        if snapshot is not None:
+            due_in -= snapshot.age()
+        if due_in <= 0:
+            try:
+                snapshot = await pool_data._single_flight(
+                    ("snapshot",) + key, lambda: _build(key, client, 0)
+                )
+            except Exception as e:  # noqa: BLE001 - the next round retries
+                logger.warning("pool snapshot refresh %s failed: %s", "/".join(key), e)
+            due_in = SNAPSHOT_TTL[key[0]] * _REFRESH_AHEAD
+            if snapshot is not None:
+                due_in -= snapshot.age()
+        wait = min(wait, due_in)
+    # A rebuild that came back stale is due again at once; not in a tight loop.
+    return max(wait, 1.0)
+
+
+async def run_pool_snapshots() -> None:
+    """Keep the snapshots of the listings being browsed fresh. Runs for the process.
+
+    A listing joins the rounds when a page of it is read, and leaves them once
+    nobody has read one for ``SNAPSHOT_IDLE_AFTER``; its snapshot stays, and is
+    served to the next reader while it is rebuilt. Everything runs one listing
+    at a time, in the BACKGROUND lane.
+    """
+    wake = asyncio.Event()
+    _wake[:] = [wake]
+    try:
+        while True:
+            wake.clear()
+            wait = _SNAPSHOT_POLL
+            with (
+                gecko_priority(GeckoPriority.BACKGROUND),
+                gecko_caller("pool_snapshots"),
+            ):
+                try:
+                    wait = await _refresh_round()
+                except Exception as e:  # noqa: BLE001 - keep the loop alive
+                    logger.warning("pool snapshot round failed: %s", e)
+            try:
+                await asyncio.wait_for(wake.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        _wake.clear()
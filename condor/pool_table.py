@@ -0,0 +1,301 @@
+"""Columnar normalization for GeckoTerminal pool listings.
+
+``pool_data`` normalizes one pool row at a time. Each row goes through
+``normalize_pool_data``, the pair fields, ``decorate_pool`` and
+``coerce_pool_numbers``: a dict walk per field, a float parse per number and a
+venue lookup per row. For one pool that is the right shape. For a listing it
+means that every row on every upstream page becomes a full dict before the dex
+filter, the volume sort and the page slice throw most of them away.
+
+A :class:`PoolTable` holds a batch of flat GeckoTerminal rows (the
+``POOL_SPEC`` shape ``_gecko_page_fetch`` caches) as columns:
+
+- numbers are NumPy arrays, parsed once per column;
+- venue facts are decided once per distinct ``dex_id``;
+- filtering, ranking and slicing are index arrays over the columns.
+
+Only the rows that survive become dicts, in :meth:`PoolTable.records`. Each
+record equals what ``pool_data._normalize_gecko_pool`` builds for the same row.
+A batch in any other shape (the raw API's nested ``attributes``) is normalized
+by that function instead and only ranked and sliced here.
+
+NumPy rather than pandas: a listing is tens to a few thousand rows, where a
+DataFrame's per-operation overhead costs more than the row loop it replaces.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from condor import pool_data
+
+# Keys only the nested or by-address shapes carry. A batch containing any of
+# them is normalized row by row.
+_NESTED_KEYS = ("attributes", "relationships", "volume_usd", "price_change_percentage")
+
+# Output field → the flat keys ``_get_nested_float`` would try, in order.
+_NESTED_FLOATS = {
+    "volume_24h": ("volume_usd_h24", "volume_usd.h24"),
+    "volume_6h": ("volume_usd_h6", "volume_usd.h6"),
+    "volume_1h": ("volume_usd_h1", "volume_usd.h1"),
+    "price_change_24h": ("price_change_percentage_h24", "price_change_percentage.h24"),
+    "price_change_6h": ("price_change_percentage_h6", "price_change_percentage.h6"),
+    "price_change_1h": ("price_change_percentage_h1", "price_change_percentage.h1"),
+}
+
+# Output field → the raw key it is copied from, coerced.
+_RAW_FLOATS = {
+    "base_token_price_usd": "base_token_price_usd",
+    "quote_token_price_usd": "quote_token_price_usd",
+    "reserve_usd": "reserve_in_usd",
+    "fdv_usd": "fdv_usd",
+    "market_cap_usd": "market_cap_usd",
+}
+
+# In the order ``_normalize_gecko_pool`` builds them, so a record serializes the
+# same way whichever path produced it.
+_COLUMNS = (
+    "address",
+    "name",
+    "base_token_symbol",
+    "quote_token_symbol",
+    "base_token_address",
+    "quote_token_address",
+    "base_token_price_usd",
+    "quote_token_price_usd",
+    "network",
+    "dex_id",
+    "reserve_usd",
+    "volume_24h",
+    "volume_6h",
+    "volume_1h",
+    "price_change_24h",
+    "price_change_6h",
+    "price_change_1h",
+    "fdv_usd",
+    "market_cap_usd",
+    "pool_created_at",
+    "source",
+    "base_symbol",
+    "quote_symbol",
+    "current_price",
+    "lp_provider",
+    "lp_supported",
+    "gateway_network",
+    "gecko_network",
+    "tradable",
+    "has_bins",
+    "trading_pair",
+)
+_NUMERIC = frozenset(_NESTED_FLOATS) | frozenset(_RAW_FLOATS) | {"current_price"}
+
+
+def _floats(values: Sequence[Any]) -> np.ndarray:
+    """Finite float64, NaN for anything missing, unparseable or infinite."""
+    try:
+        out = np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        # One bad cell: parse cell by cell rather than lose the column.
+        parsed = [pool_data._finite(v) for v in values]
+        out = np.array([np.nan if v is None else v for v in parsed], dtype=float)
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def _pair_symbol(name: Any, side: int) -> str:
+    """``decorate_pool``'s symbol for one side of a pool's display name."""
+    symbol = pool_data.extract_pair_from_name(str(name or ""))[side]
+    symbol = str(symbol or "").strip().upper()
+    return "" if symbol == "???" else symbol
+
+
+class PoolTable:
+    """A batch of decorated pools as columns: NumPy arrays for the numbers,
+    lists for the rest. Every operation returns a new table; columns are never
+    written after construction."""
+
+    __slots__ = ("columns", "size")
+
+    def __init__(self, columns: Dict[str, Any], size: int):
+        self.columns = columns
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    @classmethod
+    def from_records(cls, pools: Iterable[Dict[str, Any]]) -> "PoolTable":
+        """Already-normalized pools, for a batch the row path had to handle."""
+        pools = list(pools)
+        columns: Dict[str, Any] = {}
+        for name in _COLUMNS:
+            values = [p.get(name) for p in pools]
+            columns[name] = _floats(values) if name in _NUMERIC else values
+        return cls(columns, len(pools))
+
+    @classmethod
+    def from_gecko_rows(
+        cls, rows: Sequence[Dict[str, Any]], network: str
+    ) -> "PoolTable":
+        """Flat GeckoTerminal rows → decorated pools, for the caller's network.
+
+        Rows with no address are dropped, as the row path drops them. The rows
+        are only read, never kept or written.
+        """
+        if any(key in row for row in rows for key in _NESTED_KEYS):
+            pools = []
+            for row in rows:
+                try:
+                    pool = pool_data._normalize_gecko_pool(row, network)
+                except Exception as e:
+                    pool_data.logger.info(
+                        "gecko pool row skipped net=%s: %s", network, e
+                    )
+                    continue
+                if pool.get("address"):
+                    pools.append(pool)
+            return cls.from_records(pools)
+
+        address = [
+            row.get("address") or str(row.get("id", "")).split("_")[-1] for row in rows
+        ]
+        if not all(address):
+            rows = [row for row, a in zip(rows, address) if a]
+            address = [a for a in address if a]
+        n = len(rows)
+
+        def raw(key: str, default: Any = None) -> List[Any]:
+            return [row.get(key, default) for row in rows]
+
+        def first_float(keys: Sequence[str]) -> np.ndarray:
+            values = np.full(n, np.nan)
+            for key in keys:
+                if any(key in row for row in rows):
+                    values = np.where(np.isnan(values), _floats(raw(key)), values)
+            return values
+
+        names = raw("name", "Unknown")
+        base_symbol = [_pair_symbol(name, 0) for name in names]
+        quote_symbol = [_pair_symbol(name, 1) for name in names]
+        columns: Dict[str, Any] = {
+            "address": address,
+            "name": names,
+            "base_token_symbol": [s or "???" for s in base_symbol],
+            "quote_token_symbol": [s or "???" for s in quote_symbol],
+            "base_token_address": [
+                pool_data._gecko_token_address(row, row, "base") for row in rows
+            ],
+            "quote_token_address": [
+                pool_data._gecko_token_address(row, row, "quote") for row in rows
+            ],
+            "network": [network] * n,
+            "dex_id": raw("dex_id", "unknown"),
+            "pool_created_at": raw("pool_created_at"),
+            "source": ["gecko"] * n,
+        }
+        columns["base_symbol"] = columns["base_token_symbol"]
+        columns["quote_symbol"] = columns["quote_token_symbol"]
+
+        for field, key in _RAW_FLOATS.items():
+            columns[field] = _floats(raw(key))
+        for field, keys in _NESTED_FLOATS.items():
+            columns[field] = first_float(keys)
+        # Base priced in quote: gecko's own ratio when a row has one, else the two
+        # USD prices divided — only when both are non-zero.
+        base_usd = columns["base_token_price_usd"]
+        quote_usd = columns["quote_token_price_usd"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            divided = np.where(
+                (base_usd != 0) & (quote_usd != 0), base_usd / quote_usd, np.nan
+            )
+        ratio = first_float(("base_token_price_quote_token",))
+        price = np.where(np.isnan(ratio), divided, ratio)
+        price[~np.isfinite(price)] = np.nan
+        columns["current_price"] = price
+
+        # Venue facts depend on the dex alone: decided once per distinct venue.
+        dex_key = [str(d or "") for d in columns["dex_id"]]
+        venues = {
+            dex: (
+                pool_data.lp_provider_for_dex(dex, network),
+                pool_data.can_fetch_liquidity(dex, network),
+            )
+            for dex in set(dex_key)
+        }
+        columns["lp_provider"] = [venues[d][0] for d in dex_key]
+        columns["lp_supported"] = [venues[d][0] is not None for d in dex_key]
+        columns["has_bins"] = [venues[d][1] for d in dex_key]
+
+        gecko_network = pool_data.get_gecko_network(network)
+        gateway_network = pool_data.GECKO_TO_GATEWAY_NETWORK.get(gecko_network) or (
+            network if network in pool_data.NETWORK_TO_GECKO else ""
+        )
+        tradable = (
+            bool(gateway_network) and gateway_network in pool_data.NETWORK_TO_GECKO
+        )
+        columns["gateway_network"] = [gateway_network] * n
+        columns["gecko_network"] = [gecko_network] * n
+        columns["tradable"] = [tradable] * n
+
+        if pool_data.uses_symbol_pairs(network):
+            bases = base_symbol
+        else:
+            bases = [str(a or "") for a in columns["base_token_address"]]
+        columns["trading_pair"] = [
+            f"{b}-{q}" if b and q else "" for b, q in zip(bases, quote_symbol)
+        ]
+        return cls(columns, n)
+
+    def take(self, index: np.ndarray) -> "PoolTable":
+        """The rows at ``index``, in that order."""
+        positions = index.tolist()
+        columns = {
+            name: (
+                values[index]
+                if isinstance(values, np.ndarray)
+                else [values[i] for i in positions]
+            )
+            for name, values in self.columns.items()
+        }
+        return PoolTable(columns, len(positions))
+
+    def only_dexes(self, dexes: Iterable[str]) -> "PoolTable":
+        """Rows on the given venues (lower-cased ids); every row when empty."""
+        wanted = set(dexes)
+        if not wanted:
+            return self
+        mask = [str(d or "").strip().lower() in wanted for d in self.columns["dex_id"]]
+        return self.take(np.flatnonzero(np.array(mask, dtype=bool)))
+
+    def ranked_by(self, field: str) -> "PoolTable":
+        """Highest ``field`` first, a missing figure as zero; ties keep their order."""
+        values = np.nan_to_num(self.columns[field], nan=0.0)
+        return self.take(np.argsort(-values, kind="stable"))
+
+    def window(self, start: int, stop: int) -> "PoolTable":
+        return self.take(np.arange(self.size)[start:stop])
+
+    @staticmethod
+    def concat(tables: Sequence["PoolTable"]) -> "PoolTable":
+        if not tables:
+            return PoolTable.from_records([])
+        columns: Dict[str, Any] = {}
+        for name in _COLUMNS:
+            parts = [t.columns[name] for t in tables]
+            if name in _NUMERIC:
+                columns[name] = np.concatenate(parts)
+            else:
+                columns[name] = [v for part in parts for v in part]
+        return PoolTable(columns, sum(len(t) for t in tables))
+
+    def records(self) -> List[Dict[str, Any]]:
+        """The rows as response dicts, NaN as None and floats as Python's."""
+        values = []
+        for name in _COLUMNS:
+            column = self.columns[name]
+            if isinstance(column, np.ndarray):
+                column = [None if v != v else v for v in column.tolist()]
+            values.append(column)
+        return [dict(zip(_COLUMNS, row)) for row in zip(*values)]
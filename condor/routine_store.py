@@ -17,6 +17,7 @@ from typing import Any
 
 import condor.reports as reports
 from condor import routine_hooks
+from condor.gecko_stats import gecko_caller
 from condor.telemetry import taps as telemetry_taps
 from routines.base import (
     RoutineResult,
@@ -42,18 +43,19 @@ class _HttpBot:
     async def _post(self, method: str, data: dict, files: dict | None = None):
         if not self._token:
             return None
-        import httpx
-
-        url = f"https://api.telegram.org/bot{self._token}/{method}"
-        async with httpx.AsyncClient(timeout=30) as client:
-            if files:
-                resp = await client.post(url, data=data, files=files)
-            else:
-                resp = await client.post(url, json=data)
-            result = resp.json()
-            if not result.get("ok"):
-                logger.warning(f"Telegram {method} failed: {resp.text}")
-            return result
+        from condor.http_pool import http_client
+
+        # One kept-alive connection to Telegram rather than a handshake a message.
+        client = http_client("https://api.telegram.org")
+        url = f"/bot{self._token}/{method}"
+        if files:
+            resp = await client.post(url, data=data, files=files, timeout=30)
+        else:
+            resp = await client.post(url, json=data, timeout=30)
+        result = resp.json()
+        if not result.get("ok"):
+            logger.warning(f"Telegram {method} failed: {resp.text}")
+        return result
 
     async def send_message(self, *a, **kw):
         chat_id = kw.get("chat_id") or (a[0] if a else None)
@@ -587,7 +589,8 @@ class RoutineStore:
             with reports.attribute_owner(user_id):
                 with reports.attribute_to(agent or _agent_of(routine)):
                     with reports.default_source("routine", base_name):
-                        raw = await routine.run_fn(cfg, ctx)
+                        with gecko_caller(f"routine:{base_name}"):
+                            raw = await routine.run_fn(cfg, ctx)
             result = normalize_result(raw)
         except asyncio.CancelledError:
             result = RoutineResult(text="Stopped by user")
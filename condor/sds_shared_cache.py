@@ -0,0 +1,173 @@
+"""Cross-process cache backend for ``ServerDataService``.
+
+``get_server_data_service()`` is a per-process singleton, so every Condor
+process on a host (a second dashboard, a Telegram-only instance, a script
+importing ``condor``) used to poll the same Hummingbot API on its own. With a
+shared cache attached, each process still runs its own poll schedule, but a
+fetch first looks here: a value another process fetched within the key's
+cadence is adopted instead of refetched, and a *lease* per key makes the
+fetch itself single-flight across processes — the other processes wait for
+the holder's result rather than issuing the same request. Shared rows are read
+on that fetch path only; ``get()`` never touches the backend.
+
+Only what goes through ``ServerDataService`` is shared. The bundled MCP
+servers (``mcp_servers/hummingbot_api``, which every ACP agent runs) call the
+Hummingbot API through their own client, on demand, so they still make their
+own requests: several agents do not collapse into one poller here.
+
+``SharedCache`` is the extension point; ``SqliteSharedCache`` (WAL mode, one
+row per key) is the backend shipped here. Values cross the boundary as JSON:
+a value that would not read back equal (it does not serialize, or holds
+tuples or non-string dict keys JSON would change) is simply not shared, and
+every backend error degrades to the plain per-process fetch — the shared
+cache is an optimization, never a reason for a read to fail.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Optional, Protocol, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Anchored at the repo root like the other stores under ``data/``: every
+# process on the host must agree on the file.
+_DB_PATH = Path(__file__).resolve().parents[1] / "data" / "sds_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS leases (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SharedCache(Protocol):
+    """What ``ServerDataService`` needs from a cross-process backend.
+
+    Keys are the strings built by ``ServerDataService._shared_key``. Every
+    method may raise; the service treats any failure as "not shared".
+    """
+
+    def load(self, key: str) -> Optional[Tuple[Any, float]]:
+        """``(value, fetched_at)`` for ``key``, or None if nobody stored it."""
+        ...
+
+    def store(self, key: str, value: Any, fetched_at: float) -> None:
+        """Publish a freshly fetched value to the other processes.
+
+        Raises ``TypeError`` or ``ValueError`` for a value the backend cannot
+        carry exactly; the service then keeps it per-process.
+        """
+        ...
+
+    def try_lease(self, key: str, ttl: float) -> bool:
+        """Claim the right to fetch ``key`` for ``ttl`` seconds.
+
+        True when this process now holds the lease (it was free, expired, or
+        already ours); False when another process is fetching.
+        """
+        ...
+
+    def release(self, key: str) -> None:
+        """Give up this process's lease on ``key``, if it holds one."""
+        ...
+
+
+class SqliteSharedCache:
+    """``SharedCache`` over one SQLite file in WAL mode.
+
+    WAL lets any number of readers run alongside the one writer, which is the
+    shape of this workload: every process reads on every poll, and a write
+    happens once per key per cadence. Connections are opened per call — they
+    are cheap, and the service calls in from worker threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path or _DB_PATH
+        self._owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._path, timeout=5.0)
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    self._path.parent.mkdir(parents=True, exist_ok=True)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._ready = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def load(self, key: str) -> Optional[Tuple[Any, float]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def store(self, key: str, value: Any, fetched_at: float) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        if json.loads(encoded) != value:
+            raise ValueError("value does not survive a JSON round trip")
+        with closing(self._connect()) as conn, conn:
+            # Never let a slow process overwrite a newer value with its older one.
+            conn.execute(
+                "INSERT INTO entries (key, value, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "fetched_at = excluded.fetched_at "
+                "WHERE excluded.fetched_at > entries.fetched_at",
+                (key, encoded, fetched_at),
+            )
+
+    def try_lease(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cur = conn.execute(
+                "INSERT INTO leases (key, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, "
+                "expires = excluded.expires "
+                "WHERE leases.expires < ? OR leases.owner = excluded.owner",
+                (key, self._owner, now + ttl, now),
+            )
+            return cur.rowcount == 1
+
+    def release(self, key: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner)
+            )
+
+
+def shared_cache_from_env(env=None) -> Optional[SharedCache]:
+    """The backend ``SDS_SHARED_CACHE`` selects, or None for per-process only.
+
+    ``sqlite`` is the one backend today; anything else is logged and ignored,
+    so a typo leaves the service working exactly as before.
+    """
+    env = os.environ if env is None else env
+    choice = (env.get("SDS_SHARED_CACHE") or "").strip().lower()
+    if not choice:
+        return None
+    if choice == "sqlite":
+        return SqliteSharedCache()
+    logger.warning("Unknown SDS_SHARED_CACHE=%r, using the per-process cache", choice)
+    return None
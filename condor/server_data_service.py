@@ -11,18 +11,31 @@ Architecture:
       _health: {server_name: ServerHealth}
       _rate_limiters: {server_name: RateLimiter}
       _fetch_registry: {ServerDataType: FetchSpec}
-      _poll_task: asyncio.Task (1s tick loop)
+      _schedule: [(due_at, seq, CacheKey)] heap, _due: {CacheKey: due_at}
+      _poll_task: asyncio.Task (sleeps until the next deadline)
+      _shared: Optional[SharedCache] (cross-process, see condor.sds_shared_cache)
 """
 
 import asyncio
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import random
 import time
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from functools import partial
 from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
+try:  # optional: several times faster on the large ticker/executor payloads
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
 from condor.asyncutil import TaskSet
+from condor.sds_shared_cache import SharedCache, shared_cache_from_env
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +77,11 @@ class DataTypeDefaults:
     # portfolio-history window is worthless after minutes while a 3M one holds
     # for hours — and the key params say which variant this is.
     ttl_by_param: Optional[Tuple[str, Dict[str, float]]] = None
+    # Stale-while-revalidate: for this many seconds past the TTL,
+    # ``get_or_fetch`` answers with the stale value at once and refreshes in
+    # the background. Past ``ttl + stale_while_revalidate`` it blocks on a
+    # fetch again. 0 (the default) never serves stale: live trading state.
+    stale_while_revalidate: float = 0.0
 
     def ttl_for(self, params: Dict[str, str]) -> float:
         """TTL for a specific cache key's params."""
@@ -87,7 +105,9 @@ class DataTypeDefaults:
 
 
 _DEFAULTS: Dict[ServerDataType, DataTypeDefaults] = {
-    ServerDataType.PORTFOLIO: DataTypeDefaults(interval=10, ttl=60),
+    ServerDataType.PORTFOLIO: DataTypeDefaults(
+        interval=10, ttl=60, stale_while_revalidate=240
+    ),
     # One entry per range window, each with its own freshness horizon: a 1D
     # window at 5m candles is stale within minutes, a 3M window at 1d candles
     # holds for hours. ``interval == ttl`` here, so ``interval_for`` polls each
@@ -104,22 +124,38 @@ _DEFAULTS: Dict[ServerDataType, DataTypeDefaults] = {
     ServerDataType.PRICES: DataTypeDefaults(interval=3, ttl=30),
     ServerDataType.POSITIONS: DataTypeDefaults(interval=10, ttl=60),
     ServerDataType.ACTIVE_ORDERS: DataTypeDefaults(interval=10, ttl=60),
-    ServerDataType.TRADING_RULES: DataTypeDefaults(interval=300, ttl=600),
-    ServerDataType.CONNECTORS: DataTypeDefaults(interval=300, ttl=600),
+    ServerDataType.TRADING_RULES: DataTypeDefaults(
+        interval=300, ttl=600, stale_while_revalidate=3600
+    ),
+    ServerDataType.CONNECTORS: DataTypeDefaults(
+        interval=300, ttl=600, stale_while_revalidate=3600
+    ),
     ServerDataType.BOTS_STATUS: DataTypeDefaults(interval=5, ttl=30),
     ServerDataType.EXECUTORS: DataTypeDefaults(interval=2, ttl=30),
-    ServerDataType.BOT_RUNS: DataTypeDefaults(interval=30, ttl=120),
-    ServerDataType.CANDLE_CONNECTORS: DataTypeDefaults(interval=300, ttl=600),
+    ServerDataType.BOT_RUNS: DataTypeDefaults(
+        interval=30, ttl=120, stale_while_revalidate=240
+    ),
+    ServerDataType.CANDLE_CONNECTORS: DataTypeDefaults(
+        interval=300, ttl=600, stale_while_revalidate=3600
+    ),
     ServerDataType.SERVER_STATUS: DataTypeDefaults(interval=60, ttl=120),
-    ServerDataType.ALL_CONNECTORS: DataTypeDefaults(interval=300, ttl=600),
+    ServerDataType.ALL_CONNECTORS: DataTypeDefaults(
+        interval=300, ttl=600, stale_while_revalidate=3600
+    ),
     # Venue traits follow the CONNECTORS cadence, not the "chains change ~never"
     # one: the credentialed connector list is one of the inputs, so the answer
     # changes the moment a user adds API keys.
-    ServerDataType.VENUES: DataTypeDefaults(interval=300, ttl=600),
-    ServerDataType.TICKERS: DataTypeDefaults(interval=60, ttl=180),
+    ServerDataType.VENUES: DataTypeDefaults(
+        interval=300, ttl=600, stale_while_revalidate=3600
+    ),
+    ServerDataType.TICKERS: DataTypeDefaults(
+        interval=60, ttl=180, stale_while_revalidate=120
+    ),
     # Whole-server ticker pool: one poll feeds every per-connector ticker view and
     # all currency conversion, so reads never hit the network.
-    ServerDataType.TICKER_POOL: DataTypeDefaults(interval=60, ttl=300),
+    ServerDataType.TICKER_POOL: DataTypeDefaults(
+        interval=60, ttl=300, stale_while_revalidate=300
+    ),
 }
 
 
@@ -156,6 +192,36 @@ class CacheEntry:
     fetched_at: float
     consecutive_errors: int = 0
     last_error_at: float = 0.0
+    # Content hash of ``value`` (see ``fingerprint``); None when it could not
+    # be computed, in which case change detection falls back to ``!=``.
+    fingerprint: Optional[str] = None
+    # This write's share of the poll jitter, in [0, 1). Drawn once per entry
+    # so the deadline the scheduler computes from it is the same every time
+    # it asks, and a fresh fetch draws a fresh one.
+    jitter: float = field(default_factory=random.random)
+
+
+def fingerprint(value: Any) -> Optional[str]:
+    """A content hash of ``value`` over a canonical (key-sorted) serialization.
+
+    Computed once per write so that "did this poll change anything?" is a
+    string compare, not a deep ``==`` over a whole ticker pool on the event
+    loop — once in SDS and again per channel in the WS manager. Returns None
+    for a value that does not serialize.
+    """
+    try:
+        if orjson is not None:
+            try:
+                raw = orjson.dumps(
+                    value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                )
+            except TypeError:
+                raw = json.dumps(value, sort_keys=True, default=repr).encode()
+        else:
+            raw = json.dumps(value, sort_keys=True, default=repr).encode()
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
 
 # ============================================
@@ -221,6 +287,28 @@ class ServerHealth:
 # ============================================
 
 
+class PollPriority(IntEnum):
+    """Who a polled key is for; lower values are served first.
+
+    Rate-limit tokens are handed out in this order and the lower classes may
+    not spend the share reserved for the ones above them (``_TOKEN_RESERVE``),
+    so a burst of background refreshes never starves a chart someone is
+    looking at.
+    """
+
+    INTERACTIVE = 0  # has a live consumer (WS manager, a handler)
+    BACKGROUND = 1  # only the startup warmer keeps it polled
+    WARMUP = 2  # warmer-only and never fetched successfully yet
+
+
+# Share of each rate-limit bucket a priority class must leave untouched.
+_TOKEN_RESERVE: Dict[PollPriority, float] = {
+    PollPriority.INTERACTIVE: 0.0,
+    PollPriority.BACKGROUND: 0.2,
+    PollPriority.WARMUP: 0.4,
+}
+
+
 class RateLimiter:
     """Async token-bucket rate limiter."""
 
@@ -237,14 +325,33 @@ class RateLimiter:
         deadline = time.monotonic() + timeout
         while True:
             async with self._lock:
-                self._refill()
-                if self._tokens_sec >= 1.0 and self._tokens_min >= 1.0:
-                    self._tokens_sec -= 1.0
-                    self._tokens_min -= 1.0
-                    return True
-            if time.monotonic() >= deadline:
+                wait = self.try_acquire()
+            if wait <= 0:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 return False
-            await asyncio.sleep(0.05)
+            await asyncio.sleep(min(wait, remaining))
+
+    def try_acquire(self, reserve: float = 0.0) -> float:
+        """Take a token now if one is free beyond the ``reserve`` share.
+
+        ``reserve`` is the fraction of each bucket the caller must leave for
+        higher-priority callers. Returns 0.0 when a token was taken, otherwise
+        the seconds until one would be — so a denied caller can come back
+        exactly then instead of polling for it.
+        """
+        self._refill()
+        need_sec = 1.0 + reserve * self._per_second
+        need_min = 1.0 + reserve * self._per_minute
+        if self._tokens_sec >= need_sec and self._tokens_min >= need_min:
+            self._tokens_sec -= 1.0
+            self._tokens_min -= 1.0
+            return 0.0
+        return max(
+            (need_sec - self._tokens_sec) / self._per_second,
+            (need_min - self._tokens_min) / (self._per_minute / 60.0),
+        )
 
     def _refill(self) -> None:
         now = time.monotonic()
@@ -276,8 +383,18 @@ class FetchSpec:
 # SERVER DATA SERVICE
 # ============================================
 
-_POLL_TICK = 1  # seconds between poll loop snapshots
+_POLL_TICK = 1  # retry delay for a key whose last fetch failed (< 3 in a row)
 _CLEANUP_INTERVAL = 300  # clean stale entries every 5 min
+# Keys sharing a cadence are spread over up to this share of their interval,
+# capped at _MAX_JITTER seconds, so ten servers' 2s EXECUTORS polls don't land
+# on the same instant. Only ever added: a key is never polled faster than asked.
+_JITTER_FRACTION = 0.1
+_MAX_JITTER = 1.0
+_AUTO_SUBSCRIBER = "_auto"  # the startup warmer's subscriber id
+# Cross-process single-flight: how long a fetch lease is held at most, and how
+# often a process waiting on another's lease re-reads the shared entry.
+_SHARED_LEASE_TTL = 15.0
+_SHARED_WAIT_STEP = 0.1
 
 
 class ServerDataService:
@@ -290,6 +407,18 @@ class ServerDataService:
         self._rate_limiters: Dict[str, RateLimiter] = {}
         self._fetch_registry: Dict[ServerDataType, FetchSpec] = {}
         self._poll_task: Optional[asyncio.Task] = None
+        # Poll schedule: a heap of (due_at, seq, key) plus the authoritative
+        # due time per key. Heap entries whose due_at no longer matches
+        # ``_due`` are stale and skipped when they surface.
+        self._schedule: List[Tuple[float, int, CacheKey]] = []
+        self._due: Dict[CacheKey, float] = {}
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._poll_fetches = TaskSet(logger, "SDS poll fetch error for %s: %s")
+        # Background refreshes started by stale-while-revalidate reads.
+        self._revalidations = TaskSet(logger, "SDS revalidation error for %s: %s")
+        # Cross-process backend; None keeps the cache per-process.
+        self._shared: Optional[SharedCache] = None
         # In-flight fetches per key (single-flight coalescing)
         self._inflight: Dict[CacheKey, asyncio.Task] = {}
         self._running = False
@@ -307,6 +436,10 @@ class ServerDataService:
         """Register a fetch function for a data type."""
         self._fetch_registry[data_type] = FetchSpec(fetch_func=fetch_func)
 
+    def set_shared_cache(self, backend: Optional[SharedCache]) -> None:
+        """Share fetched values (and single-flight fetches) with other processes."""
+        self._shared = backend
+
     # ------ Client resolution ------
 
     async def _get_client(self, server_name: str):
@@ -377,6 +510,9 @@ class ServerDataService:
             except Exception as e:
                 logger.debug("SDS prime failed for %s: %s", key, e)
 
+        # A new key, or a faster subscriber on an existing one, moves the
+        # deadline; the loop re-reads the heap head when woken.
+        self._reschedule(key)
         return key
 
     def unsubscribe(self, key: CacheKey, subscriber_id: str) -> None:
@@ -386,6 +522,7 @@ class ServerDataService:
             subs.pop(subscriber_id, None)
             if not subs:
                 del self._subscriptions[key]
+                self._due.pop(key, None)
                 logger.debug("SDS: no subscribers left for %s, polling stopped", key)
 
     def unsubscribe_all(self, subscriber_id: str) -> None:
@@ -397,6 +534,7 @@ class ServerDataService:
                 empty_keys.append(key)
         for key in empty_keys:
             del self._subscriptions[key]
+            self._due.pop(key, None)
 
     # ------ Read API ------
 
@@ -416,16 +554,52 @@ class ServerDataService:
     async def get_or_fetch(
         self, server: str, data_type: ServerDataType, **params
     ) -> Optional[Any]:
-        """Return cached data if fresh, otherwise fetch. For REST/one-shot reads."""
+        """Return cached data if fresh, otherwise fetch. For REST/one-shot reads.
+
+        Within the data type's stale-while-revalidate window the stale value is
+        returned at once; see ``get_or_fetch_entry`` to also learn its age.
+        """
+        entry = await self.get_or_fetch_entry(server, data_type, **params)
+        return entry.value if entry else None
+
+    async def get_or_fetch_entry(
+        self, server: str, data_type: ServerDataType, **params
+    ) -> Optional[CacheEntry]:
+        """``get_or_fetch``, returning the cache entry so callers can report age.
+
+        A fresh entry is returned as is. An entry past its TTL but within
+        ``stale_while_revalidate`` is returned too, with a single-flight
+        refresh started in the background; an older one (or none) blocks on
+        the fetch, as a plain read always did.
+        """
         key = CacheKey.make(server, data_type, **params)
 
         # Check cache
-        cached = self.get(server, data_type, **params)
-        if cached is not None:
-            return cached
+        if self.get(server, data_type, **params) is not None:
+            return self._cache[key]
+
+        defaults = _DEFAULTS[data_type]
+        entry = self._cache.get(key)
+        if (
+            entry is not None
+            and entry.value is not None
+            and defaults.stale_while_revalidate > 0
+            and time.time() - entry.fetched_at
+            <= defaults.ttl_for(key.params_dict) + defaults.stale_while_revalidate
+        ):
+            self._revalidate(key)
+            return entry
 
         # Fetch fresh
-        return await self._fetch_and_cache(key)
+        await self._fetch_and_cache(key)
+        return self._cache.get(key)
+
+    def _revalidate(self, key: CacheKey) -> None:
+        """Refresh ``key`` in the background, unless a fetch is already running."""
+        if key in self._inflight:
+            return
+        task = asyncio.ensure_future(self._fetch_and_cache(key))
+        self._revalidations.track(task, key.data_type.value)
 
     def get_entry(
         self, server: str, data_type: ServerDataType, **params
@@ -434,24 +608,21 @@ class ServerDataService:
         key = CacheKey.make(server, data_type, **params)
         return self._cache.get(key)
 
+    def ttl_for(self, data_type: ServerDataType, **params) -> float:
+        """How long a cached value of this type (and params) counts as fresh.
+
+        For callers that report an entry's age and need to say whether it is
+        past that point, e.g. one served from the stale-while-revalidate window.
+        """
+        key_params = {k: str(v) for k, v in params.items() if v is not None}
+        return _DEFAULTS[data_type].ttl_for(key_params)
+
     # ------ Write API (for manual puts after mutations) ------
 
     def put(self, server: str, data_type: ServerDataType, value: Any, **params) -> None:
         """Manually insert/update a cache entry. Fires change callbacks."""
         key = CacheKey.make(server, data_type, **params)
-        old_entry = self._cache.get(key)
-        old_value = old_entry.value if old_entry else None
-
-        self._cache[key] = CacheEntry(
-            key=key,
-            value=value,
-            fetched_at=time.time(),
-        )
-
-        self._notify_listeners(key, value)
-
-        if value != old_value:
-            self._fire_callbacks(key, old_value, value)
+        self._write(key, value, time.time(), fingerprint(value))
 
     # ------ Invalidation ------
 
@@ -462,6 +633,7 @@ class ServerDataService:
         ]
         for k in keys_to_remove:
             del self._cache[k]
+            self._reschedule(k)
         if keys_to_remove:
             logger.debug(
                 "SDS invalidated %d entries for %s: %s",
@@ -475,6 +647,7 @@ class ServerDataService:
         keys_to_remove = [k for k in self._cache if k.server == server]
         for k in keys_to_remove:
             del self._cache[k]
+            self._reschedule(k)
         logger.info(
             "SDS invalidated all cache for server %s (%d entries)",
             server,
@@ -484,11 +657,12 @@ class ServerDataService:
     # ------ Cache-write listeners (for WebSocketManager) ------
 
     def add_listener(self, callback: Callable) -> None:
-        """Add a sync listener: ``callback(key: CacheKey, value: Any)``.
+        """Add a sync listener: ``callback(key: CacheKey, value: Any, changed: bool)``.
 
         Fired on every cache write. The listener gets the typed key — server,
         data type and params — so it never has to parse anything back out of a
-        formatted string.
+        formatted string, and ``changed`` (from the entries' fingerprints), so
+        it never has to compare payloads itself.
         """
         self._listeners.append(callback)
 
@@ -499,11 +673,11 @@ class ServerDataService:
         # was registered and stop() left a dead manager wired to the singleton.
         self._listeners = [cb for cb in self._listeners if cb != callback]
 
-    def _notify_listeners(self, key: CacheKey, value: Any) -> None:
+    def _notify_listeners(self, key: CacheKey, value: Any, changed: bool) -> None:
         """Hand the written key and its value to every listener, unchanged."""
         for cb in self._listeners:
             try:
-                cb(key, value)
+                cb(key, value, changed)
             except Exception as e:
                 logger.debug("SDS listener error: %s", e)
 
@@ -513,6 +687,7 @@ class ServerDataService:
         if self._running:
             return
         self._running = True
+        self._wakeup = asyncio.Event()
         self._poll_task = asyncio.create_task(self._poll_loop())
         logger.info("ServerDataService started")
 
@@ -546,7 +721,7 @@ class ServerDataService:
             ServerDataType.ALL_CONNECTORS,
             ServerDataType.TICKER_POOL,
         ]
-        subscriber_id = "_auto"
+        subscriber_id = _AUTO_SUBSCRIBER
 
         # Launch all core subscriptions concurrently
         async def _sub(name: str, dt: ServerDataType) -> bool:
@@ -591,7 +766,7 @@ class ServerDataService:
         )
 
     async def _subscribe_trading_rules_for_server(
-        self, server_name: str, subscriber_id: str = "_auto"
+        self, server_name: str, subscriber_id: str = _AUTO_SUBSCRIBER
     ) -> int:
         """Subscribe TRADING_RULES for all known connectors on a server. Returns count."""
         connectors = self.get(server_name, ServerDataType.CONNECTORS)
@@ -656,69 +831,171 @@ class ServerDataService:
             self._poll_task.cancel()
             logger.info("ServerDataService stopped")
         self._callback_tasks.cancel_all()
+        self._poll_fetches.cancel_all()
+        self._revalidations.cancel_all()
 
     # ------ Poll loop ------
 
     async def _poll_loop(self) -> None:
         while self._running:
             try:
-                await asyncio.sleep(_POLL_TICK)
-                await self._poll_tick()
+                self._dispatch_due()
 
                 # Periodic cleanup
                 now = time.time()
                 if now - self._last_cleanup > _CLEANUP_INTERVAL:
                     self._cleanup_stale()
                     self._last_cleanup = now
+
+                await self._sleep_until_next_due()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("SDS poll loop error: %s", e, exc_info=True)
                 await asyncio.sleep(5)
 
-    async def _poll_tick(self) -> None:
-        """Single tick: check each subscribed key and refresh if due.
+    async def _sleep_until_next_due(self) -> None:
+        """Sleep until the earliest deadline, or until a reschedule moves it.
 
-        Collects all due keys first, then fetches them concurrently via gather.
+        Never longer than the cleanup interval, so cleanup still runs on a
+        service with nothing subscribed.
         """
-        now = time.time()
-        due_keys: List[CacheKey] = []
+        self._wakeup.clear()
+        self._drop_stale_heads()
+        delay = float(_CLEANUP_INTERVAL)
+        if self._schedule:
+            delay = min(delay, max(0.0, self._schedule[0][0] - time.time()))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _drop_stale_heads(self) -> None:
+        """Pop heap entries superseded by a later reschedule or unsubscribe."""
+        while self._schedule:
+            due_at, _, key = self._schedule[0]
+            if self._due.get(key) == due_at:
+                return
+            heapq.heappop(self._schedule)
 
-        for key, subs in list(self._subscriptions.items()):
-            if not subs:
-                continue
+    def _reschedule(self, key: CacheKey) -> None:
+        """(Re)compute when ``key`` is next due and push it onto the heap.
+
+        No-op for a key nobody subscribes to — that is what stops its polling.
+        """
+        due_at = self._next_due(key)
+        if due_at is None:
+            self._due.pop(key, None)
+            return
+        # Only a deadline earlier than the one the loop sleeps towards needs
+        # to wake it.
+        wake = not self._schedule or due_at < self._schedule[0][0]
+        self._due[key] = due_at
+        heapq.heappush(self._schedule, (due_at, next(self._seq), key))
+        if wake and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_due(self, key: CacheKey) -> Optional[float]:
+        """When ``key`` should next be fetched, from its cache entry.
+
+        The entry is the source of truth, so a fetch that happened outside the
+        poll (``get_or_fetch``, ``put``) pushes the deadline out on its own.
+        """
+        subs = self._subscriptions.get(key)
+        if not subs:
+            return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return time.time()
 
-            # Effective interval = min of all subscriber intervals
-            effective_interval = min(s.interval for s in subs.values())
+        # Effective interval = min of all subscriber intervals
+        interval = min(s.interval for s in subs.values())
+        jitter = entry.jitter * min(interval * _JITTER_FRACTION, _MAX_JITTER)
+        due_at = entry.fetched_at + interval + jitter
 
-            entry = self._cache.get(key)
-            if entry:
-                age = now - entry.fetched_at
-                if age < effective_interval:
-                    continue
+        if entry.consecutive_errors:
+            # Exponential backoff from the third consecutive error on
+            if entry.consecutive_errors >= 3:
+                backoff = min(60, 2**entry.consecutive_errors)
+            else:
+                backoff = _POLL_TICK
+            due_at = max(due_at, entry.last_error_at + backoff)
+        return due_at
+
+    def _priority(self, key: CacheKey) -> PollPriority:
+        subs = self._subscriptions.get(key, {})
+        if any(sid != _AUTO_SUBSCRIBER for sid in subs):
+            return PollPriority.INTERACTIVE
+        entry = self._cache.get(key)
+        if entry is None or not entry.fetched_at:
+            return PollPriority.WARMUP
+        return PollPriority.BACKGROUND
+
+    def _dispatch_due(self) -> Tuple[List[asyncio.Task], Optional[float]]:
+        """Start a fetch for every key whose deadline has passed.
+
+        Due keys take rate-limit tokens in priority order; a key denied one is
+        rescheduled for the moment its class can next get a token. Each fetch
+        reschedules its key when it settles, so a slow server never holds up
+        the others. Returns the started fetches and the earliest token retry
+        (None when no key was held back).
+        """
+        now = time.time()
+        due: List[Tuple[PollPriority, float, CacheKey]] = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due_at, _, key = heapq.heappop(self._schedule)
+            if self._due.get(key) != due_at:
+                continue  # superseded
+            actual = self._next_due(key)
+            if actual is None:
+                self._due.pop(key, None)
+                continue
+            if actual > now:
+                # Fetched since this deadline was set: wait out the new one.
+                self._due[key] = actual
+                heapq.heappush(self._schedule, (actual, next(self._seq), key))
+                continue
+            due.append((self._priority(key), due_at, key))
 
-                # Exponential backoff on consecutive errors
-                if entry.consecutive_errors >= 3:
-                    backoff = min(60, 2**entry.consecutive_errors)
-                    if now - entry.last_error_at < backoff:
-                        continue
+        started: List[asyncio.Task] = []
+        retry_at: Optional[float] = None
+        for priority, _, key in sorted(due, key=lambda d: (d[0], d[1])):
+            limiter = self._get_rate_limiter(key.server)
+            wait = limiter.try_acquire(_TOKEN_RESERVE[priority])
+            if wait > 0:
+                due_at = now + wait
+                self._due[key] = due_at
+                heapq.heappush(self._schedule, (due_at, next(self._seq), key))
+                retry_at = due_at if retry_at is None else min(retry_at, due_at)
+                continue
+            # Out of the schedule while in flight; the fetch puts it back.
+            del self._due[key]
+            task = asyncio.ensure_future(self._poll_fetch(key))
+            started.append(self._poll_fetches.track(task, key.data_type.value))
+        return started, retry_at
 
-            due_keys.append(key)
+    async def _poll_fetch(self, key: CacheKey) -> None:
+        try:
+            await self._fetch_and_cache(key)
+        except Exception:
+            pass  # Error already recorded in _fetch_and_cache
+        finally:
+            self._reschedule(key)
 
-        if not due_keys:
-            return
+    async def _poll_tick(self) -> None:
+        """Fetch every key that is due now and wait for those fetches.
 
-        # Acquire rate limits and fetch concurrently
-        async def _rate_limited_fetch(key: CacheKey):
-            limiter = self._get_rate_limiter(key.server)
-            if not await limiter.acquire(timeout=0.5):
+        Keys held back for a rate-limit token are waited for too. The loop
+        itself never waits on a fetch; this is the synchronous form for
+        callers (and tests) that want one whole round to have completed.
+        """
+        while True:
+            started, retry_at = self._dispatch_due()
+            if started:
+                await asyncio.gather(*started, return_exceptions=True)
+            if retry_at is None:
                 return
-            try:
-                await self._fetch_and_cache(key)
-            except Exception:
-                pass  # Error already recorded in _fetch_and_cache
-
-        await asyncio.gather(*[_rate_limited_fetch(k) for k in due_keys])
+            await asyncio.sleep(max(0.0, retry_at - time.time()))
 
     async def _fetch_and_cache(self, key: CacheKey) -> Optional[Any]:
         """Fetch data and update cache, coalescing concurrent fetches per key.
@@ -735,12 +1012,48 @@ class ServerDataService:
         return await task
 
     async def _do_fetch_and_cache(self, key: CacheKey) -> Optional[Any]:
-        """Fetch data and update cache. Returns the fetched value."""
+        """Fetch data and update cache. Returns the fetched value.
+
+        With a shared cache, a value another process fetched within this key's
+        cadence is adopted instead, and the fetch itself holds the key's
+        cross-process lease so the other processes wait for it. This is the
+        only place shared rows are read: ``get()`` stays memory-only, and the
+        poll and ``get_or_fetch`` both come through here.
+        """
         spec = self._fetch_registry.get(key.data_type)
         if not spec:
             logger.debug("SDS: no fetch registered for %s", key.data_type.value)
             return None
 
+        if self._shared is None:
+            return await self._fetch_upstream(key, spec)
+
+        adopted = await self._wait_for_shared(key)
+        if adopted is not None:
+            return adopted.value
+        skey = self._shared_key(key)
+        try:
+            result = await self._fetch_upstream(key, spec)
+            entry = self._cache[key]
+            if not entry.consecutive_errors:
+                try:
+                    await asyncio.to_thread(
+                        self._shared.store, skey, entry.value, entry.fetched_at
+                    )
+                except (TypeError, ValueError) as e:
+                    # Would not read back as written: stays per-process.
+                    logger.debug("SDS: %s not shareable: %s", key.data_type.value, e)
+                except Exception as e:
+                    logger.debug("SDS shared store failed for %s: %s", key, e)
+            return result
+        finally:
+            try:
+                await asyncio.to_thread(self._shared.release, skey)
+            except Exception as e:
+                logger.debug("SDS shared lease release failed for %s: %s", key, e)
+
+    async def _fetch_upstream(self, key: CacheKey, spec: FetchSpec) -> Optional[Any]:
+        """Call the registered fetch for ``key`` and record the outcome."""
         health = self.get_server_health(key.server)
         t0 = time.monotonic()
 
@@ -773,22 +1086,88 @@ class ServerDataService:
         latency_ms = (time.monotonic() - t0) * 1000
         health.record_success(latency_ms)
 
+        # Hashing a large payload is the expensive part of a write: keep it
+        # off the event loop.
+        fp = await asyncio.to_thread(fingerprint, result)
+        self._write(key, result, time.time(), fp)
+        return result
+
+    def _write(
+        self, key: CacheKey, value: Any, fetched_at: float, fp: Optional[str]
+    ) -> CacheEntry:
+        """Store a fresh value, tell listeners, and fire callbacks if it changed."""
         old_entry = self._cache.get(key)
         old_value = old_entry.value if old_entry else None
+        if fp is not None and old_entry is not None and old_entry.fingerprint:
+            changed = fp != old_entry.fingerprint
+        else:
+            changed = value != old_value
 
-        self._cache[key] = CacheEntry(
-            key=key,
-            value=result,
-            fetched_at=time.time(),
-        )
+        entry = CacheEntry(key=key, value=value, fetched_at=fetched_at, fingerprint=fp)
+        self._cache[key] = entry
 
-        self._notify_listeners(key, result)
+        self._notify_listeners(key, value, changed)
 
         # Fire change callbacks only on diff
-        if result != old_value:
-            self._fire_callbacks(key, old_value, result)
+        if changed:
+            self._fire_callbacks(key, old_value, value)
+        return entry
 
-        return result
+    # ------ Shared cache (cross-process) ------
+
+    @staticmethod
+    def _shared_key(key: CacheKey) -> str:
+        params = "&".join(f"{k}={v}" for k, v in sorted(key.params))
+        return f"{key.server}|{key.data_type.value}|{params}"
+
+    def _fresh_window(self, key: CacheKey) -> float:
+        """How old another process's value may be and still spare a fetch."""
+        subs = self._subscriptions.get(key)
+        if subs:
+            return min(s.interval for s in subs.values())
+        return _DEFAULTS[key.data_type].interval_for(key.params_dict)
+
+    def _adopt(
+        self, key: CacheKey, row: Optional[Tuple[Any, float]], max_age: float
+    ) -> Optional[CacheEntry]:
+        if row is None:
+            return None
+        value, fetched_at = row
+        entry = self._cache.get(key)
+        if time.time() - fetched_at >= max_age or (
+            entry is not None and entry.fetched_at >= fetched_at
+        ):
+            return None
+        # The server answered another process moments ago: that is health too.
+        health = self.get_server_health(key.server)
+        health.record_success(health.last_latency_ms)
+        return self._write(key, value, fetched_at, fingerprint(value))
+
+    async def _wait_for_shared(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Adopt another process's value, or take the lease to fetch it here.
+
+        Returns the adopted entry, or None once this process holds the lease
+        (or the holder has outlived it, or the backend failed) and should fetch.
+        """
+        skey = self._shared_key(key)
+        window = self._fresh_window(key)
+        deadline = time.monotonic() + _SHARED_LEASE_TTL
+        try:
+            while True:
+                row = await asyncio.to_thread(self._shared.load, skey)
+                adopted = self._adopt(key, row, window)
+                if adopted is not None:
+                    return adopted
+                if await asyncio.to_thread(
+                    self._shared.try_lease, skey, _SHARED_LEASE_TTL
+                ):
+                    return None
+                if time.monotonic() >= deadline:
+                    return None
+                await asyncio.sleep(_SHARED_WAIT_STEP)
+        except Exception as e:
+            logger.debug("SDS shared cache unavailable for %s: %s", key, e)
+            return None
 
     def _fire_callbacks(self, key: CacheKey, old_value: Any, new_value: Any) -> None:
         """Fire subscriber callbacks asynchronously.
@@ -836,7 +1215,9 @@ class ServerDataService:
             "cached_entries": len(self._cache),
             "active_subscriptions": sum(len(s) for s in self._subscriptions.values()),
             "subscribed_keys": len(self._subscriptions),
+            "scheduled_keys": len(self._due),
             "servers_tracked": len(self._health),
+            "shared_cache": type(self._shared).__name__ if self._shared else None,
             "health": {
                 name: {
                     "status": h.status.value,
@@ -859,6 +1240,7 @@ def get_server_data_service() -> ServerDataService:
     global _instance
     if _instance is None:
         _instance = ServerDataService()
+        _instance.set_shared_cache(shared_cache_from_env())
         register_default_fetches()
     return _instance
 
@@ -219,8 +219,10 @@ async def post(envelope: dict) -> bool:
     try:
         import aiohttp
 
+        from condor.http_pool import pooled_session
+
         timeout = aiohttp.ClientTimeout(total=POST_TIMEOUT_S)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+        async with pooled_session(timeout=timeout) as session:
             async with session.post(url, json=envelope) as response:
                 return 200 <= response.status < 300
     except Exception:
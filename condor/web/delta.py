@@ -0,0 +1,210 @@
+"""Delta encoding for the dashboard's snapshot channels.
+
+The portfolio, bots and executors channels broadcast a whole snapshot every
+time anything in it changes: one executor's PnL ticking re-ships a 500-row
+list. A subscriber that opts in (``{"action": "subscribe", "delta": true}``)
+instead gets one keyframe carrying the full snapshot, then patches against the
+previous frame:
+
+- keyframe: ``{"channel", "data", "seq", "keyframe": true, "ts"}``
+- delta:    ``{"channel", "delta", "seq", "ts"}``
+
+``seq`` counts every broadcast of the channel, so a client that sees anything
+but ``last_seq + 1`` has missed a frame and asks for ``{"action": "resync"}``;
+the server answers with a keyframe at the current ``seq``.
+
+A patch is a tree of nodes, each tagged by ``op``:
+
+- ``replace``: ``{"op": "replace", "value": v}`` — the value wholesale.
+- ``dict``: ``{"op": "dict", "set": {k: v}, "del": [k], "sub": {k: node}}`` —
+  keys replaced, removed, or patched in place (empty members are omitted).
+- ``rows``: ``{"op": "rows", "key": field, "add": [row], "del": [id],
+  "sub": {id: node}, "order": [id]}`` — a list of dict rows addressed by an
+  identity field (``id`` for executors, ``controller_id`` / ``bot_name`` for
+  bots, ``token`` for balances). Surviving rows keep their place, new rows are
+  appended; ``order`` is only sent when the result would otherwise come out in
+  a different order than the snapshot.
+
+A list whose rows have no usable identity field is replaced whole — correct,
+just not smaller. No client consumes delta frames yet: the dashboard still
+subscribes without ``delta`` and gets whole snapshots. :func:`apply_patch` is
+the decoder the tests check the wire format against, and the one a client
+must match once it opts in.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Channel prefixes whose subscribers may negotiate delta frames. Streams of
+# events (trades, candles) are not snapshots and have nothing to diff against.
+DELTA_CHANNEL_PREFIXES = frozenset({"portfolio", "bots", "bots_ws", "executors"})
+
+# Row identity fields, in preference order. The first one that every row on
+# both sides carries as a string, uniquely, addresses the list.
+_ROW_KEYS = ("id", "controller_id", "bot_name", "token")
+
+
+def supports_delta(channel: str) -> bool:
+    """True if subscribers of ``channel`` may negotiate delta frames."""
+    return channel.split(":", 1)[0] in DELTA_CHANNEL_PREFIXES
+
+
+def make_patch(prev: Any, curr: Any) -> dict | None:
+    """Patch turning ``prev`` into ``curr``, or ``None`` if only a keyframe can.
+
+    ``None`` means the two snapshots share no structure worth diffing (a type
+    change at the root, or a scalar payload); the caller sends a keyframe.
+    """
+    node = _diff(prev, curr)
+    if node is None:
+        # Identical snapshots: an empty patch still advances ``seq``.
+        if isinstance(curr, dict):
+            return {"op": "dict"}
+        field = _row_key(prev, curr) if isinstance(curr, list) else None
+        return {"op": "rows", "key": field} if field is not None else None
+    if node["op"] == "replace":
+        return None
+    return node
+
+
+def apply_patch(base: Any, patch: dict) -> Any:
+    """Apply ``patch`` to ``base`` and return the result.
+
+    ``base`` is not mutated; containers are copied along the patched paths
+    only, so unchanged subtrees are shared with it.
+    """
+    op = patch["op"]
+    if op == "replace":
+        return patch["value"]
+    if op == "dict":
+        out = dict(base)
+        for k in patch.get("del", ()):
+            out.pop(k, None)
+        out.update(patch.get("set", {}))
+        for k, node in patch.get("sub", {}).items():
+            out[k] = apply_patch(out[k], node)
+        return out
+    if op == "rows":
+        field = patch["key"]
+        removed = set(patch.get("del", ()))
+        sub = patch.get("sub", {})
+        rows: dict[str, Any] = {}
+        for row in base:
+            rid = row[field]
+            if rid in removed:
+                continue
+            rows[rid] = apply_patch(row, sub[rid]) if rid in sub else row
+        for row in patch.get("add", ()):
+            rows[row[field]] = row
+        order = patch.get("order")
+        if order is None:
+            return list(rows.values())
+        return [rows[rid] for rid in order]
+    raise ValueError(f"Unknown patch op: {op!r}")
+
+
+# -- Diffing --
+
+
+def _diff(prev: Any, curr: Any) -> dict | None:
+    """Patch node for ``prev -> curr``, or ``None`` when they are equal."""
+    if prev is curr:
+        return None
+    if isinstance(prev, dict) and isinstance(curr, dict):
+        return _diff_dict(prev, curr)
+    if isinstance(prev, list) and isinstance(curr, list):
+        field = _row_key(prev, curr)
+        if field is not None:
+            return _diff_rows(prev, curr, field)
+    if type(prev) is type(curr) and prev == curr:
+        return None
+    return {"op": "replace", "value": curr}
+
+
+def _diff_dict(prev: dict, curr: dict) -> dict | None:
+    set_: dict[str, Any] = {}
+    sub: dict[str, dict] = {}
+    deleted = [k for k in prev if k not in curr]
+    for k, v in curr.items():
+        if k not in prev:
+            set_[k] = v
+            continue
+        node = _diff(prev[k], v)
+        if node is None:
+            continue
+        if node["op"] == "replace":
+            set_[k] = v
+        else:
+            sub[k] = node
+    if not (set_ or sub or deleted):
+        return None
+    node: dict[str, Any] = {"op": "dict"}
+    if set_:
+        node["set"] = set_
+    if deleted:
+        node["del"] = deleted
+    if sub:
+        node["sub"] = sub
+    return node
+
+
+def _diff_rows(prev: list[dict], curr: list[dict], field: str) -> dict | None:
+    prev_by_id = {row[field]: row for row in prev}
+    curr_ids = [row[field] for row in curr]
+    curr_id_set = set(curr_ids)
+
+    deleted = [rid for rid in prev_by_id if rid not in curr_id_set]
+    added: list[dict] = []
+    sub: dict[str, dict] = {}
+    for row in curr:
+        rid = row[field]
+        old = prev_by_id.get(rid)
+        if old is None:
+            added.append(row)
+            continue
+        node = _diff(old, row)
+        if node is not None:
+            sub[rid] = node
+
+    # Order the decoder produces without help: survivors in place, then adds.
+    natural = [rid for rid in prev_by_id if rid in curr_id_set]
+    natural.extend(row[field] for row in added)
+    reordered = natural != curr_ids
+
+    if not (added or deleted or sub or reordered):
+        return None
+    node: dict[str, Any] = {"op": "rows", "key": field}
+    if added:
+        node["add"] = added
+    if deleted:
+        node["del"] = deleted
+    if sub:
+        node["sub"] = sub
+    if reordered:
+        node["order"] = curr_ids
+    return node
+
+
+def _row_key(prev: list, curr: list) -> str | None:
+    """Identity field shared by every row of both lists, or ``None``."""
+    if not prev or not curr:
+        return None
+    if not all(isinstance(r, dict) for r in prev) or not all(
+        isinstance(r, dict) for r in curr
+    ):
+        return None
+    for field in _ROW_KEYS:
+        if _is_unique_str_key(prev, field) and _is_unique_str_key(curr, field):
+            return field
+    return None
+
+
+def _is_unique_str_key(rows: list[dict], field: str) -> bool:
+    seen: set[str] = set()
+    for row in rows:
+        rid = row.get(field)
+        if not isinstance(rid, str) or rid in seen:
+            return False
+        seen.add(rid)
+    return True
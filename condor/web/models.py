@@ -54,6 +54,10 @@ class PortfolioResponse(BaseModel):
     server: str
     connectors: list[ConnectorBalance]
     total_usd: float = 0.0
+    # Seconds since the balances were fetched. Past the cache TTL the route
+    # answers with the stale snapshot (``stale``) while it refreshes.
+    age_seconds: float = 0.0
+    stale: bool = False
 
 
 class PortfolioHistoryPoint(BaseModel):
@@ -0,0 +1,189 @@
+"""Per-connection outbound queue for the dashboard WebSocket.
+
+``WebSocketManager.broadcast`` used to ``gather`` one ``send_text`` per
+subscriber, so a client with a stalled TCP window kept a coroutine (and the
+frame it held) pending on every single broadcast until its send finally raised.
+Each connection now owns an :class:`Outbox`: broadcasting only enqueues, and a
+writer task per connection drains the queue at whatever pace that client's
+socket allows.
+
+The queue is bounded, and what happens when a client falls behind depends on
+the channel:
+
+- **latest-only** (snapshot channels: portfolio, bots, executors, ...): a frame
+  replaces the one still waiting for the same channel, keeping its place in the
+  queue. A backed-up client skips straight to the newest snapshot. For a delta
+  subscriber the skipped patches cannot be chained, so the entry is marked to
+  be rebuilt as a keyframe at write time.
+- **drop** (event streams: trades, candle ticks): once the queue is full the
+  frame is dropped and counted per channel.
+
+A client that stays at capacity past ``stall_grace`` seconds, or whose single
+send takes longer than ``send_timeout``, is failed with :class:`SlowConsumer`
+so the manager can disconnect it. One phone on a bad network then costs at most
+one bounded queue, not memory and latency on every broadcast.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Frames one connection may have waiting before drop-policy frames are shed.
+OUTBOX_MAX_FRAMES = 256
+# A single send that takes longer than this means the client is not reading.
+OUTBOX_SEND_TIMEOUT = 30.0
+# How long a connection may sit at capacity before it is disconnected.
+OUTBOX_STALL_GRACE = 30.0
+
+
+class SlowConsumer(Exception):
+    """The client is not draining its outbox fast enough to stay connected."""
+
+
+class Outbox:
+    """Bounded, coalescing send queue drained by one writer task.
+
+    ``send`` writes one text frame to the socket. ``snapshot`` rebuilds the
+    current keyframe text for a channel (or ``None`` if there is none), for
+    delta entries that were coalesced. ``on_fail`` is called once, from the
+    writer or from :meth:`put`, when the outbox gives up on the client; the
+    outbox is closed by then and accepts nothing more.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        *,
+        snapshot: Callable[[str], str | None],
+        on_fail: Callable[[BaseException], None],
+        max_frames: int = OUTBOX_MAX_FRAMES,
+        send_timeout: float = OUTBOX_SEND_TIMEOUT,
+        stall_grace: float = OUTBOX_STALL_GRACE,
+    ) -> None:
+        self._send = send
+        self._snapshot = snapshot
+        self._on_fail = on_fail
+        self._max_frames = max_frames
+        self._send_timeout = send_timeout
+        self._stall_grace = stall_grace
+        # Entries are mutable ``[channel, text]`` pairs so a coalescing put can
+        # swap the text in place; ``text is None`` means "rebuild a keyframe".
+        self._entries: deque[list] = deque()
+        self._pending: dict[str, list] = {}  # channel -> its queued latest-only entry
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writer: asyncio.Task | None = None
+        self._full_since: float | None = None
+        self._closed = False
+        self.dropped: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(
+        self, channel: str, text: str, *, coalesce: bool, delta: bool = False
+    ) -> bool:
+        """Queue one frame for ``channel``. Returns ``False`` if it was shed.
+
+        ``coalesce`` selects the latest-only policy; ``delta`` says the frame is
+        a patch against the previous one, which a coalesced entry cannot keep.
+        """
+        if self._closed:
+            return False
+        if coalesce:
+            entry = self._pending.get(channel)
+            if entry is not None:
+                entry[1] = None if delta else text
+                return True
+        if len(self._entries) >= self._max_frames:
+            self._shed(channel)
+            return False
+        entry = [channel, text]
+        self._entries.append(entry)
+        if coalesce:
+            self._pending[channel] = entry
+        self._idle.clear()
+        self._wakeup.set()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run(), name="ws_outbox")
+        return True
+
+    async def wait_idle(self) -> None:
+        """Wait until every queued frame has been written (or the outbox closed)."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Stop the writer and discard whatever is still queued."""
+        self._closed = True
+        self._entries.clear()
+        self._pending.clear()
+        self._idle.set()
+        writer = self._writer
+        if writer is not None and not writer.done():
+            if writer is not asyncio.current_task():
+                writer.cancel()
+
+    # -- Internals --
+
+    def _shed(self, channel: str) -> None:
+        self.dropped[channel] += 1
+        now = time.monotonic()
+        if self._full_since is None:
+            self._full_since = now
+            logger.warning(
+                "WS outbox full (%d frames), dropping frames for %s",
+                self._max_frames,
+                channel,
+            )
+        elif now - self._full_since > self._stall_grace:
+            self._fail(
+                SlowConsumer(
+                    f"outbox full for {now - self._full_since:.0f}s, "
+                    f"{sum(self.dropped.values())} frames dropped"
+                )
+            )
+
+    def _fail(self, exc: BaseException) -> None:
+        if self._closed:
+            return
+        self.close()
+        self._on_fail(exc)
+
+    async def _run(self) -> None:
+        try:
+            while not self._closed:
+                await self._wakeup.wait()
+                while self._entries:
+                    entry = self._entries.popleft()
+                    channel, text = entry
+                    if self._pending.get(channel) is entry:
+                        del self._pending[channel]
+                    if text is None:
+                        text = self._snapshot(channel)
+                        if text is None:
+                            continue
+                    try:
+                        await asyncio.wait_for(self._send(text), self._send_timeout)
+                    except asyncio.TimeoutError:
+                        raise SlowConsumer(
+                            f"send blocked for {self._send_timeout:.0f}s"
+                        ) from None
+                    if len(self._entries) < self._max_frames // 2:
+                        self._full_since = None
+                self._wakeup.clear()
+                self._idle.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail(e)
@@ -5,6 +5,10 @@ introduced: the gate in ``routes/code.py`` is *admin or an explicit per-user
 grant*, and until now the only way to set that grant was hand-editing
 config.yml. This is where an admin sets it instead.
 
+It also serves ``/admin/gecko``, the per-caller accounting of the shared
+GeckoTerminal budget kept by ``condor.gecko_stats``, and ``/admin/charts``, the
+queue and counters of the chart workers in ``condor.chart_render``.
+
 Every route here is admin-only, checked server-side by ``_require_admin``. The
 dashboard hides the panel from non-admins, but that is cosmetic — hiding a
 control is not a gate, so each handler asks again and answers 403 whatever the
@@ -26,7 +30,7 @@ log = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-def _require_admin(user: WebUser) -> None:
+def _require_admin(user: WebUser, what: str = "administer users") -> None:
     """Refuse anyone who is not a Condor admin.
 
     Mirrors the shape of the telemetry gate in ``routes/settings.py``: the role
@@ -36,7 +40,7 @@ def _require_admin(user: WebUser) -> None:
     if not get_config_manager().is_admin(user.id):
         raise HTTPException(
             status_code=403,
-            detail="Only an admin can administer users",
+            detail=f"Only an admin can {what}",
         )
 
 
@@ -117,3 +121,27 @@ async def set_code_run_grant(
             user_id,
         )
     return {"user_id": user_id, "code_run": cm.has_code_run_grant(user_id)}
+
+
+@router.get("/gecko")
+async def get_gecko_stats(user: WebUser = Depends(get_current_user)):
+    """Who is spending the shared GeckoTerminal budget, and how the caches hold up.
+
+    Per-caller request counts, outcomes and latency over the last hour, hit
+    rates per cache and single-flight joins, next to the budget's current state.
+    Process-local counters only: reading them sends nothing upstream.
+    """
+    _require_admin(user, "read upstream usage")
+    from condor import gecko_stats
+    from condor.pool_data import gecko_health
+
+    return {"budget": gecko_health(), **gecko_stats.gecko_stats()}
+
+
+@router.get("/charts")
+async def get_chart_stats(user: WebUser = Depends(get_current_user)):
+    """How the chart workers are keeping up: queue, failures, render time, cache."""
+    _require_admin(user, "read chart rendering")
+    from condor.chart_render import render_stats
+
+    return render_stats()
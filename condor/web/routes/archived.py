@@ -4,10 +4,12 @@ import asyncio
 import logging
 import os
 from collections import OrderedDict
-from typing import Any
+from typing import Any, Awaitable
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
+from condor.archived_trades import fetch_archived_trades
 from condor.fetchers.executors import normalize_executor_side
 from condor.web.auth import require_server_access
 from condor.web.models import (
@@ -38,6 +40,12 @@ _performance_cache: OrderedDict[tuple[str, str], ArchivedBotPerformance] = Order
 _performance_inflight: dict[tuple[str, str], "asyncio.Task[ArchivedBotPerformance]"] = (
     {}
 )
+# Callers awaiting each in-flight fetch. When the last one leaves before it
+# finishes (its client went away), nobody wants it and it is cancelled.
+_performance_waiters: dict[tuple[str, str], int] = {}
+
+# How often a request waiting on a cold fetch checks that its client is there.
+_DISCONNECT_POLL = 0.5
 
 
 def _cache_get(cache_key: tuple[str, str]) -> ArchivedBotPerformance | None:
@@ -213,7 +221,8 @@ async def _fetch_and_cache_performance(
 
     The fetch runs as a detached task and awaiters ``shield`` it, so one caller
     navigating away and cancelling their request cannot also cancel the fetch
-    the remaining callers are waiting on.
+    the remaining callers are waiting on. The last caller leaving does cancel
+    it, and with it every trade page still in flight.
     """
     cache_key = (name, db_path)
 
@@ -231,7 +240,35 @@ async def _fetch_and_cache_performance(
                 _performance_inflight.pop(_key, None)
 
         task.add_done_callback(_clear)
-    return await asyncio.shield(task)
+
+    _performance_waiters[cache_key] = _performance_waiters.get(cache_key, 0) + 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        left = _performance_waiters.pop(cache_key) - 1
+        if left:
+            _performance_waiters[cache_key] = left
+        elif not task.done():
+            task.cancel()
+
+
+async def _while_connected(request: Request, fetch: Awaitable[Any]) -> Any:
+    """Await ``fetch``, cancelling it if the client disconnects first.
+
+    Uvicorn does not cancel a handler whose client went away, so without this
+    a closed tab kept a cold archive downloading to the end.
+    """
+    task = asyncio.ensure_future(fetch)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=_DISCONNECT_POLL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
 
 
 async def _fetch_performance(
@@ -253,26 +290,13 @@ async def _fetch_performance(
     trading_pairs = summary.get("trading_pairs", [])
     exchanges = summary.get("exchanges", [])
 
-    # Fetch all trades (paginated)
-    all_trades: list[dict] = []
-    offset = 0
-    limit = 500
-    while True:
-        try:
-            resp = await client.archived_bots.get_database_trades(
-                db_path, limit=limit, offset=offset
-            )
-        except Exception:
-            break
-        if not resp:
-            break
-        trades = resp.get("trades", [])
-        if not trades:
-            break
-        all_trades.extend(trades)
-        if len(trades) < limit:
-            break
-        offset += limit
+    # Fetch all trades, several pages at a time, or from the local store
+    total_trades = summary.get("total_trades")
+    all_trades, _ = await fetch_archived_trades(
+        client,
+        db_path,
+        total=int(total_trades) if isinstance(total_trades, (int, float)) else None,
+    )
 
     # Fetch executors
     raw_executors: list[dict] = []
@@ -293,55 +317,33 @@ async def _fetch_performance(
         executors, exchanges, trading_pairs
     )
 
-    # Calculate PnL from trades
-    from condor.archived_pnl import calculate_pnl_from_trades
-
-    pnl_data = calculate_pnl_from_trades(all_trades)
+    # Calculate PnL from trades, off the loop: a long-running bot has 10^5+ rows
+    from condor.archived_pnl import compute_pnl
 
-    # Count buy/sell
-    buy_count = sum(1 for t in all_trades if t.get("trade_type", "").upper() == "BUY")
-    sell_count = len(all_trades) - buy_count
+    pnl, _ = await asyncio.to_thread(compute_pnl, all_trades)
 
-    # Convert cumulative_pnl to PnlPoint list with epoch seconds
-    raw_cumulative = pnl_data.get("cumulative_pnl", [])
-    cumulative_pnl: list[PnlPoint] = []
-    for point in raw_cumulative:
-        ts = point.get("timestamp")
-        if ts is None:
-            continue
-        if hasattr(ts, "timestamp"):
-            epoch = ts.timestamp()
-        elif isinstance(ts, (int, float)):
-            epoch = ts / 1000 if ts > 1e12 else ts
-        else:
-            continue
-        cumulative_pnl.append(PnlPoint(timestamp=epoch, pnl=point.get("pnl", 0)))
-
-    # Downsample if >5000 points
-    if len(cumulative_pnl) > 5000:
-        step = len(cumulative_pnl) // 5000
-        cumulative_pnl = cumulative_pnl[::step]
-        if cumulative_pnl[-1] != raw_cumulative[-1]:
-            last = raw_cumulative[-1]
-            ts = last.get("timestamp")
-            if hasattr(ts, "timestamp"):
-                epoch = ts.timestamp()
-            elif isinstance(ts, (int, float)):
-                epoch = ts / 1000 if ts > 1e12 else ts
-            else:
-                epoch = 0
-            cumulative_pnl.append(PnlPoint(timestamp=epoch, pnl=last.get("pnl", 0)))
+    # Downsample if >5000 points, always keeping the last one
+    epochs, pnls = pnl.point_epoch, pnl.point_pnl
+    if len(epochs) > 5000:
+        keep = np.arange(0, len(epochs), len(epochs) // 5000)
+        if keep[-1] != len(epochs) - 1:
+            keep = np.append(keep, len(epochs) - 1)
+        epochs, pnls = epochs[keep], pnls[keep]
+    cumulative_pnl = [
+        PnlPoint(timestamp=epoch, pnl=value)
+        for epoch, value in zip(epochs.tolist(), pnls.tolist())
+    ]
 
     result = ArchivedBotPerformance(
         bot_name=bot_name,
         db_path=db_path,
-        total_pnl=pnl_data.get("total_pnl", 0),
-        total_fees=pnl_data.get("total_fees", 0),
-        total_volume=pnl_data.get("total_volume", 0),
+        total_pnl=pnl.total_pnl,
+        total_fees=pnl.total_fees,
+        total_volume=pnl.total_volume,
         trade_count=len(all_trades),
-        buy_count=buy_count,
-        sell_count=sell_count,
-        pnl_by_pair=pnl_data.get("pnl_by_pair", {}),
+        buy_count=pnl.buy_count,
+        sell_count=pnl.sell_count,
+        pnl_by_pair=pnl.pnl_by_pair,
         cumulative_pnl=cumulative_pnl,
         trading_pairs=trading_pairs,
         exchanges=exchanges,
@@ -398,6 +400,7 @@ async def list_archived_bots(name: str, user: WebUser = Depends(require_server_a
     "/servers/{name}/archived/performance", response_model=ArchivedBotPerformance
 )
 async def get_archived_performance(
+    request: Request,
     name: str,
     db_path: str = Query(..., description="Database path"),
     include_executors: bool = Query(
@@ -409,7 +412,9 @@ async def get_archived_performance(
 
     client = await cm.get_client(name)
 
-    perf = await _fetch_and_cache_performance(client, name, db_path)
+    perf = await _while_connected(
+        request, _fetch_and_cache_performance(client, name, db_path)
+    )
 
     if not include_executors:
         # Return without executors for fast initial load
@@ -420,6 +425,7 @@ async def get_archived_performance(
 
 @router.get("/servers/{name}/archived/executors", response_model=PaginatedExecutors)
 async def get_archived_executors(
+    request: Request,
     name: str,
     db_path: str = Query(..., description="Database path"),
     offset: int = Query(0, ge=0),
@@ -435,7 +441,9 @@ async def get_archived_executors(
     perf = _cache_get(cache_key)
     if perf is None:
         client = await cm.get_client(name)
-        perf = await _fetch_and_cache_performance(client, name, db_path)
+        perf = await _while_connected(
+            request, _fetch_and_cache_performance(client, name, db_path)
+        )
 
     executors = perf.executors
     page = executors[offset : offset + limit]
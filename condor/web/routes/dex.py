@@ -25,7 +25,15 @@ from config_manager import get_config_manager
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["dex"])
+
+async def _charge_pool_browser() -> None:
+    """Charge this request's GeckoTerminal calls to the pool browser."""
+    from condor import gecko_stats
+
+    gecko_stats.charge_task_to("pool_browser")
+
+
+router = APIRouter(tags=["dex"], dependencies=[Depends(_charge_pool_browser)])
 
 # A token or pool address: an EVM 0x-address or a base58 Solana pubkey. Both reach
 # GeckoTerminal as a URL path segment, so they are validated before they get there
@@ -78,7 +86,8 @@ async def list_pools(
         description="source=gecko: the chain, as a Gateway network or gecko id",
     ),
     view: str = Query(
-        default="trending", description="source=gecko: trending | top | new | token"
+        default="trending",
+        description="source=gecko: trending | top | new | token | search",
     ),
     connector: str = Query(
         default="meteora", description="source=gateway: meteora | orca | raydium | ..."
@@ -86,6 +95,7 @@ async def list_pools(
     query: str | None = Query(
         default=None,
         description="source=gecko+view=token: the token address. "
+        "source=gecko+view=search: a symbol, name, mint or pool address. "
         "source=gateway: free text matched against pool names.",
     ),
     dexes: str | None = Query(
@@ -93,6 +103,12 @@ async def list_pools(
         description="source=gecko: comma-separated GeckoTerminal dex ids to keep "
         "(meteora,orca,raydium-clmm). Empty means every venue.",
     ),
+    sort: str | None = Query(
+        default=None,
+        description="source=gecko+view=search: volume_24h (default) | reserve_usd "
+        "| price_change_24h | apr | fdv_usd, highest first. source=orca|gateway "
+        "with no query: reserve_usd | volume_24h | apr; empty is the venue's order.",
+    ),
     limit: int = Query(default=20, ge=1, le=100),
     page: int = Query(default=1, ge=1, description="1-based page of `limit` rows"),
     user: WebUser = Depends(require_server_access),
@@ -111,6 +127,11 @@ async def list_pools(
     ``has_more`` — not a total — is what the browser's Next needs. Orca answers it
     exactly, having the whole ranked set in hand; Gateway and gecko report no total,
     so there a full page is the only evidence of another.
+
+    ``view=search`` reads the chain's local pool index (``condor.pool_index``),
+    which merges all three; it goes upstream only for an address it cannot answer.
+    An unsearched Orca or Gateway listing is a slice of its precomputed snapshot
+    (``condor.pool_snapshots``), which is also what makes it sortable.
     """
     cm = get_config_manager()
 
@@ -119,15 +140,22 @@ async def list_pools(
         list_gecko_pools_page,
         list_orca_pools,
     )
+    from condor.pool_snapshots import SNAPSHOT_SORTS, venue_page
 
     source = (source or "gecko").strip().lower()
+    query = (query or "").strip() or None
+    if source in ("orca", "gateway") and sort and sort not in SNAPSHOT_SORTS:
+        raise HTTPException(status_code=400, detail="Unknown sort")
 
     if source == "orca":
         # Orca's own API, not Gateway's proxy of it: same pools, but with the
         # volume, fees, price and yield the proxy nulls, and with pagination that
         # is not stuck on page one. Gateway stays the fallback for when Orca is
         # rate-limiting — a degraded row beats an empty table.
-        paged = await list_orca_pools(search=query, limit=limit, page=page)
+        if query:
+            paged = await list_orca_pools(search=query, limit=limit, page=page)
+        else:
+            paged = await venue_page("orca", sort=sort, limit=limit, page=page)
         if paged is not None:
             pools, has_more = paged
             return {
@@ -145,6 +173,23 @@ async def list_pools(
         except Exception as e:
             logger.warning("Gateway pools unavailable for %s: %s", name, e)
             return {"pools": [], "source": source, "page": page, "has_more": False}
+        if not query:
+            paged = await venue_page(
+                "gateway",
+                sort=sort,
+                limit=limit,
+                page=page,
+                connector=connector,
+                client=client,
+            )
+            if paged is not None:
+                pools, has_more = paged
+                return {
+                    "pools": pools,
+                    "source": source,
+                    "page": page,
+                    "has_more": has_more,
+                }
         pools = await list_gateway_pools(
             client, connector, search=query, limit=limit, page=page
         )
@@ -164,15 +209,48 @@ async def list_pools(
     # A ticker would be pasted straight into a GeckoTerminal path segment.
     if view == "token" and not _ADDRESS_RE.match(token):
         raise HTTPException(status_code=400, detail="Invalid token address")
+    wanted = [d for d in (dexes or "").split(",") if d.strip()]
 
     before = _throttle_counter()
+    if view in ("search", "token"):
+        from condor.pool_index import INDEX_SORTS, search_pools
+
+        sort = sort or "volume_24h"
+        if sort not in INDEX_SORTS:
+            raise HTTPException(status_code=400, detail="Unknown sort")
+        try:
+            # For the Gateway listings the index merges in; it builds without them.
+            client = await cm.get_client(name)
+        except Exception:
+            client = None
+        # The token view stays a token's pools: the browser resolves a pasted
+        # *pool* address with its own lookup alongside this one.
+        result = await search_pools(
+            network,
+            token,
+            dexes=wanted,
+            sort=sort,
+            limit=limit,
+            page=page,
+            client=client,
+            token_only=view == "token",
+        )
+        return {
+            "pools": result["pools"],
+            "source": source,
+            "page": page,
+            "has_more": result["has_more"],
+            "indexed": result["indexed"],
+            "upstream": _upstream_state(_throttle_counter() > before),
+        }
+
     result = await list_gecko_pools_page(
         network,
         view=view,
         token=token,
         limit=limit,
         page=page,
-        dexes=[d for d in (dexes or "").split(",") if d.strip()],
+        dexes=wanted,
     )
     return {
         "pools": result["pools"],
@@ -282,7 +360,9 @@ def _upstream_state(throttled_request: bool = False) -> dict:
     ``throttled_request`` is the stronger signal of the two and belongs to the
     call being answered: the budget can be spent without the breaker being open,
     in which case ``rate_limited`` is False while the rows are still missing.
+    ``top_callers`` says who spent the last hour of it.
     """
+    from condor.gecko_stats import top_callers
     from condor.pool_data import gecko_health
 
     health = gecko_health()
@@ -298,6 +378,7 @@ def _upstream_state(throttled_request: bool = False) -> dict:
         "seconds_since_429": (
             round(float(last_429), 1) if last_429 is not None else None
         ),
+        "top_callers": top_callers(),
     }
 
 
@@ -568,6 +649,12 @@ async def get_pool_bins(
         description="The pool's Gateway CLMM connector, or the GeckoTerminal "
         "dex_id it is derived from (meteora-dlmm → meteora).",
     ),
+    since: str | None = Query(
+        default=None,
+        description="The fingerprint of the bins the caller already holds. When it "
+        "is the current read or the one before it, only the bins that changed "
+        "since are returned.",
+    ),
     user: WebUser = Depends(require_server_access),
 ):
     """The pool's liquidity bins, for the depth column beside its chart.
@@ -579,8 +666,13 @@ async def get_pool_bins(
     draw its bins, and the two must not be read as proxies for each other.
 
     The ``get_pool_info`` → ``get_pools`` fallback for pools outside Gateway's
-    DLMM list stays where it already is, in ``fetch_liquidity_bins``; this
+    DLMM list stays in ``pool_data``, behind ``fetch_bin_snapshot``; this
     handler injects a client and shapes the answer.
+
+    Every answer carries the read's ``fingerprint``. A poller that sends it back
+    as ``since`` gets ``delta: true`` and only the bins that moved since then,
+    with ``removed`` listing the prices of bins that are gone — nothing at all
+    when the pool has not changed.
     """
     cm = get_config_manager()
 
@@ -589,7 +681,7 @@ async def get_pool_bins(
 
     from condor.pool_data import (
         can_fetch_liquidity,
-        fetch_liquidity_bins,
+        fetch_bin_snapshot,
         get_connector_for_dex,
     )
 
@@ -615,32 +707,33 @@ async def get_pool_bins(
         return _no_bins("The API server is not reachable, so bins cannot be read.")
 
     try:
-        bins, pool_info, error = await fetch_liquidity_bins(
+        snapshot, error = await fetch_bin_snapshot(
             pool_address=pool_address,
             connector=resolved,
             network=network,
             client=client,
         )
-    except Exception as e:  # fetch_liquidity_bins already swallows its own
+    except Exception as e:  # fetch_bin_snapshot already swallows its own
         logger.warning("Liquidity bins failed for %s: %s", pool_address[:12], e)
         return _no_bins("Liquidity bins could not be read from Gateway.")
 
-    if error or not bins:
+    if error or snapshot is None or not len(snapshot):
         return _no_bins(error or "Gateway reports no liquidity bins for this pool.")
 
-    pool_info = pool_info or {}
+    pool_info = snapshot.info
     base_usd = _as_float(pool_info.get("base_token_price_usd"))
     quote_usd = _as_float(pool_info.get("quote_token_price_usd"))
 
+    changed, removed = None, []
+    if since and since == snapshot.fingerprint:
+        changed = []
+    elif since and since == snapshot.parent and snapshot.changed is not None:
+        changed, removed = snapshot.changed, snapshot.removed.tolist()
+
     rows = []
-    for raw in bins:
-        if not isinstance(raw, dict):
-            continue
-        price = _as_float(raw.get("price"))
-        if price is None:
-            continue
-        base_amount = _as_float(raw.get("base_token_amount")) or 0.0
-        quote_amount = _as_float(raw.get("quote_token_amount")) or 0.0
+    for raw in snapshot.bins(changed):
+        base_amount = raw["base_token_amount"]
+        quote_amount = raw["quote_token_amount"]
         # Only when both sides can be priced: a half-priced bin would size its
         # bar against a different unit than its neighbours.
         liquidity_usd = (
@@ -650,16 +743,13 @@ async def get_pool_bins(
         )
         rows.append(
             {
-                "price": price,
+                "price": raw["price"],
                 "base_amount": base_amount,
                 "quote_amount": quote_amount,
                 "liquidity_usd": liquidity_usd,
             }
         )
 
-    if not rows:
-        return _no_bins("Gateway reports no liquidity bins for this pool.")
-
     active_price = _as_float(pool_info.get("price"))
     if active_price is None:
         active_price = _as_float(pool_info.get("current_price"))
@@ -675,4 +765,7 @@ async def get_pool_bins(
         "bin_step": bin_step,
         "available": True,
         "reason": None,
+        "fingerprint": snapshot.fingerprint,
+        "delta": changed is not None,
+        "removed": removed,
     }
@@ -6,7 +6,7 @@ import time
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from condor import dex_candles
+from condor import candle_store, dex_candles
 from config_manager import get_config_manager
 
 logger = logging.getLogger(__name__)
@@ -56,6 +56,7 @@ from condor.web.models import (
     WebUser,
 )
 from condor.web.routes._errors import upstream_error
+from condor.web.streams.candles import _INTERVAL_SECONDS
 
 router = APIRouter(tags=["market"])
 
@@ -76,9 +77,12 @@ async def _fetch_dex_candles(
     end_time: float | None,
 ) -> list[CandleData]:
     """GeckoTerminal candles for a DEX/LP/XRPL pair, as the response model."""
-    rows = await dex_candles.fetch_dex_candles(
-        connector, pool_address, trading_pair, interval, start_time, end_time
-    )
+    from condor.pool_data import gecko_caller
+
+    with gecko_caller("candles"):
+        rows = await dex_candles.fetch_dex_candles(
+            connector, pool_address, trading_pair, interval, start_time, end_time
+        )
     return [CandleData(**row) for row in rows]
 
 
@@ -173,10 +177,11 @@ async def get_dex_pool(
     to handle.
     """
 
-    from condor.pool_data import lp_provider_for_dex, resolve_pool_info
+    from condor.pool_data import gecko_caller, lp_provider_for_dex, resolve_pool_info
 
     try:
-        info = await resolve_pool_info(connector, trading_pair)
+        with gecko_caller("lp_panel"):
+            info = await resolve_pool_info(connector, trading_pair)
     except Exception as e:
         logger.warning(
             "Pool resolution failed connector=%s pair=%s: %s",
@@ -434,18 +439,36 @@ async def _fetch_candles_upstream(
         )
 
     client = await cm.get_client(name)
+    rows: list[dict] = []
+    if start_time is not None:
+        # A time range is served from the local store, which only asks the
+        # API for what it has not fetched before.
+        try:
+            rows = await candle_store.historical_candles(
+                client,
+                connector,
+                trading_pair,
+                interval,
+                _INTERVAL_SECONDS.get(interval, 60),
+                start_time,
+                end_time if end_time else time.time(),
+            )
+        except Exception as e:
+            logger.warning(
+                "get_historical_candles failed: %s — falling back to get_candles", e
+            )
+        if rows:
+            return [CandleData(**row) for row in rows]
     try:
+        # The range came back empty (or there was none to ask for): the plain
+        # `limit`-sized window.
         rows = await fetch_historical_candles(
             client,
             connector,
             trading_pair,
             interval,
-            # No start_time means no time range to ask for: go straight to the
-            # plain `limit`-sized window.
-            start_time=int(start_time) if start_time is not None else None,
-            end_time=int(end_time) if end_time else int(time.time()),
+            start_time=None,
             limit=limit,
-            fallback_on_error=True,
             # CORR-168: one malformed row costs one candle, not the whole
             # chart. The fetcher logs what it dropped at warning, so a payload
             # bug is still diagnosable without 500ing every request for the
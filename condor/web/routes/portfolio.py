@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Any
 
@@ -33,6 +34,7 @@ async def get_portfolio(
 
     from condor.server_data_service import ServerDataType, get_server_data_service
 
+    fetched_at = time.time()
     try:
         if refresh:
             # Bypass SDS cache — force exchange re-fetch via Hummingbot
@@ -43,9 +45,14 @@ async def get_portfolio(
             # Update SDS cache so subsequent non-refresh reads get fresh data
             get_server_data_service().put(name, ServerDataType.PORTFOLIO, state)
         else:
-            state = await get_server_data_service().get_or_fetch(
+            # A degraded server must not hold the page hostage: within the
+            # stale-while-revalidate window this answers from cache at once.
+            entry = await get_server_data_service().get_or_fetch_entry(
                 name, ServerDataType.PORTFOLIO
             )
+            state = entry.value if entry else None
+            if entry is not None:
+                fetched_at = entry.fetched_at
     except Exception as e:
         logger.warning("Portfolio fetch exception for %s: %s", name, e)
         raise HTTPException(status_code=502, detail=f"Failed to get portfolio: {e}")
@@ -126,7 +133,14 @@ async def get_portfolio(
 
     _dedupe_hyperliquid_unified(connectors)
     total_usd = sum(c.total_usd for c in connectors)
-    return PortfolioResponse(server=name, connectors=connectors, total_usd=total_usd)
+    age = max(0.0, time.time() - fetched_at)
+    return PortfolioResponse(
+        server=name,
+        connectors=connectors,
+        total_usd=total_usd,
+        age_seconds=round(age, 1),
+        stale=age > get_server_data_service().ttl_for(ServerDataType.PORTFOLIO),
+    )
 
 
 # Hyperliquid stable/quote symbols (perp margin reports "USD", spot holds "USDC").
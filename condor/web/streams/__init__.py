@@ -33,7 +33,9 @@ class StreamHost(Protocol):
     _last_data: dict[str, Any]
     _oneshot_tasks: TaskSet
 
-    async def broadcast(self, channel: str, data: Any) -> None: ...
+    async def broadcast(
+        self, channel: str, data: Any, *, columnar: Any = None
+    ) -> None: ...
 
     async def _broadcast_update(self, channel: str, data: Any) -> None: ...
 
@@ -20,9 +20,11 @@ import json
 import logging
 import math
 import time
+from array import array
+from bisect import bisect_left
 from typing import TYPE_CHECKING, Any
 
-from condor import dex_candles
+from condor import candle_store, dex_candles
 from condor.asyncutil import TaskSet
 from condor.fetchers.market_data import fetch_historical_candles, normalize_candle
 
@@ -93,14 +95,38 @@ def parse_candle_channel(channel: str) -> tuple[str, str, str, str, str | None]
     return server_name, connector, pair, interval, pool_address or None
 
 
+# Candle dict keys, in the column order of the columnar wire format.
+_CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Batches larger than this are merged with one sort-and-rebuild instead of
+# one ordered insert per candle (a backfill landing behind a live buffer).
+_CANDLE_MERGE_THRESHOLD = 32
+
+
 class _CandleBuffer:
-    """Per-channel candle buffer with dynamic sizing based on interval + duration."""
+    """Per-channel candle buffer with dynamic sizing based on interval + duration.
+
+    A ring in ascending timestamp order: ``_ts`` (an ``array('d')``) holds the
+    timestamps and ``_rows`` the candle dicts at the same indices, with
+    ``_start`` marking the oldest live row. The hot path — the live candle
+    updating in place, or the next candle opening — touches only the tail;
+    eviction only advances ``_start`` (the dead prefix is compacted once it
+    outgrows the live rows); snapshots are a slice, never a sort. Out-of-order
+    candles fall back to a bisected insert, or one merge for a large batch.
+
+    Rows are ordered by timestamp rather than keyed by interval slot:
+    GeckoTerminal omits empty candles and calendar intervals (``1M``) are not
+    fixed-width, so the buffer keeps the newest ``max_size`` candles, as it
+    always has.
+    """
 
-    __slots__ = ("interval", "_data", "_max_size", "last_accessed")
+    __slots__ = ("interval", "_ts", "_rows", "_start", "_max_size", "last_accessed")
 
     def __init__(self, interval: str, duration_seconds: int = 3600):
         self.interval = interval
-        self._data: dict[float, dict] = {}
+        self._ts = array("d")
+        self._rows: list[dict] = []
+        self._start = 0
         self._max_size: int = 200
         self.last_accessed: float = time.monotonic()
         self.set_duration(duration_seconds)
@@ -125,34 +151,76 @@ class _CandleBuffer:
         return new_max
 
     def upsert(self, candle: dict) -> None:
-        self._data[candle["timestamp"]] = candle
+        self._upsert_one(candle)
         self._evict()
 
     def upsert_many(self, candles: list[dict]) -> None:
-        for c in candles:
-            self._data[c["timestamp"]] = c
+        if len(candles) > _CANDLE_MERGE_THRESHOLD:
+            self._merge(candles)
+        else:
+            for c in candles:
+                self._upsert_one(c)
         self._evict()
 
     def get_sorted(self) -> list[dict]:
         self.last_accessed = time.monotonic()
-        return sorted(self._data.values(), key=lambda c: c["timestamp"])
+        return self._rows[self._start :]
+
+    def get_columns(self) -> dict[str, list[float]]:
+        """The buffered candles as one ascending list per field.
+
+        The columnar wire format: the same data as :meth:`get_sorted` without
+        repeating six keys per candle.
+        """
+        self.last_accessed = time.monotonic()
+        rows = self._rows[self._start :]
+        return {field: [c[field] for c in rows] for field in _CANDLE_FIELDS}
 
     def get(self, timestamp: float) -> dict | None:
         """The buffered candle at ``timestamp``, or ``None``."""
-        return self._data.get(timestamp)
+        i = bisect_left(self._ts, timestamp, self._start)
+        if i < len(self._ts) and self._ts[i] == timestamp:
+            return self._rows[i]
+        return None
+
+    def _upsert_one(self, candle: dict) -> None:
+        ts = candle["timestamp"]
+        if not self.size or ts > self._ts[-1]:
+            self._ts.append(ts)
+            self._rows.append(candle)
+        elif ts == self._ts[-1]:
+            self._rows[-1] = candle  # the live candle, updated in place
+        else:
+            i = bisect_left(self._ts, ts, self._start)
+            if self._ts[i] == ts:
+                self._rows[i] = candle
+            else:
+                self._ts.insert(i, ts)
+                self._rows.insert(i, candle)
+
+    def _merge(self, candles: list[dict]) -> None:
+        merged = {c["timestamp"]: c for c in self._rows[self._start :]}
+        for c in candles:
+            merged[c["timestamp"]] = c
+        keep = sorted(merged)[-self._max_size :]
+        self._ts = array("d", keep)
+        self._rows = [merged[ts] for ts in keep]
+        self._start = 0
 
     def _evict(self) -> None:
-        excess = len(self._data) - self._max_size
-        if excess <= 0:
-            return
-        # Drop the `excess` oldest timestamps in a single O(n log n) pass
-        # instead of calling min() (O(n)) per evicted candle.
-        for ts in sorted(self._data)[:excess]:
-            del self._data[ts]
+        excess = self.size - self._max_size
+        if excess > 0:
+            self._start += excess
+        # Compact the dead prefix once it outgrows the live rows, so eviction
+        # stays amortized O(1) and memory within 2x of max_size.
+        if self._start and self._start >= self.size:
+            del self._ts[: self._start]
+            del self._rows[: self._start]
+            self._start = 0
 
     @property
     def size(self) -> int:
-        return len(self._data)
+        return len(self._rows) - self._start
 
     @property
     def max_size(self) -> int:
@@ -161,12 +229,12 @@ class _CandleBuffer:
     @property
     def latest_timestamp(self) -> float:
         """Timestamp of the newest buffered candle, or 0 when empty."""
-        return max(self._data) if self._data else 0
+        return self._rows[-1]["timestamp"] if self.size else 0
 
     @property
     def needs_backfill(self) -> bool:
         """True if buffer has room for significantly more candles."""
-        return len(self._data) < self._max_size * 0.5
+        return self.size < self._max_size * 0.5
 
 
 class CandleStreamsMixin:
@@ -183,12 +251,13 @@ class CandleStreamsMixin:
         _candle_teardown_timers: dict[str, asyncio.TimerHandle]
         _last_candle_ws_update: dict[str, float]
         _candle_first_msg_logged: set[str]
-        _connections: list[Any]
         # Host surface (see condor.web.streams.StreamHost).
         _last_data: dict[str, Any]
         _oneshot_tasks: TaskSet
 
-        async def broadcast(self, channel: str, data: Any) -> None: ...
+        async def broadcast(
+            self, channel: str, data: Any, *, columnar: Any = None
+        ) -> None: ...
 
         async def _send(self, conn: Any, channel: str, data: Any) -> None: ...
 
@@ -241,9 +310,12 @@ class CandleStreamsMixin:
                     )
 
         # Send buffered candles as initial snapshot
-        sorted_candles = buf.get_sorted()
-        if sorted_candles:
-            await self._send(conn, channel, {"type": "candles", "data": sorted_candles})
+        if buf.size:
+            if channel in conn.columnar_channels:
+                snapshot = {"type": "candles_columnar", "data": buf.get_columns()}
+            else:
+                snapshot = {"type": "candles", "data": buf.get_sorted()}
+            await self._send(conn, channel, snapshot)
 
         # If the stream task is still running (kept alive during grace period), skip restart
         self._ensure_stream("candles", channel)
@@ -269,9 +341,12 @@ class CandleStreamsMixin:
         if buf.needs_backfill:
             await self._backfill_candles(channel)
         # Broadcast updated snapshot to ALL subscribers on this channel
-        sorted_candles = buf.get_sorted()
-        if sorted_candles:
-            await self.broadcast(channel, {"type": "candles", "data": sorted_candles})
+        if buf.size:
+            await self.broadcast(
+                channel,
+                {"type": "candles", "data": buf.get_sorted()},
+                columnar={"type": "candles_columnar", "data": buf.get_columns()},
+            )
 
     async def _backfill_candles(self, channel: str) -> None:
         """Fetch historical candles to fill the buffer gap."""
@@ -301,9 +376,12 @@ class CandleStreamsMixin:
             )
 
             if dex_candles.uses_gecko_candles(connector):
-                candles = await dex_candles.fetch_dex_candles(
-                    connector, pool_address, pair, interval, start_time, end_time
-                )
+                from condor.pool_data import gecko_caller
+
+                with gecko_caller("candles"):
+                    candles = await dex_candles.fetch_dex_candles(
+                        connector, pool_address, pair, interval, start_time, end_time
+                    )
                 if candles:
                     buf.upsert_many(candles)
                     logger.info(
@@ -316,15 +394,15 @@ class CandleStreamsMixin:
                 return
 
             client = await cm.get_client(server_name)
-            candles = await fetch_historical_candles(
-                client,
-                connector,
-                pair,
-                interval,
-                start_time=start_time,
-                end_time=end_time,
-                limit=min(buf.max_size, 5000),
+            # Closed candles come off the local store; only the gaps (after a
+            # restart, usually just the stretch since shutdown) go upstream.
+            candles = await candle_store.historical_candles(
+                client, connector, pair, interval, interval_sec, start_time, end_time
             )
+            if not candles:
+                candles = await fetch_historical_candles(
+                    client, connector, pair, interval, limit=min(buf.max_size, 5000)
+                )
             if candles:
                 buf.upsert_many(candles)
                 logger.info(
@@ -612,17 +690,29 @@ class CandleStreamsMixin:
                 try:
                     now = int(time.time())
                     if gecko:
-                        candles = await dex_candles.fetch_dex_candles(
-                            connector,
-                            pool_address,
-                            pair,
-                            interval,
-                            now - interval_sec * 5,
-                            now,
-                            # The shared OHLCV cache holds a pool for minutes,
-                            # long enough to freeze a live chart.
-                            use_cache=False,
+                        from condor.pool_data import (
+                            GeckoPriority,
+                            gecko_caller,
+                            gecko_priority,
                         )
+
+                        # Someone is watching this chart: its tail goes ahead
+                        # of scanners and prefetches on the shared budget.
+                        with (
+                            gecko_priority(GeckoPriority.LIVE),
+                            gecko_caller("candles"),
+                        ):
+                            candles = await dex_candles.fetch_dex_candles(
+                                connector,
+                                pool_address,
+                                pair,
+                                interval,
+                                now - interval_sec * 5,
+                                now,
+                                # The shared OHLCV cache holds a pool for minutes,
+                                # long enough to freeze a live chart.
+                                use_cache=False,
+                            )
                     else:
                         cm = get_config_manager()
                         client = await cm.get_client(server_name)
@@ -706,7 +796,7 @@ class CandleStreamsMixin:
                     ch
                     for ch, buf in self._candle_buffers.items()
                     if (now - buf.last_accessed) > _CANDLE_BUFFER_IDLE_TTL
-                    and not any(ch in c.channels for c in self._connections)
+                    and not self._has_subscribers(ch)
                 ]
                 for ch in stale:
                     buf = self._candle_buffers.pop(ch, None)
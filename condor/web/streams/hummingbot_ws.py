@@ -361,6 +361,9 @@ class HummingbotStreamsMixin:
                     page_size=NEXT_PAGE,
                     first_page_size=FIRST_PAGE,
                     max_items=MAX_PREFETCH,
+                    # The next page loads while this one is transformed and
+                    # broadcast.
+                    read_ahead=1,
                 ):
                     all_raw.extend(page)
                     transformed.extend(self._transform_executors(page))
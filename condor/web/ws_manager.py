@@ -5,7 +5,9 @@ The upstream stream implementations live in ``condor.web.streams`` (candles in
 ``streams.hummingbot_ws``) as mixins over the small host surface this module
 implements — see ``condor.web.streams.StreamHost``. ``WebSocketManager`` keeps
 only connection/subscription bookkeeping, the SDS bridge, broadcasting and the
-stream lifecycle registry.
+stream lifecycle registry. The opt-in delta wire protocol for the snapshot
+channels (keyframes, patches, ``seq`` and resync) is encoded by
+``condor.web.delta``.
 """
 
 from __future__ import annotations
@@ -23,6 +25,8 @@ from fastapi import WebSocket
 from condor import dex_candles  # noqa: F401
 from condor.asyncutil import TaskSet
 from condor.web.auth import decode_jwt
+from condor.web.delta import make_patch, supports_delta
+from condor.web.outbox import Outbox, SlowConsumer
 from condor.web.streams.candles import (  # noqa: F401
     CandleStreamsMixin,
     _CandleBuffer,
@@ -31,6 +35,11 @@ from condor.web.streams.candles import (  # noqa: F401
 )
 from condor.web.streams.hummingbot_ws import HummingbotStreamsMixin
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 if TYPE_CHECKING:
     from condor.server_data_service import CacheKey
 
@@ -51,6 +60,24 @@ _SDT_TO_CHANNEL_PREFIX = {
     "PRICES": "prices",
 }
 
+# Channel prefixes whose frames are whole snapshots: a client that falls behind
+# only needs the newest one, so its outbox keeps just that. Every other channel
+# is an event stream (trades, candle ticks) whose frames are shed, and counted,
+# once the outbox is full.
+_LATEST_ONLY_PREFIXES = frozenset(
+    {
+        "portfolio",
+        "bots",
+        "prices",
+        "executors",
+        "bots_ws",
+        "positions_ws",
+        "performance_ws",
+        "controller_perf",
+        "orderbook",
+    }
+)
+
 # CacheKey params a data type's channel is scoped by, in channel-segment order.
 # A data type absent from this table has a server-wide channel (`{prefix}:{server}`)
 # and its key must carry no params at all — an account-scoped portfolio or any
@@ -90,13 +117,45 @@ def channel_for_key(key: CacheKey) -> str | None:
     return ":".join([prefix, key.server, *segments])
 
 
+def encode_frame(frame: dict) -> str:
+    """Serialize one outbound WS frame to the text sent on the wire.
+
+    orjson when it is installed (it is several times faster on the large
+    executor and ticker payloads), the stdlib otherwise. orjson rejects a few
+    things ``json`` accepts — integers past 64 bits, for one — so a frame it
+    cannot encode falls back rather than failing the broadcast. Both produce
+    the compact form Starlette's ``send_json`` used.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(frame, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(frame, separators=(",", ":"), ensure_ascii=False)
+
+
 class _Connection:
-    __slots__ = ("ws", "user_id", "channels")
+    __slots__ = (
+        "ws",
+        "user_id",
+        "channels",
+        "delta_channels",
+        "columnar_channels",
+        "outbox",
+    )
 
     def __init__(self, ws: WebSocket, user_id: int):
         self.ws = ws
         self.user_id = user_id
         self.channels: set[str] = set()
+        # Subset of ``channels`` this client negotiated delta frames for
+        # (see condor.web.delta).
+        self.delta_channels: set[str] = set()
+        # Candle channels this client wants snapshots for in the columnar
+        # format (see _CandleBuffer.get_columns).
+        self.columnar_channels: set[str] = set()
+        # Bounded send queue + writer task, created on the first frame.
+        self.outbox: Outbox | None = None
 
 
 class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
@@ -112,7 +171,14 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
 
     def __init__(self):
         self._connections: list[_Connection] = []
+        # Reverse index, channel -> its subscribed connections. Maintained on
+        # subscribe/unsubscribe/disconnect so the per-write lookups (every SDS
+        # cache write, every candle tick) cost O(subscribers), not a scan of
+        # every connection's channel set.
+        self._subscribers: dict[str, set[_Connection]] = {}
         self._last_data: dict[str, Any] = {}  # channel -> last broadcast payload
+        # channel -> sequence number of its last broadcast (delta channels only)
+        self._channel_seq: dict[str, int] = {}
         self._candle_tasks: dict[str, asyncio.Task] = {}
         self._candle_poll_tasks: dict[str, asyncio.Task] = {}
         self._trade_tasks: dict[str, asyncio.Task] = {}
@@ -203,6 +269,7 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
             self._cleanup_task = None
 
         self._last_data.clear()
+        self._channel_seq.clear()
 
     def _cleanup_sds_subscriptions(self) -> None:
         """Remove all SDS subscriptions."""
@@ -238,9 +305,15 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
         return conn
 
     def disconnect(self, conn: _Connection) -> None:
+        if conn.outbox is not None:
+            conn.outbox.close()
         if conn in self._connections:
             self._connections.remove(conn)
             logger.info("WS disconnected: user %s", conn.user_id)
+            # Unindex every channel first: the stop checks below must already
+            # see this connection gone from all of them.
+            for channel in conn.channels:
+                self._unindex(conn, channel)
             for channel in list(conn.channels):
                 prefix = channel.split(":", 1)[0]
                 if prefix in self._stream_registry():
@@ -302,26 +375,33 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
                     server_name,
                 )
                 return
-            conn.channels.add(channel)
+            self._add_subscription(conn, channel)
+            if msg.get("delta") is True and supports_delta(channel):
+                conn.delta_channels.add(channel)
+            else:
+                conn.delta_channels.discard(channel)
             logger.info("WS subscribe: user=%s channel=%s", conn.user_id, channel)
             prefix = channel.split(":", 1)[0]
             if prefix == "candles":
                 # Candles are special: snapshot comes from the candle buffer
-                # (not _last_data) and the subscribe carries a duration param.
+                # (not _last_data) and the subscribe carries a duration param
+                # and, optionally, the columnar snapshot format.
+                if msg.get("format") == "columnar":
+                    conn.columnar_channels.add(channel)
+                else:
+                    conn.columnar_channels.discard(channel)
                 duration = msg.get("duration")  # seconds, sent by frontend
                 await self._handle_candle_subscribe(conn, channel, duration)
             elif prefix in self._stream_registry():
                 # Send last known data immediately, then ensure the stream runs
-                if channel in self._last_data:
-                    await self._send(conn, channel, self._last_data[channel])
+                await self._send_snapshot(conn, channel)
                 self._ensure_stream(prefix, channel)
             else:
-                if channel in self._last_data:
-                    await self._send(conn, channel, self._last_data[channel])
+                await self._send_snapshot(conn, channel)
                 await self._subscribe_sds(channel)
 
         elif action == "unsubscribe" and channel:
-            conn.channels.discard(channel)
+            self._remove_subscription(conn, channel)
             prefix = channel.split(":", 1)[0]
             if prefix in self._stream_registry():
                 self._maybe_stop_stream(prefix, channel)
@@ -334,6 +414,11 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
             if channel.startswith("candles:") and duration:
                 await self._handle_candle_duration_change(conn, channel, duration)
 
+        elif action == "resync" and channel:
+            # A delta client saw a gap in ``seq``: re-anchor it on a keyframe.
+            if channel in conn.delta_channels:
+                await self._send_snapshot(conn, channel)
+
     # -- SDS bridge --
 
     async def _subscribe_sds(self, channel: str) -> None:
@@ -455,9 +540,13 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
 
     # -- SDS listener --
 
-    def _on_data_update(self, key: CacheKey, value: Any) -> None:
+    def _on_data_update(self, key: CacheKey, value: Any, changed: bool = True) -> None:
         """Called by SDS on every cache write. Maps the key to a WS channel and
-        broadcasts. ``key`` is an SDS ``CacheKey``: server, data type and params."""
+        broadcasts. ``key`` is an SDS ``CacheKey``: server, data type and params.
+
+        ``changed`` is SDS's fingerprint verdict against the previous write, so
+        an unchanged poll costs no payload comparison here at all.
+        """
         channel = channel_for_key(key)
         if channel is None:
             return
@@ -465,8 +554,7 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
         dt_name = key.data_type.name
         server_name = key.server
 
-        has_subscribers = any(channel in conn.channels for conn in self._connections)
-        if not has_subscribers:
+        if not self._has_subscribers(channel):
             return
 
         # Skip SDS-triggered broadcast for channels with active WS streams
@@ -485,6 +573,12 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
             except Exception as e:
                 logger.debug("Failed to transform bots data for WS: %s", e)
                 return
+            # The overlay can change while the SDS payload does not, so SDS's
+            # verdict does not cover what bots subscribers see: compare that.
+            changed = value != self._last_data.get(channel)
+
+        if not changed and channel in self._last_data:
+            return
 
         self._oneshot_tasks.track(
             asyncio.create_task(
@@ -494,46 +588,186 @@ class WebSocketManager(CandleStreamsMixin, HummingbotStreamsMixin):
         )
 
     async def _broadcast_update(self, channel: str, data: Any) -> None:
-        prev = self._last_data.get(channel)
-        if data != prev:
-            await self.broadcast(channel, data)
+        """Broadcast one SDS write that ``_on_data_update`` found changed."""
+        await self.broadcast(channel, data)
 
     # -- Broadcasting --
 
-    async def broadcast(self, channel: str, data: Any) -> None:
+    async def broadcast(self, channel: str, data: Any, *, columnar: Any = None) -> None:
+        """Fan ``data`` out to the channel's subscribers.
+
+        ``columnar``, when given, is the same payload in the columnar format and
+        goes to the connections that asked for it instead of ``data``.
+        """
+        prev = self._last_data.get(channel)
         self._last_data[channel] = data
-        subscribers = [
-            conn for conn in list(self._connections) if channel in conn.channels
-        ]
+        seq = self._advance_seq(channel)
+        # Snapshot: a failing enqueue disconnects, which mutates the index.
+        subscribers = list(self._subscribers.get(channel, ()))
         if not subscribers:
             return
-        # Fan out concurrently so a slow/backpressured client does not block the
-        # rest of the subscribers in the same broadcast tick.
-        results = await asyncio.gather(
-            *(self._send(conn, channel, data) for conn in subscribers),
-            return_exceptions=True,
+        # Every subscriber gets the same bytes, so each frame is encoded once
+        # per broadcast (and stamped once) rather than once per connection.
+        ts = time.time()
+        full_text: str | None = None
+        delta_text: str | None = None
+        columnar_text: str | None = None
+        if columnar is not None and any(
+            channel in c.columnar_channels for c in subscribers
+        ):
+            columnar_text = encode_frame(
+                {"channel": channel, "data": columnar, "ts": ts}
+            )
+        if any(channel not in c.delta_channels for c in subscribers):
+            full_text = encode_frame({"channel": channel, "data": data, "ts": ts})
+        if seq is not None and any(channel in c.delta_channels for c in subscribers):
+            # One patch shared by every delta subscriber: they all hold the
+            # previous frame (the keyframe they subscribed with, or the last
+            # delta), so none of them needs its own diff.
+            patch = make_patch(prev, data) if prev is not None else None
+            delta_text = encode_frame(
+                self._delta_frame(channel, data, seq, patch, ts=ts)
+            )
+        # Enqueue only: each connection's writer drains its own outbox, so a
+        # slow/backpressured client never holds up this tick or the others.
+        for conn in subscribers:
+            if channel in conn.delta_channels:
+                self._enqueue(conn, channel, delta_text, delta=True)
+            elif columnar_text is not None and channel in conn.columnar_channels:
+                self._enqueue(conn, channel, columnar_text)
+            else:
+                self._enqueue(conn, channel, full_text)
+
+    async def _send(self, conn: _Connection, channel: str, data: Any) -> None:
+        self._enqueue(
+            conn,
+            channel,
+            encode_frame({"channel": channel, "data": data, "ts": time.time()}),
         )
-        dead: list[_Connection] = []
-        for conn, result in zip(subscribers, results):
-            if isinstance(result, Exception):
-                logger.warning(
-                    "Broadcast send failed: channel=%s user=%s: %s",
-                    channel,
-                    conn.user_id,
-                    result,
+
+    async def _send_snapshot(self, conn: _Connection, channel: str) -> None:
+        """Send the channel's last payload to one subscriber, if there is one.
+
+        A delta subscriber gets it as a keyframe at the channel's current
+        ``seq``, which anchors the patches that follow.
+        """
+        if channel not in self._last_data:
+            return
+        if channel in conn.delta_channels:
+            self._enqueue(conn, channel, self._keyframe_text(channel))
+        else:
+            await self._send(conn, channel, self._last_data[channel])
+
+    def _keyframe_text(self, channel: str) -> str | None:
+        """Encoded keyframe of the channel's last payload at its current ``seq``."""
+        if channel not in self._last_data:
+            return None
+        frame = self._delta_frame(
+            channel,
+            self._last_data[channel],
+            self._channel_seq.get(channel, 0),
+            None,
+            ts=time.time(),
+        )
+        return encode_frame(frame)
+
+    # -- Outbound queues --
+
+    def _enqueue(
+        self, conn: _Connection, channel: str, text: str | None, *, delta: bool = False
+    ) -> None:
+        """Queue one encoded frame on the connection's outbox (see condor.web.outbox)."""
+        if text is None:
+            return
+        if conn.outbox is None:
+            conn.outbox = Outbox(
+                conn.ws.send_text,
+                snapshot=self._keyframe_text,
+                on_fail=lambda exc: self._on_send_failure(conn, exc),
+            )
+        conn.outbox.put(
+            channel,
+            text,
+            coalesce=channel.split(":", 1)[0] in _LATEST_ONLY_PREFIXES,
+            delta=delta,
+        )
+
+    def _on_send_failure(self, conn: _Connection, exc: BaseException) -> None:
+        """An outbox gave up on its client: drop the connection and close it."""
+        dropped = conn.outbox.dropped if conn.outbox is not None else {}
+        logger.warning(
+            "WS send failed: user=%s: %s (dropped frames: %s)",
+            conn.user_id,
+            exc,
+            dict(dropped) or "none",
+        )
+        self.disconnect(conn)
+        if isinstance(exc, SlowConsumer):
+            self._oneshot_tasks.track(
+                asyncio.create_task(
+                    self._close_slow_consumer(conn), name=f"ws_close:{conn.user_id}"
                 )
-                dead.append(conn)
-        for conn in dead:
-            self.disconnect(conn)
+            )
 
-    async def _send(self, conn: _Connection, channel: str, data: Any) -> None:
-        await conn.ws.send_json({"channel": channel, "data": data, "ts": time.time()})
+    @staticmethod
+    async def _close_slow_consumer(conn: _Connection) -> None:
+        # The socket is by definition not draining; don't wait on it forever.
+        try:
+            await asyncio.wait_for(
+                conn.ws.close(code=1013, reason="Slow consumer"), timeout=5
+            )
+        except Exception:
+            pass
+
+    def _advance_seq(self, channel: str) -> int | None:
+        """Bump and return the channel's broadcast ``seq`` (``None`` if the
+        channel does not speak the delta protocol)."""
+        if not supports_delta(channel):
+            return None
+        seq = self._channel_seq.get(channel, 0) + 1
+        self._channel_seq[channel] = seq
+        return seq
+
+    @staticmethod
+    def _delta_frame(
+        channel: str, data: Any, seq: int, patch: dict | None, *, ts: float
+    ) -> dict:
+        """Delta-protocol frame: the patch, or a keyframe when there is none."""
+        if patch is None:
+            return {
+                "channel": channel,
+                "data": data,
+                "seq": seq,
+                "keyframe": True,
+                "ts": ts,
+            }
+        return {"channel": channel, "delta": patch, "seq": seq, "ts": ts}
 
     # -- Generic stream lifecycle --
 
     def _has_subscribers(self, channel: str) -> bool:
         """True if any connection is currently subscribed to the channel."""
-        return any(channel in c.channels for c in self._connections)
+        return bool(self._subscribers.get(channel))
+
+    # -- Subscription index --
+
+    def _add_subscription(self, conn: _Connection, channel: str) -> None:
+        conn.channels.add(channel)
+        self._subscribers.setdefault(channel, set()).add(conn)
+
+    def _remove_subscription(self, conn: _Connection, channel: str) -> None:
+        conn.channels.discard(channel)
+        conn.delta_channels.discard(channel)
+        conn.columnar_channels.discard(channel)
+        self._unindex(conn, channel)
+
+    def _unindex(self, conn: _Connection, channel: str) -> None:
+        subs = self._subscribers.get(channel)
+        if subs is None:
+            return
+        subs.discard(conn)
+        if not subs:
+            del self._subscribers[channel]
 
     # All 8 stream types share the same start/stop lifecycle; only candle needs
     # a non-uniform stop (deferred teardown with keep-alive) supplied via
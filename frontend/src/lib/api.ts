@@ -63,6 +63,8 @@ export interface PortfolioResponse {
   server: string;
   connectors: ConnectorBalance[];
   total_usd: number;
+  age_seconds: number;
+  stale: boolean;
 }
 
 export interface PortfolioHistoryPoint {
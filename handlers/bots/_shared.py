@@ -402,7 +402,7 @@ def generate_config_id(
     return _gs_generate_id(config, existing_configs or [])
 
 
-def generate_candles_chart(
+async def generate_candles_chart(
     candles_data: List[Dict[str, Any]],
     trading_pair: str,
     start_price: Optional[float] = None,
@@ -435,4 +435,4 @@ def generate_candles_chart(
         "limit_price": limit_price,
         "side": side,
     }
-    return _gs_generate_chart(config, candles_data, current_price)
+    return await _gs_generate_chart(config, candles_data, current_price)
@@ -17,6 +17,7 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
+from condor.archived_trades import fetch_archived_trades
 from utils.telegram_formatters import (
     escape_markdown_v2,
     format_error_message,
@@ -33,6 +34,9 @@ ARCHIVED_CACHE_TTL = 300  # 5 minutes
 # Pagination settings
 BOTS_PER_PAGE = 5
 
+# Safety limit on the trades one chart or report downloads
+MAX_TRADES = 50_000
+
 # Upper bound on concurrent per-database backend calls. The archived set grows
 # by one every time a bot is stopped and is never pruned, so the fan-out is
 # bounded rather than unlimited to stay friendly to the API server.
@@ -189,40 +193,15 @@ async def fetch_database_trades(
 
 
 async def fetch_all_trades(client, db_path: str) -> List[Dict[str, Any]]:
-    """Fetch ALL trades with pagination."""
-    all_trades = []
-    offset = 0
-    limit = 500
-
-    while True:
-        response = await fetch_database_trades(
-            client, db_path, limit=limit, offset=offset
-        )
-        if not response:
-            break
-
-        trades = response.get("trades", [])
-        if not trades:
-            break
-
-        all_trades.extend(trades)
-
-        # Check pagination
-        pagination = response.get("pagination", {})
-        if not pagination.get("has_more", False):
-            break
-
-        offset += limit
-
-        # Safety limit to avoid infinite loops
-        if len(all_trades) > 50000:
-            logger.warning(
-                f"Trade limit reached for {db_path}, stopping at {len(all_trades)}"
-            )
-            break
+    """Fetch ALL trades, several pages at a time or from the local store."""
+    trades, truncated = await fetch_archived_trades(
+        client, db_path, max_trades=MAX_TRADES
+    )
+    if truncated:
+        logger.warning(f"Trade limit reached for {db_path}, stopping at {len(trades)}")
 
-    logger.debug(f"Fetched {len(all_trades)} total trades for {db_path}")
-    return all_trades
+    logger.debug(f"Fetched {len(trades)} total trades for {db_path}")
+    return trades
 
 
 async def fetch_database_orders(
@@ -586,7 +565,7 @@ async def show_archived_detail(
         )
 
         # For detail view, use first page of trades for quick PnL estimate
-        pnl_data = calculate_pnl_from_trades(trades)
+        pnl_data = await asyncio.to_thread(calculate_pnl_from_trades, trades)
         total_pnl = pnl_data.get("total_pnl", 0)
         total_fees = pnl_data.get("total_fees", 0)
         total_volume = pnl_data.get("total_volume", 0)
@@ -727,7 +706,7 @@ async def show_timeline_chart(
                 trades = await fetch_all_trades(client, db_path)
 
                 # Calculate PnL from trades
-                pnl_data = calculate_pnl_from_trades(trades)
+                pnl_data = await asyncio.to_thread(calculate_pnl_from_trades, trades)
 
                 bots_data.append(
                     {
@@ -748,7 +727,7 @@ async def show_timeline_chart(
         # Import chart generation
         from .archived_chart import generate_timeline_chart
 
-        chart_bytes = generate_timeline_chart(bots_data)
+        chart_bytes = await generate_timeline_chart(bots_data)
 
         if chart_bytes:
             # Calculate total PnL from all bots
@@ -826,11 +805,13 @@ async def show_bot_chart(
         )
 
         # Calculate PnL from trades
-        pnl_data = calculate_pnl_from_trades(trades)
+        pnl_data = await asyncio.to_thread(calculate_pnl_from_trades, trades)
         total_pnl = pnl_data.get("total_pnl", 0)
 
         # Generate chart (pass db_path for bot name extraction)
-        chart_bytes = generate_performance_chart(summary, None, trades, db_path=db_path)
+        chart_bytes = await generate_performance_chart(
+            summary, None, trades, db_path=db_path
+        )
 
         if chart_bytes:
             bot_name = _extract_bot_name(db_path)
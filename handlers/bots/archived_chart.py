@@ -7,6 +7,7 @@ Provides:
 - PnL calculation from trade data (OPEN/CLOSE positions)
 """
 
+import asyncio
 import io
 import logging
 import os
@@ -16,6 +17,7 @@ from typing import Any, Dict, List, Optional, Tuple
 # The PnL math is pure and shared with the web routes and the archived_analyzer
 # routine, so it lives in condor/ — re-exported here for existing callers.
 from condor.archived_pnl import calculate_pnl_from_trades, parse_timestamp
+from condor.chart_render import render_png
 
 logger = logging.getLogger(__name__)
 
@@ -81,7 +83,7 @@ def get_time_range_from_trades(
     return min(timestamps), max(timestamps)
 
 
-def generate_timeline_chart(
+async def generate_timeline_chart(
     bots_data: List[Dict[str, Any]],
     width: int = 1100,
     height: int = 600,
@@ -215,11 +217,7 @@ def generate_timeline_chart(
         )
 
         # Export to PNG
-        img_bytes = io.BytesIO()
-        fig.write_image(img_bytes, format="png", scale=2)
-        img_bytes.seek(0)
-
-        return img_bytes
+        return io.BytesIO(await render_png(fig))
 
     except ImportError as e:
         logger.error(f"Missing required package for chart generation: {e}")
@@ -229,7 +227,7 @@ def generate_timeline_chart(
         return None
 
 
-def generate_performance_chart(
+async def generate_performance_chart(
     summary: Dict[str, Any],
     performance: Optional[Dict[str, Any]],
     trades: List[Dict[str, Any]],
@@ -258,7 +256,7 @@ def generate_performance_chart(
         bot_name = summary.get("bot_name") or _extract_bot_name(db_path)
 
         # Calculate PnL from trades
-        pnl_data = calculate_pnl_from_trades(trades)
+        pnl_data = await asyncio.to_thread(calculate_pnl_from_trades, trades)
         cumulative_pnl = pnl_data.get("cumulative_pnl", [])
         pnl_by_pair = pnl_data.get("pnl_by_pair", {})
         total_pnl = pnl_data.get("total_pnl", 0)
@@ -396,11 +394,7 @@ def generate_performance_chart(
         )
 
         # Export to PNG
-        img_bytes = io.BytesIO()
-        fig.write_image(img_bytes, format="png", scale=2)
-        img_bytes.seek(0)
-
-        return img_bytes
+        return io.BytesIO(await render_png(fig))
 
     except ImportError as e:
         logger.error(f"Missing required package for chart generation: {e}")
@@ -410,7 +404,7 @@ def generate_performance_chart(
         return None
 
 
-def generate_report_chart(
+async def generate_report_chart(
     summary: Dict[str, Any],
     performance: Optional[Dict[str, Any]],
     trades: List[Dict[str, Any]],
@@ -441,7 +435,7 @@ def generate_report_chart(
         bot_name = summary.get("bot_name") or _extract_bot_name(db_path)
 
         # Calculate PnL from trades
-        pnl_data = calculate_pnl_from_trades(trades)
+        pnl_data = await asyncio.to_thread(calculate_pnl_from_trades, trades)
         cumulative_pnl = pnl_data.get("cumulative_pnl", [])
         pnl_by_pair = pnl_data.get("pnl_by_pair", {})
         total_pnl = pnl_data.get("total_pnl", 0)
@@ -560,11 +554,7 @@ def generate_report_chart(
         fig.update_yaxes(showgrid=True, gridcolor=DARK_THEME["grid_color"])
 
         # Export to PNG
-        img_bytes = io.BytesIO()
-        fig.write_image(img_bytes, format="png", scale=2)
-        img_bytes.seek(0)
-
-        return img_bytes
+        return io.BytesIO(await render_png(fig))
 
     except ImportError as e:
         logger.error(f"Missing required package for chart generation: {e}")
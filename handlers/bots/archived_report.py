@@ -6,18 +6,26 @@ Saves comprehensive reports to local filesystem:
 - PNG chart file with performance visualization
 """
 
+import asyncio
 import json
 import logging
 import os
+import sys
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from condor.archived_trades import fetch_archived_trades
+from condor.fetchers._pagination import collect_offset_pages
+
 logger = logging.getLogger(__name__)
 
 # Reports directory in project root
 REPORTS_DIR = Path("reports")
 
+ORDERS_PAGE = 500
+
 
 def ensure_reports_dir() -> Path:
     """Create reports directory if it doesn't exist."""
@@ -56,6 +64,17 @@ def _serialize_datetime(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def _summary_count(summary: Dict[str, Any], field: str) -> Optional[int]:
+    """A row count from the database summary, or None when it is not a number."""
+    value = summary.get(field)
+    return int(value) if isinstance(value, (int, float)) else None
+
+
+def _raise_page_error(offset: int, error: BaseException) -> None:
+    """Fail the report on a page that failed twice, as the sequential walk did."""
+    raise error
+
+
 def build_report_json(
     db_path: str,
     summary: Dict[str, Any],
@@ -154,41 +173,25 @@ async def save_full_report(
             logger.warning(f"Could not fetch performance for {db_path}: {e}")
             performance = None
 
-        # Fetch trades with pagination (get all)
-        all_trades = []
-        offset = 0
-        limit = 500
-        while True:
-            trades_response = await client.archived_bots.get_database_trades(
-                db_path, limit=limit, offset=offset
-            )
-            if not trades_response:
-                break
-            trades = trades_response.get("trades", [])
-            if not trades:
-                break
-            all_trades.extend(trades)
-            if len(trades) < limit:
-                break
-            offset += limit
+        # Fetch trades several pages at a time, or from the local store. A page
+        # that fails twice fails the report rather than saving part of it.
+        all_trades, _ = await fetch_archived_trades(
+            client,
+            db_path,
+            total=_summary_count(summary, "total_trades"),
+            on_error=_raise_page_error,
+        )
         logger.info(f"Fetched {len(all_trades)} trades")
 
-        # Fetch orders with pagination
-        all_orders = []
-        offset = 0
-        while True:
-            orders_response = await client.archived_bots.get_database_orders(
-                db_path, limit=limit, offset=offset
-            )
-            if not orders_response:
-                break
-            orders = orders_response.get("orders", [])
-            if not orders:
-                break
-            all_orders.extend(orders)
-            if len(orders) < limit:
-                break
-            offset += limit
+        # Fetch orders several pages at a time
+        all_orders = await collect_offset_pages(
+            partial(client.archived_bots.get_database_orders, db_path),
+            lambda resp: (resp or {}).get("orders") or [],
+            page_size=ORDERS_PAGE,
+            max_items=sys.maxsize,
+            total=_summary_count(summary, "total_orders"),
+            on_error=_raise_page_error,
+        )
         logger.info(f"Fetched {len(all_orders)} orders")
 
         # Fetch executors
@@ -201,7 +204,7 @@ async def save_full_report(
         # Calculate PnL from trades
         from .archived_chart import calculate_pnl_from_trades
 
-        pnl_data = calculate_pnl_from_trades(all_trades)
+        pnl_data = await asyncio.to_thread(calculate_pnl_from_trades, all_trades)
         logger.info(f"Calculated PnL: ${pnl_data.get('total_pnl', 0):.2f}")
 
         # Build report
@@ -229,7 +232,7 @@ async def save_full_report(
             try:
                 from .archived_chart import generate_report_chart
 
-                chart_bytes = generate_report_chart(
+                chart_bytes = await generate_report_chart(
                     summary=summary,
                     performance=performance,
                     trades=all_trades,
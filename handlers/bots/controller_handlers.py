@@ -2156,7 +2156,7 @@ async def _show_wizard_prices_step(
 
         # Generate chart and send as photo with caption
         if candles_list:
-            chart_bytes = generate_candles_chart(
+            chart_bytes = await generate_candles_chart(
                 candles_list,
                 pair,
                 start_price=start,
@@ -3920,7 +3920,7 @@ async def _update_wizard_message_for_prices_after_edit(
 
         # Generate new chart with updated prices
         if candles_list:
-            chart_bytes = generate_candles_chart(
+            chart_bytes = await generate_candles_chart(
                 candles_list,
                 pair,
                 start_price=start,
@@ -4461,7 +4461,7 @@ async def fetch_and_apply_market_data(
 
             if candles:
                 # Generate and send chart
-                chart_bytes = generate_candles_chart(
+                chart_bytes = await generate_candles_chart(
                     candles,
                     pair,
                     start_price=start,
@@ -4713,7 +4713,7 @@ async def process_field_input(
                     )
 
                     if candles:
-                        chart_bytes = generate_candles_chart(
+                        chart_bytes = await generate_candles_chart(
                             candles,
                             pair,
                             start_price=start,
@@ -66,7 +66,7 @@ class BaseController(ABC):
 
     @classmethod
     @abstractmethod
-    def generate_chart(
+    async def generate_chart(
         cls,
         config: Dict[str, Any],
         candles_data: List[Dict[str, Any]],
@@ -71,14 +71,14 @@ class GridStrikeController(BaseController):
         return validate_config(config)
 
     @classmethod
-    def generate_chart(
+    async def generate_chart(
         cls,
         config: Dict[str, Any],
         candles_data: List[Dict[str, Any]],
         current_price: Optional[float] = None,
     ) -> io.BytesIO:
         """Generate visualization chart."""
-        return generate_chart(config, candles_data, current_price)
+        return await generate_chart(config, candles_data, current_price)
 
     @classmethod
     def generate_id(
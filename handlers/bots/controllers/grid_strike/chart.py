@@ -14,12 +14,13 @@ Uses the unified candlestick chart function from visualizations module.
 import io
 from typing import Any, Dict, List, Optional
 
+from condor.chart_render import render_png
 from handlers.dex.visualizations import DARK_THEME, generate_candlestick_chart
 
 from .config import SIDE_LONG
 
 
-def generate_chart(
+async def generate_chart(
     config: Dict[str, Any],
     candles_data: List[Dict[str, Any]],
     current_price: Optional[float] = None,
@@ -108,7 +109,7 @@ def generate_chart(
         )
 
     # Use the unified candlestick chart function
-    result = generate_candlestick_chart(
+    result = await generate_candlestick_chart(
         candles=data,
         title=title,
         current_price=current_price,
@@ -145,15 +146,12 @@ def generate_chart(
             height=500,
         )
 
-        img_bytes = io.BytesIO()
-        fig.write_image(img_bytes, format="png", scale=2)
-        img_bytes.seek(0)
-        return img_bytes
+        return io.BytesIO(await render_png(fig))
 
     return result
 
 
-def generate_preview_chart(
+async def generate_preview_chart(
     config: Dict[str, Any],
     candles_data: List[Dict[str, Any]],
     current_price: Optional[float] = None,
@@ -164,4 +162,4 @@ def generate_preview_chart(
     Same as generate_chart but with smaller dimensions.
     """
     # Use the same logic but we could customize dimensions here if needed
-    return generate_chart(config, candles_data, current_price)
+    return await generate_chart(config, candles_data, current_price)
@@ -1271,7 +1271,7 @@ async def show_controller_chart(
             from .controllers.pmm_mister import generate_chart
         else:
             from .controllers.grid_strike import generate_chart
-        chart_bytes = generate_chart(ctrl_config, candles, current_price)
+        chart_bytes = await generate_chart(ctrl_config, candles, current_price)
 
         if chart_bytes:
             # Build caption based on controller type
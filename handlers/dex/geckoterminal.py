@@ -25,6 +25,7 @@ from condor.pool_data import (
     gecko_request,
     get_connector_for_dex,
 )
+from condor.pool_index import indexed, search_gecko_rows
 from config_manager import get_client
 from utils.telegram_formatters import escape_markdown_v2
 
@@ -1310,12 +1311,14 @@ async def show_network_menu(
 async def handle_gecko_search(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
-    """Prompt user to enter token address for search"""
+    """Prompt user to enter a token address or symbol for search"""
     context.user_data["dex_state"] = "gecko_search"
 
     # Get selected network
     network, _ = get_gecko_state(context.user_data)
     network_display = NETWORK_NAMES.get(network, network.title())
+    # Asks for the chain's local pool index while the user is still typing.
+    indexed(network)
 
     keyboard = [
         [
@@ -1329,7 +1332,7 @@ async def handle_gecko_search(
     message = (
         r"🔍 *Token Search*" + "\n\n"
         f"Network: *{escape_markdown_v2(network_display)}*\n\n"
-        "Enter a token address to find pools:\n\n"
+        "Enter a token address or symbol to find pools:\n\n"
         "_Tap network button to change_"
     )
 
@@ -1404,11 +1407,14 @@ async def process_gecko_search(
     try:
         token_address = user_input.strip()
 
-        # Use the selected network directly
-        result = await gecko_call(
-            "get_top_pools_by_network_token", selected_network, token_address
-        )
-        pools = _extract_pools_from_response(result, 10)
+        # The chain's local pool index first; GeckoTerminal only for a token
+        # address it cannot answer (a symbol is answered from the index alone).
+        pools = await search_gecko_rows(selected_network, token_address, 10)
+        if pools is None:
+            result = await gecko_call(
+                "get_top_pools_by_network_token", selected_network, token_address
+            )
+            pools = _extract_pools_from_response(result, 10)
 
         if not pools:
             await loading_msg.edit_text(
@@ -1619,7 +1625,7 @@ async def _show_pool_chart(
         base_symbol = pool_data.get("base_token_symbol")
         quote_symbol = pool_data.get("quote_token_symbol")
 
-        chart_buffer = generate_ohlcv_chart(
+        chart_buffer = await generate_ohlcv_chart(
             ohlcv_data=ohlcv_data,
             pair_name=pair_name,
             timeframe=_format_timeframe_label(timeframe),
@@ -2145,7 +2151,7 @@ async def show_ohlcv_chart(
         base_symbol = pool_data.get("base_token_symbol")
         quote_symbol = pool_data.get("quote_token_symbol")
 
-        chart_buffer = generate_ohlcv_chart(
+        chart_buffer = await generate_ohlcv_chart(
             ohlcv_data=ohlcv_data,
             pair_name=pair_name,
             timeframe=_format_timeframe_label(timeframe),
@@ -2326,7 +2332,7 @@ async def show_gecko_liquidity(
 
         # Generate chart
         pair_name = pool_data.get("name", "Pool")
-        chart_bytes = generate_liquidity_chart(
+        chart_bytes = await generate_liquidity_chart(
             bins=bins, current_price=current_price, pair_name=pair_name
         )
 
@@ -2478,7 +2484,7 @@ async def show_gecko_combined(
         base_symbol = pool_data.get("base_token_symbol")
         quote_symbol = pool_data.get("quote_token_symbol")
 
-        chart_buf = generate_combined_chart(
+        chart_buf = await generate_combined_chart(
             ohlcv_data=ohlcv_data or [],
             bins=bins or [],
             pair_name=pair_name,
@@ -3028,10 +3034,13 @@ async def handle_gecko_token_search(
     await query.answer("Searching pools...")
 
     try:
-        result = await gecko_call(
-            "get_top_pools_by_network_token", network, token_info.get("address", "")
-        )
-        pools = _extract_pools_from_response(result, 10)
+        token_address = token_info.get("address", "")
+        pools = await search_gecko_rows(network, token_address, 10)
+        if pools is None:
+            result = await gecko_call(
+                "get_top_pools_by_network_token", network, token_address
+            )
+            pools = _extract_pools_from_response(result, 10)
 
         if not pools:
             await query.message.edit_text(
@@ -14,6 +14,7 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
+from condor.pool_bins import fetch_bins_many
 from condor.pool_data import (
     fetch_liquidity_bins,
     fetch_ohlcv,
@@ -887,52 +888,37 @@ async def handle_plot_liquidity(
         chat_id = update.effective_chat.id
         client = await get_client(chat_id, context=context)
 
-        # Fetch all pool infos in parallel with individual timeouts
-        POOL_FETCH_TIMEOUT = 10  # seconds per pool
-
-        async def fetch_pool_with_info(pool):
-            """Fetch pool info and return combined data"""
-            pool_address = pool.get("pool_address", pool.get("address", ""))
-            connector = pool.get("connector", "meteora")
-            try:
-                pool_info = await asyncio.wait_for(
-                    _fetch_pool_info(client, pool_address, connector),
-                    timeout=POOL_FETCH_TIMEOUT,
-                )
-                bins = pool_info.get("bins", [])
-                bin_step = pool.get("bin_step") or pool_info.get("bin_step")
-
-                # Log what we're getting
-                logger.info(
-                    f"Pool {pool_address[:8]}... bins={len(bins)}, bin_step={bin_step}"
-                )
-                if bins:
-                    # Log first bin structure for debugging
-                    logger.debug(f"First bin sample: {bins[0]}")
-
-                return {
+        # One batched read: cached pools cost nothing, the rest go to Gateway
+        # through the shared bins gate, each with its own timeout.
+        keys = [
+            (
+                pool.get("connector", "meteora"),
+                pool.get("pool_address", pool.get("address", "")),
+            )
+            for pool in selected_pools
+        ]
+        fetched = await fetch_bins_many(keys, client=client)
+
+        pools_data = []
+        for pool, key in zip(selected_pools, keys):
+            snapshot, error = fetched[key]
+            if snapshot is None:
+                logger.warning(f"Failed to fetch pool {key[1][:12]}...: {error}")
+                continue
+            pool_info = snapshot.pool_info()
+            bin_step = pool.get("bin_step") or pool_info.get("bin_step")
+            logger.info(
+                f"Pool {key[1][:8]}... bins={len(snapshot)}, bin_step={bin_step}"
+            )
+            pools_data.append(
+                {
                     "pool": pool,
                     "pool_info": pool_info,
-                    "bins": bins,
+                    "bins": pool_info["bins"],
                     "bin_step": bin_step,
+                    "snapshot": snapshot,
                 }
-            except asyncio.TimeoutError:
-                logger.warning(
-                    f"Timeout fetching pool {pool_address[:12]}... after {POOL_FETCH_TIMEOUT}s"
-                )
-                return None
-            except Exception as e:
-                logger.warning(f"Failed to fetch pool {pool_address}: {e}")
-                return None
-
-        # Fetch all pools simultaneously
-        tasks = [fetch_pool_with_info(pool) for pool in selected_pools]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Filter successful results and count failures
-        pools_data = [
-            r for r in results if r is not None and not isinstance(r, Exception)
-        ]
+            )
         failed_count = len(selected_pools) - len(pools_data)
 
         if not pools_data:
@@ -960,7 +946,7 @@ async def handle_plot_liquidity(
 
         # Generate aggregated chart
         pair_name = search_term if search_term else "Multi-Pool"
-        chart_bytes = generate_aggregated_liquidity_chart(pools_data, pair_name)
+        chart_bytes = await generate_aggregated_liquidity_chart(pools_data, pair_name)
 
         if not chart_bytes:
             # Try to give more info about what went wrong
@@ -1559,7 +1545,7 @@ async def _show_pool_detail(
     # Generate combined chart if we have OHLCV or bins
     if ohlcv_data or bins:
         try:
-            chart_bytes = generate_combined_chart(
+            chart_bytes = await generate_combined_chart(
                 ohlcv_data=ohlcv_data or [],
                 bins=bins or [],
                 pair_name=pair,
@@ -1575,7 +1561,7 @@ async def _show_pool_detail(
             # Fallback to liquidity-only chart
             if bins:
                 try:
-                    chart_bytes = generate_liquidity_chart(
+                    chart_bytes = await generate_liquidity_chart(
                         bins=bins,
                         active_bin_id=active_bin,
                         current_price=price_float,
@@ -2053,7 +2039,7 @@ async def handle_pool_ohlcv(
             return
 
         # Generate chart
-        chart_buf = generate_ohlcv_chart(
+        chart_buf = await generate_ohlcv_chart(
             ohlcv_data=ohlcv_data,
             pair_name=pair,
             timeframe=_format_timeframe_label(timeframe),
@@ -2265,7 +2251,7 @@ async def handle_pool_combined_chart(
             pass
 
         # Generate combined chart
-        chart_buf = generate_combined_chart(
+        chart_buf = await generate_combined_chart(
             ohlcv_data=ohlcv_data or [],
             bins=bins or [],
             pair_name=pair,
@@ -3027,7 +3013,7 @@ async def handle_pos_view(
                 entry_float = float(entry_price) if entry_price else None
                 current_float = float(current_price) if current_price else None
 
-                chart_bytes = generate_combined_chart(
+                chart_bytes = await generate_combined_chart(
                     ohlcv_data=ohlcv_data or [],
                     bins=bins or [],
                     pair_name=pair,
@@ -4366,7 +4352,7 @@ async def show_add_position_menu(
 
             # Generate combined chart if we have OHLCV or bins
             if ohlcv_data or bins:
-                chart_bytes = generate_combined_chart(
+                chart_bytes = await generate_combined_chart(
                     ohlcv_data=ohlcv_data or [],
                     bins=bins or [],
                     pair_name=pair,
@@ -4383,7 +4369,7 @@ async def show_add_position_menu(
         # Fallback to liquidity-only chart if combined chart failed
         if not chart_bytes and bins:
             try:
-                chart_bytes = generate_liquidity_chart(
+                chart_bytes = await generate_liquidity_chart(
                     bins=bins,
                     active_bin_id=pool_info.get("active_bin_id"),
                     current_price=current_val,
@@ -11,6 +11,7 @@ from typing import Awaitable, Callable
 from telegram import Update
 from telegram.ext import CallbackQueryHandler, ContextTypes, MessageHandler, filters
 
+from condor.gecko_stats import gecko_caller
 from utils.auth import restricted
 from utils.telegram_formatters import format_error_message
 
@@ -701,11 +702,14 @@ async def dex_callback_handler(
         if action in SIMPLE_ACTIONS:
             handler = SIMPLE_ACTIONS[action]
             if handler is not None:
-                await handler(update, context)
+                with gecko_caller("telegram"):
+                    await handler(update, context)
             return
 
         # Try parameterized action handlers
-        if await _handle_parameterized_action(update, context, action):
+        with gecko_caller("telegram"):
+            handled = await _handle_parameterized_action(update, context, action)
+        if handled:
             return
 
         # Unknown action
@@ -751,7 +755,8 @@ async def dex_message_handler(
         # Dispatch to appropriate handler
         handler = MESSAGE_STATE_HANDLERS.get(dex_state)
         if handler:
-            await handler(update, context, user_input)
+            with gecko_caller("telegram"):
+                await handler(update, context, user_input)
         else:
             await update.message.reply_text(f"Unknown state: {dex_state}")
 
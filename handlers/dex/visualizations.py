@@ -13,6 +13,8 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Union
 
+from condor.chart_render import render_png
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,7 +103,7 @@ def _parse_timestamp(raw_ts) -> Optional[datetime]:
     return None
 
 
-def generate_candlestick_chart(
+async def generate_candlestick_chart(
     candles: List[Union[Dict, List]],
     title: str = "",
     current_price: Optional[float] = None,
@@ -343,11 +345,7 @@ def generate_candlestick_chart(
             )
 
         # Convert to PNG bytes
-        img_bytes = io.BytesIO()
-        fig.write_image(img_bytes, format="png", scale=2)
-        img_bytes.seek(0)
-
-        return img_bytes
+        return io.BytesIO(await render_png(fig))
 
     except ImportError as e:
         logger.warning(f"Plotly not available for candlestick chart: {e}")
@@ -357,7 +355,7 @@ def generate_candlestick_chart(
         return None
 
 
-def generate_liquidity_chart(
+async def generate_liquidity_chart(
     bins: list,
     active_bin_id: int = None,
     current_price: float = None,
@@ -518,8 +516,7 @@ def generate_liquidity_chart(
         )
 
         # Export to bytes
-        img_bytes = fig.to_image(format="png", scale=2)
-        return img_bytes
+        return await render_png(fig)
 
     except ImportError as e:
         logger.warning(f"Plotly not available for chart generation: {e}")
@@ -529,7 +526,7 @@ def generate_liquidity_chart(
         return None
 
 
-def generate_ohlcv_chart(
+async def generate_ohlcv_chart(
     ohlcv_data: List,
     pair_name: str,
     timeframe: str,
@@ -556,7 +553,7 @@ def generate_ohlcv_chart(
 
     # Use the unified candlestick chart function
     # GeckoTerminal returns newest first, so reverse_data=True
-    return generate_candlestick_chart(
+    return await generate_candlestick_chart(
         candles=ohlcv_data,
         title=title,
         show_volume=True,
@@ -566,7 +563,7 @@ def generate_ohlcv_chart(
     )
 
 
-def generate_combined_chart(
+async def generate_combined_chart(
     ohlcv_data: List,
     bins: List,
     pair_name: str,
@@ -1029,11 +1026,7 @@ def generate_combined_chart(
             fig.update_xaxes(title_text="Liquidity", row=1, col=2)
 
         # Save to buffer
-        buf = io.BytesIO()
-        fig.write_image(buf, format="png", scale=2)
-        buf.seek(0)
-
-        return buf
+        return io.BytesIO(await render_png(fig))
 
     except ImportError as e:
         logger.warning(f"Plotly not available for combined chart: {e}")
@@ -1043,128 +1036,42 @@ def generate_combined_chart(
         return None
 
 
-def generate_aggregated_liquidity_chart(
+async def generate_aggregated_liquidity_chart(
     pools_data: list, pair_name: str = "Aggregated"
 ) -> Optional[bytes]:
     """Generate aggregated liquidity distribution chart from multiple pools
 
     Collects all bins from all pools, buckets them into price ranges,
     and creates a stacked bar chart showing liquidity distribution.
+    The bucketing is ``condor.pool_bins.aggregate_liquidity``.
 
     Args:
-        pools_data: List of dicts with 'pool', 'pool_info', 'bins' data
+        pools_data: List of dicts with 'pool', 'pool_info' and 'bins' (or a
+            'snapshot') data
         pair_name: Trading pair name for title
 
     Returns:
         PNG image bytes or None if failed
     """
     try:
-        from collections import defaultdict
-
         import plotly.graph_objects as go
 
+        from condor.pool_bins import aggregate_liquidity
+
         if not pools_data:
             logger.warning("No pools_data provided to aggregated chart")
             return None
 
-        # Filter pools that have bins data
-        valid_pools = [p for p in pools_data if p.get("bins")]
-        if not valid_pools:
-            logger.warning("No valid pools with bins data")
-            return None
-
-        # Collect all bin data from all pools
-        all_bins = []
-        total_tvl = 0
-        weighted_price_sum = 0
-
-        for pool_data in valid_pools:
-            pool = pool_data.get("pool", {})
-            pool_info = pool_data.get("pool_info", {})
-            bins = pool_data.get("bins", [])
-
-            tvl = float(pool.get("liquidity", 0) or pool_info.get("liquidity", 0) or 0)
-            current_price = float(
-                pool_info.get("price", 0) or pool.get("current_price", 0) or 0
-            )
-
-            if tvl > 0 and current_price > 0:
-                total_tvl += tvl
-                weighted_price_sum += current_price * tvl
-
-            for b in bins:
-                base = float(b.get("base_token_amount", 0) or 0)
-                quote = float(b.get("quote_token_amount", 0) or 0)
-                price = float(b.get("price", 0) or 0)
-
-                if price > 0:
-                    base_value_in_quote = base * price
-                    total_value = base_value_in_quote + quote
-                    if total_value > 0:
-                        all_bins.append(
-                            {
-                                "price": price,
-                                "base_value": base_value_in_quote,
-                                "quote": quote,
-                                "total": total_value,
-                            }
-                        )
-
-        if not all_bins:
+        profile = aggregate_liquidity(pools_data)
+        if profile is None:
             logger.warning("No bins collected from pools")
             return None
 
-        # Calculate weighted average price
-        avg_price = (
-            weighted_price_sum / total_tvl
-            if total_tvl > 0
-            else sum(b["price"] for b in all_bins) / len(all_bins)
-        )
-
-        # Sort bins by price
-        all_bins.sort(key=lambda x: x["price"])
-
-        # Filter outliers (keep middle 95% by value)
-        cumulative = 0
-        total_value = sum(b["total"] for b in all_bins)
-        min_idx, max_idx = 0, len(all_bins) - 1
-
-        for i, b in enumerate(all_bins):
-            cumulative += b["total"]
-            if cumulative >= total_value * 0.025 and min_idx == 0:
-                min_idx = i
-            if cumulative >= total_value * 0.975:
-                max_idx = i
-                break
-
-        filtered_bins = all_bins[min_idx : max_idx + 1]
-        if len(filtered_bins) < 5:
-            filtered_bins = all_bins
-
-        # Create price buckets
-        prices = [b["price"] for b in filtered_bins]
-        min_price, max_price = min(prices), max(prices)
-        price_range = max_price - min_price
-
-        # Determine bucket count (30-80 based on data density)
-        num_buckets = min(80, max(30, len(filtered_bins) // 5))
-        bucket_size = price_range / num_buckets if price_range > 0 else 1
-
-        # Aggregate into buckets
-        buckets = defaultdict(lambda: {"base_value": 0, "quote": 0})
-        for b in filtered_bins:
-            bucket_idx = (
-                int((b["price"] - min_price) / bucket_size) if bucket_size > 0 else 0
-            )
-            bucket_idx = min(bucket_idx, num_buckets - 1)
-            bucket_price = min_price + (bucket_idx + 0.5) * bucket_size
-            buckets[bucket_price]["base_value"] += b["base_value"]
-            buckets[bucket_price]["quote"] += b["quote"]
-
-        # Extract for plotting
-        bucket_prices = sorted(buckets.keys())
-        base_values = [buckets[p]["base_value"] for p in bucket_prices]
-        quote_values = [buckets[p]["quote"] for p in bucket_prices]
+        bucket_prices = profile.prices
+        base_values = profile.base_values
+        quote_values = profile.quote_values
+        avg_price = profile.avg_price
+        min_price, max_price = profile.min_price, profile.max_price
 
         # Create figure
         fig = go.Figure()
@@ -1204,7 +1111,7 @@ def generate_aggregated_liquidity_chart(
         # Update layout (use unified theme)
         fig.update_layout(
             title=dict(
-                text=f"<b>{pair_name} Aggregated Liquidity ({len(valid_pools)} pools)</b>",
+                text=f"<b>{pair_name} Aggregated Liquidity ({profile.pools} pools)</b>",
                 font=dict(
                     family=DARK_THEME["font_family"],
                     size=18,
@@ -1241,8 +1148,7 @@ def generate_aggregated_liquidity_chart(
             color=DARK_THEME["axis_color"],
         )
 
-        img_bytes = fig.to_image(format="png", scale=2)
-        return img_bytes
+        return await render_png(fig)
 
     except ImportError as e:
         logger.warning(f"Plotly not available: {e}")
@@ -660,7 +660,7 @@ async def show_step_2_combined(
         chart_bytes = None
         if candles:
             try:
-                chart_bytes = generate_chart(config, candles, current_price)
+                chart_bytes = await generate_chart(config, candles, current_price)
             except Exception as e:
                 logger.warning(f"Error generating chart: {e}")
 
@@ -782,7 +782,7 @@ async def _refresh_step_2(
         chart_bytes = None
         if candles:
             try:
-                chart_bytes = generate_chart(config, candles, current_price)
+                chart_bytes = await generate_chart(config, candles, current_price)
             except Exception as e:
                 logger.warning(f"Error generating chart: {e}")
 
@@ -20,6 +20,7 @@ from telegram.ext import CallbackContext, ContextTypes
 
 import condor.reports
 from condor import routine_hooks
+from condor.gecko_stats import gecko_caller
 from condor.routine_store import get_routine_store
 from handlers import clear_all_input_states
 from routines.base import (
@@ -323,8 +324,11 @@ async def _execute_routine(
         # Reports belong to the user whose user_data the run executes against
         # (the starter), falling back to the chat — the same identity the hooks
         # record (SEC-152) — so the web can authorize reads by it (SEC-196).
-        with condor.reports.attribute_owner(
-            owner_id if owner_id is not None else chat_id
+        with (
+            condor.reports.attribute_owner(
+                owner_id if owner_id is not None else chat_id
+            ),
+            gecko_caller(f"routine:{routine_name.split('/')[-1]}"),
         ):
             raw_result = await routine.run_fn(config, context)
         rich_result = normalize_result(raw_result)
@@ -48,6 +48,10 @@ logger = logging.getLogger(__name__)
 # real HTTP errors while removing the token leak.
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+# The pool loops startup() detaches. Held here so they are not collected mid-run
+# and so teardown() can cancel them before their HTTP clients are closed.
+_pool_tasks: set[asyncio.Task] = set()
+
 
 def _get_start_menu_keyboard(is_admin: bool = False) -> InlineKeyboardMarkup:
     """Build the start menu inline keyboard."""
@@ -625,7 +629,7 @@ async def startup(application: Application) -> None:
     get_routine_store().set_bot(outbound_bot)
 
     # Start ServerDataService (unified server-centric cache)
-    from condor.server_data_service import get_server_data_service
+    from condor.server_data_service import ServerDataType, get_server_data_service
     from condor.server_data_service import register_default_fetches as sds_register
 
     sds_register()
@@ -633,6 +637,40 @@ async def startup(application: Application) -> None:
     sds.start()
     await sds.auto_subscribe_servers()
 
+    # Reload the GeckoTerminal lookups the last process resolved, and resolve the
+    # tokens of running executors, before the dashboard asks for them. Detached:
+    # it spends background budget and must not hold up boot.
+    from condor.pool_data import warm_pool_caches
+    from config_manager import get_config_manager
+
+    running = []
+    for server_name in get_config_manager().list_servers():
+        cached = sds.get(server_name, ServerDataType.EXECUTORS)
+        if isinstance(cached, dict):
+            cached = cached.get("executors") or cached.get("data")
+        if isinstance(cached, list):
+            running.extend(cached)
+    _pool_tasks.add(asyncio.create_task(warm_pool_caches(running)))
+
+    # Keep a local index of the pools on the chains being searched, so a search
+    # is answered without a GeckoTerminal request. Solana, the browser's default
+    # chain, is indexed from boot; any other once someone searches it.
+    from condor.pool_index import run_pool_index
+
+    _pool_tasks.add(asyncio.create_task(run_pool_index(["solana-mainnet-beta"])))
+
+    # Keep the pool behind each charted DEX pair resolved ahead of the chart, so
+    # opening one costs no lookup once the pair has been seen.
+    from condor.pool_routes import run_pool_routes
+
+    _pool_tasks.add(asyncio.create_task(run_pool_routes()))
+
+    # Keep the unsearched Orca and Gateway listings being browsed precomputed,
+    # so a page of one is a slice rather than an upstream read.
+    from condor.pool_snapshots import run_pool_snapshots
+
+    _pool_tasks.add(asyncio.create_task(run_pool_snapshots()))
+
     # Start agent session health monitor. The health monitor is process
     # lifecycle, not a session operation, so it is driven off the module
     # directly rather than through the client facade.
@@ -731,6 +769,22 @@ async def teardown(application: Application) -> None:
 
     await hummingbot_client.close()
 
+    # Stop the pool loops before the clients they read through are closed
+    for task in _pool_tasks:
+        task.cancel()
+    await asyncio.gather(*_pool_tasks, return_exceptions=True)
+    _pool_tasks.clear()
+
+    # Close the pooled outbound HTTP clients (GeckoTerminal, Orca, routines)
+    from condor.http_pool import close_http_pools
+
+    await close_http_pools()
+
+    # Stop the chart workers and their browsers
+    from condor.chart_render import close_chart_renderer
+
+    close_chart_renderer()
+
     # Record the clean exit and give the outbox one last chance. Both are no-ops
     # unless the admin opted in, and neither can fail the shutdown.
     try:
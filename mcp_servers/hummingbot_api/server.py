@@ -982,6 +982,7 @@ async def explore_geckoterminal(
         "multi_pools",
         "token_pools",
         "token_info",
+        "pair_pool",
         "ohlcv",
         "trades",
     ],
@@ -990,6 +991,7 @@ async def explore_geckoterminal(
     pool_address: str | None = None,
     pool_addresses: list[str] | None = None,
     token_address: str | None = None,
+    trading_pair: str | None = None,
     timeframe: str = "1h",
     before_timestamp: int | None = None,
     currency: str = "usd",
@@ -1009,8 +1011,9 @@ async def explore_geckoterminal(
     7. action="multi_pools" + network + pool_addresses → Compare multiple pools
     8. action="token_pools" + network + token_address → Top pools for a token
     9. action="token_info" + network + token_address → Token details (price, mcap, fdv)
-    10. action="ohlcv" + network + pool_address → OHLCV candle data
-    11. action="trades" + network + pool_address → Recent trades
+    10. action="pair_pool" + network + trading_pair → The pool a pair is charted from
+    11. action="ohlcv" + network + pool_address (or trading_pair) → OHLCV candle data
+    12. action="trades" + network + pool_address (or trading_pair) → Recent trades
 
     Args:
         action: The data to retrieve.
@@ -1019,6 +1022,9 @@ async def explore_geckoterminal(
         pool_address: Pool contract address (for pool_detail, ohlcv, trades).
         pool_addresses: List of pool addresses (for multi_pools).
         token_address: Token contract address (for token_pools, token_info).
+        trading_pair: '<base>-<quote>' (for pair_pool; ohlcv and trades without a
+            pool_address). The base is a token address ('<mint>-SOL') or, on
+            ticker networks like xrpl, a symbol ('SOLO-XRP').
         timeframe: OHLCV interval (default: '1h'). Options: 1m, 5m, 15m, 1h, 4h, 12h, 1d.
         before_timestamp: Fetch OHLCV candles before this unix timestamp (pagination).
         currency: OHLCV price currency, 'usd' or 'token' (default: 'usd').
@@ -1033,6 +1039,7 @@ async def explore_geckoterminal(
         pool_address=pool_address,
         pool_addresses=pool_addresses,
         token_address=token_address,
+        trading_pair=trading_pair,
         timeframe=timeframe,
         before_timestamp=before_timestamp,
         currency=currency,
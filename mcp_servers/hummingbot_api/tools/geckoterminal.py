@@ -5,6 +5,7 @@ Provides free, public DEX market data from GeckoTerminal API:
 - Network and DEX discovery
 - Pool exploration (trending, top, new, by token)
 - Pool details and multi-pool lookup
+- The pool a trading pair is charted from
 - OHLCV candle data
 - Recent trades
 """
@@ -246,6 +247,31 @@ def format_token_info(token: dict) -> str:
     return "\n".join(lines)
 
 
+def format_pair_route(trading_pair: str, network: str, route: Any) -> str:
+    info = route.info
+    minutes = route.age() / 60
+    lines = [
+        f"Pair: {trading_pair} on {network}",
+        f"Pool: {info.get('name') or 'N/A'}",
+        f"Address: {route.address}",
+        f"DEX: {info.get('dex_id') or 'N/A'}",
+        f"Series: {route.token} token",
+        f"Reserve (USD) when chosen: {format_number(route.liquidity or None)}",
+        f"Resolved: {minutes:.0f} min ago",
+    ]
+    return "\n".join(lines)
+
+
+async def _pair_route(network: str, trading_pair: str) -> Any:
+    """The pair's route from Condor's routing table, resolved on first use."""
+    from condor.pool_routes import route_pair
+
+    route = await route_pair(network, trading_pair)
+    if route is None:
+        raise ToolError(f"No pool found for '{trading_pair}' on {network}")
+    return route
+
+
 # ── Main entry point ─────────────────────────────────────────────────────────
 
 
@@ -256,6 +282,7 @@ async def explore_geckoterminal(
     pool_address: str | None = None,
     pool_addresses: list[str] | None = None,
     token_address: str | None = None,
+    trading_pair: str | None = None,
     timeframe: str = "1h",
     before_timestamp: int | None = None,
     currency: str = "usd",
@@ -264,8 +291,12 @@ async def explore_geckoterminal(
     trade_volume_filter: float | None = None,
 ) -> dict[str, Any]:
     """Execute a GeckoTerminal API action and return formatted results."""
+    from condor.gecko_stats import charge_task_to
     from condor.pool_data import gecko_request
 
+    # The MCP server answers each tool call in a task of its own.
+    charge_task_to("mcp")
+
     async def _get(path: str, params: dict | None = None) -> dict:
         """One call on this process's gecko budget.
 
@@ -399,11 +430,27 @@ async def explore_geckoterminal(
         token_data = _extract_token_info(data)
         return {"formatted_output": format_token_info(token_data)}
 
+    # ── Pool behind a trading pair ───────────────────────────────
+    elif action == "pair_pool":
+        if not network or not trading_pair:
+            raise ToolError(
+                "'network' and 'trading_pair' are required for action='pair_pool'"
+            )
+        route = await _pair_route(network, trading_pair)
+        return {"formatted_output": format_pair_route(trading_pair, network, route)}
+
     # ── OHLCV candles ────────────────────────────────────────────
     elif action == "ohlcv":
+        if network and trading_pair and not pool_address:
+            # The pair's own pool, read from the side that prices the pair.
+            route = await _pair_route(network, trading_pair)
+            pool_address = route.address
+            if route.token == "quote":
+                token = "quote" if token == "base" else "base"
         if not network or not pool_address:
             raise ToolError(
-                "'network' and 'pool_address' are required for action='ohlcv'"
+                "'network' and 'pool_address' (or 'trading_pair') are required "
+                "for action='ohlcv'"
             )
         tf_unit, tf_period = _parse_timeframe(timeframe)
         params: dict[str, Any] = {
@@ -436,6 +483,8 @@ async def explore_geckoterminal(
 
     # ── Trades ───────────────────────────────────────────────────
     elif action == "trades":
+        if network and trading_pair and not pool_address:
+            pool_address = (await _pair_route(network, trading_pair)).address
         if not network or not pool_address:
             raise ToolError(
                 "'network' and 'pool_address' are required for action='trades'"
@@ -457,5 +506,5 @@ async def explore_geckoterminal(
     else:
         raise ToolError(
             f"Unknown action '{action}'. Available actions: networks, dexes, trending_pools, top_pools, "
-            f"new_pools, pool_detail, multi_pools, token_pools, token_info, ohlcv, trades"
+            f"new_pools, pool_detail, multi_pools, token_pools, token_info, pair_pool, ohlcv, trades"
         )
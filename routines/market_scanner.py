@@ -7,11 +7,11 @@ import logging
 import time
 from typing import Any
 
-import aiohttp
 import numpy as np
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
 from config_manager import get_client
 
 logger = logging.getLogger(__name__)
@@ -42,7 +42,7 @@ class Config(BaseModel):
 
 async def fetch_top_pairs(top_n: int, min_volume: float) -> list[dict]:
     """Fetch 24h tickers from Binance Futures and return top N by quote volume."""
-    async with aiohttp.ClientSession() as session:
+    async with pooled_session() as session:
         async with session.get(BINANCE_FUTURES_TICKER) as resp:
             resp.raise_for_status()
             tickers = await resp.json()
@@ -12,6 +12,8 @@ import pandas as pd
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.chart_render import render_png
+from condor.http_pool import pooled_session
 from config_manager import get_client
 from routines.base import RoutineResult
 
@@ -73,9 +75,10 @@ async def _fetch_token_info(mint: str) -> dict:
     On the process-wide gecko budget — the ~30/min free tier is per IP and shared
     with the dashboard, so this routine cannot pace itself in isolation.
     """
-    from condor.pool_data import gecko_request
+    from condor.pool_data import GeckoPriority, gecko_priority, gecko_request
 
-    data = await gecko_request("GET", f"networks/solana/tokens/{mint}")
+    with gecko_priority(GeckoPriority.BACKGROUND):
+        data = await gecko_request("GET", f"networks/solana/tokens/{mint}")
     attrs = data.get("data", {}).get("attributes", {})
     price = float(attrs.get("price_usd") or 0)
     fdv = float(attrs.get("fdv_usd") or 0)
@@ -147,7 +150,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     price_data = {}
 
     # Step 1: Fetch GeckoTerminal token info + DefiLlama fees (parallel, aiohttp)
-    async with aiohttp.ClientSession() as session:
+    async with pooled_session() as session:
         # Token info from GeckoTerminal. No hand-rolled sleep between calls: the
         # shared gate paces these against every other caller in the process,
         # which a local sleep cannot.
@@ -347,9 +350,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
 
         chat_id = context._chat_id if hasattr(context, "_chat_id") else None
         if chat_id:
-            buf = io.BytesIO()
-            fig.write_image(buf, format="png", width=900, height=700, scale=2)
-            buf.seek(0)
+            buf = io.BytesIO(await render_png(fig, width=900, height=700))
             await context.bot.send_photo(
                 chat_id=chat_id, photo=buf, caption=summary, parse_mode="Markdown"
             )
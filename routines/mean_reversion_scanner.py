@@ -10,6 +10,8 @@ import numpy as np
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.http_pool import pooled_session
+
 logger = logging.getLogger(__name__)
 
 BINANCE_SPOT_TICKER = "https://api.binance.com/api/v3/ticker/24hr"
@@ -286,7 +288,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     chat_id = context._chat_id
     headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
 
-    async with aiohttp.ClientSession(headers=headers) as session:
+    async with pooled_session(headers=headers) as session:
         # 1. Fetch top perpetual pairs by volume
         try:
             pairs = await fetch_top_pairs(session, config.min_volume_usd, config.top_n)
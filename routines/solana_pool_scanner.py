@@ -9,6 +9,8 @@ from typing import Optional
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.chart_render import render_png
+
 logger = logging.getLogger(__name__)
 
 NETWORK = "solana"
@@ -55,14 +57,15 @@ async def _fetch_pools_page(dex_id: str, page: int) -> list[dict]:
     able to exhaust the ~30/min the whole process shares — hence the shared gate
     rather than a session of its own.
     """
-    from condor.pool_data import gecko_request
+    from condor.pool_data import GeckoPriority, gecko_priority, gecko_request
 
     try:
-        body = await gecko_request(
-            "GET",
-            f"networks/{NETWORK}/dexes/{dex_id}/pools",
-            params={"page": str(page)},
-        )
+        with gecko_priority(GeckoPriority.BACKGROUND):
+            body = await gecko_request(
+                "GET",
+                f"networks/{NETWORK}/dexes/{dex_id}/pools",
+                params={"page": str(page)},
+            )
         return body.get("data", [])
     except Exception as e:
         logger.warning(f"GeckoTerminal {dex_id} p{page} failed: {e}")
@@ -183,7 +186,7 @@ def _parse_pool(raw: dict) -> dict | None:
     }
 
 
-def _build_chart(top: list[dict], sort_by: str) -> tuple[bytes | None, any]:
+async def _build_chart(top: list[dict], sort_by: str) -> tuple[bytes | None, any]:
     try:
         import plotly.graph_objects as go
     except ImportError:
@@ -289,10 +292,7 @@ def _build_chart(top: list[dict], sort_by: str) -> tuple[bytes | None, any]:
         ),
     )
 
-    buf = io.BytesIO()
-    fig.write_image(buf, format="png", scale=2)
-    buf.seek(0)
-    return buf.getvalue(), fig
+    return await render_png(fig), fig
 
 
 async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
@@ -365,7 +365,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
 
     report_text = "\n".join(lines)
 
-    chart_bytes, plotly_fig = _build_chart(top, config.sort_by)
+    chart_bytes, plotly_fig = await _build_chart(top, config.sort_by)
 
     chat_id = getattr(context, "_chat_id", None)
     if chart_bytes and chat_id and context.bot:
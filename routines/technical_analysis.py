@@ -13,6 +13,7 @@ from plotly.subplots import make_subplots
 from pydantic import BaseModel, Field
 from telegram.ext import ContextTypes
 
+from condor.chart_render import render_png
 from config_manager import get_client
 from routines.base import RoutineResult
 
@@ -240,7 +241,7 @@ def suggest_grid(
 # ---------------------------------------------------------------------------
 
 
-def generate_chart(
+async def generate_chart(
     df: pd.DataFrame,
     macd_line: pd.Series,
     signal_line: pd.Series,
@@ -479,10 +480,7 @@ def generate_chart(
     for ann in fig.layout.annotations:
         ann.font = dict(color="#aaa", size=11)
 
-    buf = io.BytesIO()
-    fig.write_image(buf, format="png", scale=2)
-    buf.seek(0)
-    return buf, fig
+    return io.BytesIO(await render_png(fig)), fig
 
 
 # ---------------------------------------------------------------------------
@@ -714,7 +712,7 @@ async def run(config: Config, context: ContextTypes.DEFAULT_TYPE) -> str:
     plotly_fig = None
     if config.send_chart:
         try:
-            buf, plotly_fig = generate_chart(
+            buf, plotly_fig = await generate_chart(
                 df,
                 macd_line,
                 signal_line,
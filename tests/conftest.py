@@ -1,6 +1,7 @@
 """Test helpers shared across the suite."""
 
 import importlib.util
+import os
 import sys
 
 import pytest
@@ -31,8 +32,29 @@ def load_shared_routine(name: str):
     return module
 
 
+# Wall-clock benchmarks assert that one path beats another by a margin, which a
+# loaded CI runner cannot promise; they run only when asked for.
+_BENCHMARKS_ENV = "CONDOR_BENCHMARKS"
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        f"benchmark: a wall-clock benchmark, run only with {_BENCHMARKS_ENV}=1",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get(_BENCHMARKS_ENV):
+        return
+    skip = pytest.mark.skip(reason=f"benchmark: set {_BENCHMARKS_ENV}=1 to run")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
 @pytest.fixture(autouse=True)
-def _reset_gecko_throttle():
+def _reset_gecko_throttle(_isolated_pool_cache):
     """Give every test the full GeckoTerminal budget.
 
     The limiter is process-wide and window-based on real time, so without this a
@@ -57,3 +79,54 @@ def _isolated_notification_store(tmp_path, monkeypatch):
     from condor import notifications
 
     monkeypatch.setattr(notifications, "_FILE", tmp_path / "notifications.json")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_candle_store(tmp_path, monkeypatch):
+    """Keep the candle store out of the developer's ``data/`` directory.
+
+    Every chart backfill and candle route goes through ``condor.candle_store``;
+    without this, one test's candles would answer the next test's request from
+    disk, and a test run would seed the running install's store.
+    """
+    from condor import candle_store
+
+    monkeypatch.setattr(candle_store, "_DB_PATH", tmp_path / "candles.sqlite")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_chart_cache(tmp_path, monkeypatch):
+    """Keep rendered charts out of the developer's ``data/`` directory.
+
+    ``render_png`` answers a figure it has seen from ``condor.chart_cache``, so a
+    shared cache would let one test's image answer the next test's render.
+    """
+    from condor import chart_cache
+
+    monkeypatch.setattr(chart_cache, "_DIR", tmp_path / "chart_cache")
+    chart_cache.reset_chart_cache()
+    yield
+    chart_cache.reset_chart_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_pool_cache(tmp_path_factory, monkeypatch):
+    """Keep ``pool_data``'s persisted lookups out of the real ``data/`` store.
+
+    The token, pool and page caches write through to ``condor.pool_cache`` and
+    read it back on a miss, so a shared file would let one test's answers leak
+    into the next one's "cold" cache — and into the running install's.
+    """
+    from condor import pool_cache
+
+    path = tmp_path_factory.mktemp("pool_cache") / "pool_cache.sqlite"
+    monkeypatch.setattr(pool_cache, "_DB_PATH", path)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _isolated_archived_trades(tmp_path, monkeypatch):
+    """Keep downloaded archive trades out of the developer's ``data/`` directory."""
+    from condor import archived_trades
+
+    monkeypatch.setattr(archived_trades, "_DIR", tmp_path / "archived_trades")
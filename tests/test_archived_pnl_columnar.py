@@ -0,0 +1,166 @@
+"""The columnar PnL engine (``condor.archived_pnl.compute_pnl``).
+
+An archived bot's PnL was a Python loop over every trade, run on the event
+loop: a market maker's few hundred thousand fills held every other user for
+seconds per report. ``compute_pnl`` pulls the trades into NumPy columns once
+and computes each pair's inventory, cost basis and realized PnL as prefix
+scans. A :class:`PnlCheckpoint` lets trades appended to a history cost only
+themselves.
+
+The per-trade walk is the reference: every result here is checked against it.
+"""
+
+import json
+import random
+import time
+
+import pytest
+
+from condor import archived_pnl
+from condor.archived_pnl import (
+    CheckpointMismatch,
+    PnlCheckpoint,
+    _calculate_pnl_average_cost,
+    _calculate_pnl_open_close,
+    _timestamp_sort_key,
+    compute_pnl,
+)
+from tests.test_archived_pnl_characterization import SCENARIOS
+
+
+def _walk(trades):
+    """The per-trade reference, in the mode ``calculate_pnl_from_trades`` picks."""
+    positions = {str(t.get("position") or "").upper() for t in trades}
+    if "NIL" in positions and not positions & {"OPEN", "CLOSE"}:
+        return _calculate_pnl_average_cost(trades)
+    return _calculate_pnl_open_close(trades)
+
+
+def history(n, mode="NIL", pairs=3, seed=0):
+    """``n`` random fills over ``pairs`` pairs, shuffled, with ms timestamps."""
+    rng = random.Random(seed)
+    return [
+        {
+            "timestamp": 1_760_000_000_000 + rng.randrange(10**9),
+            "trading_pair": f"PAIR{rng.randrange(pairs)}-USDC",
+            "trade_type": rng.choice(["BUY", "SELL"]),
+            "position": mode if mode == "NIL" else rng.choice(["OPEN", "CLOSE"]),
+            "price": rng.uniform(90, 110),
+            "amount": rng.uniform(0.1, 2.0),
+            "trade_fee_in_quote": rng.uniform(0, 0.05),
+        }
+        for _ in range(n)
+    ]
+
+
+def assert_matches(columnar, walked):
+    assert columnar["total_pnl"] == pytest.approx(walked["total_pnl"], rel=1e-9)
+    assert columnar["total_fees"] == walked["total_fees"]
+    assert columnar["total_volume"] == walked["total_volume"]
+    assert list(columnar["pnl_by_pair"]) == list(walked["pnl_by_pair"])
+    assert columnar["pnl_by_pair"] == pytest.approx(walked["pnl_by_pair"], rel=1e-9)
+    got, want = columnar["cumulative_pnl"], walked["cumulative_pnl"]
+    assert [(p["timestamp"], p["pair"]) for p in got] == [
+        (p["timestamp"], p["pair"]) for p in want
+    ]
+    assert [p["pnl"] for p in got] == pytest.approx(
+        [p["pnl"] for p in want], rel=1e-9, abs=1e-9
+    )
+
+
+@pytest.mark.parametrize("name", [n for n in SCENARIOS if SCENARIOS[n]])
+def test_every_characterization_scenario_matches_the_walk(name):
+    trades = SCENARIOS[name]
+
+    assert_matches(compute_pnl(trades)[0].as_dict(), _walk(trades))
+
+
+@pytest.mark.parametrize("mode", ["NIL", "OPEN/CLOSE"])
+@pytest.mark.parametrize("seed", range(3))
+def test_a_random_history_matches_the_walk(mode, seed):
+    trades = history(3000, mode, seed=seed)
+
+    assert_matches(compute_pnl(trades)[0].as_dict(), _walk(trades))
+
+
+def test_a_long_history_goes_through_the_columnar_engine(monkeypatch):
+    trades = history(archived_pnl.COLUMNAR_MIN_TRADES)
+    calls = []
+    monkeypatch.setattr(
+        archived_pnl, "compute_pnl", lambda t: calls.append(t) or compute_pnl(t)
+    )
+
+    result = archived_pnl.calculate_pnl_from_trades(trades)
+    archived_pnl.calculate_pnl_from_trades(trades[:-1])
+
+    assert len(calls) == 1
+    assert_matches(result, _walk(trades))
+
+
+@pytest.mark.parametrize("mode", ["NIL", "OPEN/CLOSE"])
+def test_a_checkpoint_carries_the_history_on(mode):
+    trades = sorted(history(4000, mode, seed=7), key=_timestamp_sort_key)
+    whole, _ = compute_pnl(trades)
+
+    _, checkpoint = compute_pnl(trades[:2500])
+    stored = json.loads(json.dumps(checkpoint.to_dict()))
+    resumed, after = compute_pnl(trades[2500:], PnlCheckpoint.from_dict(stored))
+
+    assert resumed.total_pnl == pytest.approx(whole.total_pnl, rel=1e-9)
+    assert resumed.total_fees == pytest.approx(whole.total_fees, rel=1e-12)
+    assert resumed.pnl_by_pair == pytest.approx(whole.pnl_by_pair, rel=1e-9)
+    assert list(resumed.pnl_by_pair) == list(whole.pnl_by_pair)
+    assert resumed.point_pnl == pytest.approx(whole.point_pnl[-1500:], rel=1e-9)
+    assert after.trades == 4000 and checkpoint.trades == 2500, "not mutated"
+
+
+def test_trades_that_cannot_follow_a_checkpoint_are_refused():
+    trades = sorted(history(100), key=_timestamp_sort_key)
+    _, checkpoint = compute_pnl(trades[50:])
+
+    with pytest.raises(CheckpointMismatch, match="before the checkpoint"):
+        compute_pnl(trades[:50], checkpoint)
+    perp = dict(trades[-1], timestamp=trades[-1]["timestamp"] + 1, position="OPEN")
+    with pytest.raises(CheckpointMismatch, match="accounting mode"):
+        compute_pnl([perp], checkpoint)
+
+
+def test_buys_and_sells_are_counted():
+    trades = history(500, seed=3)
+
+    result, _ = compute_pnl(trades)
+
+    buys = sum(t["trade_type"] == "BUY" for t in trades)
+    assert (result.buy_count, result.sell_count) == (buys, 500 - buys)
+
+
+def _best(fn, repeats):
+    """The fastest of ``repeats`` timed calls, in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", [10_000, 100_000, 1_000_000])
+def test_benchmark_archived_pnl(size):
+    trades = history(size, seed=size)
+    appended = history(100, seed=1)
+    for trade in appended:
+        trade["timestamp"] += 10**10
+    _, checkpoint = compute_pnl(trades)
+    repeats = 3 if size <= 100_000 else 1
+
+    walked = _best(lambda: _walk(trades), repeats)
+    columnar = _best(lambda: compute_pnl(trades), repeats)
+    resumed = _best(lambda: compute_pnl(appended, checkpoint), 3)
+
+    print(
+        f"\n{size} trades: {walked * 1e3:.0f}ms walked -> {columnar * 1e3:.0f}ms "
+        f"columnar; 100 more on a checkpoint {resumed * 1e3:.2f}ms"
+    )
+    assert columnar < walked
+    assert resumed < columnar / 5
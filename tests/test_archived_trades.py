@@ -0,0 +1,408 @@
+"""Archived trades fetched several pages at a time, and kept on disk.
+
+Every archived flow paged through a database's trades 500 at a time, one round
+trip after another, and every view of the same archive paid them all again.
+``collect_offset_pages`` keeps an adaptive window of page requests in flight and
+reassembles them in offset order. ``condor.archived_trades`` stores a trade set
+it downloaded in full, because an archived database never changes.
+"""
+
+import asyncio
+import math
+import random
+import time
+
+import pytest
+
+from condor import archived_trades
+from condor.fetchers._pagination import OFFSET_MAX_CONCURRENCY, collect_offset_pages
+from condor.web.routes import archived as archived_routes
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _rows(result):
+    return result.get("trades", []) if isinstance(result, dict) else []
+
+
+class OffsetListing:
+    """An offset-addressed endpoint over ``size`` rows, with a latency per page.
+
+    Records the offsets asked for and the most requests it had in flight.
+    ``failures`` maps an offset to how often it fails.
+    """
+
+    def __init__(self, size, latency=0.01, failures=None, rows=None):
+        self.rows = rows if rows is not None else [{"id": n} for n in range(size)]
+        self.latency = latency
+        self.failures = dict(failures or {})
+        self.offsets = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, db_path=None, limit=500, offset=0):
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            latency = self.latency(offset) if callable(self.latency) else self.latency
+            await asyncio.sleep(latency)
+        finally:
+            self.in_flight -= 1
+        if self.failures.get(offset):
+            self.failures[offset] -= 1
+            raise ConnectionError(f"page at {offset} failed")
+        return {"trades": self.rows[offset : offset + limit]}
+
+
+def collect(listing, **kwargs):
+    kwargs.setdefault("page_size", 100)
+    kwargs.setdefault("max_items", 10**9)
+    return run(collect_offset_pages(listing, _rows, **kwargs))
+
+
+def test_pages_that_land_out_of_order_come_back_in_order():
+    rng = random.Random(4)
+    listing = OffsetListing(2345, latency=lambda offset: rng.uniform(0, 0.02))
+
+    rows = collect(listing)
+
+    assert rows == listing.rows
+    assert listing.max_in_flight > 1
+
+
+def test_a_known_total_costs_no_speculative_requests():
+    listing = OffsetListing(1234)
+
+    rows = collect(listing, total=1234)
+
+    assert len(rows) == 1234
+    assert sorted(listing.offsets) == [n * 100 for n in range(13)]
+
+
+def test_a_stale_total_is_walked_past_one_page_at_a_time():
+    listing = OffsetListing(450)
+
+    rows = collect(listing, total=200)
+
+    assert rows == listing.rows
+    assert sorted(listing.offsets) == [0, 100, 200, 300, 400]
+
+
+def test_the_window_grows_to_its_bound_while_pages_come_back_quickly():
+    listing = OffsetListing(5000)
+
+    collect(listing, max_concurrency=4)
+
+    assert listing.max_in_flight == 4
+
+
+def test_a_failed_page_is_retried_once():
+    listing = OffsetListing(1000, failures={300: 1})
+
+    rows = collect(listing)
+
+    assert rows == listing.rows
+    assert listing.offsets.count(300) == 2
+
+
+def test_a_page_that_fails_twice_ends_the_listing_before_it():
+    listing = OffsetListing(1000, failures={300: 2})
+    errors = []
+
+    rows = collect(listing, on_error=lambda offset, e: errors.append(offset))
+
+    assert rows == listing.rows[:300]
+    assert errors == [300]
+
+
+def test_the_cap_ends_the_walk_and_says_so():
+    listing = OffsetListing(1000)
+    truncated = []
+
+    rows = collect(listing, max_items=250, on_truncated=lambda: truncated.append(1))
+
+    assert rows == listing.rows[:250]
+    assert truncated == [1]
+    assert max(listing.offsets) == 200
+
+
+def test_cancelling_the_walk_cancels_the_pages_in_flight():
+    listing = OffsetListing(10_000, latency=0.05)
+
+    async def drive():
+        walk = asyncio.ensure_future(
+            collect_offset_pages(listing, _rows, page_size=100, max_items=10**9)
+        )
+        await asyncio.sleep(0.12)
+        walk.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await walk
+        requested = len(listing.offsets)
+        await asyncio.sleep(0.1)
+        return requested
+
+    requested = run(drive())
+
+    assert listing.in_flight == 0
+    assert len(listing.offsets) == requested < 100, "nothing requested after"
+
+
+# ── The local store ──
+
+
+class ArchivedBots:
+    def __init__(self, listing):
+        self.get_database_trades = listing
+
+
+class Client:
+    def __init__(self, listing, base_url="http://hb:8000"):
+        self.base_url = base_url
+        self.archived_bots = ArchivedBots(listing)
+
+
+def trade(n):
+    """A trade row with every value shape the store has to give back."""
+    row = {
+        "timestamp": 1_760_000_000_000 + n,
+        "trading_pair": "SOL-USDC",
+        "trade_type": "BUY" if n % 2 else "SELL",
+        "price": 100.0 + n / 7,
+        "amount": 1.5,
+        "trade_fee_in_quote": None if n % 3 else 0.01,
+        "fee_paid": {"SOL": 0.001},
+        "is_maker": bool(n % 2),
+    }
+    if n % 5:
+        row["position"] = "NIL"
+    return row
+
+
+def test_a_complete_download_is_read_back_from_disk():
+    listing = OffsetListing(1200, rows=[trade(n) for n in range(1200)])
+    client = Client(listing)
+
+    first, truncated = run(archived_trades.fetch_archived_trades(client, "bot.sqlite"))
+    requests = len(listing.offsets)
+    again, _ = run(archived_trades.fetch_archived_trades(client, "bot.sqlite"))
+
+    assert first == listing.rows and not truncated
+    assert again == first
+    assert [type(v) for v in again[3].values()] == [type(v) for v in first[3].values()]
+    assert len(listing.offsets) == requests, "the second read made no request"
+
+
+def test_a_capped_read_of_a_stored_set_is_truncated():
+    listing = OffsetListing(1200)
+    client = Client(listing)
+    run(archived_trades.fetch_archived_trades(client, "bot.sqlite"))
+
+    rows, truncated = run(
+        archived_trades.fetch_archived_trades(client, "bot.sqlite", max_trades=1000)
+    )
+
+    assert len(rows) == 1000 and truncated
+
+
+@pytest.mark.parametrize(
+    "client, max_trades",
+    [
+        (Client(OffsetListing(1200), base_url=""), None),
+        (Client(OffsetListing(1200)), 1000),
+        (Client(OffsetListing(1200, failures={500: 2})), None),
+    ],
+    ids=["unidentified server", "capped", "failed page"],
+)
+def test_an_incomplete_or_unkeyed_download_is_not_stored(client, max_trades):
+    run(
+        archived_trades.fetch_archived_trades(
+            client, "bot.sqlite", max_trades=max_trades
+        )
+    )
+
+    assert not list(archived_trades._DIR.glob("*.npz"))
+
+
+def test_a_damaged_file_is_downloaded_again():
+    listing = OffsetListing(700)
+    client = Client(listing)
+    run(archived_trades.fetch_archived_trades(client, "bot.sqlite"))
+    archived_trades._path(client.base_url, "bot.sqlite").write_bytes(b"not a zip")
+
+    rows, _ = run(archived_trades.fetch_archived_trades(client, "bot.sqlite"))
+
+    assert rows == listing.rows
+
+
+# ── The web route ──
+
+
+class PerformanceBackend:
+    def __init__(self, listing):
+        self.get_database_trades = listing
+
+    async def get_database_summary(self, db_path):
+        return {"bot_name": "mm", "total_trades": 100_000}
+
+    async def get_database_executors(self, db_path):
+        return {"executors": []}
+
+
+class RouteClient:
+    def __init__(self, listing):
+        self.archived_bots = PerformanceBackend(listing)
+
+
+@pytest.fixture
+def routes():
+    archived_routes._performance_cache.clear()
+    archived_routes._performance_inflight.clear()
+    yield archived_routes
+    archived_routes._performance_cache.clear()
+    archived_routes._performance_inflight.clear()
+    archived_routes._performance_waiters.clear()
+
+
+def test_the_last_caller_leaving_cancels_the_download(routes):
+    listing = OffsetListing(100_000, latency=0.05)
+    client = RouteClient(listing)
+
+    async def drive():
+        callers = [
+            asyncio.ensure_future(
+                routes._fetch_and_cache_performance(client, "srv", "db.sqlite")
+            )
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.1)
+        callers[0].cancel()
+        await asyncio.sleep(0.1)
+        still_running = not routes._performance_inflight[("srv", "db.sqlite")].done()
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        requested = len(listing.offsets)
+        await asyncio.sleep(0.1)
+        return still_running, requested
+
+    still_running, requested = run(drive())
+
+    assert still_running, "one caller leaving kept the download for the other"
+    assert listing.in_flight == 0
+    assert len(listing.offsets) == requested < 200, "nothing requested after"
+    assert not routes._performance_inflight and not routes._performance_waiters
+
+
+def test_a_request_whose_client_disconnects_stops_waiting(routes, monkeypatch):
+    monkeypatch.setattr(routes, "_DISCONNECT_POLL", 0.02)
+    listing = OffsetListing(100_000, latency=0.05)
+    client = RouteClient(listing)
+
+    class Request:
+        def __init__(self):
+            self.polls = 0
+
+        async def is_disconnected(self):
+            self.polls += 1
+            return self.polls > 2
+
+    async def drive():
+        with pytest.raises(routes.HTTPException) as excinfo:
+            await routes._while_connected(
+                Request(), routes._fetch_and_cache_performance(client, "srv", "db")
+            )
+        await asyncio.sleep(0.01)
+        return excinfo.value.status_code
+
+    assert run(drive()) == 499
+    assert listing.in_flight == 0 and not routes._performance_inflight
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", [50_000])
+def test_benchmark_an_archive_download(size):
+    latency = 0.01
+    pages = math.ceil(size / archived_trades.TRADES_PAGE)
+    client = Client(OffsetListing(size, latency=latency))
+
+    async def drive():
+        start = time.perf_counter()
+        await archived_trades.fetch_archived_trades(client, "bot.sqlite", total=size)
+        windowed = time.perf_counter() - start
+        start = time.perf_counter()
+        await archived_trades.fetch_archived_trades(client, "bot.sqlite")
+        stored = time.perf_counter() - start
+        return windowed, stored
+
+    windowed, stored = run(drive())
+    sequential = (pages + 1) * latency
+    print(
+        f"\n{size} trades, {pages} pages at {latency * 1e3:.0f}ms: "
+        f"~{sequential * 1e3:.0f}ms one page at a time -> {windowed * 1e3:.0f}ms "
+        f"{OFFSET_MAX_CONCURRENCY} at a time -> {stored * 1e3:.0f}ms from disk"
+    )
+    assert windowed < sequential / 3
+    assert stored < windowed
+
+
+def test_an_on_error_that_raises_fails_the_download():
+    client = Client(OffsetListing(1200, failures={500: 2}))
+
+    def fail(offset, error):
+        raise error
+
+    with pytest.raises(ConnectionError):
+        run(archived_trades.fetch_archived_trades(client, "bot.sqlite", on_error=fail))
+
+    assert not list(archived_trades._DIR.glob("*.npz"))
+
+
+# ── The saved report ──
+
+
+class ReportBackend:
+    def __init__(self, orders, total_trades="unknown"):
+        self.get_database_trades = OffsetListing(700)
+        self.get_database_orders = orders
+        self.total_trades = total_trades
+
+    async def get_database_summary(self, db_path):
+        return {"bot_name": "mm", "total_trades": self.total_trades}
+
+    async def get_database_performance(self, db_path):
+        return None
+
+    async def get_database_executors(self, db_path):
+        return {"executors": []}
+
+
+class Orders(OffsetListing):
+    async def __call__(self, db_path=None, limit=500, offset=0):
+        result = await super().__call__(db_path, limit, offset)
+        return {"orders": result["trades"]}
+
+
+def _save_report(backend, tmp_path, monkeypatch):
+    from handlers.bots import archived_report
+
+    monkeypatch.setattr(archived_report, "REPORTS_DIR", tmp_path)
+    client = Client(None)
+    client.archived_bots = backend
+    return run(archived_report.save_full_report(client, "bot.sqlite", False))
+
+
+def test_a_report_whose_order_page_fails_twice_is_not_saved(tmp_path, monkeypatch):
+    backend = ReportBackend(Orders(1200, failures={500: 2}), total_trades=700)
+
+    assert _save_report(backend, tmp_path, monkeypatch) == (None, None)
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_a_report_ignores_a_count_that_is_not_a_number(tmp_path, monkeypatch):
+    backend = ReportBackend(Orders(1200), total_trades="unknown")
+
+    json_path, _ = _save_report(backend, tmp_path, monkeypatch)
+
+    assert json_path is not None
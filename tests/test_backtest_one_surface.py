@@ -165,7 +165,7 @@ def stubs(monkeypatch):
     """Stub the chart renderer and the report builder; record what they were asked."""
     calls = {"charts": 0, "render_png": None}
 
-    def fake_generate_chart(*args, render_png=True, **kwargs):
+    async def fake_generate_chart(*args, render_png=True, **kwargs):
         calls["charts"] += 1
         calls["render_png"] = render_png
         # Mirrors the real contract, pinned against plotly in
@@ -365,8 +365,10 @@ def test_the_renderer_can_skip_the_png():
     """The real contract behind chart=False: a figure, no image bytes."""
     candle_df = bc._build_candle_df(_PAYLOAD["processed_data"])
 
-    buf, fig = bc.generate_chart(
-        candle_df, [], [], _PAYLOAD["results"], bc.Config(), render_png=False
+    buf, fig = asyncio.run(
+        bc.generate_chart(
+            candle_df, [], [], _PAYLOAD["results"], bc.Config(), render_png=False
+        )
     )
 
     assert buf is None
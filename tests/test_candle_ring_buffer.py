@@ -0,0 +1,232 @@
+"""The array-backed candle ring buffer behind every candle channel.
+
+``_CandleBuffer`` used to keep a ``dict[timestamp, candle]`` and sort it on
+every snapshot and every eviction. It now keeps the candles in ascending
+order behind an ``array('d')`` of timestamps, so the live candle updates in
+place, eviction advances a start offset, and ``get_sorted`` / ``get_columns``
+read straight through. The
+reference model below is the old dict buffer; the buffer must agree with it
+for any mix of live ticks, late candles and backfills.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+import pytest
+
+from condor.web.streams.candles import _CANDLE_FIELDS, _CandleBuffer
+from condor.web.ws_manager import WebSocketManager, _Connection, encode_frame
+
+
+def _candle(ts: float, close: float = 1.0) -> dict:
+    return {
+        "timestamp": float(ts),
+        "open": close - 0.5,
+        "high": close + 1.0,
+        "low": close - 1.0,
+        "close": close,
+        "volume": close * 10,
+    }
+
+
+class _DictBuffer:
+    """The pre-array implementation, as the reference model."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.data: dict[float, dict] = {}
+
+    def upsert_many(self, candles):
+        for c in candles:
+            self.data[c["timestamp"]] = c
+        for ts in sorted(self.data)[: max(len(self.data) - self.max_size, 0)]:
+            del self.data[ts]
+
+    def get_sorted(self):
+        return sorted(self.data.values(), key=lambda c: c["timestamp"])
+
+
+def test_live_ticks_update_in_place_and_open_new_candles():
+    buf = _CandleBuffer("1m")
+    buf.upsert(_candle(60, close=1.0))
+    buf.upsert(_candle(60, close=2.0))  # same candle, still forming
+    buf.upsert(_candle(120, close=3.0))
+
+    assert buf.size == 2
+    assert buf.latest_timestamp == 120
+    assert [c["close"] for c in buf.get_sorted()] == [2.0, 3.0]
+    assert buf.get(60) == _candle(60, close=2.0)
+    assert buf.get(90) is None
+
+
+def test_eviction_keeps_the_newest_max_size_candles():
+    buf = _CandleBuffer("1m", 3600)  # 60 slots, floored at 200
+    for i in range(1000):
+        buf.upsert(_candle(i * 60, close=i))
+
+    assert buf.size == buf.max_size == 200
+    closes = [c["close"] for c in buf.get_sorted()]
+    assert closes == list(range(800, 1000))
+    # The dead prefix is compacted, not kept forever.
+    assert len(buf._rows) < 2 * buf.max_size
+
+
+def test_shrinking_the_duration_evicts_the_oldest():
+    buf = _CandleBuffer("1m", 3 * 86400)
+    buf.upsert_many([_candle(i * 60) for i in range(1000)])
+    buf.set_duration(3600)
+    assert buf.size == 200
+    assert buf.get_sorted()[0]["timestamp"] == 800 * 60
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_the_dict_buffer_for_any_arrival_order(seed):
+    rng = random.Random(seed)
+    buf = _CandleBuffer("1m", 300 * 60)
+    ref = _DictBuffer(buf.max_size)
+    for _ in range(300):
+        kind = rng.random()
+        if kind < 0.6:  # live tick on (or just past) the newest candle
+            latest = int(buf.latest_timestamp // 60)
+            batch = [_candle((latest + rng.randint(0, 1)) * 60, rng.random())]
+        elif kind < 0.9:  # small REST poll overlapping the tail
+            start = rng.randint(0, 600)
+            batch = [_candle((start + k) * 60, rng.random()) for k in range(5)]
+        else:  # backfill of a large, unordered window
+            start = rng.randint(0, 600)
+            batch = [_candle((start + k) * 60, rng.random()) for k in range(200)]
+            rng.shuffle(batch)
+        if len(batch) == 1:
+            buf.upsert(batch[0])
+        else:
+            buf.upsert_many(batch)
+        ref.upsert_many(batch)
+
+    assert buf.get_sorted() == ref.get_sorted()
+    assert buf.size == len(ref.data)
+    assert buf.latest_timestamp == max(ref.data)
+
+
+def test_columns_are_the_sorted_candles_transposed():
+    buf = _CandleBuffer("5m")
+    buf.upsert_many([_candle(t * 300, close=t) for t in (3, 1, 2)])
+
+    columns = buf.get_columns()
+    assert list(columns) == list(_CANDLE_FIELDS)
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    assert rows == buf.get_sorted()
+
+
+class _FakeWS:
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
+
+
+class _AllowAll:
+    def has_server_access(self, user_id, server_name):
+        return True
+
+
+def test_columnar_subscriber_gets_columnar_snapshots(monkeypatch):
+    import config_manager
+
+    monkeypatch.setattr(config_manager, "get_config_manager", lambda: _AllowAll())
+    channel = "candles:srv:binance:BTC-USDT:1m"
+    manager = WebSocketManager()
+    manager._ensure_stream = lambda prefix, ch: None
+    buf = _CandleBuffer("1m", 3600)
+    buf.upsert_many([_candle(i * 60, close=i) for i in range(3)])
+    manager._candle_buffers[channel] = buf
+
+    rows_ws, cols_ws = _FakeWS(), _FakeWS()
+    rows_conn, cols_conn = _Connection(rows_ws, 1), _Connection(cols_ws, 2)
+    manager._connections.extend([rows_conn, cols_conn])
+
+    async def scenario():
+        await manager.handle_message(
+            rows_conn, json.dumps({"action": "subscribe", "channel": channel})
+        )
+        await manager.handle_message(
+            cols_conn,
+            json.dumps(
+                {"action": "subscribe", "channel": channel, "format": "columnar"}
+            ),
+        )
+        # Growing the duration re-broadcasts the snapshot in each format.
+        manager._backfill_candles = lambda ch: asyncio.sleep(0)
+        await manager._handle_candle_duration_change(rows_conn, channel, 7 * 86400)
+        for conn in (rows_conn, cols_conn):
+            await conn.outbox.wait_idle()
+
+    asyncio.run(scenario())
+
+    assert [f["data"]["type"] for f in rows_ws.sent] == ["candles", "candles"]
+    assert [f["data"]["type"] for f in cols_ws.sent] == [
+        "candles_columnar",
+        "candles_columnar",
+    ]
+    assert rows_ws.sent[0]["data"]["data"] == buf.get_sorted()
+    assert cols_ws.sent[-1]["data"]["data"] == buf.get_columns()
+
+
+@pytest.mark.benchmark
+def test_benchmark_3_day_1m_buffer():
+    """A full 3-day 1m buffer: per-tick and per-subscribe cost, dict vs ring."""
+    n = 3 * 1440
+    history = [_candle(i * 60, close=i) for i in range(n)]
+
+    def dict_tick(data: dict, ts: float) -> None:
+        # The old upsert (sort-based eviction) plus the poll's latest_timestamp.
+        data[ts] = _candle(ts)
+        excess = len(data) - n
+        if excess > 0:
+            for k in sorted(data)[:excess]:
+                del data[k]
+        max(data)
+
+    def ring_tick(buf: _CandleBuffer, ts: float) -> None:
+        buf.upsert(_candle(ts))
+        buf.latest_timestamp
+
+    def per_call(fn, rounds=200):
+        start = time.perf_counter()
+        for k in range(rounds):
+            fn(n + k // 4)  # four ticks per new candle
+        return (time.perf_counter() - start) / rounds
+
+    data = {c["timestamp"]: c for c in history}
+    buf = _CandleBuffer("1m", 3 * 86400)
+    buf.upsert_many(history)
+
+    tick_before = per_call(lambda k: dict_tick(data, k * 60))
+    tick_after = per_call(lambda k: ring_tick(buf, k * 60))
+    snap_before = per_call(
+        lambda k: encode_frame(
+            {"type": "candles", "data": sorted(data.values(), key=_by_ts)}
+        ),
+        rounds=20,
+    )
+    snap_after = per_call(
+        lambda k: encode_frame({"type": "candles", "data": buf.get_sorted()}),
+        rounds=20,
+    )
+    rows_text = encode_frame({"type": "candles", "data": buf.get_sorted()})
+    cols_text = encode_frame({"type": "candles_columnar", "data": buf.get_columns()})
+    print(
+        f"\n3-day 1m buffer ({n} candles): "
+        f"tick {tick_before * 1e6:.0f}us -> {tick_after * 1e6:.0f}us, "
+        f"snapshot {snap_before * 1e3:.2f}ms -> {snap_after * 1e3:.2f}ms, "
+        f"wire {len(rows_text)} -> {len(cols_text)} bytes columnar"
+    )
+    assert tick_after * 5 < tick_before
+    assert snap_after < snap_before * 1.5
+    assert len(cols_text) < len(rows_text) * 0.7
+
+
+def _by_ts(c: dict) -> float:
+    return c["timestamp"]
@@ -0,0 +1,141 @@
+"""The on-disk candle store shared by the chart backfills and candle routes.
+
+A range request must only go upstream for what the store has not covered,
+coverage must survive a "restart" (a fresh read of the same file), and the
+forming candle must never mark its range covered — or a live chart would stop
+asking for its tail.
+"""
+
+import asyncio
+import sqlite3
+import time
+
+from condor import candle_store
+
+SERIES = candle_store.series_key("hb", "binance", "BTC-USDT", "1m")
+# A closed, minute-aligned window well in the past.
+T0 = 1_700_000_000.0 - 1_700_000_000.0 % 60
+
+
+def _candle(ts: float, close: float = 1.0) -> dict:
+    return {
+        "timestamp": float(ts),
+        "open": close,
+        "high": close + 1.0,
+        "low": close - 1.0,
+        "close": close,
+        "volume": 10.0,
+    }
+
+
+class _Upstream:
+    """Answers each requested gap with one candle per minute, and records it."""
+
+    def __init__(self):
+        self.calls: list[tuple[float, float]] = []
+
+    async def __call__(self, lo: float, hi: float) -> list[dict]:
+        self.calls.append((lo, hi))
+        first = lo - lo % 60
+        return [_candle(ts) for ts in range(int(first), int(hi) + 1, 60)]
+
+
+def _fetch(upstream, start, end):
+    return asyncio.run(candle_store.fetch_range(SERIES, 60, start, end, upstream))
+
+
+def test_a_repeated_range_is_served_from_disk():
+    upstream = _Upstream()
+    first = _fetch(upstream, T0, T0 + 3600)
+    second = _fetch(upstream, T0, T0 + 3600)
+
+    assert len(upstream.calls) == 1
+    assert second == first
+    assert [c["timestamp"] for c in second] == [T0 + 60 * i for i in range(61)]
+
+
+def test_only_the_missing_gaps_go_upstream():
+    upstream = _Upstream()
+    _fetch(upstream, T0, T0 + 3600)
+    _fetch(upstream, T0 + 7200, T0 + 10800)
+    upstream.calls.clear()
+
+    candles = _fetch(upstream, T0, T0 + 10800)
+
+    assert upstream.calls == [(T0 + 3600, T0 + 7200)]
+    assert [c["timestamp"] for c in candles] == [T0 + 60 * i for i in range(181)]
+    # The three pieces are now one covered range.
+    assert candle_store.gaps(SERIES, T0, T0 + 10800) == []
+
+
+def test_the_forming_candle_does_not_mark_its_range_covered():
+    now = time.time()
+    upstream = _Upstream()
+    _fetch(upstream, now - 600, now)
+    upstream.calls.clear()
+    _fetch(upstream, now - 600, now)
+
+    # The closed part came off disk; only the live tail was asked again.
+    assert len(upstream.calls) == 1
+    lo, hi = upstream.calls[0]
+    assert lo > now - 600 and hi == now
+
+
+def test_an_empty_answer_is_retried_next_time():
+    calls = []
+
+    async def empty(lo, hi):
+        calls.append((lo, hi))
+        return []
+
+    assert _fetch(empty, T0, T0 + 3600) == []
+    assert _fetch(empty, T0, T0 + 3600) == []
+    assert len(calls) == 2
+
+
+class _CappedUpstream(_Upstream):
+    """Answers with only the newest ``cap`` candles, as GeckoTerminal does."""
+
+    def __init__(self, cap):
+        super().__init__()
+        self.cap = cap
+
+    async def __call__(self, lo, hi):
+        return (await super().__call__(lo, hi))[-self.cap :]
+
+
+def test_a_capped_answer_covers_only_the_candles_it_returned():
+    upstream = _CappedUpstream(1000)
+    _fetch(upstream, T0, T0 + 3 * 86400)
+    upstream.calls.clear()
+
+    older_hour = _fetch(upstream, T0 + 3600, T0 + 7200)
+
+    assert upstream.calls == [(T0 + 3600, T0 + 7200)]
+    assert len(older_hour) == 61
+    newest = T0 + 3 * 86400
+    assert candle_store.gaps(SERIES, newest - 999 * 60, newest) == []
+
+
+def test_a_broken_store_degrades_to_a_plain_fetch(monkeypatch):
+    def broken(*a, **kw):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(candle_store, "gaps", broken)
+    upstream = _Upstream()
+
+    candles = _fetch(upstream, T0, T0 + 600)
+
+    assert upstream.calls == [(T0, T0 + 600)]
+    assert len(candles) == 11
+
+
+def test_pruning_keeps_the_newest_candles_and_trims_coverage(monkeypatch):
+    monkeypatch.setattr(candle_store, "MAX_CANDLES_PER_SERIES", 10)
+    upstream = _Upstream()
+    _fetch(upstream, T0, T0 + 3600)
+
+    kept = candle_store.read(SERIES, T0, T0 + 3600, 60)
+    assert [c["timestamp"] for c in kept] == [T0 + 60 * i for i in range(51, 61)]
+    # The pruned head is a gap again, so asking for it re-fetches it.
+    assert candle_store.gaps(SERIES, T0, T0 + 3600) == [(T0, T0 + 60 * 50)]
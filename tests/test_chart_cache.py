@@ -0,0 +1,170 @@
+"""Rendered charts kept by a hash of their figure (``condor.chart_cache``).
+
+A re-opened archived chart, a scheduled routine drawing an unchanged window and
+a config preview redrawn with the same parameters each paid a Chromium round
+trip for a PNG that already existed. ``render_png`` now keys every image by
+the SHA-256 of the figure's JSON, size and scale, and answers a figure it has
+seen from a memory LRU or the disk tier behind it.
+"""
+
+import asyncio
+import os
+import time
+
+import plotly.graph_objects as go
+import pytest
+
+from condor import chart_cache, chart_render
+
+
+def _no_warm():
+    pass
+
+
+def _echo(spec, width, height, scale):
+    return f"png {len(spec)} {width}x{height}@{scale}".encode()
+
+
+def _slow(spec, width, height, scale):
+    time.sleep(0.3)
+    return b"png"
+
+
+def _busy(spec, width, height, scale):
+    deadline = time.perf_counter() + 0.25
+    while time.perf_counter() < deadline:
+        pass
+    return b"png"
+
+
+@pytest.fixture(autouse=True)
+def renderer(monkeypatch):
+    monkeypatch.setattr(chart_render, "_worker_init", _no_warm)
+    monkeypatch.setattr(chart_render, "_worker_render", _echo)
+    chart_render.close_chart_renderer()
+    chart_render.reset_render_stats()
+    yield chart_render
+    chart_render.close_chart_renderer()
+    chart_render.reset_render_stats()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def candles(closes):
+    return go.Figure(go.Scatter(y=list(closes)), layout_title_text="SOL-USDC 1h")
+
+
+def test_the_same_figure_is_rendered_once(renderer):
+    first = run(renderer.render_png(candles([1, 2, 3])))
+    again = run(renderer.render_png(candles([1, 2, 3])))
+
+    assert again == first
+    assert renderer.render_stats()["rendered"] == 1
+    cache = renderer.render_stats()["cache"]
+    assert cache["memory_hits"] == 1 and cache["misses"] == 1
+    assert cache["hit_rate"] == 0.5
+
+
+def test_new_data_or_a_new_size_is_a_new_image(renderer):
+    run(renderer.render_png(candles([1, 2, 3])))
+    run(renderer.render_png(candles([1, 2, 4])))
+    run(renderer.render_png(candles([1, 2, 3]), width=900, height=700))
+    run(renderer.render_png(candles([1, 2, 3]), scale=1))
+
+    assert renderer.render_stats()["rendered"] == 4
+
+
+def test_the_disk_tier_answers_after_a_restart(renderer):
+    png = run(renderer.render_png(candles([5, 6])))
+    chart_cache.reset_chart_cache()  # a new process: memory is gone
+
+    again = run(renderer.render_png(candles([5, 6])))
+
+    assert again == png
+    assert renderer.render_stats()["rendered"] == 1
+    assert chart_cache.chart_cache_stats()["disk_hits"] == 1
+
+
+def test_callers_asking_for_one_chart_at_once_share_its_render(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _slow)
+
+    async def drive():
+        return await asyncio.gather(
+            *(renderer.render_png(candles([7, 8])) for _ in range(4))
+        )
+
+    assert run(drive()) == [b"png"] * 4
+    stats = renderer.render_stats()
+    assert stats["rendered"] == 1 and stats["joined"] == 3
+
+
+def test_the_memory_tier_drops_its_least_recently_used_image(monkeypatch):
+    monkeypatch.setattr(chart_cache, "MEMORY_BYTES", 250)
+
+    async def drive():
+        for key in ("a", "b"):
+            await chart_cache.put_chart(key * 64, b"x" * 100)
+        await chart_cache.get_chart("a" * 64)  # "b" is now the oldest
+        await chart_cache.put_chart("c" * 64, b"x" * 100)
+
+    run(drive())
+
+    assert list(chart_cache._memory) == ["a" * 64, "c" * 64]
+    assert chart_cache.chart_cache_stats()["evicted"] == 1
+    assert run(chart_cache.get_chart("b" * 64)) == b"x" * 100, "still on disk"
+
+
+def test_the_disk_tier_is_swept_past_its_size(monkeypatch):
+    monkeypatch.setattr(chart_cache, "DISK_BYTES", 250)
+    monkeypatch.setattr(chart_cache, "_SWEEP_EVERY", 1)
+
+    async def drive():
+        for n, key in enumerate(("a", "b", "c")):
+            await chart_cache.put_chart(key * 64, b"x" * 100)
+            used = time.time() - 100 + n
+            os.utime(chart_cache._path(key * 64), (used, used))
+
+    run(drive())
+    run(chart_cache.put_chart("d" * 64, b"x" * 100))
+
+    on_disk = sorted(p.name[0] for p in chart_cache._DIR.glob("*/*.png"))
+    assert on_disk == ["c", "d"]
+
+
+def test_a_disk_that_cannot_be_written_leaves_the_memory_tier(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(chart_cache, "_DIR", blocker)
+
+    run(chart_cache.put_chart("e" * 64, b"png"))
+
+    assert run(chart_cache.get_chart("e" * 64)) == b"png"
+    assert run(chart_cache.get_chart("f" * 64)) is None
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("repeats", [20])
+def test_benchmark_a_repeated_chart(renderer, monkeypatch, repeats):
+    monkeypatch.setattr(renderer, "_worker_render", _busy)
+    figure = candles(range(500))
+
+    async def drive():
+        await renderer.render_png(go.Figure())  # the workers' start-up
+        start = time.perf_counter()
+        await renderer.render_png(figure)
+        rendered = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeats):
+            await renderer.render_png(figure)
+        cached = (time.perf_counter() - start) / repeats
+        return rendered, cached
+
+    rendered, cached = run(drive())
+    print(
+        f"\nrepeated chart: {rendered * 1e3:.1f}ms rendered -> "
+        f"{cached * 1e3:.3f}ms from the cache"
+    )
+    assert renderer.render_stats()["rendered"] == 2
+    assert cached < rendered / 10
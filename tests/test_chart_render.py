@@ -0,0 +1,250 @@
+"""Charts rendered in worker processes (``condor.chart_render``).
+
+Every chart was ``fig.write_image`` inside an async handler: Kaleido's render ran
+on the event loop and held every other user, and the server poller, until it
+finished. ``render_png`` hands the figure to a pool of worker processes, bounded
+and queued on the loop, with a timeout that restarts a stuck worker and a retry
+past one that died.
+
+These tests swap the worker's render for the functions below, as this
+environment has no Chromium for Kaleido to drive; what they check is the pool
+around the render.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+
+import plotly.graph_objects as go
+import pytest
+from fastapi import HTTPException
+
+from condor import chart_render
+from condor.web.models import WebUser
+from condor.web.routes import admin as admin_routes
+
+ADMIN = WebUser(id=1, username="root", role="admin")
+USER = WebUser(id=222, username="u", first_name="U", role="user")
+
+_FLAG = "CONDOR_TEST_CHART_CRASH_FLAG"
+
+
+# ── Worker stand-ins: module-level, so a spawned worker can import them ──
+
+
+def _no_warm():
+    pass
+
+
+def _echo(spec, width, height, scale):
+    return f"png {width}x{height}@{scale} pid={os.getpid()}".encode()
+
+
+def _slow(spec, width, height, scale):
+    time.sleep(0.3)
+    return b"png"
+
+
+def _busy(spec, width, height, scale):
+    """CPU-bound for about as long as a mid-sized chart takes Kaleido."""
+    deadline = time.perf_counter() + 0.25
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return b"png"
+
+
+def _hang(spec, width, height, scale):
+    time.sleep(60)
+    return b"never"
+
+
+def _crash(spec, width, height, scale):
+    os._exit(1)
+
+
+def _crash_once(spec, width, height, scale):
+    flag = os.environ[_FLAG]
+    if not os.path.exists(flag):
+        open(flag, "w").close()
+        os._exit(1)
+    return b"png after a crash"
+
+
+def _bad_figure(spec, width, height, scale):
+    raise ValueError("bad figure")
+
+
+@pytest.fixture(autouse=True)
+def renderer(monkeypatch):
+    monkeypatch.setattr(chart_render, "_worker_init", _no_warm)
+    monkeypatch.setattr(chart_render, "_worker_render", _echo)
+    chart_render.close_chart_renderer()
+    chart_render.reset_render_stats()
+    yield chart_render
+    chart_render.close_chart_renderer()
+    chart_render.reset_render_stats()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+_figures = itertools.count()
+
+
+def _figure():
+    """A figure no other test has rendered, so no render is a cache hit."""
+    return go.Figure(layout_title_text=f"chart {next(_figures)}")
+
+
+async def _max_stall(coro, tick=0.005):
+    """Await ``coro`` while a ticker runs; the longest the loop went unserved."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set():
+            await asyncio.sleep(tick)
+            now = time.perf_counter()
+            gaps.append(now - last - tick)
+            last = now
+
+    watch = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)  # the ticker's first timestamp
+    try:
+        result = await coro
+    finally:
+        done.set()
+        await watch
+    return result, max(gaps, default=0.0)
+
+
+def test_a_figure_is_rendered_in_a_worker_process(renderer):
+    png = run(renderer.render_png(_figure(), width=900, height=700))
+
+    assert png.startswith(b"png 900x700@2")
+    assert f"pid={os.getpid()}".encode() not in png
+    stats = renderer.render_stats()
+    assert stats["rendered"] == 1 and stats["failed"] == 0 and stats["running"]
+
+
+def test_the_loop_keeps_running_while_a_chart_renders(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _slow)
+
+    async def drive():
+        await renderer.render_png(_figure())  # the workers' start-up
+        return await _max_stall(renderer.render_png(_figure()))
+
+    png, stall = run(drive())
+
+    assert png == b"png"
+    assert stall < 0.1
+
+
+def test_renders_past_the_pool_size_queue_and_are_counted(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _slow)
+
+    async def drive():
+        renders = [
+            asyncio.ensure_future(renderer.render_png(_figure()))
+            for _ in range(renderer.RENDER_WORKERS + 2)
+        ]
+        await asyncio.sleep(0.05)
+        during = renderer.render_stats()
+        await asyncio.gather(*renders)
+        return during
+
+    during = run(drive())
+    after = renderer.render_stats()
+
+    assert during["rendering"] == renderer.RENDER_WORKERS
+    assert during["waiting"] == 2
+    assert after["max_waiting"] == 2
+    assert after["waiting"] == after["rendering"] == 0
+    assert after["rendered"] == renderer.RENDER_WORKERS + 2
+
+
+def test_a_stuck_render_times_out_and_restarts_the_workers(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _hang)
+
+    with pytest.raises(renderer.ChartRenderError, match="timed out"):
+        run(renderer.render_png(_figure(), timeout=0.5))
+    monkeypatch.setattr(renderer, "_worker_render", _echo)
+    png = run(renderer.render_png(_figure()))
+
+    stats = renderer.render_stats()
+    assert png.startswith(b"png")
+    assert stats["timeouts"] == 1 and stats["restarts"] == 1
+    assert stats["failed"] == 1 and stats["rendered"] == 1
+
+
+def test_a_render_that_kills_its_worker_is_retried_once(
+    renderer, monkeypatch, tmp_path
+):
+    monkeypatch.setenv(_FLAG, str(tmp_path / "crashed"))
+    monkeypatch.setattr(renderer, "_worker_render", _crash_once)
+
+    png = run(renderer.render_png(_figure()))
+
+    assert png == b"png after a crash"
+    assert renderer.render_stats()["restarts"] == 1
+
+
+def test_a_render_that_always_kills_its_worker_fails(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _crash)
+
+    with pytest.raises(renderer.ChartRenderError, match="died twice"):
+        run(renderer.render_png(_figure()))
+
+    stats = renderer.render_stats()
+    assert stats["restarts"] == 2 and stats["failed"] == 1
+
+
+def test_a_figure_that_fails_to_render_raises_without_a_restart(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _bad_figure)
+
+    with pytest.raises(ValueError, match="bad figure"):
+        run(renderer.render_png(_figure()))
+
+    stats = renderer.render_stats()
+    assert stats["failed"] == 1 and stats["restarts"] == 0 and stats["running"]
+
+
+def test_only_an_admin_reads_the_render_stats(renderer, monkeypatch):
+    class _ConfigManager:
+        def is_admin(self, user_id):
+            return user_id == ADMIN.id
+
+    monkeypatch.setattr(admin_routes, "get_config_manager", lambda: _ConfigManager())
+    run(renderer.render_png(_figure()))
+
+    body = run(admin_routes.get_chart_stats(user=ADMIN))
+    with pytest.raises(HTTPException) as excinfo:
+        run(admin_routes.get_chart_stats(user=USER))
+
+    assert body["rendered"] == 1 and body["workers"] == renderer.RENDER_WORKERS
+    assert excinfo.value.status_code == 403
+
+
+@pytest.mark.benchmark
+def test_benchmark_event_loop_stall_per_chart(renderer, monkeypatch):
+    monkeypatch.setattr(renderer, "_worker_render", _busy)
+
+    async def inline():
+        _busy(None, None, None, 2)
+
+    async def drive():
+        _, inline_stall = await _max_stall(inline())
+        await renderer.render_png(_figure())  # the workers' start-up
+        _, pooled_stall = await _max_stall(renderer.render_png(_figure()))
+        return inline_stall, pooled_stall
+
+    inline_stall, pooled_stall = run(drive())
+    print(
+        f"\n250ms chart: {inline_stall * 1e3:.1f}ms loop stall rendered inline -> "
+        f"{pooled_stall * 1e3:.2f}ms through the workers"
+    )
+    assert pooled_stall < inline_stall / 5
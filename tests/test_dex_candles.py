@@ -355,10 +355,10 @@ def test_top_pool_fallback_when_the_executors_pool_is_empty(monkeypatch):
 
     async def _fake_top(mint, network, quote):
         assert (mint, quote) == (MINT, "SOL")
-        return "live_pool"
+        return {"address": "live_pool"}
 
     monkeypatch.setattr(dex_candles, "_pool_ohlcv", _fake_ohlcv)
-    monkeypatch.setattr(pool_data, "fetch_token_top_pool", _fake_top)
+    monkeypatch.setattr(pool_data, "fetch_token_top_pool_info", _fake_top)
     candles = run(
         market._fetch_dex_candles(
             "solana-mainnet-beta", "dead_pool", f"{MINT}-SOL", "1m", None, None
@@ -378,10 +378,10 @@ def test_no_fallback_for_a_ticker_base(monkeypatch):
 
     async def _fake_top(*_a, **_k):
         called.append(1)
-        return ""
+        return None
 
     monkeypatch.setattr(dex_candles, "_pool_ohlcv", _fake_ohlcv)
-    monkeypatch.setattr(pool_data, "fetch_token_top_pool", _fake_top)
+    monkeypatch.setattr(pool_data, "fetch_token_top_pool_info", _fake_top)
     assert (
         run(
             market._fetch_dex_candles(
@@ -505,10 +505,10 @@ def test_xrpl_pair_charts_the_pool_found_by_symbol(monkeypatch):
 
     async def _fake_search(base, quote, network):
         assert (base, quote, network) == ("SOLO", "XRP", "xrpl")
-        return "solo_xrp_pool", False
+        return {"address": "solo_xrp_pool"}, False
 
     monkeypatch.setattr(dex_candles, "_pool_ohlcv", _fake_ohlcv)
-    monkeypatch.setattr(pool_data, "fetch_pair_top_pool", _fake_search)
+    monkeypatch.setattr(pool_data, "fetch_pair_top_pool_info", _fake_search)
     candles = run(market._fetch_dex_candles("xrpl", None, "SOLO-XRP", "1m", None, None))
     assert seen == {"pool": "solo_xrp_pool", "token": "base"}
     assert [c.close for c in candles] == [0.0121]
@@ -522,9 +522,9 @@ def test_an_inverted_xrpl_pair_reads_the_quote_series(monkeypatch):
         return []
 
     async def _fake_search(*_a, **_k):
-        return "rlusd_xrp_pool", True
+        return {"address": "rlusd_xrp_pool"}, True
 
     monkeypatch.setattr(dex_candles, "_pool_ohlcv", _fake_ohlcv)
-    monkeypatch.setattr(pool_data, "fetch_pair_top_pool", _fake_search)
+    monkeypatch.setattr(pool_data, "fetch_pair_top_pool_info", _fake_search)
     run(market._fetch_dex_candles("xrpl", None, "XRP-RLUSD", "1m", None, None))
     assert seen["token"] == "quote"
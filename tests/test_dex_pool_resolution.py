@@ -4,10 +4,11 @@ Two things are being protected here.
 
 **The candle path must not notice the refactor.** ``fetch_token_top_pool`` used to
 do the GeckoTerminal query itself; it is now the address form of
-``fetch_token_top_pool_info``, and ``dex_candles._resolve_pool`` still calls the
-former. Same address, same cache entry, same "a failure is not cached but an empty
-answer is" behavior — ``tests/test_dex_candles.py`` covers the address contract,
-these cover the delegation and the shared cache.
+``fetch_token_top_pool_info``, which ``dex_candles._resolve_pool`` reaches through
+the pair's route in ``condor.pool_routes``. Same address, same cache entry, same
+"a failure is not cached but an empty answer is" behavior —
+``tests/test_dex_candles.py`` covers the address contract, these cover the
+delegation and the shared cache.
 
 **The LP panel cannot guess the venue.** An ``lp_executor`` needs
 ``lp_provider`` as ``dex/clmm``, and the API rejects anything else. The deepest pool
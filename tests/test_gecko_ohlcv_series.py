@@ -0,0 +1,124 @@
+"""Incremental OHLCV series behind ``pool_data.fetch_ohlcv``.
+
+The cache and single-flight were keyed on the whole upstream window, so a live
+poll (``use_cache=False``) re-downloaded up to 1000 candles to pick up the
+newest one, and a historical window already inside a chart's range went
+upstream again. Each pool feed is now one merged series: a refresh asks only
+for the tail since the newest stored candle, revising the one still forming,
+and any window the series holds is sliced locally.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from condor import pool_data
+
+POOL = "So11111111111111111111111111111111111111112"
+
+
+class _Pool:
+    """A pool with a 1m candle every minute for the last ``depth`` minutes.
+
+    ``get_ohlcv`` answers like GeckoTerminal: the newest ``limit`` candles
+    before ``before_timestamp`` (or now), ascending. ``bump`` moves the price,
+    which revises the candle still forming.
+    """
+
+    def __init__(self, depth: int = 3000):
+        self.depth = depth
+        self.price = 1.0
+        self.calls: list = []
+
+    def _rows(self):
+        head = int(time.time()) // 60 * 60
+        rows = [[head - 60 * i, 1.0, 1.0, 1.0, 1.0, 5.0] for i in range(self.depth)]
+        rows[0] = [head, 1.0, self.price, 1.0, self.price, 5.0]
+        return rows[::-1]
+
+    async def __call__(self, method, network, address, timeframe, **kw):
+        assert method == "get_ohlcv"
+        limit, before = kw["limit"], kw.get("before_timestamp")
+        self.calls.append((limit, before))
+        rows = [r for r in self._rows() if before is None or r[0] < before]
+        return rows[-limit:]
+
+
+@pytest.fixture
+def gecko(monkeypatch):
+    pool = _Pool()
+    monkeypatch.setattr(pool_data, "gecko_call", pool)
+    return pool
+
+
+def _ohlcv(**kw):
+    return asyncio.run(pool_data.fetch_ohlcv(POOL, "solana", timeframe="1m", **kw))
+
+
+def test_a_live_poll_fetches_only_the_tail_and_revises_the_open_candle(gecko):
+    first, _ = _ohlcv(limit=1000)
+    gecko.price = 2.0
+    polled, err = _ohlcv(limit=1000, use_cache=False)
+
+    assert err is None and len(polled) == 1000
+    assert polled[-1][4] == 2.0, "the forming candle was revised in place"
+    stamps = [r[0] for r in polled]
+    assert stamps == sorted(set(stamps)) and stamps[-1] >= first[-1][0]
+    tail_limit, tail_before = gecko.calls[-1]
+    assert tail_before is None and tail_limit <= 3
+    print(
+        f"\nLive 1m poll: {gecko.calls[0][0]} candles -> {tail_limit} per tick "
+        f"({100 * (1 - tail_limit / gecko.calls[0][0]):.1f}% fewer)"
+    )
+    assert tail_limit / gecko.calls[0][0] < 0.1
+
+
+def test_a_closed_window_inside_the_series_is_served_locally(gecko):
+    latest, _ = _ohlcv(limit=1000)
+    before = int(latest[-100][0])
+
+    window, err = _ohlcv(limit=200, before_timestamp=before)
+
+    assert err is None and len(gecko.calls) == 1
+    assert [r[0] for r in window] == [r[0] for r in latest[-300:-100]]
+
+
+def test_an_older_window_extends_the_series_backwards(gecko):
+    latest, _ = _ohlcv(limit=1000)
+    oldest = int(latest[0][0])
+
+    older, _ = _ohlcv(limit=500, before_timestamp=oldest)
+    spanning, _ = _ohlcv(limit=400, before_timestamp=oldest + 60 * 200)
+
+    assert len(gecko.calls) == 2, "the spanning window is sliced from the series"
+    assert [r[0] for r in spanning] == [r[0] for r in (older + latest)[300:700]]
+
+
+def test_a_young_pool_is_served_in_full_without_asking_again(gecko):
+    gecko.depth = 40
+    rows, _ = _ohlcv(limit=1000)
+    again, _ = _ohlcv(limit=500)
+
+    assert len(rows) == 40 and again == rows
+    assert len(gecko.calls) == 1
+
+
+def test_an_empty_tail_refresh_leaves_the_series_alone(gecko, monkeypatch):
+    first, _ = _ohlcv(limit=100)
+    monkeypatch.setattr(time, "time", lambda now=time.time(): now + 120)
+    real = gecko.__call__
+
+    async def empty_tail(method, network, address, timeframe, **kw):
+        if kw["limit"] < 100:
+            gecko.calls.append((kw["limit"], kw.get("before_timestamp")))
+            return []
+        return await real(method, network, address, timeframe, **kw)
+
+    monkeypatch.setattr(pool_data, "gecko_call", empty_tail)
+
+    cached, err = _ohlcv(limit=100)
+    polled, poll_err = _ohlcv(limit=100, use_cache=False)
+
+    assert err is None and cached == first
+    assert poll_err is None and len(polled) == 100
@@ -0,0 +1,200 @@
+"""Priority lanes on the shared GeckoTerminal budget (``GeckoPriority``).
+
+Every caller used to queue FIFO for the same ~25 requests a minute, so a
+scanner fanning out over venues could spend the window a person was waiting
+on, and the pool browser answered "No pools found". Requests now go out by
+lane: a live chart and a page load ahead of background work, background work
+held to a share of the window, and prefetches only on the idle part of it.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from condor import pool_data
+from condor.pool_data import GeckoPriority, gecko_priority
+
+SOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _address(n: int) -> str:
+    # A base58-looking 44-char pool address, distinct per row.
+    return f"{n:04d}".replace("0", "A") + "z" * 40
+
+
+def _api_row(n: int) -> dict:
+    return {
+        "id": f"solana_{_address(n)}",
+        "type": "pool",
+        "attributes": {
+            "address": _address(n),
+            "name": "SOL / USDC",
+            "base_token_price_usd": "150.0",
+            "base_token_price_native_currency": None,
+            "quote_token_price_usd": "1.0",
+            "quote_token_price_native_currency": None,
+            "reserve_in_usd": "1000000",
+            "pool_created_at": "2024-01-01T00:00:00Z",
+            "fdv_usd": None,
+            "market_cap_usd": None,
+            "price_change_percentage": {"h1": None, "h24": "1.0"},
+            "transactions": {
+                "h1": {"buys": 0, "sells": 0},
+                "h24": {"buys": 0, "sells": 0},
+            },
+            "volume_usd": {"h24": str(10_000 - n)},
+        },
+        "relationships": {
+            "dex": {"data": {"id": "meteora"}},
+            "base_token": {"data": {"id": f"solana_{SOL}"}},
+            "quote_token": {"data": {"id": f"solana_{USDC}"}},
+        },
+    }
+
+
+class _Gecko:
+    """Serves two full upstream pages of pools, and candles for any pool."""
+
+    def __init__(self):
+        self.pages: list = []
+        self.ohlcv: list = []
+
+    async def api_request(self, method, path, params=None):
+        page = int((params or {}).get("page", 1))
+        self.pages.append(page)
+        if page > 2:
+            return {"data": []}
+        return {"data": [_api_row((page - 1) * 20 + i) for i in range(20)]}
+
+    async def get_ohlcv(self, network, address, timeframe, **kw):
+        self.ohlcv.append(address)
+        now = int(time.time()) // 300 * 300
+        return [[now - 300 * i, 1.0, 1.1, 0.9, 1.0, 5.0] for i in range(3)]
+
+
+@pytest.fixture
+def gecko(monkeypatch):
+    client = _Gecko()
+    monkeypatch.setattr(pool_data, "_gecko_client", lambda: client)
+    pool_data._gecko_inflight.clear()
+    yield client
+    pool_data._gecko_inflight.clear()
+
+
+def _spend(n: int, age: float = 0.0) -> None:
+    """Mark ``n`` requests as sent ``age`` seconds ago."""
+    at = time.time() - age
+    pool_data._gecko_call_times.extend([at] * n)
+
+
+def test_background_work_leaves_the_reserve_to_people(monkeypatch):
+    monkeypatch.setattr(pool_data, "_GECKO_MAX_WAIT", 0.0)
+    monkeypatch.setattr(pool_data, "_GECKO_BACKGROUND_MAX_WAIT", 0.0)
+    share = pool_data._lane_capacity(GeckoPriority.BACKGROUND)
+    assert 0 < share < pool_data._GECKO_RATE_LIMIT
+
+    async def drive():
+        with gecko_priority(GeckoPriority.BACKGROUND):
+            for _ in range(share):
+                await pool_data._acquire_rate_slot()
+            with pytest.raises(pool_data.GeckoRateLimited):
+                await pool_data._acquire_rate_slot()
+        # The page load still finds a slot behind the scanner.
+        await pool_data._acquire_rate_slot()
+
+    run(drive())
+    assert len(pool_data._gecko_call_times) == share + 1
+
+
+def test_a_queued_page_load_goes_before_an_earlier_queued_scanner():
+    # The window is full and frees all at once in 0.3s.
+    _spend(pool_data._GECKO_RATE_LIMIT, age=pool_data._GECKO_RATE_WINDOW - 0.3)
+    order: list = []
+
+    async def take(priority, label, delay=0.0):
+        await asyncio.sleep(delay)
+        with gecko_priority(priority):
+            await pool_data._acquire_rate_slot()
+        order.append(label)
+
+    async def drive():
+        await asyncio.gather(
+            take(GeckoPriority.BACKGROUND, "scanner"),
+            take(GeckoPriority.INTERACTIVE, "page", delay=0.05),
+        )
+
+    run(drive())
+    assert order == ["page", "scanner"]
+
+
+def test_a_prefetch_is_dropped_rather_than_queued():
+    _spend(pool_data._lane_capacity(GeckoPriority.PREFETCH))
+
+    async def drive():
+        with gecko_priority(GeckoPriority.PREFETCH):
+            t0 = time.monotonic()
+            with pytest.raises(pool_data.GeckoRateLimited):
+                await pool_data._acquire_rate_slot()
+            return time.monotonic() - t0
+
+    assert run(drive()) < 0.05
+    assert pool_data._gecko_budget_idle() is False
+
+
+def test_a_viewer_joining_a_prefetch_flight_promotes_it(gecko):
+    # Past the prefetch share: the flight would be dropped at its own priority.
+    _spend(pool_data._lane_capacity(GeckoPriority.PREFETCH))
+
+    async def prefetch():
+        with gecko_priority(GeckoPriority.PREFETCH):
+            return await pool_data._gecko_page_rows("solana", "trending", "", 1)
+
+    async def viewer():
+        return await pool_data._gecko_page_rows("solana", "trending", "", 1)
+
+    async def drive():
+        return await asyncio.gather(prefetch(), viewer())
+
+    guessed, wanted = run(drive())
+    assert wanted and guessed == wanted
+    assert gecko.pages == [1], "one request, at the viewer's priority"
+
+
+def test_an_idle_budget_prefetches_the_next_page_and_the_top_charts(gecko):
+    async def drive():
+        first = await pool_data.list_gecko_pools_page(
+            "solana-mainnet-beta", view="trending", limit=20, page=1
+        )
+        await asyncio.gather(*list(pool_data._gecko_prefetch_tasks))
+        seen = list(gecko.pages)
+        second = await pool_data.list_gecko_pools_page(
+            "solana-mainnet-beta", view="trending", limit=20, page=2
+        )
+        return first, second, seen
+
+    first, second, seen = run(drive())
+
+    assert first["has_more"] and len(second["pools"]) == 20
+    assert seen == [1, 2], "page 2 was fetched before anyone asked for it"
+    assert gecko.pages.count(2) == 1, "and answered the click from cache"
+    top = [p["address"] for p in first["pools"][: pool_data._PREFETCH_TOP_POOLS]]
+    assert sorted(gecko.ohlcv) == sorted(top)
+
+
+def test_a_busy_budget_prefetches_nothing(gecko):
+    _spend(pool_data._lane_capacity(GeckoPriority.PREFETCH))
+
+    async def drive():
+        await pool_data.list_gecko_pools_page(
+            "solana-mainnet-beta", view="trending", limit=20, page=1
+        )
+        assert not pool_data._gecko_prefetch_tasks
+
+    run(drive())
+    assert gecko.pages == [1] and gecko.ohlcv == []
@@ -0,0 +1,223 @@
+"""Who spends the shared GeckoTerminal budget (``condor.gecko_stats``).
+
+``gecko_health`` counted requests, 429s and refusals for the whole process, so
+a spent budget said nothing about who had spent it: the candle loop, the pool
+browser, a routine or an agent. Each caller now names itself with a context
+variable that ``gecko_call`` records against. Caches count their hits and
+misses, and single-flight fetches count the callers that joined them. An admin
+endpoint serves the lot, and the pool browser's upstream state adds the top
+callers.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from starlette.testclient import TestClient
+
+import condor.web.routes.dex as dex_routes
+from condor import gecko_stats, pool_data
+from condor.web.auth import get_current_user
+from condor.web.models import WebUser
+from condor.web.routes import admin as admin_routes
+
+ADMIN = WebUser(id=1, username="root", role="admin")
+USER = WebUser(id=222, username="u", first_name="U", role="user")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class _Client:
+    """A gecko client that answers every raw request with ``result``."""
+
+    def __init__(self, result=None, error=None, delay=0.0):
+        self.calls = 0
+        self._result = result if result is not None else {"data": []}
+        self._error = error
+        self.delay = delay
+
+    async def api_request(self, *_a, **_k):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = _Client()
+    monkeypatch.setattr(pool_data, "_gecko_client", lambda: fake)
+    return fake
+
+
+class _ConfigManager:
+    def __init__(self, admins=()):
+        self._admins = set(admins)
+
+    def is_admin(self, user_id):
+        return user_id in self._admins
+
+    def has_server_access(self, user_id, name, *a, **kw):
+        return True
+
+
+def test_requests_are_charged_to_the_outermost_caller(client):
+    async def drive():
+        with gecko_stats.gecko_caller("routine:scanner"):
+            with gecko_stats.gecko_caller("candles"):
+                await pool_data.gecko_request("GET", "networks")
+        with gecko_stats.gecko_caller("candles"):
+            await pool_data.gecko_request("GET", "networks")
+            await pool_data.gecko_request("GET", "networks")
+        await pool_data.gecko_request("GET", "networks")
+
+    run(drive())
+    callers = gecko_stats.gecko_stats()["callers"]
+
+    assert list(callers) == ["candles", "routine:scanner", gecko_stats.UNTAGGED]
+    assert callers["candles"]["requests_last_hour"] == 2
+    assert callers["routine:scanner"]["totals"][gecko_stats.OK] == 1
+    assert callers["candles"]["lanes"] == {"interactive": 2}
+    assert callers["candles"]["latency"]["count"] == 2
+
+
+def test_a_refused_call_is_counted_apart_from_sent_ones(client, monkeypatch):
+    monkeypatch.setattr(pool_data, "_GECKO_RATE_LIMIT", 2)
+
+    async def drive():
+        with gecko_stats.gecko_caller("pool_browser"):
+            for _ in range(3):
+                try:
+                    await pool_data.gecko_request("GET", "networks")
+                except pool_data.GeckoRateLimited:
+                    pass
+
+    run(drive())
+    browser = gecko_stats.gecko_stats()["callers"]["pool_browser"]
+
+    assert client.calls == 2
+    assert browser["requests_last_minute"] == 2
+    assert browser["last_hour"][gecko_stats.REFUSED] == 1
+    assert browser["latency"]["count"] == 2
+    assert gecko_stats.top_callers() == [
+        {
+            "caller": "pool_browser",
+            "requests_last_minute": 2,
+            "requests_last_hour": 2,
+            "refused_last_hour": 1,
+        }
+    ]
+
+
+def test_a_failed_request_is_an_error_with_a_latency(monkeypatch):
+    failing = _Client(error=ValueError("boom"))
+    monkeypatch.setattr(pool_data, "_gecko_client", lambda: failing)
+
+    with pytest.raises(ValueError):
+        run(pool_data.gecko_request("GET", "networks"))
+
+    totals = gecko_stats.gecko_stats()["callers"][gecko_stats.UNTAGGED]["totals"]
+    assert totals[gecko_stats.ERROR] == 1 and totals[gecko_stats.OK] == 0
+
+
+def test_cache_hits_and_misses_are_counted_per_cache(client):
+    for _ in range(4):
+        run(pool_data.list_gecko_dexes("solana-mainnet-beta"))
+
+    caches = gecko_stats.gecko_stats()["caches"]
+
+    assert client.calls == 1
+    assert caches["gecko_dexes"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+
+
+def test_single_flight_joins_are_counted():
+    async def drive():
+        gate = asyncio.Event()
+
+        async def fetch():
+            await gate.wait()
+            return "rows"
+
+        waiters = [
+            asyncio.ensure_future(pool_data._single_flight(("page", "x"), fetch))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        return await asyncio.gather(*waiters)
+
+    assert run(drive()) == ["rows"] * 3
+    assert gecko_stats.gecko_stats()["single_flight"] == {
+        "page": {"started": 1, "joined": 2}
+    }
+
+
+def test_a_single_flight_fetch_is_charged_to_its_starter(client):
+    client.delay = 0.05
+
+    async def drive():
+        with gecko_stats.gecko_caller("candles"):
+            first = asyncio.ensure_future(
+                pool_data._single_flight(
+                    ("page", "y"),
+                    lambda: pool_data.gecko_request("GET", "networks"),
+                )
+            )
+            await asyncio.sleep(0)
+        with gecko_stats.gecko_caller("pool_browser"):
+            second = pool_data._single_flight(
+                ("page", "y"), lambda: pool_data.gecko_request("GET", "networks")
+            )
+            await asyncio.gather(first, second)
+
+    run(drive())
+
+    assert client.calls == 1
+    assert [row["caller"] for row in gecko_stats.top_callers()] == ["candles"]
+
+
+def test_the_pool_browser_charges_its_requests_and_reports_top_callers(
+    client, monkeypatch
+):
+    cm = _ConfigManager()
+    monkeypatch.setattr(dex_routes, "get_config_manager", lambda: cm)
+    monkeypatch.setattr("condor.web.auth.get_config_manager", lambda: cm)
+    app = FastAPI()
+    app.include_router(dex_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: USER
+    web = TestClient(app)
+
+    web.get("/servers/srv/dex/dexes", params={"network": "solana-mainnet-beta"})
+    upstream = web.get("/servers/srv/dex/upstream").json()
+
+    assert client.calls == 1
+    assert [row["caller"] for row in upstream["top_callers"]] == ["pool_browser"]
+
+
+def test_only_an_admin_reads_the_accounting(client, monkeypatch):
+    cm = _ConfigManager(admins={ADMIN.id})
+    monkeypatch.setattr(admin_routes, "get_config_manager", lambda: cm)
+    with gecko_stats.gecko_caller("mcp"):
+        run(pool_data.gecko_request("GET", "networks"))
+
+    body = run(admin_routes.get_gecko_stats(user=ADMIN))
+    with pytest.raises(HTTPException) as excinfo:
+        run(admin_routes.get_gecko_stats(user=USER))
+
+    assert body["callers"]["mcp"]["requests_last_hour"] == 1
+    assert body["budget"]["requests_last_minute"] == 1
+    assert excinfo.value.status_code == 403
+
+
+def test_the_reset_forgets_every_count(client):
+    with gecko_stats.gecko_caller("candles"):
+        run(pool_data.gecko_request("GET", "networks"))
+
+    pool_data.reset_gecko_throttle()
+
+    assert gecko_stats.gecko_stats()["callers"] == {}
+    assert gecko_stats.top_callers() == []
@@ -0,0 +1,158 @@
+"""Pooled outbound HTTP (``condor.http_pool``).
+
+Routines opened an ``aiohttp.ClientSession`` per run or per request, the Telegram
+fallback bot an ``httpx.AsyncClient`` per message, and every one of them paid a
+connect (and a TLS handshake) before its first byte. Clients and connectors are
+now pooled per event loop and per host, kept alive between requests, and
+closed once at shutdown.
+"""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from condor import http_pool
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _serve():
+    """A local server that records the client port of every request it answers."""
+    peers = []
+
+    async def handle(request):
+        peers.append(request.transport.get_extra_info("peername")[1])
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_get("/", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", peers
+
+
+def test_one_client_per_base_url_and_headers_per_loop():
+    async def clients():
+        a = http_pool.http_client("https://api.example.com")
+        b = http_pool.http_client("https://api.example.com")
+        c = http_pool.http_client("https://api.example.com", headers={"X": "1"})
+        await http_pool.close_http_pools()
+        return a, b, c
+
+    a, b, c = run(clients())
+    d, _, _ = run(clients())
+
+    assert a is b and a is not c
+    assert d is not a, "a new loop gets its own connections"
+    assert a.is_closed and c.is_closed
+
+
+def test_a_second_live_loop_leaves_the_first_loops_client_alone():
+    first, second = asyncio.new_event_loop(), asyncio.new_event_loop()
+
+    async def client():
+        return http_pool.http_client("https://api.example.com")
+
+    try:
+        a = first.run_until_complete(client())
+        b = second.run_until_complete(client())
+
+        assert a is not b
+        assert first.run_until_complete(client()) is a, "still the first's client"
+    finally:
+        for loop in (first, second):
+            loop.run_until_complete(http_pool.close_http_pools())
+            loop.close()
+    assert a.is_closed and b.is_closed
+
+
+def test_the_gecko_client_builds_no_client_of_its_own(monkeypatch):
+    from condor import pool_data
+
+    built = []
+    monkeypatch.setattr(pool_data, "_gecko_client_instance", None)
+    monkeypatch.setattr(
+        pool_data.httpx, "AsyncClient", lambda *a, **kw: built.append(kw)
+    )
+
+    pool_data._gecko_client()
+
+    assert built == []
+
+
+def test_pooled_sessions_reuse_one_connection():
+    async def drive():
+        runner, url, peers = await _serve()
+        try:
+            for _ in range(10):
+                async with http_pool.pooled_session() as session:
+                    async with session.get(url) as resp:
+                        assert (await resp.json()) == {"ok": True}
+            connector = http_pool._connector()
+            await http_pool.close_http_pools()
+            return peers, connector
+        finally:
+            await runner.cleanup()
+
+    peers, connector = run(drive())
+
+    assert len(peers) == 10 and len(set(peers)) == 1
+    assert connector.closed
+
+
+def test_the_pooled_httpx_client_keeps_its_connection_alive():
+    async def drive():
+        runner, url, peers = await _serve()
+        try:
+            client = http_pool.http_client(url)
+            for _ in range(10):
+                (await client.get("/")).raise_for_status()
+            await http_pool.close_http_pools()
+            return peers
+        finally:
+            await runner.cleanup()
+
+    assert len(set(run(drive()))) == 1
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("requests", [30])
+def test_benchmark_pooled_vs_a_session_per_request(requests):
+    import aiohttp
+
+    async def drive():
+        runner, url, peers = await _serve()
+        try:
+            start = time.perf_counter()
+            for _ in range(requests):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url) as resp:
+                        await resp.read()
+            fresh = time.perf_counter() - start
+            fresh_peers = len(set(peers))
+            peers.clear()
+
+            start = time.perf_counter()
+            for _ in range(requests):
+                async with http_pool.pooled_session() as session:
+                    async with session.get(url) as resp:
+                        await resp.read()
+            pooled = time.perf_counter() - start
+            await http_pool.close_http_pools()
+            return fresh, pooled, fresh_peers, len(set(peers))
+        finally:
+            await runner.cleanup()
+
+    fresh, pooled, fresh_conns, pooled_conns = run(drive())
+    print(
+        f"\n{requests} requests: {fresh * 1e3:.1f}ms over {fresh_conns} connections "
+        f"-> {pooled * 1e3:.1f}ms over {pooled_conns}"
+    )
+    assert fresh_conns == requests and pooled_conns == 1
@@ -0,0 +1,181 @@
+"""Read-ahead for the cursor walk (``walk_pages(read_ahead=...)``).
+
+``walk_pages`` requested page N+1 only once its consumer had finished with page
+N, so a walk whose consumer works on each page (agent performance building
+rows, the executor pre-fetch broadcasting them) paid the round trip and the
+work one after the other, every page. With ``read_ahead`` the next request goes
+out as soon as its cursor is known and overlaps that work. A ``deadline``
+bounds the whole walk.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from condor.fetchers._pagination import collect_pages, walk_pages
+
+
+def _extract(result):
+    return result.get("data", []) if isinstance(result, dict) else []
+
+
+class CursorListing:
+    """A cursor-paged endpoint over ``size`` rows, with a latency per page.
+
+    Records when each request started and how many were in flight at once.
+    """
+
+    def __init__(self, size, latency=0.02, fail_at=None):
+        self.size = size
+        self.latency = latency
+        self.fail_at = fail_at
+        self.started = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, limit, cursor=None):
+        start = int(cursor or 0)
+        self.started.append((start, time.perf_counter()))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if start == self.fail_at:
+            raise ConnectionError(f"page at {start} failed")
+        rows = [{"id": n} for n in range(start, min(start + limit, self.size))]
+        following = start + limit
+        return {"data": rows, "next_cursor": str(following) if rows else None}
+
+
+async def consume(listing, work=0.0, **kwargs):
+    """Walk ``listing``, spending ``work`` seconds on each page as it arrives."""
+    kwargs.setdefault("page_size", 10)
+    kwargs.setdefault("max_items", 10**6)
+    rows = []
+    async for page in walk_pages(listing, _extract, **kwargs):
+        rows.extend(page)
+        await asyncio.sleep(work)
+    return rows
+
+
+def test_read_ahead_yields_the_same_rows_in_the_same_order():
+    plain = asyncio.run(consume(CursorListing(95)))
+    ahead = asyncio.run(consume(CursorListing(95), read_ahead=2))
+
+    assert ahead == plain == [{"id": n} for n in range(95)]
+
+
+def test_the_next_page_is_requested_while_the_consumer_works():
+    listing = CursorListing(30, latency=0.03)
+
+    asyncio.run(consume(listing, work=0.05, read_ahead=1))
+
+    first, second = listing.started[0][1], listing.started[1][1]
+    assert second - first < 0.045, "requested before the consumer finished"
+    assert listing.max_in_flight == 1, "a cursor walk stays one request at a time"
+
+
+@pytest.mark.parametrize("depth", [1, 3])
+def test_no_more_than_the_depth_is_read_ahead_of_a_slow_consumer(depth):
+    listing = CursorListing(200, latency=0.001)
+
+    async def drive():
+        walk = walk_pages(
+            listing, _extract, page_size=10, max_items=10**6, read_ahead=depth
+        )
+        await walk.__anext__()
+        await asyncio.sleep(0.1)  # the consumer sits on its first page
+        requested = len(listing.started)
+        await walk.aclose()
+        return requested
+
+    assert asyncio.run(drive()) == 1 + depth
+
+
+def test_a_consumer_that_stops_early_cancels_the_read_ahead():
+    listing = CursorListing(10**4, latency=0.05)
+
+    async def drive():
+        async for page in walk_pages(
+            listing, _extract, page_size=10, max_items=10**6, read_ahead=1
+        ):
+            break
+        await asyncio.sleep(0)
+        requested = len(listing.started)
+        await asyncio.sleep(0.15)
+        return requested
+
+    requested = asyncio.run(drive())
+
+    assert listing.in_flight == 0
+    assert len(listing.started) == requested <= 2
+
+
+def test_a_failed_page_raises_after_the_pages_before_it():
+    listing = CursorListing(100, fail_at=30)
+    seen = []
+
+    async def drive():
+        async for page in walk_pages(
+            listing, _extract, page_size=10, max_items=10**6, read_ahead=2
+        ):
+            seen.extend(page)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(drive())
+    assert seen == [{"id": n} for n in range(30)]
+
+
+@pytest.mark.parametrize("read_ahead", [0, 1])
+def test_the_deadline_ends_the_walk_as_truncated(read_ahead):
+    listing = CursorListing(10**4, latency=0.02)
+    truncated = []
+
+    rows = asyncio.run(
+        consume(
+            listing,
+            read_ahead=read_ahead,
+            deadline=0.1,
+            on_truncated=lambda: truncated.append(1),
+        )
+    )
+
+    assert truncated == [1]
+    assert 10 <= len(rows) <= 80
+
+
+def test_a_deadline_still_reads_the_first_page():
+    rows = asyncio.run(
+        collect_pages(
+            CursorListing(100), _extract, page_size=10, max_items=100, deadline=0
+        )
+    )
+
+    assert len(rows) == 10
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("pages", [20])
+def test_benchmark_a_walk_whose_consumer_works_per_page(pages):
+    latency = work = 0.02
+
+    async def timed(read_ahead):
+        start = time.perf_counter()
+        await consume(
+            CursorListing(pages * 10, latency=latency),
+            work=work,
+            read_ahead=read_ahead,
+        )
+        return time.perf_counter() - start
+
+    serial = asyncio.run(timed(0))
+    ahead = asyncio.run(timed(1))
+    print(
+        f"\n{pages} pages, {latency * 1e3:.0f}ms round trip + {work * 1e3:.0f}ms work "
+        f"each: {serial * 1e3:.0f}ms one after the other -> {ahead * 1e3:.0f}ms "
+        f"reading ahead"
+    )
+    assert ahead < serial * 0.8
@@ -0,0 +1,307 @@
+"""CLMM liquidity bins as arrays, read in bounded batches (``condor.pool_bins``).
+
+The aggregated liquidity chart opened one Gateway ``get_pool_info`` per pool, all
+at once, around the shared bins cache, and every chart walked the bins as dicts.
+Bins are now cached as :class:`BinSnapshot` arrays, read for many pools through
+one bounded batch, diffed against the previous read so a poller is sent only
+what moved, and bucketed across pools with array operations.
+"""
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+import condor.web.routes.dex as dex_routes
+from condor import pool_bins, pool_data
+from condor.pool_bins import BinSnapshot
+from condor.web.auth import get_current_user
+from condor.web.models import WebUser
+
+POOL = "8sLbNZoA1cfnvMJLPfp98ZLAnFSYCFApfJKMbiXNLwxj"
+USER = WebUser(id=111, username="u", first_name="U", role="user")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def _clear_bins_cache():
+    pool_data._pool_bins_cache.clear()
+    yield
+    pool_data._pool_bins_cache.clear()
+
+
+def bins_around(active: int, width: int = 20, amount: float = 1.0) -> list:
+    """A DLMM-shaped grid: quote below the active bin, base above, both at it."""
+    return [
+        {
+            "bin_id": i,
+            "price": 100.0 * 1.002 ** (i - active),
+            "base_token_amount": amount if i >= active else 0.0,
+            "quote_token_amount": 100.0 * amount if i <= active else 0.0,
+        }
+        for i in range(active - width, active + width + 1)
+    ]
+
+
+def info_for(address: str, bins: list, active: int = 500) -> dict:
+    return {"address": address, "active_bin_id": active, "bin_step": 20, "bins": bins}
+
+
+class FakeClmm:
+    """Gateway's CLMM namespace: slow reads, counted, with the peak in flight."""
+
+    def __init__(self, infos: dict, delay: float = 0.01):
+        self.infos = infos
+        self.delay = delay
+        self.calls: list = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_pool_info(self, connector, network, pool_address):
+        self.calls.append(pool_address)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return self.infos[pool_address]
+        finally:
+            self.in_flight -= 1
+
+
+class FakeClient:
+    def __init__(self, clmm):
+        self.gateway_clmm = clmm
+
+
+def _expire(connector: str, address: str) -> None:
+    fetched_at, snapshot = pool_data._pool_bins_cache[(connector, address)]
+    pool_data._pool_bins_cache[(connector, address)] = (fetched_at - 3600, snapshot)
+
+
+def test_a_snapshot_keeps_the_dict_shape_callers_read():
+    bins = bins_around(500, width=2)
+    bins.reverse()
+    bins.append({"bin_id": 900, "base_token_amount": 5.0})  # no price
+    bins.append({"bin_id": 499, "price": "99.8", "quote_token_amount": None})
+
+    info = BinSnapshot.from_pool_info(info_for(POOL, bins)).pool_info()
+
+    assert [b["bin_id"] for b in info["bins"]] == [498, 499, 499, 500, 501, 502]
+    assert info["bins"][2] == {
+        "bin_id": 499,
+        "price": 99.8,
+        "base_token_amount": 0.0,
+        "quote_token_amount": 0.0,
+    }
+    assert info["active_bin_id"] == 500 and info["address"] == POOL
+
+
+def test_a_reread_records_only_the_bins_a_swap_moved():
+    before = bins_around(500)
+    after = [dict(b) for b in bins_around(500)]
+    after[20]["base_token_amount"] = 0.5  # the active bin
+    after[21]["base_token_amount"] = 0.0  # the one above it drained
+    clmm = FakeClmm({POOL: info_for(POOL, before)})
+    client = FakeClient(clmm)
+
+    first, _ = run(pool_data.fetch_bin_snapshot(POOL, "meteora", client=client))
+    _expire("meteora", POOL)
+    clmm.infos[POOL] = info_for(POOL, after[1:])
+    second, _ = run(pool_data.fetch_bin_snapshot(POOL, "meteora", client=client))
+    _expire("meteora", POOL)
+    third, _ = run(pool_data.fetch_bin_snapshot(POOL, "meteora", client=client))
+
+    assert first.parent is None and first.changed is None
+    assert second.parent == first.fingerprint != second.fingerprint
+    assert second.bin_id[second.changed].tolist() == [500, 501]
+    assert second.removed.tolist() == [before[0]["price"]]
+    # An unchanged read keeps the delta, so a poller one step behind still gets it.
+    assert third.fingerprint == second.fingerprint
+    assert third.changed.tolist() == second.changed.tolist()
+    assert len(clmm.calls) == 3
+
+
+def test_the_bins_route_sends_a_poller_only_the_changes(monkeypatch):
+    clmm = FakeClmm({POOL: info_for(POOL, bins_around(500))})
+
+    class FakeConfigManager:
+        def has_server_access(self, *a, **kw):
+            return True
+
+        async def get_client(self, name):
+            return FakeClient(clmm)
+
+    monkeypatch.setattr(dex_routes, "get_config_manager", FakeConfigManager)
+    monkeypatch.setattr("condor.web.auth.get_config_manager", FakeConfigManager)
+    app = FastAPI()
+    app.include_router(dex_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: USER
+    http = TestClient(app)
+    url = f"/servers/srv/dex/pools/{POOL}/bins"
+
+    full = http.get(url).json()
+    moved = bins_around(500)
+    moved[20]["quote_token_amount"] = 7.0
+    clmm.infos[POOL] = info_for(POOL, moved)
+    _expire("meteora", POOL)
+    delta = http.get(url, params={"since": full["fingerprint"]}).json()
+    same = http.get(url, params={"since": delta["fingerprint"]}).json()
+    stranger = http.get(url, params={"since": "not-a-fingerprint"}).json()
+
+    assert full["delta"] is False and len(full["bins"]) == 41
+    assert delta["delta"] is True and delta["removed"] == []
+    assert [b["quote_amount"] for b in delta["bins"]] == [7.0]
+    assert same["delta"] is True and same["bins"] == []
+    assert stranger["delta"] is False and len(stranger["bins"]) == 41
+
+
+def test_a_batch_reads_each_pool_once_within_the_gate():
+    pools = {
+        f"Pool{n:040d}": info_for(f"Pool{n:040d}", bins_around(500)) for n in range(30)
+    }
+    clmm = FakeClmm(pools)
+    client = FakeClient(clmm)
+    keys = [("meteora", address) for address in pools]
+
+    first = run(pool_bins.fetch_bins_many(keys + keys[:5], client=client))
+    again = run(pool_bins.fetch_bins_many(keys, client=client))
+
+    assert sorted(clmm.calls) == sorted(pools)
+    assert clmm.peak <= pool_data._BINS_MAX_CONCURRENCY
+    assert all(
+        snapshot is not None and error is None for snapshot, error in first.values()
+    )
+    assert {k: s.fingerprint for k, (s, _) in again.items()} == {
+        k: s.fingerprint for k, (s, _) in first.items()
+    }
+
+
+def test_a_failing_pool_does_not_sink_the_batch():
+    clmm = FakeClmm({POOL: info_for(POOL, bins_around(500))})
+    keys = [("meteora", POOL), ("meteora", "Missing1111"), ("sushiswap", POOL)]
+
+    got = run(pool_bins.fetch_bins_many(keys, client=FakeClient(clmm)))
+
+    assert got[("meteora", POOL)][1] is None
+    assert got[("meteora", "Missing1111")][0] is None
+    assert "not available" in got[("sushiswap", POOL)][1]
+
+
+def _row_aggregate(pools_data):
+    """The aggregated chart's bucketing as it was: one dict per bin."""
+    all_bins, total_tvl, weighted = [], 0, 0
+    for entry in pools_data:
+        pool, info = entry["pool"], entry["pool_info"]
+        tvl = float(pool.get("liquidity", 0) or 0)
+        price = float(info.get("price", 0) or 0)
+        if tvl > 0 and price > 0:
+            total_tvl += tvl
+            weighted += price * tvl
+        for b in entry["bins"]:
+            base = float(b.get("base_token_amount", 0) or 0)
+            quote = float(b.get("quote_token_amount", 0) or 0)
+            p = float(b.get("price", 0) or 0)
+            if p > 0 and base * p + quote > 0:
+                all_bins.append((p, base * p, quote, base * p + quote))
+    avg = (
+        weighted / total_tvl
+        if total_tvl
+        else sum(b[0] for b in all_bins) / len(all_bins)
+    )
+    all_bins.sort(key=lambda b: b[0])
+    cumulative, whole = 0, sum(b[3] for b in all_bins)
+    low, high = None, len(all_bins) - 1
+    for i, b in enumerate(all_bins):
+        cumulative += b[3]
+        if cumulative >= whole * 0.025 and low is None:
+            low = i
+        if cumulative >= whole * 0.975:
+            high = i
+            break
+    kept = all_bins[low : high + 1]
+    if len(kept) < 5:
+        kept = all_bins
+    lo, hi = kept[0][0], kept[-1][0]
+    count = min(80, max(30, len(kept) // 5))
+    size = (hi - lo) / count if hi > lo else 1
+    buckets = defaultdict(lambda: [0, 0])
+    for p, base_value, quote, _ in kept:
+        i = min(int((p - lo) / size), count - 1)
+        buckets[lo + (i + 0.5) * size][0] += base_value
+        buckets[lo + (i + 0.5) * size][1] += quote
+    prices = sorted(buckets)
+    return prices, [buckets[p][0] for p in prices], [buckets[p][1] for p in prices], avg
+
+
+def _pools_data(count: int, width: int) -> list:
+    rng = random.Random(11)
+    data = []
+    for n in range(count):
+        bins = bins_around(500 + rng.randint(-50, 50), width, rng.random() * 10)
+        for b in bins:
+            b["base_token_amount"] *= rng.random()
+        info = info_for(f"P{n}", bins)
+        info["price"] = 100.0 + rng.random()
+        data.append(
+            {"pool": {"liquidity": rng.random() * 1e6}, "pool_info": info, "bins": bins}
+        )
+    return data
+
+
+def test_aggregation_matches_the_row_path():
+    pools_data = _pools_data(30, 60)
+
+    profile = pool_bins.aggregate_liquidity(pools_data)
+    prices, base_values, quote_values, avg = _row_aggregate(pools_data)
+
+    assert profile.prices == pytest.approx(prices)
+    assert profile.base_values == pytest.approx(base_values)
+    assert profile.quote_values == pytest.approx(quote_values)
+    assert profile.avg_price == pytest.approx(avg)
+    assert profile.pools == 30
+    assert (
+        pool_bins.aggregate_liquidity([{"pool": {}, "pool_info": {}, "bins": []}])
+        is None
+    )
+
+
+@pytest.mark.benchmark
+def test_benchmark_aggregating_30_positions():
+    pools_data = _pools_data(30, 200)
+    for entry in pools_data:
+        entry["snapshot"] = BinSnapshot.from_pool_info(entry["pool_info"])
+
+    def best_of(fn, rounds=5):
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1e3
+
+    before = best_of(lambda: _row_aggregate(pools_data))
+    after = best_of(lambda: pool_bins.aggregate_liquidity(pools_data))
+    print(f"\nAggregating 30 pools x 401 bins: {before:.1f}ms -> {after:.1f}ms")
+    assert after < before
+
+
+def test_a_token_price_move_changes_the_fingerprint_and_resends_every_bin():
+    bins = bins_around(500)
+    priced = dict(info_for(POOL, bins), base_token_price_usd=150.0)
+    first = pool_bins.BinSnapshot.from_pool_info(
+        dict(priced, quote_token_price_usd=1.0)
+    )
+    second = pool_bins.BinSnapshot.from_pool_info(
+        dict(priced, quote_token_price_usd=1.01), previous=first
+    )
+
+    assert second.fingerprint != first.fingerprint
+    assert second.parent == first.fingerprint
+    assert second.changed.tolist() == list(range(len(bins)))
@@ -0,0 +1,146 @@
+"""Persisted GeckoTerminal lookup caches (``condor.pool_cache``).
+
+Token symbols, top pools and pool metadata lived only in process memory, capped
+at 512 entries and evicted in insertion order, so every restart re-resolved from
+scratch on the shared ~25 requests a minute. They are now written through to a
+SQLite store, read back on a miss, evicted least-recently-used, and reloaded at
+boot along with the tokens of running executors.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+from condor import pool_cache, pool_data
+
+SOL = "So11111111111111111111111111111111111111112"
+BONK = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _restart(*caches) -> None:
+    """Drop the in-memory copies only, as a new process would start."""
+    for cache in caches:
+        OrderedDict.clear(cache)
+
+
+class _Gecko:
+    def __init__(self):
+        self.calls: list = []
+
+    async def get_specific_token_on_network(self, network, address):
+        self.calls.append(("token", address))
+        return {"attributes": {"symbol": "BONK" if address == BONK else "SOL"}}
+
+
+def _with_gecko(monkeypatch) -> _Gecko:
+    client = _Gecko()
+    monkeypatch.setattr(pool_data, "_gecko_client", lambda: client)
+    return client
+
+
+def test_a_resolved_symbol_survives_a_restart(monkeypatch):
+    gecko = _with_gecko(monkeypatch)
+
+    assert run(pool_data.fetch_token_symbol(BONK, "solana")) == "BONK"
+    _restart(pool_data._token_symbol_cache)
+    assert run(pool_data.fetch_token_symbol(BONK, "solana")) == "BONK"
+
+    assert gecko.calls == [("token", BONK)], "the second process read it from disk"
+
+
+def test_memory_evicts_the_least_recently_read_entry(monkeypatch):
+    monkeypatch.setattr(pool_data, "_TOKEN_CACHE_MAX", 2)
+    cache = pool_data._LruCache()
+    for key in ("a", "b"):
+        cache.put((key,), key, sweep_after=60)
+
+    assert cache.entry(("a",)) is not None  # "a" is now the most recent
+    cache.put(("c",), "c", sweep_after=60)
+
+    assert list(cache) == [("a",), ("c",)]
+
+
+def test_disk_prunes_by_age_then_by_least_recent_use():
+    now = time.time()
+    for i, age in enumerate((10, 20, 30, 10_000)):
+        pool_cache.store("kind", (f"k{i}",), i, now - age)
+    pool_cache.touch("kind", [("k2",)], now + 1)
+
+    pool_cache.prune("kind", max_age=3600, max_rows=2)
+
+    kept = [key for key, _, _ in pool_cache.recent("kind", 10, 3600)]
+    assert sorted(kept) == [("k1",), ("k2",)]
+    assert pool_cache.load("other", ("k0",)) is None, "kinds are separate"
+
+
+def test_a_value_that_is_not_json_stays_in_memory_only():
+    pool_cache.store("kind", ("k",), {1, 2}, time.time())
+    assert pool_cache.load("kind", ("k",)) is None
+
+
+def test_boot_reloads_recent_rows_and_resolves_running_positions(monkeypatch):
+    gecko = _with_gecko(monkeypatch)
+    run(pool_data.fetch_token_symbol(SOL, "solana"))
+    _restart(pool_data._token_symbol_cache)
+
+    async def no_pool(mint, network, quote):
+        return None
+
+    monkeypatch.setattr(pool_data, "fetch_token_top_pool_info", no_pool)
+    executors = [
+        {
+            "connector_name": "solana-mainnet-beta",
+            "trading_pair": f"{BONK}-SOL",
+            "status": "RUNNING",
+        },
+        {
+            "connector_name": "solana-mainnet-beta",
+            "trading_pair": f"{SOL}-USDC",
+            "status": "TERMINATED",
+        },
+        {"connector_name": "binance", "trading_pair": "BTC-USDT", "status": "RUNNING"},
+    ]
+    run(pool_data.warm_pool_caches(executors))
+
+    assert ("solana", SOL) in pool_data._token_symbol_cache, "loaded from disk"
+    assert (
+        pool_data._ttl_get(
+            pool_data._token_symbol_cache, ("solana", BONK), pool_data.TOKEN_SYMBOL_TTL
+        )
+        == "BONK"
+    )
+    assert gecko.calls == [("token", SOL), ("token", BONK)]
+
+
+def test_a_value_json_would_change_is_not_stored():
+    pool_cache.store("kind", ("ints",), {1: "a"}, time.time())
+    pool_cache.store("kind", ("pair",), ({"address": "p"}, True), time.time())
+
+    assert pool_cache.load("kind", ("ints",)) is None
+    assert pool_cache.load("kind", ("pair",)) is None
+
+
+def test_a_cache_of_tuples_reads_its_tuples_back_after_a_restart():
+    cache = pool_data._pair_pool_cache
+    cache.put(("solana", "SOL", "USDC"), ({"address": "p"}, True), sweep_after=60)
+    _restart(cache)
+
+    entry = cache.entry(("solana", "SOL", "USDC"))
+
+    assert entry is not None and entry[1] == ({"address": "p"}, True)
+
+
+def test_a_read_from_disk_writes_nothing_until_its_use_is_flushed(monkeypatch):
+    cache = pool_data._LruCache("kind")
+    cache.put(("k",), "v", sweep_after=60)
+    _restart(cache)
+    touched = []
+    monkeypatch.setattr(pool_cache, "touch", lambda *a: touched.append(a))
+
+    assert cache.entry(("k",))[1] == "v"
+    assert not touched, "the miss recorded its use later, not inline"
+    assert ("k",) in cache._touched
@@ -0,0 +1,228 @@
+"""The local pool index behind the DEX explorer's searches (``condor.pool_index``).
+
+Every search was a GeckoTerminal request: the browser's token view, Telegram's
+token search, the multi-venue Top page's fan-out of one request per venue per
+page. A chain's top pools are now indexed in the background, from the gecko
+listings and Orca's snapshot, and a search by symbol, mint or address is
+answered from memory — upstream only for an address the index cannot answer.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from condor import pool_data, pool_index
+
+SOL = "So11111111111111111111111111111111111111112"
+USDC = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+BONK = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _address(n: int) -> str:
+    return f"Poo1{n:040d}"
+
+
+def gecko_row(n: int, symbol: str = "SOL", dex: str = "meteora", base=SOL) -> dict:
+    """A flat GeckoTerminal row, as ``_gecko_page_rows`` returns it."""
+    return {
+        "id": f"solana_{_address(n)}",
+        "name": f"{symbol} / USDC",
+        "address": _address(n),
+        "dex_id": dex,
+        "base_token_id": f"solana_{base}",
+        "quote_token_id": f"solana_{USDC}",
+        "base_token_price_usd": "1.0",
+        "quote_token_price_usd": "1.0",
+        "reserve_in_usd": str(1000 + n),
+        "volume_usd_h24": str(10_000 - n),
+    }
+
+
+class _Upstream:
+    """The listings an index build reads, counted."""
+
+    def __init__(self, top, venues=None, orca=None):
+        self.top = top
+        self.venues = venues or {}
+        self.orca = orca or []
+        self.calls: list = []
+
+    async def page_rows(self, gnet, view, token, page, dex=None):
+        self.calls.append((view, token, page, dex))
+        rows = self.venues.get(dex, []) if dex else self.top
+        start = (page - 1) * pool_data.GECKO_PAGE_SIZE
+        return rows[start : start + pool_data.GECKO_PAGE_SIZE]
+
+    async def dexes(self, network):
+        return [{"id": "meteora", "name": "Meteora"}, {"id": "pumpswap", "name": "P"}]
+
+    async def orca_snapshot(self, search):
+        return self.orca
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    feed = _Upstream(
+        top=[gecko_row(n) for n in range(40)]
+        + [gecko_row(40, "BONK", "raydium", BONK), gecko_row(41, "WBONK", "orca")],
+        venues={"meteora": [gecko_row(100 + n, "MET") for n in range(5)]},
+        orca=[
+            {
+                "address": _address(40),
+                "name": "BONK-USDC",
+                "dex_id": "orca",
+                "apr": 42.0,
+                "source": "orca",
+            }
+        ],
+    )
+    monkeypatch.setattr(pool_data, "_gecko_page_rows", feed.page_rows)
+    monkeypatch.setattr(pool_data, "list_gecko_dexes", feed.dexes)
+    monkeypatch.setattr(pool_data, "_orca_snapshot", feed.orca_snapshot)
+    return feed
+
+
+def _build():
+    return run(pool_index.refresh_pool_index("solana-mainnet-beta"))
+
+
+def test_a_symbol_is_found_locally_exact_before_substring(upstream):
+    index = _build()
+    calls = len(upstream.calls)
+
+    result = run(pool_index.search_pools("solana-mainnet-beta", "bonk"))
+
+    assert len(upstream.calls) == calls, "answered without an upstream request"
+    assert result["indexed"] is True
+    assert [p["base_token_symbol"] for p in result["pools"]] == ["BONK", "WBONK"]
+    # Orca's snapshot filled the yield the gecko row has no column for.
+    assert result["pools"][0]["apr"] == 42.0
+    assert index.venues == {"meteora": (5, True)}
+
+
+def test_venue_filter_and_sort_are_served_from_memory(upstream):
+    _build()
+
+    by_reserve = run(
+        pool_index.search_pools(
+            "solana-mainnet-beta", "", dexes=["meteora"], sort="reserve_usd", limit=3
+        )
+    )
+    by_volume = run(
+        pool_index.search_pools("solana-mainnet-beta", "", dexes=["meteora"], limit=3)
+    )
+
+    reserves = [p["reserve_usd"] for p in by_reserve["pools"]]
+    assert reserves == sorted(reserves, reverse=True) and by_reserve["has_more"]
+    assert by_volume["pools"][0]["address"] == _address(0)
+    assert {p["dex_id"] for p in by_volume["pools"]} == {"meteora"}
+
+
+def test_a_token_address_goes_upstream_unless_the_index_fills_the_page(
+    upstream, monkeypatch
+):
+    _build()
+    asked = []
+
+    async def token_page(network, view, token, limit, page, dexes):
+        asked.append(token)
+        return {"pools": [{"address": "from-upstream"}], "has_more": False}
+
+    monkeypatch.setattr(pool_data, "list_gecko_pools_page", token_page)
+
+    few = run(pool_index.search_pools("solana-mainnet-beta", BONK, limit=20))
+    many = run(pool_index.search_pools("solana-mainnet-beta", SOL, limit=20))
+    pool = run(pool_index.search_pools("solana-mainnet-beta", _address(7)))
+
+    assert few["pools"] == [{"address": "from-upstream"}] and not few["indexed"]
+    assert many["indexed"] and len(many["pools"]) == 20
+    assert pool["indexed"] and [p["address"] for p in pool["pools"]] == [_address(7)]
+    assert asked == [BONK]
+
+
+def test_the_multi_venue_top_page_reads_the_index(upstream):
+    _build()
+    upstream.calls.clear()
+
+    page = run(
+        pool_data._scoped_top_page("solana", "solana", ["meteora"], limit=10, page=1)
+    )
+
+    assert upstream.calls == []
+    assert len(page["pools"]) == 10
+    assert {p["dex_id"] for p in page["pools"]} == {"meteora"}
+
+
+def test_telegram_search_reads_gecko_rows_and_defers_a_miss(upstream):
+    _build()
+
+    rows = run(pool_index.search_gecko_rows("solana", "MET", 3))
+
+    assert [r["address"] for r in rows] == [_address(100 + n) for n in range(3)]
+    assert "reserve_in_usd" in rows[0], "gecko's own row shape"
+    assert run(pool_index.search_gecko_rows("solana", BONK, 10)) is None
+    assert run(pool_index.search_gecko_rows("eth", "MET", 3)) == []
+
+
+def test_telegram_search_answers_a_symbol_from_the_index_alone(upstream):
+    _build()
+
+    rows = run(pool_index.search_gecko_rows("solana", "BONK", 10))
+
+    assert [r["address"] for r in rows] == [_address(40), _address(41)]
+    assert run(pool_index.search_gecko_rows("solana", "NOSUCH", 10)) == []
+
+
+def test_telegram_search_counts_only_gecko_listed_pools(upstream):
+    upstream.orca = [
+        {
+            "address": _address(200 + n),
+            "name": "BONK-SOL",
+            "dex_id": "orca",
+            "base_token_address": BONK,
+            "source": "orca",
+        }
+        for n in range(12)
+    ]
+    index = _build()
+    assert len(index.exact(BONK)[1]) >= 10, "the index holds enough BONK pools"
+
+    assert run(pool_index.search_gecko_rows("solana", BONK, 10)) is None
+
+
+def test_the_refresher_builds_a_searched_chain_and_wakes_the_search(upstream):
+    async def drive():
+        refresher = asyncio.ensure_future(pool_index.run_pool_index())
+        await asyncio.sleep(0)
+        try:
+            return await pool_index.search_pools("solana-mainnet-beta", "wbonk")
+        finally:
+            refresher.cancel()
+
+    result = run(drive())
+
+    assert [p["base_token_symbol"] for p in result["pools"]] == ["WBONK"]
+
+
+@pytest.mark.benchmark
+def test_benchmark_searching_a_1000_pool_index():
+    pools = [
+        pool_data._normalize_gecko_pool(gecko_row(n, f"TOK{n}"), "solana")
+        for n in range(1000)
+    ]
+    index = pool_index.PoolIndex("solana-mainnet-beta", pools, [None] * len(pools))
+
+    start = time.perf_counter()
+    for query in ("tok1", "tok99", "usdc", _address(512)[:10], "nothing"):
+        hits = index.search(query, ["meteora"], "volume_24h")
+    elapsed = (time.perf_counter() - start) / 5 * 1e3
+
+    assert hits == []
+    assert index.search("tok999") == [999]
+    print(f"\nSearch over a 1000-pool index: {elapsed:.2f}ms per query")
+    assert elapsed < 50
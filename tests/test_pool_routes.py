@@ -0,0 +1,196 @@
+"""The pair → pool routing table behind DEX charts (``condor.pool_routes``).
+
+A chart with no pinned pool resolved its pool on every candle fetch, and paid a
+GeckoTerminal request for it whenever the lookup cache had lapsed. Routes are now
+a persisted table with a liquidity score and an expiry, refreshed in the
+background and replaced when the chosen pool's liquidity collapses, so opening
+a chart costs no resolution calls once its pair has been seen.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+import pytest
+
+from condor import dex_candles, pool_data, pool_routes
+from condor.web.routes import market
+from mcp_servers.hummingbot_api.tools import geckoterminal
+
+MINT = "DezXAZ8z7PnrnRJjz3wXBoRgixCa6xjnB7YaB1pPB263"
+DEEP = "8sLbNZoA1cfnvMJLPfp98ZLAnFSYCFApfJKMbiXNLwxj"
+NEW = "5rCf1DM8LjKTw4YqhnoLcngyZYeNnQqztScTogYHAS6"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class _Lookups:
+    """The two resolution calls, counted, answering from ``pools``."""
+
+    def __init__(self, pools=None, pair=None):
+        self.pools = pools or {"SOL": {"address": DEEP, "reserve_usd": 1_000_000}}
+        self.pair = pair or (None, False)
+        self.calls: list = []
+
+    async def token(self, mint, network, quote, max_age=pool_data.TOKEN_POOL_TTL):
+        self.calls.append(("token", mint, quote, max_age))
+        return self.pools.get(quote)
+
+    async def search(self, base, quote, network, max_age=pool_data.TOKEN_POOL_TTL):
+        self.calls.append(("pair", base, quote, max_age))
+        return self.pair
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    fake = _Lookups()
+    monkeypatch.setattr(pool_data, "fetch_token_top_pool_info", fake.token)
+    monkeypatch.setattr(pool_data, "fetch_pair_top_pool_info", fake.search)
+    return fake
+
+
+def _age(pair: str, seconds: float, network: str = "solana-mainnet-beta") -> None:
+    key = pool_routes.route_key(network, pair)
+    resolved_at, value = pool_routes._routes[key]
+    pool_routes._routes[key] = (resolved_at - seconds, value)
+
+
+def test_a_second_chart_open_makes_no_resolution_call(lookups, monkeypatch):
+    charted = []
+
+    async def _ohlcv(pool, connector, timeframe, limit, before, **kwargs):
+        charted.append((pool, kwargs.get("token")))
+        return [[1000, 1, 1, 1, 1, 5]]
+
+    monkeypatch.setattr(dex_candles, "_pool_ohlcv", _ohlcv)
+    for _ in range(3):
+        run(
+            market._fetch_dex_candles(
+                "solana-mainnet-beta", None, f"{MINT}-SOL", "1m", None, None
+            )
+        )
+    run(pool_data.resolve_pool_info("solana-mainnet-beta", f"{MINT}-sol"))
+
+    assert len(lookups.calls) == 1
+    assert charted == [(DEEP, "base")] * 3
+
+
+def test_a_route_survives_a_restart(lookups):
+    route = run(pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL"))
+    OrderedDict.clear(pool_routes._routes)
+
+    again = run(pool_routes.route_pair("solana", f"{MINT}-SOL"))
+
+    assert again.address == route.address == DEEP
+    assert again.liquidity == 1_000_000
+    assert len(lookups.calls) == 1
+
+
+def test_an_inverted_ticker_pair_routes_to_the_quote_series(lookups):
+    lookups.pair = ({"address": "rlusd_xrp_pool", "reserve_usd": "5000"}, True)
+
+    route = run(pool_routes.route_pair("xrpl", "xrp-rlusd"))
+
+    assert route.token == "quote" and route.liquidity == 5000.0
+    assert lookups.calls == [("pair", "XRP", "RLUSD", pool_data.TOKEN_POOL_TTL)]
+
+
+def test_no_pool_is_not_stored_as_a_route(lookups):
+    lookups.pools = {}
+
+    assert run(pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-USDT")) is None
+    assert run(pool_routes.route_pair("solana-mainnet-beta", "BTC")) is None
+    assert len(pool_routes._routes) == 0
+
+
+def test_a_stale_route_is_served_while_the_refresher_replaces_it(lookups):
+    async def drive():
+        refresher = asyncio.ensure_future(pool_routes.run_pool_routes())
+        await asyncio.sleep(0)
+        try:
+            await pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL")
+            _age(f"{MINT}-SOL", pool_routes.ROUTE_TTL)
+            lookups.pools["SOL"] = {"address": NEW, "reserve_usd": 2_000_000}
+            stale = await pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL")
+            for _ in range(20):
+                await asyncio.sleep(0)
+            fresh = await pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL")
+            return stale, fresh
+        finally:
+            refresher.cancel()
+
+    stale, fresh = run(drive())
+
+    assert stale.address == DEEP
+    assert fresh.address == NEW and fresh.age() < 60
+    # The refresher asks GeckoTerminal, not the lookup's own cache.
+    assert lookups.calls[-1] == ("token", MINT, "SOL", 0)
+
+
+def test_a_collapsed_pool_is_replaced(lookups, monkeypatch):
+    reserves = {DEEP: 1_000_000.0}
+    asked = []
+
+    async def _by_address(network, addresses):
+        asked.append(list(addresses))
+        return [{"address": a, "reserve_usd": reserves[a]} for a in addresses]
+
+    monkeypatch.setattr(pool_data, "fetch_pools_by_addresses", _by_address)
+    run(pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL"))
+    run(pool_routes.route_pair("solana-mainnet-beta", "SOLO-XRP"))  # no pool
+
+    run(pool_routes._refresh_round())
+    healthy = run(pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL"))
+
+    pool_routes._checked_at.clear()
+    reserves[DEEP] = 1_000_000 * pool_routes.COLLAPSE_RATIO / 2
+    lookups.pools["SOL"] = {"address": NEW, "reserve_usd": 400_000}
+    run(pool_routes._refresh_round())
+    moved = run(pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL"))
+
+    assert healthy.address == DEEP
+    assert moved.address == NEW and moved.liquidity == 400_000
+    assert asked == [[DEEP], [DEEP]]
+
+
+def test_idle_pairs_leave_the_rounds(lookups):
+    run(pool_routes.route_pair("solana-mainnet-beta", f"{MINT}-SOL"))
+    key = pool_routes.route_key("solana-mainnet-beta", f"{MINT}-SOL")
+    pool_routes._demand[key] = ("solana-mainnet-beta", time.time() - 2 * 86400)
+    _age(f"{MINT}-SOL", pool_routes.ROUTE_TTL)
+
+    run(pool_routes._refresh_round())
+
+    assert key not in pool_routes._demand
+    assert len(lookups.calls) == 1
+
+
+def test_the_mcp_tool_reads_a_pair_through_its_route(lookups, monkeypatch):
+    requested = []
+
+    async def _gecko_request(method, path, params=None):
+        requested.append((path, params))
+        return {"data": {"attributes": {"ohlcv_list": [[1000, 1, 2, 0.5, 1.5, 9]]}}}
+
+    monkeypatch.setattr(pool_data, "gecko_request", _gecko_request)
+    lookups.pair = ({"address": "rlusd_xrp_pool", "name": "RLUSD / XRP"}, True)
+
+    described = run(
+        geckoterminal.explore_geckoterminal(
+            action="pair_pool", network="xrpl", trading_pair="XRP-RLUSD"
+        )
+    )
+    candles = run(
+        geckoterminal.explore_geckoterminal(
+            action="ohlcv", network="xrpl", trading_pair="XRP-RLUSD", limit=10
+        )
+    )
+
+    assert "rlusd_xrp_pool" in described["formatted_output"]
+    assert "Series: quote token" in described["formatted_output"]
+    assert "1 candles" in candles["formatted_output"]
+    assert requested[0][0] == "networks/xrpl/pools/rlusd_xrp_pool/ohlcv/hour"
+    assert requested[0][1]["token"] == "quote"
+    assert len(lookups.calls) == 1
@@ -0,0 +1,307 @@
+"""Precomputed Orca and Gateway listings for the pool browser (``condor.pool_snapshots``).
+
+The Orca and Gateway tabs fetched and normalized their listings on the request
+path, so the first page after the cache's TTL waited on a 500-row upstream call.
+Each unsearched listing is now a snapshot, ranked in advance by TVL, volume and
+yield and rebuilt in the background before it expires. A page of one is a
+slice, and an expired snapshot is served while it is replaced.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+import condor.web.routes.dex as dex_routes
+from condor import pool_data, pool_snapshots
+from condor.web.auth import get_current_user
+from condor.web.models import WebUser
+
+USER = WebUser(id=111, username="u", first_name="U", role="user")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def _address(n: int) -> str:
+    return f"Whir{n:040d}"
+
+
+def orca_row(n: int, tvl: float, volume: float, yield_: float) -> dict:
+    """One raw ``api.orca.so`` whirlpool."""
+    return {
+        "address": _address(n),
+        "tokenA": {"symbol": f"T{n}", "address": f"Mint{n:040d}"},
+        "tokenB": {
+            "symbol": "USDC",
+            "address": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        },
+        "tvlUsdc": str(tvl),
+        "feeRate": "400",
+        "stats": {"24h": {"volume": str(volume), "yieldOverTvl": str(yield_)}},
+    }
+
+
+class _Orca:
+    """Orca's API, counted; ``rows`` ranked by TVL as the real one answers."""
+
+    def __init__(self, size=50):
+        self.rows = [
+            orca_row(n, tvl=1e6 - n, volume=(n * 37) % size, yield_=n / 1000)
+            for n in range(size)
+        ]
+        self.calls = 0
+        self.error = None
+
+    async def fetch(self, size, search=None, **kwargs):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return list(self.rows)
+
+
+@pytest.fixture
+def orca(monkeypatch):
+    fake = _Orca()
+    monkeypatch.setattr(pool_data.orca_api, "fetch_whirlpools", fake.fetch)
+    pool_data._orca_pool_list_cache.clear()
+    pool_data._gateway_pool_list_cache.clear()
+    return fake
+
+
+def _age(key, seconds):
+    """Age a snapshot and the listing cache entry it was built from."""
+    pool_snapshots._snapshots[key].built_at -= seconds
+    cache = pool_data._orca_pool_list_cache
+    if key[0] == "orca" and ("",) in cache:
+        fetched_at, rows = cache[("",)]
+        cache[("",)] = (fetched_at - seconds, rows)
+
+
+def test_every_page_and_sort_is_a_slice_of_one_read(orca):
+    first = run(pool_snapshots.venue_page("orca", limit=20, page=1))
+    last = run(pool_snapshots.venue_page("orca", limit=20, page=3))
+    by_volume = run(pool_snapshots.venue_page("orca", "volume_24h", limit=5))
+    by_yield = run(pool_snapshots.venue_page("orca", "apr", limit=5))
+
+    assert orca.calls == 1
+    assert [p["address"] for p in first[0]] == [_address(n) for n in range(20)]
+    assert first[1] is True and len(last[0]) == 10 and last[1] is False
+    volumes = [p["volume_24h"] for p in by_volume[0]]
+    assert volumes == sorted(volumes, reverse=True) and volumes[0] == 49
+    assert by_yield[0][0]["address"] == _address(49)
+
+
+def test_a_page_is_a_copy_a_caller_cannot_poison(orca):
+    rows, _ = run(pool_snapshots.venue_page("orca", limit=1))
+    rows[0]["name"] = "poisoned"
+
+    again, _ = run(pool_snapshots.venue_page("orca", limit=1))
+
+    assert again[0]["name"] != "poisoned"
+
+
+def test_normalization_and_ranking_run_off_the_event_loop(orca, monkeypatch):
+    threads = []
+    normalize = pool_data._normalize_venue_rows
+
+    def _record(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return normalize(*args, **kwargs)
+
+    monkeypatch.setattr(pool_data, "_normalize_venue_rows", _record)
+    run(pool_snapshots.venue_page("orca"))
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_an_expired_snapshot_is_served_while_the_refresher_replaces_it(orca):
+    async def drive():
+        refresher = asyncio.ensure_future(pool_snapshots.run_pool_snapshots())
+        await asyncio.sleep(0)
+        try:
+            await pool_snapshots.venue_page("orca")
+            _age(("orca", ""), 10 * pool_snapshots.SNAPSHOT_TTL["orca"])
+            orca.rows[0] = orca_row(999, tvl=2e6, volume=1, yield_=0)
+            stale = await pool_snapshots.venue_page("orca", limit=1)
+            calls_before_answer = orca.calls
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if orca.calls > 1:
+                    break
+            await asyncio.sleep(0.05)
+            fresh = await pool_snapshots.venue_page("orca", limit=1)
+            return stale, calls_before_answer, fresh
+        finally:
+            refresher.cancel()
+
+    stale, calls_before_answer, fresh = run(drive())
+
+    assert calls_before_answer == 1, "the stale page was answered without a read"
+    assert stale[0][0]["address"] == _address(0)
+    assert fresh[0][0]["address"] == _address(999)
+    assert orca.calls == 2
+
+
+def test_a_failed_rebuild_keeps_the_snapshot_and_leaves_it_due(orca):
+    run(pool_snapshots.venue_page("orca"))
+    key = ("orca", "")
+    held = pool_snapshots._snapshots[key]
+    _age(key, pool_snapshots.SNAPSHOT_TTL["orca"])
+    orca.error = RuntimeError("429")
+
+    wait = run(pool_snapshots._refresh_round())
+
+    assert pool_snapshots._snapshots[key] is held
+    assert wait == 1.0, "due again on the next round"
+
+
+def test_an_idle_listing_leaves_the_rounds_but_keeps_its_snapshot(orca):
+    run(pool_snapshots.venue_page("orca"))
+    key = ("orca", "")
+    pool_snapshots._demand[key] = (None, time.time() - 2 * 900)
+    _age(key, pool_snapshots.SNAPSHOT_TTL["orca"])
+
+    run(pool_snapshots._refresh_round())
+
+    assert key not in pool_snapshots._demand and key in pool_snapshots._snapshots
+    assert orca.calls == 1
+
+
+# ── Gateway ──
+
+
+def gateway_row(n: int, apr: float) -> dict:
+    return {
+        "pool_address": _address(n),
+        "connector": "meteora",
+        "trading_pair": f"T{n}-USDC",
+        "base_symbol": f"T{n}",
+        "quote_symbol": "USDC",
+        "mint_x": f"Mint{n:040d}",
+        "mint_y": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        "liquidity": 1000.0 + n,
+        "volume_24h": 10.0 * n,
+        "apr": apr,
+        "base_fee_percentage": 0.2,
+        "price_change_24h": 0.0,
+    }
+
+
+class _Clmm:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls: list = []
+
+    async def get_pools(self, connector, page, limit, search_term=None):
+        self.calls.append((page, limit))
+        return {"pools": self.rows[page * limit : (page + 1) * limit]}
+
+
+class _Client:
+    def __init__(self, rows):
+        self.gateway_clmm = _Clmm(rows)
+
+
+class _ConfigManager:
+    def __init__(self, client):
+        self._client = client
+
+    def has_server_access(self, *a, **kw):
+        return True
+
+    async def get_client(self, name):
+        return self._client
+
+
+@pytest.fixture
+def browser(monkeypatch, orca):
+    def build(client):
+        cm = _ConfigManager(client)
+        monkeypatch.setattr(dex_routes, "get_config_manager", lambda: cm)
+        monkeypatch.setattr("condor.web.auth.get_config_manager", lambda: cm)
+        app = FastAPI()
+        app.include_router(dex_routes.router)
+        app.dependency_overrides[get_current_user] = lambda: USER
+        return TestClient(app)
+
+    return build
+
+
+def test_a_gateway_listing_is_sorted_from_its_snapshot(browser):
+    client = _Client([gateway_row(n, apr=float(n % 7)) for n in range(30)])
+    web = browser(client)
+
+    body = web.get(
+        "/servers/srv/dex/pools?source=gateway&connector=meteora&sort=apr&limit=5"
+    ).json()
+    page2 = web.get(
+        "/servers/srv/dex/pools?source=gateway&connector=meteora&limit=5&page=2"
+    ).json()
+
+    assert client.gateway_clmm.calls == [(0, pool_snapshots.GATEWAY_SNAPSHOT_ROWS)]
+    assert [p["apr"] for p in body["pools"]] == [6.0] * 4 + [5.0]
+    assert [p["address"] for p in page2["pools"]] == [_address(n) for n in range(5, 10)]
+    assert page2["has_more"] is True
+
+
+def test_a_page_past_a_partial_gateway_snapshot_is_read_upstream(browser):
+    rows = [
+        gateway_row(n, apr=1.0) for n in range(pool_snapshots.GATEWAY_SNAPSHOT_ROWS + 5)
+    ]
+    client = _Client(rows)
+    web = browser(client)
+    limit = 20
+    past = pool_snapshots.GATEWAY_SNAPSHOT_ROWS // limit + 1
+
+    body = web.get(
+        f"/servers/srv/dex/pools?source=gateway&connector=meteora&limit={limit}"
+        f"&page={past}"
+    ).json()
+
+    assert client.gateway_clmm.calls[-1] == (past - 1, limit)
+    assert len(body["pools"]) == 5
+
+
+def test_a_searched_or_unknown_sort_listing_skips_the_snapshot(browser, orca):
+    web = browser(None)
+
+    assert web.get("/servers/srv/dex/pools?source=orca&sort=fdv_usd").status_code == 400
+    web.get("/servers/srv/dex/pools?source=orca&query=BONK")
+
+    assert pool_snapshots._snapshots == {}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("size", [500])
+def test_benchmark_a_page_after_the_ttl(orca, size):
+    orca.rows = [orca_row(n, tvl=1e6 - n, volume=n, yield_=0.001) for n in range(size)]
+
+    async def drive():
+        await pool_snapshots.venue_page("orca")
+        pool_data._orca_pool_list_cache.clear()
+        start = time.perf_counter()
+        await pool_data.list_orca_pools(limit=20, page=3)
+        relisted = time.perf_counter() - start
+
+        refresher = asyncio.ensure_future(pool_snapshots.run_pool_snapshots())
+        await asyncio.sleep(0)
+        try:
+            _age(("orca", ""), 10 * pool_snapshots.SNAPSHOT_TTL["orca"])
+            start = time.perf_counter()
+            await pool_snapshots.venue_page("orca", "volume_24h", limit=20, page=3)
+            sliced = time.perf_counter() - start
+        finally:
+            refresher.cancel()
+        return relisted, sliced
+
+    relisted, sliced = run(drive())
+    print(
+        f"\n{size}-row listing, page 3 after the TTL: {relisted * 1e3:.2f}ms "
+        f"re-read and normalized -> {sliced * 1e3:.3f}ms sliced from the snapshot"
+    )
+    assert sliced < relisted
@@ -0,0 +1,138 @@
+"""Columnar GeckoTerminal listings (``condor.pool_table``).
+
+The pool browser normalized every upstream row into a full dict (a float parse
+per field, a venue lookup per row) before the dex filter, the volume sort and
+the page slice threw most of them away. A listing is now a :class:`PoolTable`:
+numbers parsed once per column, venue facts once per dex, filter, rank and slice
+as index arrays, and dicts built only for the rows that reach the response.
+"""
+
+import random
+import time
+
+import pytest
+
+from condor import pool_data
+from condor.pool_table import PoolTable
+
+SOL = "So11111111111111111111111111111111111111112"
+DEXES = ("meteora", "orca", "raydium-clmm", "pumpswap")
+
+
+def _row(n: int, rng: random.Random) -> dict:
+    """One flat row in the shape ``_gecko_page_fetch`` caches."""
+    return {
+        "id": f"solana_{n:044d}",
+        "address": f"{n:044d}",
+        "name": f"TOK{n} / SOL",
+        "base_token_price_usd": str(rng.random()),
+        "quote_token_price_usd": "150.0",
+        "reserve_in_usd": str(rng.random() * 1e6),
+        "pool_created_at": "2024-01-01T00:00:00Z",
+        "fdv_usd": None,
+        "market_cap_usd": "1000",
+        "price_change_percentage_h1": "1.0",
+        "price_change_percentage_h24": "-2.0",
+        "volume_usd_h24": str(rng.random() * 1e5),
+        "dex_id": DEXES[n % len(DEXES)],
+        "base_token_id": f"solana_{n:044d}",
+        "quote_token_id": f"solana_{SOL}",
+    }
+
+
+def _rows(count: int) -> list:
+    rng = random.Random(7)
+    return [_row(n, rng) for n in range(count)]
+
+
+def _row_path(rows, network):
+    """What the browser built before: one ``_normalize_gecko_pool`` per row."""
+    pools = [pool_data._normalize_gecko_pool(dict(row), network) for row in rows]
+    return [p for p in pools if p.get("address")]
+
+
+def test_records_match_the_row_path_field_for_field():
+    rows = _rows(200)
+    rows[3]["name"] = None
+    rows[4]["name"] = "a-b"
+    rows[5]["base_token_price_usd"] = "nan"
+    rows[6]["volume_usd_h24"] = None
+    rows[7]["address"] = ""
+    rows[7]["id"] = ""
+    rows[8]["dex_id"] = None
+    rows[9]["quote_token_price_usd"] = "0"
+    rows[10]["base_token_price_quote_token"] = "0.5"
+
+    for network in ("solana-mainnet-beta", "solana", "xrpl"):
+        expected = _row_path(rows, network)
+        got = PoolTable.from_gecko_rows(rows, network).records()
+        assert got == expected, network
+        assert [list(p) for p in got] == [list(p) for p in expected], "key order"
+
+
+def test_filter_rank_and_window_are_the_list_operations():
+    rows = _rows(100)
+    rows[1]["volume_usd_h24"] = rows[2]["volume_usd_h24"] = "5e9"  # a tie
+
+    table = PoolTable.from_gecko_rows(rows, "solana-mainnet-beta")
+    got = table.only_dexes({"meteora", "orca"}).ranked_by("volume_24h").window(2, 12)
+
+    expected = [
+        p
+        for p in _row_path(rows, "solana-mainnet-beta")
+        if p["dex_id"] in ("meteora", "orca")
+    ]
+    expected.sort(key=lambda p: p.get("volume_24h") or 0.0, reverse=True)
+    assert got.records() == expected[2:12]
+    assert table.only_dexes(set()) is table
+    assert PoolTable.concat([table.window(0, 40), table.window(40, 100)]).records() == (
+        table.records()
+    )
+
+
+def test_a_nested_batch_falls_back_to_the_row_path():
+    raw = {
+        "id": "solana_abc",
+        "attributes": {
+            "address": "abc",
+            "name": "BONK / SOL",
+            "volume_usd": {"h24": "12.5"},
+        },
+    }
+
+    got = PoolTable.from_gecko_rows([raw], "solana").records()
+
+    assert got == [pool_data._normalize_gecko_pool(raw, "solana")]
+    assert got[0]["volume_24h"] == 12.5
+
+
+@pytest.mark.benchmark
+def test_benchmark_a_1000_row_listing():
+    rows = _rows(1000)
+    network, dexes = "solana-mainnet-beta", {"meteora"}
+
+    def by_row():
+        pools = [
+            p
+            for p in _row_path(rows, network)
+            if str(p.get("dex_id") or "").lower() in dexes
+        ]
+        pools.sort(key=lambda p: p.get("volume_24h") or 0.0, reverse=True)
+        return pools[:20]
+
+    def by_column():
+        table = PoolTable.from_gecko_rows(rows, network).only_dexes(dexes)
+        return table.ranked_by("volume_24h").window(0, 20).records()
+
+    def best_of(fn, rounds=5):
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1e3
+
+    assert by_column() == by_row()
+    before, after = best_of(by_row), best_of(by_column)
+    print(f"\n1000-row listing to a 20-row page: {before:.1f}ms -> {after:.1f}ms")
+    assert after < before
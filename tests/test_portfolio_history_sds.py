@@ -14,6 +14,7 @@ a second subscriber never spawns a duplicate poll.
 """
 
 import asyncio
+import json
 from pathlib import Path
 
 import pytest
@@ -232,12 +233,20 @@ def _expire(sds: ServerDataService) -> None:
     """Age every cache entry past its interval so the next tick is due."""
     for entry in sds._cache.values():
         entry.fetched_at = 0.0
+    _reschedule(sds)
 
 
 def _age(sds: ServerDataService, seconds: float) -> None:
     """Backdate every cache entry by ``seconds`` (per-range cadences differ)."""
     for entry in sds._cache.values():
         entry.fetched_at -= seconds
+    _reschedule(sds)
+
+
+def _reschedule(sds: ServerDataService) -> None:
+    """Recompute deadlines: backdating an entry is not something SDS watches."""
+    for key in list(sds._subscriptions):
+        sds._reschedule(key)
 
 
 def test_poll_starts_with_the_portfolio_subscriber_and_stops_with_it(env):
@@ -248,8 +257,8 @@ def test_poll_starts_with_the_portfolio_subscriber_and_stops_with_it(env):
     async def _drive():
         manager = WebSocketManager()
         conn = _Connection(_FakeWS(), user_id=1)
-        conn.channels.add("portfolio:srv")
         manager._connections.append(conn)
+        manager._add_subscription(conn, "portfolio:srv")
 
         await manager._subscribe_sds("portfolio:srv")
         await _drain(manager)
@@ -262,7 +271,7 @@ def test_poll_starts_with_the_portfolio_subscriber_and_stops_with_it(env):
         polled = len(client.history_calls)
 
         # Last subscriber leaves.
-        conn.channels.discard("portfolio:srv")
+        manager._remove_subscription(conn, "portfolio:srv")
         manager._maybe_unsub_sds("portfolio:srv")
         after_unsub = len(client.history_calls)
 
@@ -377,8 +386,8 @@ def test_second_subscriber_does_not_spawn_a_duplicate_poll(env):
         manager = WebSocketManager()
         for user_id in (1, 2):
             conn = _Connection(_FakeWS(), user_id=user_id)
-            conn.channels.add("portfolio:srv")
             manager._connections.append(conn)
+            manager._add_subscription(conn, "portfolio:srv")
             await manager._subscribe_sds("portfolio:srv")
             await _drain(manager)
 
@@ -404,8 +413,8 @@ def test_first_client_leaving_keeps_the_poll_alive_for_the_second(env):
         conns = []
         for user_id in (1, 2):
             conn = _Connection(_FakeWS(), user_id=user_id)
-            conn.channels.add("portfolio:srv")
             manager._connections.append(conn)
+            manager._add_subscription(conn, "portfolio:srv")
             conns.append(conn)
         await manager._subscribe_sds("portfolio:srv")
         await _drain(manager)
@@ -443,5 +452,5 @@ class _FakeWS:
     def __init__(self):
         self.sent: list[dict] = []
 
-    async def send_json(self, payload: dict) -> None:
-        self.sent.append(payload)
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
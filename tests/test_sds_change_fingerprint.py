@@ -0,0 +1,172 @@
+"""Fingerprint-based change detection in ServerDataService.
+
+Every write used to deep-compare the new payload against the old one
+(``result != old_value``) and the WS manager compared it a second time per
+channel — for TICKER_POOL that is every connector x every pair, twice per
+poll, on the event loop. SDS now hashes each payload once (off the loop for
+fetches), stores the hash on the ``CacheEntry``, and hands listeners a
+``changed`` flag.
+"""
+
+import asyncio
+import copy
+import json
+import random
+import time
+
+import pytest
+
+from condor.server_data_service import (
+    CacheKey,
+    ServerDataService,
+    ServerDataType,
+    fingerprint,
+)
+from condor.web.ws_manager import WebSocketManager, _Connection
+
+
+def _ticker_pool(n_pairs: int = 5000, seed: int = 7) -> dict:
+    """A TICKER_POOL payload shaped like ``fetch_ticker_pool``'s, 5k tickers."""
+    rng = random.Random(seed)
+    connectors: dict = {}
+    for i in range(n_pairs):
+        connector = f"exchange_{i % 10}"
+        pair = f"T{i}-USDT"
+        connectors.setdefault(connector, {})[pair] = {
+            "price": rng.uniform(0.01, 50_000),
+            "base_volume": rng.uniform(0, 1e6),
+            "quote_volume": rng.uniform(0, 1e8),
+            "usd_volume": rng.uniform(0, 1e8),
+        }
+    prices = {
+        pair: t["price"]
+        for tickers in connectors.values()
+        for pair, t in tickers.items()
+    }
+    updated_at = {c: 1_700_000_000.0 for c in connectors}
+    return {"connectors": connectors, "prices": prices, "updated_at": updated_at}
+
+
+def _make_sds(values: list):
+    sds = ServerDataService()
+
+    async def _fake_get_client(server_name):
+        return object()
+
+    async def _fetch(client, **params):
+        return values.pop(0)
+
+    sds._get_client = _fake_get_client
+    sds.register_fetch(ServerDataType.TICKER_POOL, _fetch)
+    return sds
+
+
+def test_listeners_get_a_changed_flag_and_callbacks_fire_only_on_change():
+    pool = _ticker_pool(200)
+    moved = copy.deepcopy(pool)
+    moved["prices"]["T3-USDT"] += 1
+    seen: list = []
+    fired: list = []
+
+    async def _on_change(key, old, new):
+        fired.append(new)
+
+    async def _drive():
+        sds = _make_sds([pool, copy.deepcopy(pool), moved])
+        sds.add_listener(lambda key, value, changed: seen.append(changed))
+        await sds.subscribe(
+            "srv", ServerDataType.TICKER_POOL, "ws_manager", callback=_on_change
+        )
+        for _ in range(2):
+            sds._cache[CacheKey.make("srv", ServerDataType.TICKER_POOL)].fetched_at = 0
+            await sds._fetch_and_cache(CacheKey.make("srv", ServerDataType.TICKER_POOL))
+        await asyncio.sleep(0)
+        return sds
+
+    sds = asyncio.run(_drive())
+
+    assert seen == [True, False, True]
+    assert len(fired) == 2
+    entry = sds._cache[CacheKey.make("srv", ServerDataType.TICKER_POOL)]
+    assert entry.fingerprint == fingerprint(moved)
+
+
+def test_fingerprint_ignores_key_order_and_notices_any_value():
+    a = {"x": 1, "y": {"b": [1, 2], "a": None}}
+    b = {"y": {"a": None, "b": [1, 2]}, "x": 1}
+
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint(a) != fingerprint({**a, "x": 2})
+
+
+def test_a_value_that_cannot_be_hashed_falls_back_to_equality():
+    seen: list = []
+    sds = ServerDataService()
+    sds.add_listener(lambda key, value, changed: seen.append(changed))
+
+    # Mixed-type keys: no canonical key order exists.
+    sds.put("srv", ServerDataType.PORTFOLIO, {1: "a", "b": 2})
+    sds.put("srv", ServerDataType.PORTFOLIO, {1: "a", "b": 2})
+
+    assert seen == [True, False]
+
+
+class _FakeWS:
+    def __init__(self):
+        self.sent: list = []
+
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
+
+
+def test_ws_manager_skips_an_unchanged_write_without_comparing():
+    manager = WebSocketManager()
+    ws = _FakeWS()
+    conn = _Connection(ws, user_id=1)
+    manager._connections.append(conn)
+    manager._add_subscription(conn, "portfolio:srv")
+    key = CacheKey.make("srv", ServerDataType.PORTFOLIO)
+
+    async def _drive():
+        manager._on_data_update(key, {"total": 1}, True)
+        await asyncio.gather(*list(manager._oneshot_tasks))
+        manager._on_data_update(key, {"total": 1}, False)
+        assert len(manager._oneshot_tasks) == 0
+        await conn.outbox.wait_idle()
+
+    asyncio.run(_drive())
+
+    assert [m["data"] for m in ws.sent] == [{"total": 1}]
+
+
+@pytest.mark.benchmark
+def test_benchmark_unchanged_5k_ticker_pool_poll():
+    pool = _ticker_pool()
+    same = copy.deepcopy(pool)
+    stored = fingerprint(pool)
+
+    def deep_compare():
+        # Before: SDS's `result != old_value`, then the WS manager's `data != prev`.
+        return (same != pool) or (same != pool)
+
+    def on_loop_now():
+        # After: the hash was computed in a worker thread; the loop compares it.
+        return fingerprint_of_same != stored
+
+    fingerprint_of_same = fingerprint(same)
+    assert deep_compare() is False and on_loop_now() is False
+
+    def per_call(fn, rounds=20):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds
+
+    before, after = per_call(deep_compare), per_call(on_loop_now)
+    hashing = per_call(lambda: fingerprint(same), rounds=5)
+    print(
+        f"\nUnchanged 5k-ticker pool poll, event-loop time: "
+        f"2x deep == {before * 1e3:.2f}ms -> fingerprint compare "
+        f"{after * 1e6:.1f}us (hash {hashing * 1e3:.2f}ms, in a worker thread)"
+    )
+    assert after * 100 < before
@@ -16,6 +16,7 @@ channel, and no per-data-type string synthesis creeps back into SDS.
 
 import asyncio
 import inspect
+import json
 
 from condor.server_data_service import (
     CacheKey,
@@ -30,27 +31,31 @@ class _FakeWS:
     def __init__(self):
         self.sent: list[dict] = []
 
-    async def send_json(self, payload: dict) -> None:
-        self.sent.append(payload)
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
 
 
 def _manager_with_subscriber(channel: str) -> tuple[WebSocketManager, _FakeWS]:
     manager = WebSocketManager()
     ws = _FakeWS()
     conn = _Connection(ws, user_id=1)
-    conn.channels.add(channel)
     manager._connections.append(conn)
+    manager._add_subscription(conn, channel)
     return manager, ws
 
 
 async def _drain(manager: WebSocketManager) -> None:
     await asyncio.gather(*list(manager._oneshot_tasks), return_exceptions=True)
+    # Broadcasts only enqueue; the per-connection writers do the sending.
+    for conn in manager._connections:
+        if conn.outbox is not None:
+            await conn.outbox.wait_idle()
     await asyncio.sleep(0)
 
 
 def _capture(sds: ServerDataService) -> list[tuple]:
     seen: list[tuple] = []
-    sds.add_listener(lambda key, value: seen.append((key, value)))
+    sds.add_listener(lambda key, value, changed: seen.append((key, value)))
     return seen
 
 
@@ -159,7 +164,11 @@ def test_key_without_a_channel_is_dropped_deliberately_not_misrouted():
 def test_listener_registration_survives_a_failing_listener():
     """One listener raising must not stop the others (or the cache write)."""
     sds = ServerDataService()
-    sds.add_listener(lambda key, value: (_ for _ in ()).throw(RuntimeError("boom")))
+
+    def failing(key, value, changed):
+        raise RuntimeError("boom")
+
+    sds.add_listener(failing)
     seen = _capture(sds)
 
     sds.put("srv", ServerDataType.BOTS_STATUS, {"bots": []})
@@ -196,7 +205,7 @@ def test_ws_manager_listener_registers_and_unregisters_on_the_live_service():
     try:
         assert len(sds._listeners) == before + 1
         sig = inspect.signature(manager._on_data_update)
-        assert list(sig.parameters) == ["key", "value"]
+        assert list(sig.parameters) == ["key", "value", "changed"]
     finally:
         sds.remove_listener(manager._on_data_update)
     assert len(sds._listeners) == before
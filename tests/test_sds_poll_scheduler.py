@@ -0,0 +1,226 @@
+"""The ServerDataService poll scheduler.
+
+The poll loop used to wake every second, scan every subscribed key and fire
+all due keys in one gather, each racing for a rate-limit token — a loser
+simply waited for the next second. Keys now sit in a heap by deadline, the
+loop sleeps exactly until the next one, and tokens go to interactive keys
+before the startup warmer's.
+"""
+
+import asyncio
+import time
+
+from condor.server_data_service import (
+    _AUTO_SUBSCRIBER,
+    _MAX_JITTER,
+    PollPriority,
+    RateLimiter,
+    ServerDataService,
+    ServerDataType,
+)
+
+
+def _make_sds(calls: list):
+    sds = ServerDataService()
+
+    async def _fake_get_client(server_name):
+        return object()
+
+    async def _fetch(client, **params):
+        calls.append(params.get("connector_name"))
+        return {"n": len(calls)}
+
+    sds._get_client = _fake_get_client
+    sds.register_fetch(ServerDataType.TRADING_RULES, _fetch)
+    sds.register_fetch(ServerDataType.EXECUTORS, _fetch)
+    return sds
+
+
+def test_the_loop_sleeps_until_the_next_deadline_not_a_fixed_tick():
+    calls: list = []
+
+    async def _drive():
+        sds = _make_sds(calls)
+        await sds.subscribe("srv", ServerDataType.EXECUTORS, "ws_manager", interval=0.2)
+        sds.start()
+        await asyncio.sleep(0.75)
+        sds.stop()
+
+    asyncio.run(_drive())
+
+    # Prime plus at least two polls in 0.75s: a 1s tick would have managed none.
+    assert len(calls) >= 3
+
+
+def test_interactive_keys_get_the_token_before_background_ones():
+    calls: list = []
+
+    async def _drive():
+        sds = _make_sds(calls)
+        for connector in ("bg_a", "bg_b"):
+            await sds.subscribe(
+                "srv",
+                ServerDataType.TRADING_RULES,
+                _AUTO_SUBSCRIBER,
+                interval=60,
+                connector_name=connector,
+            )
+        await sds.subscribe(
+            "srv",
+            ServerDataType.TRADING_RULES,
+            "ws_manager",
+            interval=60,
+            connector_name="live",
+        )
+        for entry in sds._cache.values():
+            entry.fetched_at -= 120
+        for key in list(sds._subscriptions):
+            sds._reschedule(key)
+
+        # Two tokens left: the background share may not touch the last one.
+        limiter = sds._get_rate_limiter("srv")
+        limiter._tokens_sec = 2.0
+        del calls[:]
+        started, retry_at = sds._dispatch_due()
+        await asyncio.gather(*started)
+        return retry_at
+
+    retry_at = asyncio.run(_drive())
+
+    assert calls == ["live"]
+    # The held-back keys come back when a token frees up, not on a fixed tick.
+    assert retry_at is not None and retry_at - time.time() < 1.0
+
+
+def test_priority_classes():
+    async def _drive():
+        sds = _make_sds([])
+
+        async def _failing(client, **params):
+            raise RuntimeError("offline")
+
+        sds.register_fetch(ServerDataType.PORTFOLIO, _failing)
+        warm = await sds.subscribe(
+            "srv", ServerDataType.EXECUTORS, _AUTO_SUBSCRIBER, interval=5
+        )
+        cold = await sds.subscribe(
+            "srv", ServerDataType.PORTFOLIO, _AUTO_SUBSCRIBER, interval=5
+        )
+        before = sds._priority(warm)
+        await sds.subscribe("srv", ServerDataType.EXECUTORS, "ws_manager", interval=5)
+        return before, sds._priority(warm), sds._priority(cold)
+
+    background, interactive, warmup = asyncio.run(_drive())
+
+    assert background is PollPriority.BACKGROUND
+    assert interactive is PollPriority.INTERACTIVE
+    assert warmup is PollPriority.WARMUP
+
+
+def test_a_fetch_outside_the_poll_pushes_the_deadline_out():
+    calls: list = []
+
+    async def _drive():
+        sds = _make_sds(calls)
+        key = await sds.subscribe(
+            "srv", ServerDataType.EXECUTORS, "ws_manager", interval=2
+        )
+        sds._cache[key].fetched_at -= 10
+        sds._reschedule(key)
+        # A REST read refreshes the entry before the poll gets to it.
+        sds.invalidate("srv", ServerDataType.EXECUTORS)
+        await sds.get_or_fetch("srv", ServerDataType.EXECUTORS)
+        mark = len(calls)
+        await sds._poll_tick()
+        return mark, sds._due[key] - time.time()
+
+    mark, until_due = asyncio.run(_drive())
+
+    assert len(calls) == mark, "a freshly fetched key is not polled again"
+    assert 1.5 < until_due <= 2 + _MAX_JITTER
+
+
+def test_unsubscribing_drops_the_key_from_the_schedule():
+    calls: list = []
+
+    async def _drive():
+        sds = _make_sds(calls)
+        key = await sds.subscribe(
+            "srv", ServerDataType.EXECUTORS, "ws_manager", interval=2
+        )
+        sds.unsubscribe(key, "ws_manager")
+        sds._cache[key].fetched_at = 0.0
+        mark = len(calls)
+        await sds._poll_tick()
+        return mark, sds
+
+    mark, sds = asyncio.run(_drive())
+
+    assert len(calls) == mark
+    assert sds._due == {}
+
+
+def test_jitter_only_ever_delays_and_stays_bounded():
+    async def _drive():
+        sds = _make_sds([])
+        offsets = []
+        for n in range(50):
+            key = await sds.subscribe(
+                "srv",
+                ServerDataType.TRADING_RULES,
+                "ws_manager",
+                interval=2,
+                connector_name=f"c{n}",
+            )
+            fetched_at = sds._cache[key].fetched_at
+            asked = {sds._next_due(key) - fetched_at for _ in range(5)}
+            assert len(asked) == 1, "a key's deadline must not move between asks"
+            offsets.extend(asked)
+        return offsets
+
+    offsets = asyncio.run(_drive())
+
+    assert all(2.0 <= o <= 2.0 + 0.2 for o in offsets)
+    assert len(set(offsets)) > 1, "keys sharing a cadence must not line up"
+
+
+def test_a_due_key_is_fetched_not_pushed_back_by_a_fresh_jitter_draw():
+    calls: list = []
+
+    async def _drive():
+        sds = _make_sds(calls)
+        keys = []
+        for n in range(4):
+            keys.append(
+                await sds.subscribe(
+                    "srv",
+                    ServerDataType.TRADING_RULES,
+                    "ws_manager",
+                    interval=2,
+                    connector_name=f"c{n}",
+                )
+            )
+        # Each deadline passed just now, well inside the jitter window: a
+        # deadline redrawn on dispatch would almost always land in the future.
+        for key in keys:
+            entry = sds._cache[key]
+            entry.jitter = 0.0
+            entry.fetched_at = time.time() - 2.0 - 0.01
+            sds._reschedule(key)
+        mark = len(calls)
+        await sds._poll_tick()
+        return mark
+
+    mark = asyncio.run(_drive())
+
+    assert len(calls) == mark + 4
+
+
+def test_try_acquire_leaves_the_reserve_and_says_how_long_to_wait():
+    limiter = RateLimiter(per_second=5.0, per_minute=100.0)
+    limiter._tokens_sec = 1.5
+
+    assert limiter.try_acquire(reserve=0.2) > 0
+    assert limiter.try_acquire() == 0.0
+    wait = limiter.try_acquire()
+    assert 0 < wait <= 0.2
@@ -0,0 +1,133 @@
+"""Cross-process ServerDataService cache (``condor.sds_shared_cache``).
+
+Two ``ServerDataService`` instances, each with its own ``SqliteSharedCache``
+on the same file, stand in for two Condor processes on one host: one poller
+must serve both, and a cold key must cost one backend request between them.
+"""
+
+import asyncio
+
+import pytest
+
+from condor.sds_shared_cache import SqliteSharedCache, shared_cache_from_env
+from condor.server_data_service import ServerDataService, ServerDataType
+
+
+def _process(path, calls: list, value=None, delay: float = 0.0):
+    sds = ServerDataService()
+    sds.set_shared_cache(SqliteSharedCache(path))
+
+    async def _fake_get_client(server_name):
+        return object()
+
+    async def _fetch(client, **params):
+        calls.append(sds)
+        await asyncio.sleep(delay)
+        return value if value is not None else {"total": len(calls)}
+
+    sds._get_client = _fake_get_client
+    sds.register_fetch(ServerDataType.PORTFOLIO, _fetch)
+    return sds
+
+
+def test_a_value_fetched_by_one_process_is_read_by_another(tmp_path):
+    calls: list = []
+    a = _process(tmp_path / "sds.sqlite", calls)
+    b = _process(tmp_path / "sds.sqlite", calls)
+
+    fetched = asyncio.run(a.get_or_fetch("srv", ServerDataType.PORTFOLIO))
+    read = asyncio.run(b.get_or_fetch("srv", ServerDataType.PORTFOLIO))
+
+    assert fetched == read == {"total": 1}
+    assert len(calls) == 1
+    assert b.get_server_health("srv").status.value == "online"
+
+
+def test_get_never_reads_the_backend(tmp_path):
+    calls: list = []
+    a = _process(tmp_path / "sds.sqlite", calls)
+    b = _process(tmp_path / "sds.sqlite", calls)
+
+    asyncio.run(a.get_or_fetch("srv", ServerDataType.PORTFOLIO))
+
+    assert b.get("srv", ServerDataType.PORTFOLIO) is None
+
+
+def test_a_cold_key_costs_one_fetch_across_processes(tmp_path):
+    calls: list = []
+    a = _process(tmp_path / "sds.sqlite", calls, delay=0.3)
+    b = _process(tmp_path / "sds.sqlite", calls, delay=0.3)
+
+    async def _drive():
+        return await asyncio.gather(
+            a.get_or_fetch("srv", ServerDataType.PORTFOLIO),
+            b.get_or_fetch("srv", ServerDataType.PORTFOLIO),
+        )
+
+    results = asyncio.run(_drive())
+
+    assert len(calls) == 1, "the second process must wait on the first's lease"
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [{"at": object()}, {1: "int key"}, {"pair": ("SOL", "USDC")}],
+    ids=["unserializable", "int key", "tuple"],
+)
+def test_a_value_json_would_change_stays_per_process(tmp_path, value):
+    calls: list = []
+    a = _process(tmp_path / "sds.sqlite", calls, value=value)
+    b = _process(tmp_path / "sds.sqlite", calls)
+
+    fetched = asyncio.run(a.get_or_fetch("srv", ServerDataType.PORTFOLIO))
+    asyncio.run(b.get_or_fetch("srv", ServerDataType.PORTFOLIO))
+
+    assert fetched is value
+    assert len(calls) == 2, "the second process fetched its own"
+
+
+def test_a_broken_backend_degrades_to_a_plain_fetch(tmp_path):
+    class _Broken:
+        def __getattr__(self, name):
+            def _fail(*a, **kw):
+                raise OSError("disk gone")
+
+            return _fail
+
+    calls: list = []
+    sds = _process(tmp_path / "sds.sqlite", calls)
+    sds.set_shared_cache(_Broken())
+
+    value = asyncio.run(sds.get_or_fetch("srv", ServerDataType.PORTFOLIO))
+
+    assert value == {"total": 1}
+    assert sds.get("srv", ServerDataType.PORTFOLIO) == {"total": 1}
+
+
+def test_leases_are_exclusive_until_released_or_expired(tmp_path):
+    a = SqliteSharedCache(tmp_path / "sds.sqlite")
+    b = SqliteSharedCache(tmp_path / "sds.sqlite")
+
+    assert a.try_lease("k", ttl=30)
+    assert a.try_lease("k", ttl=30), "re-entrant for the holder"
+    assert not b.try_lease("k", ttl=30)
+    a.release("k")
+    assert b.try_lease("k", ttl=-1)
+    assert a.try_lease("k", ttl=30), "an expired lease is up for grabs"
+
+
+def test_an_older_value_never_overwrites_a_newer_one(tmp_path):
+    cache = SqliteSharedCache(tmp_path / "sds.sqlite")
+    cache.store("k", {"v": 2}, fetched_at=200.0)
+    cache.store("k", {"v": 1}, fetched_at=100.0)
+
+    assert cache.load("k") == ({"v": 2}, 200.0)
+
+
+def test_the_backend_is_opt_in():
+    assert shared_cache_from_env({}) is None
+    assert shared_cache_from_env({"SDS_SHARED_CACHE": "redis"}) is None
+    assert isinstance(
+        shared_cache_from_env({"SDS_SHARED_CACHE": "sqlite"}), SqliteSharedCache
+    )
@@ -0,0 +1,126 @@
+"""Stale-while-revalidate reads in ServerDataService.get_or_fetch.
+
+Past its TTL an entry used to make every REST read block on a fresh backend
+call — seconds, when the server is degraded. Within the data type's
+``stale_while_revalidate`` window the stale value now comes back at once and
+one background refresh replaces it; past that hard bound the read blocks again.
+"""
+
+import asyncio
+import time
+
+import condor.server_data_service as sds_module
+from condor.server_data_service import _DEFAULTS, ServerDataService, ServerDataType
+from condor.web.models import WebUser
+from condor.web.routes.portfolio import get_portfolio
+
+_USER = WebUser(id=1, role="user")
+PORTFOLIO = {"main": {"binance": [{"token": "BTC", "units": 1, "value": 100.0}]}}
+
+
+def _make_sds(calls: list, delay: float = 0.0):
+    sds = ServerDataService()
+
+    async def _fake_get_client(server_name):
+        return object()
+
+    async def _fetch(client, **params):
+        calls.append(time.monotonic())
+        await asyncio.sleep(delay)
+        return {"n": len(calls), **PORTFOLIO}
+
+    sds._get_client = _fake_get_client
+    sds.register_fetch(ServerDataType.PORTFOLIO, _fetch)
+    sds.register_fetch(ServerDataType.EXECUTORS, _fetch)
+    return sds
+
+
+def _age(sds, data_type, seconds):
+    for key, entry in sds._cache.items():
+        if key.data_type is data_type:
+            entry.fetched_at = time.time() - seconds
+
+
+def test_a_stale_read_answers_at_once_and_refreshes_once_in_the_background():
+    calls: list = []
+    ttl = _DEFAULTS[ServerDataType.PORTFOLIO].ttl
+
+    async def _drive():
+        sds = _make_sds(calls, delay=0.2)
+        await sds.get_or_fetch("srv", ServerDataType.PORTFOLIO)
+        _age(sds, ServerDataType.PORTFOLIO, ttl + 30)
+
+        t0 = time.monotonic()
+        entries = await asyncio.gather(
+            *(sds.get_or_fetch_entry("srv", ServerDataType.PORTFOLIO) for _ in range(5))
+        )
+        elapsed = time.monotonic() - t0
+        await asyncio.sleep(0.3)
+        return entries, elapsed, sds.get("srv", ServerDataType.PORTFOLIO)
+
+    entries, elapsed, refreshed = asyncio.run(_drive())
+
+    assert elapsed < 0.1, "the stale read must not wait for the backend"
+    assert all(e.value["n"] == 1 for e in entries)
+    assert all(time.time() - e.fetched_at > ttl for e in entries)
+    assert len(calls) == 2, "five stale reads share one background refresh"
+    assert refreshed["n"] == 2
+
+
+def test_past_the_max_stale_bound_the_read_blocks_on_a_fetch():
+    calls: list = []
+    defaults = _DEFAULTS[ServerDataType.PORTFOLIO]
+
+    async def _drive():
+        sds = _make_sds(calls)
+        await sds.get_or_fetch("srv", ServerDataType.PORTFOLIO)
+        _age(
+            sds,
+            ServerDataType.PORTFOLIO,
+            defaults.ttl + defaults.stale_while_revalidate + 1,
+        )
+        return await sds.get_or_fetch("srv", ServerDataType.PORTFOLIO)
+
+    value = asyncio.run(_drive())
+
+    assert value["n"] == 2
+
+
+def test_live_trading_state_is_never_served_stale():
+    calls: list = []
+
+    async def _drive():
+        sds = _make_sds(calls)
+        await sds.get_or_fetch("srv", ServerDataType.EXECUTORS)
+        _age(sds, ServerDataType.EXECUTORS, _DEFAULTS[ServerDataType.EXECUTORS].ttl + 1)
+        return await sds.get_or_fetch("srv", ServerDataType.EXECUTORS)
+
+    assert _DEFAULTS[ServerDataType.EXECUTORS].stale_while_revalidate == 0
+    assert asyncio.run(_drive())["n"] == 2
+
+
+def test_the_portfolio_route_reports_how_stale_its_answer_is(monkeypatch):
+    calls: list = []
+    sds = _make_sds(calls, delay=0.2)
+    monkeypatch.setattr(sds_module, "get_server_data_service", lambda: sds)
+
+    async def _drive():
+        fresh = await get_portfolio("srv", refresh=False, user=_USER)
+        _age(sds, ServerDataType.PORTFOLIO, 90)
+        stale = await get_portfolio("srv", refresh=False, user=_USER)
+        return fresh, stale
+
+    fresh, stale = asyncio.run(_drive())
+
+    assert not fresh.stale and fresh.age_seconds < 1
+    assert stale.stale and 89 <= stale.age_seconds <= 91
+    assert stale.total_usd == 100.0
+
+
+def test_ttl_for_reports_the_freshness_window_of_a_key():
+    sds = ServerDataService()
+
+    assert (
+        sds.ttl_for(ServerDataType.PORTFOLIO) == _DEFAULTS[ServerDataType.PORTFOLIO].ttl
+    )
+    assert sds.ttl_for(ServerDataType.PORTFOLIO_HISTORY, range_key="3M") == 7200
@@ -0,0 +1,147 @@
+"""Broadcast fan-out encodes each frame once, not once per subscriber.
+
+Twenty dashboard tabs on one ``executors:`` channel used to cost twenty
+identical ``json.dumps`` calls per tick, because every ``_send`` went through
+``send_json``. The frame is now encoded (and stamped) once per broadcast and the
+same text handed to every connection. The benchmark at the bottom prints the
+per-broadcast CPU time against subscriber count for both shapes.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from condor.web import ws_manager
+from condor.web.ws_manager import WebSocketManager, _Connection, encode_frame
+
+
+class _FakeWS:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(raw)
+
+
+def _executors(n: int) -> list[dict]:
+    return [
+        {
+            "id": f"ex{i}",
+            "type": "position",
+            "connector": "binance_perpetual",
+            "trading_pair": "BTC-USDT",
+            "side": "buy",
+            "status": "running",
+            "pnl": i * 0.37,
+            "volume": i * 12.5,
+            "timestamp": 1_700_000_000.0 + i,
+            "custom_info": {"level_id": f"L{i}", "fills": [1.0, 2.0]},
+            "config": {"amount": 10.0, "leverage": 5},
+        }
+        for i in range(n)
+    ]
+
+
+def _manager(subscribers: int, channel: str) -> tuple[WebSocketManager, list]:
+    manager = WebSocketManager()
+    sockets = []
+    for user_id in range(subscribers):
+        ws = _FakeWS()
+        conn = _Connection(ws, user_id=user_id)
+        manager._connections.append(conn)
+        manager._add_subscription(conn, channel)
+        sockets.append(ws)
+    return manager, sockets
+
+
+async def _flush(manager: WebSocketManager) -> None:
+    for conn in manager._connections:
+        await conn.outbox.wait_idle()
+
+
+def test_every_subscriber_gets_the_same_text_from_one_encode(monkeypatch):
+    calls = []
+
+    def counting(frame):
+        calls.append(frame)
+        return encode_frame(frame)
+
+    monkeypatch.setattr(ws_manager, "encode_frame", counting)
+    manager, sockets = _manager(20, "candles:srv:binance:BTC-USDT:1m")
+
+    async def scenario():
+        await manager.broadcast("candles:srv:binance:BTC-USDT:1m", {"x": 1})
+        await _flush(manager)
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 1
+    texts = {ws.sent[0] for ws in sockets}
+    assert len(texts) == 1, "subscribers saw different frames (or timestamps)"
+    frame = json.loads(texts.pop())
+    assert frame["channel"] == "candles:srv:binance:BTC-USDT:1m"
+    assert frame["data"] == {"x": 1}
+    assert isinstance(frame["ts"], float)
+
+
+def test_encoding_matches_the_stdlib_wire_form():
+    frame = {"channel": "bots:srv", "data": {"ü": [1, 2.5, None, True]}, "ts": 1.5}
+    assert json.loads(encode_frame(frame)) == frame
+
+
+def test_encoding_falls_back_when_orjson_rejects_the_payload():
+    frame = {"channel": "bots:srv", "data": {"big": 2**70}, "ts": 1.0}
+    assert json.loads(encode_frame(frame))["data"]["big"] == 2**70
+
+
+async def _broadcast_and_flush(manager, channel, payload) -> None:
+    # The writers do the sending now; count their CPU too.
+    await manager.broadcast(channel, payload)
+    await _flush(manager)
+
+
+@pytest.mark.benchmark
+def test_benchmark_broadcast_cpu_by_subscriber_count():
+    """Per-broadcast CPU: encode-per-subscriber (old) vs encode-once (new)."""
+    channel = "executors:srv"
+    payload = _executors(500)
+    rounds = 5
+
+    async def per_subscriber(manager):
+        # The pre-change fan-out: one json.dumps per connection.
+        ts = time.time()
+        await asyncio.gather(
+            *(
+                c.ws.send_text(
+                    json.dumps({"channel": channel, "data": payload, "ts": ts})
+                )
+                for c in manager._connections
+            )
+        )
+
+    def measure(fn, subscribers):
+        manager, _ = _manager(subscribers, channel)
+
+        async def run():
+            start = time.process_time()
+            for _ in range(rounds):
+                await fn(manager)
+            return (time.process_time() - start) / rounds
+
+        return asyncio.run(run())
+
+    rows = []
+    for n in (1, 5, 20, 50):
+        old = measure(per_subscriber, n)
+        new = measure(lambda m: _broadcast_and_flush(m, channel, payload), n)
+        rows.append((n, old, new))
+
+    print("\nsubscribers  per-subscriber-encode  encode-once")
+    for n, old, new in rows:
+        print(f"{n:>11}  {old * 1000:>18.2f}ms  {new * 1000:>9.2f}ms")
+
+    # Encode-once cost must not scale with the audience the way it used to.
+    _, old_50, new_50 = rows[-1]
+    assert new_50 * 5 < old_50
@@ -0,0 +1,220 @@
+"""Opt-in delta frames for the dashboard's snapshot channels.
+
+A delta subscriber must be able to rebuild every snapshot a legacy subscriber
+receives, byte-for-byte, from one keyframe plus the patches that follow — and a
+subscriber that never asked for deltas must see exactly the frames it always
+did. These pin both, plus the ``seq``/resync contract a client uses to recover
+from a missed frame.
+"""
+
+import asyncio
+import copy
+import json
+
+import pytest
+
+from condor.web.delta import apply_patch, make_patch, supports_delta
+from condor.web.ws_manager import WebSocketManager, _Connection
+
+
+class _FakeWS:
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
+
+
+class _AllowAll:
+    def has_server_access(self, user_id, server_name):
+        return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    import config_manager
+
+    monkeypatch.setattr(config_manager, "get_config_manager", lambda: _AllowAll())
+    m = WebSocketManager()
+    # The executor stream itself is not under test; only the frames are.
+    m._ensure_stream = lambda prefix, channel: None
+    return m
+
+
+def _executors(n: int, pnl: float = 0.0) -> list[dict]:
+    return [
+        {"id": f"ex{i}", "status": "running", "pnl": pnl if i == 0 else 1.0}
+        for i in range(n)
+    ]
+
+
+async def _subscribe(manager, *, delta: bool, channel: str = "executors:srv"):
+    ws = _FakeWS()
+    conn = _Connection(ws, user_id=1)
+    manager._connections.append(conn)
+    msg = {"action": "subscribe", "channel": channel}
+    if delta:
+        msg["delta"] = True
+    await manager.handle_message(conn, json.dumps(msg))
+    return conn, ws
+
+
+async def _flush(manager) -> None:
+    """Wait for every connection's writer to put its queued frames on the wire."""
+    for conn in manager._connections:
+        if conn.outbox is not None:
+            await conn.outbox.wait_idle()
+
+
+def _replay(frames: list[dict]):
+    """Decode a delta subscriber's frames the way the dashboard does."""
+    state, last_seq, snapshots = None, None, []
+    for frame in frames:
+        if frame.get("keyframe"):
+            state = frame["data"]
+        else:
+            assert frame["seq"] == last_seq + 1, "gap in seq"
+            state = apply_patch(state, frame["delta"])
+        last_seq = frame["seq"]
+        snapshots.append(state)
+    return snapshots
+
+
+# -- Encoding --
+
+
+@pytest.mark.parametrize(
+    "prev, curr",
+    [
+        # executors: one row changes, one appears, one goes
+        (_executors(5), _executors(5, pnl=3.5)),
+        (_executors(5), _executors(6)),
+        (_executors(5), _executors(5)[1:]),
+        # a new executor at the head of the list reorders it
+        (_executors(3), [{"id": "new", "pnl": 0.0}] + _executors(3)),
+        # bots page: nested keyed lists plus scalar totals
+        (
+            {
+                "controllers": [{"controller_id": "c1", "global_pnl_quote": 1.0}],
+                "bots": [{"bot_name": "b1", "general_logs": ["a"]}],
+                "total_pnl": 1.0,
+            },
+            {
+                "controllers": [
+                    {"controller_id": "c1", "global_pnl_quote": 2.0},
+                    {"controller_id": "c2", "global_pnl_quote": 0.0},
+                ],
+                "bots": [{"bot_name": "b1", "general_logs": ["a", "b"]}],
+                "total_pnl": 2.0,
+            },
+        ),
+        # portfolio: account -> connector -> balances keyed by token
+        (
+            {"main": {"binance": [{"token": "BTC", "units": 1.0}]}},
+            {
+                "main": {
+                    "binance": [
+                        {"token": "BTC", "units": 0.5},
+                        {"token": "USDT", "units": 10.0},
+                    ]
+                },
+                "sub": {},
+            },
+        ),
+        # rows without a usable identity are replaced whole
+        ([{"x": 1}, {"x": 2}], [{"x": 1}, {"x": 3}]),
+    ],
+)
+def test_patch_round_trips_to_the_new_snapshot(prev, curr):
+    before = copy.deepcopy(prev)
+    patch = make_patch(prev, curr)
+    if patch is None:
+        return  # keyframe territory; nothing to apply
+    wire = json.loads(json.dumps(patch))
+    assert apply_patch(prev, wire) == curr
+    assert prev == before, "apply_patch mutated its base"
+
+
+def test_one_changed_row_ships_only_that_row():
+    prev, curr = _executors(500), _executors(500, pnl=9.0)
+    patch = make_patch(prev, curr)
+    assert patch == {
+        "op": "rows",
+        "key": "id",
+        "sub": {"ex0": {"op": "dict", "set": {"pnl": 9.0}}},
+    }
+    assert len(json.dumps(patch)) * 100 < len(json.dumps(curr))
+
+
+def test_only_snapshot_channels_speak_delta():
+    assert supports_delta("executors:srv")
+    assert supports_delta("portfolio:srv")
+    assert supports_delta("bots:srv")
+    assert not supports_delta("candles:srv:binance:BTC-USDT:1m")
+    assert not supports_delta("trades:srv:binance:BTC-USDT")
+
+
+# -- Protocol --
+
+
+def test_delta_subscriber_rebuilds_every_legacy_snapshot(manager):
+    snapshots = [_executors(3), _executors(3, pnl=1.5), _executors(4)]
+
+    async def scenario():
+        await manager.broadcast("executors:srv", snapshots[0])
+        _, legacy = await _subscribe(manager, delta=False)
+        _, delta = await _subscribe(manager, delta=True)
+        await _flush(manager)
+        for snap in snapshots[1:]:
+            await manager.broadcast("executors:srv", snap)
+            # One tick at a time: a backed-up client is allowed to skip frames.
+            await _flush(manager)
+        return legacy, delta
+
+    legacy, delta = asyncio.run(scenario())
+
+    assert [f["data"] for f in legacy.sent] == snapshots
+    assert all("seq" not in f for f in legacy.sent), "legacy frames changed shape"
+    assert delta.sent[0]["keyframe"] is True
+    assert all("delta" in f for f in delta.sent[1:])
+    assert _replay(delta.sent) == snapshots
+
+
+def test_first_broadcast_without_a_base_is_a_keyframe(manager):
+    async def scenario():
+        _, ws = await _subscribe(manager, delta=True)
+        await _flush(manager)
+        assert ws.sent == []  # nothing to snapshot yet
+        await manager.broadcast("executors:srv", _executors(2))
+        await _flush(manager)
+        return ws
+
+    ws = asyncio.run(scenario())
+
+    assert ws.sent[0]["keyframe"] is True
+    assert ws.sent[0]["seq"] == 1
+
+
+def test_resync_answers_with_a_keyframe_at_the_current_seq(manager):
+    async def scenario():
+        conn, ws = await _subscribe(manager, delta=True)
+        for i in range(3):
+            await manager.broadcast("executors:srv", _executors(2, pnl=i))
+            await _flush(manager)
+        msg = {"action": "resync", "channel": "executors:srv"}
+        await manager.handle_message(conn, json.dumps(msg))
+        await _flush(manager)
+        return ws
+
+    ws = asyncio.run(scenario())
+
+    assert ws.sent[-1]["keyframe"] is True
+    assert ws.sent[-1]["seq"] == 3
+    assert ws.sent[-1]["data"] == _executors(2, pnl=2)
+
+
+def test_delta_is_ignored_on_channels_that_do_not_support_it(manager):
+    channel = "trades:srv:binance:BTC-USDT"
+    conn, _ = asyncio.run(_subscribe(manager, delta=True, channel=channel))
+    assert channel in conn.channels
+    assert conn.delta_channels == set()
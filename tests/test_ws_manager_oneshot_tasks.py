@@ -10,6 +10,7 @@ stalled channel left no trace on this module's logger.
 
 import asyncio
 import inspect
+import json
 import logging
 
 from condor.server_data_service import CacheKey, ServerDataType
@@ -22,8 +23,8 @@ class _FakeWS:
     def __init__(self):
         self.sent: list[dict] = []
 
-    async def send_json(self, payload: dict) -> None:
-        self.sent.append(payload)
+    async def send_text(self, raw: str) -> None:
+        self.sent.append(json.loads(raw))
 
 
 def _key(data_type: str, server: str = "srv", **params) -> CacheKey:
@@ -35,14 +36,18 @@ def _manager_with_subscriber(channel: str) -> tuple[WebSocketManager, _FakeWS]:
     manager = WebSocketManager()
     ws = _FakeWS()
     conn = _Connection(ws, user_id=1)
-    conn.channels.add(channel)
     manager._connections.append(conn)
+    manager._add_subscription(conn, channel)
     return manager, ws
 
 
 async def _drain(manager: WebSocketManager) -> None:
     """Await whatever one-shot tasks the manager currently holds."""
     await asyncio.gather(*list(manager._oneshot_tasks), return_exceptions=True)
+    # Broadcasts only enqueue; the per-connection writers do the sending.
+    for conn in manager._connections:
+        if conn.outbox is not None:
+            await conn.outbox.wait_idle()
     # Done-callbacks are scheduled via call_soon; give the loop a turn to run them.
     await asyncio.sleep(0)
 
@@ -0,0 +1,176 @@
+"""Per-connection bounded outboxes for the dashboard WebSocket.
+
+A client whose socket stops draining must cost one bounded queue — not a
+pending coroutine and a retained frame on every broadcast — and must not delay
+anyone else. Snapshot channels keep only the newest frame, event channels shed
+with a counter, and a client that stays backed up is disconnected.
+"""
+
+import asyncio
+import json
+
+from condor.web.outbox import Outbox, SlowConsumer
+from condor.web.ws_manager import WebSocketManager, _Connection
+
+
+class _GatedWS:
+    """A socket whose sends block until ``gate`` is set."""
+
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.gate = gate
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+
+    async def send_text(self, raw: str) -> None:
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(json.loads(raw))
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_with = code
+
+
+def _subscribe(manager: WebSocketManager, ws, *channels: str) -> _Connection:
+    conn = _Connection(ws, user_id=len(manager._connections) + 1)
+    manager._connections.append(conn)
+    for channel in channels:
+        manager._add_subscription(conn, channel)
+    return conn
+
+
+def test_snapshot_channel_keeps_only_the_newest_frame():
+    async def scenario():
+        gate = asyncio.Event()
+        manager = WebSocketManager()
+        ws = _GatedWS(gate)
+        conn = _subscribe(manager, ws, "portfolio:srv")
+        await manager.broadcast("portfolio:srv", {"total": 0})
+        await asyncio.sleep(0)  # writer takes frame 0 and blocks on the socket
+        for i in range(1, 50):
+            await manager.broadcast("portfolio:srv", {"total": i})
+        # The first frame is already in the writer's hands; the rest coalesced.
+        queued = len(conn.outbox)
+        gate.set()
+        await conn.outbox.wait_idle()
+        return queued, ws.sent
+
+    queued, sent = asyncio.run(scenario())
+    assert queued == 1
+    assert [f["data"] for f in sent] == [{"total": 0}, {"total": 49}]
+
+
+def test_event_channel_sheds_and_counts_once_full():
+    async def scenario():
+        gate = asyncio.Event()
+        sent: list[str] = []
+
+        async def send(text):
+            await gate.wait()
+            sent.append(text)
+
+        box = Outbox(
+            send, snapshot=lambda ch: None, on_fail=lambda e: None, max_frames=4
+        )
+        accepted = [
+            box.put("trades:srv:x:y", str(i), coalesce=False) for i in range(10)
+        ]
+        await asyncio.sleep(0)  # writer takes frame 0
+        accepted.append(box.put("trades:srv:x:y", "late", coalesce=False))
+        gate.set()
+        await box.wait_idle()
+        return accepted, sent, box.dropped
+
+    accepted, sent, dropped = asyncio.run(scenario())
+    assert accepted[:4] == [True] * 4
+    assert accepted[4:10] == [False] * 6
+    assert accepted[10] is True, "room freed by the writer is reused"
+    assert sent == ["0", "1", "2", "3", "late"]
+    assert dropped["trades:srv:x:y"] == 6
+
+
+def test_coalesced_delta_frame_is_rebuilt_as_a_keyframe():
+    async def scenario():
+        gate = asyncio.Event()
+        manager = WebSocketManager()
+        ws = _GatedWS(gate)
+        conn = _subscribe(manager, ws, "executors:srv")
+        conn.delta_channels.add("executors:srv")
+        rows = [{"id": "a", "pnl": 0.0}]
+        await manager.broadcast("executors:srv", rows)
+        await asyncio.sleep(0)  # the keyframe is now in flight
+        for pnl in (1.0, 2.0, 3.0):  # deltas that pile up behind it
+            await manager.broadcast("executors:srv", [{"id": "a", "pnl": pnl}])
+        gate.set()
+        await conn.outbox.wait_idle()
+        return ws.sent
+
+    sent = asyncio.run(scenario())
+    assert [f.get("keyframe") for f in sent] == [True, True]
+    assert sent[-1]["seq"] == 4
+    assert sent[-1]["data"] == [{"id": "a", "pnl": 3.0}]
+
+
+def test_stalled_client_does_not_delay_the_others_and_is_disconnected():
+    async def scenario():
+        manager = WebSocketManager()
+        stalled = _GatedWS(asyncio.Event())  # never released
+        healthy = _GatedWS()
+        slow = _subscribe(manager, stalled, "portfolio:srv")
+        fast = _subscribe(manager, healthy, "portfolio:srv")
+        await manager.broadcast("portfolio:srv", {"total": 1})
+        # Shrink the send timeout on the stalled outbox to keep the test fast.
+        slow.outbox._send_timeout = 0.05
+        await fast.outbox.wait_idle()
+        delivered_before_timeout = list(healthy.sent)
+        await asyncio.sleep(0.2)
+        await asyncio.gather(*list(manager._oneshot_tasks), return_exceptions=True)
+        return manager, slow, fast, delivered_before_timeout, stalled
+
+    manager, slow, fast, delivered, stalled = asyncio.run(scenario())
+    assert [f["data"] for f in delivered] == [{"total": 1}]
+    assert slow not in manager._connections
+    assert fast in manager._connections
+    assert stalled.closed_with == 1013
+
+
+def test_backlog_past_the_grace_period_fails_the_consumer():
+    async def scenario():
+        failures: list[BaseException] = []
+
+        async def never(text):
+            await asyncio.Event().wait()
+
+        box = Outbox(
+            never,
+            snapshot=lambda ch: None,
+            on_fail=failures.append,
+            max_frames=2,
+            send_timeout=60,
+            stall_grace=0.05,
+        )
+        for i in range(4):
+            box.put("trades:srv:x:y", str(i), coalesce=False)
+        await asyncio.sleep(0.1)
+        # Still stuck at capacity (the writer freed one slot and never returned).
+        box.put("trades:srv:x:y", "more", coalesce=False)
+        box.put("trades:srv:x:y", "more", coalesce=False)
+        return failures, box.closed
+
+    failures, closed = asyncio.run(scenario())
+    assert closed
+    assert len(failures) == 1 and isinstance(failures[0], SlowConsumer)
+
+
+def test_disconnect_stops_the_writer():
+    async def scenario():
+        manager = WebSocketManager()
+        ws = _GatedWS(asyncio.Event())
+        conn = _subscribe(manager, ws, "portfolio:srv")
+        await manager.broadcast("portfolio:srv", {"total": 1})
+        writer = conn.outbox._writer
+        manager.disconnect(conn)
+        await asyncio.sleep(0)
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.cancelled()
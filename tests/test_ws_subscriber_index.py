@@ -0,0 +1,134 @@
+"""The channel -> connections reverse index behind every subscriber lookup.
+
+``_has_subscribers``, ``broadcast`` and ``_on_data_update`` used to scan every
+connection's channel set on every SDS cache write and candle tick. They now
+read ``_subscribers``, which subscribe, unsubscribe and disconnect keep in step
+with ``conn.channels``. The benchmark replays one SDS poll tick against 200
+connections x 30 channels with both lookups.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from condor.web.ws_manager import WebSocketManager, _Connection
+
+
+class _FakeWS:
+    async def send_text(self, raw: str) -> None:
+        pass
+
+
+class _AllowAll:
+    def has_server_access(self, user_id, server_name):
+        return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    import config_manager
+
+    monkeypatch.setattr(config_manager, "get_config_manager", lambda: _AllowAll())
+    m = WebSocketManager()
+    m._ensure_stream = lambda prefix, channel: None
+    m._maybe_stop_stream = lambda prefix, channel: None
+    return m
+
+
+def _message(action: str, channel: str) -> str:
+    return json.dumps({"action": action, "channel": channel})
+
+
+def test_index_follows_subscribe_unsubscribe_and_disconnect(manager):
+    a, b = _Connection(_FakeWS(), 1), _Connection(_FakeWS(), 2)
+    manager._connections.extend([a, b])
+
+    async def scenario():
+        await manager.handle_message(a, _message("subscribe", "executors:srv"))
+        await manager.handle_message(b, _message("subscribe", "executors:srv"))
+        await manager.handle_message(b, _message("subscribe", "trades:srv:x:BTC-USDT"))
+        after_subscribe = {ch: set(c) for ch, c in manager._subscribers.items()}
+
+        await manager.handle_message(a, _message("unsubscribe", "executors:srv"))
+        after_unsubscribe = {ch: set(c) for ch, c in manager._subscribers.items()}
+
+        manager.disconnect(b)
+        return after_subscribe, after_unsubscribe
+
+    after_subscribe, after_unsubscribe = asyncio.run(scenario())
+
+    assert after_subscribe == {
+        "executors:srv": {a, b},
+        "trades:srv:x:BTC-USDT": {b},
+    }
+    assert after_unsubscribe == {
+        "executors:srv": {b},
+        "trades:srv:x:BTC-USDT": {b},
+    }
+    assert manager._subscribers == {}, "empty channels must not linger"
+    assert not manager._has_subscribers("executors:srv")
+
+
+def test_disconnect_stop_checks_already_see_the_connection_gone(monkeypatch):
+    """A stream stop decided during disconnect must not count the leaver."""
+    m = WebSocketManager()
+    seen: list[bool] = []
+    m._maybe_stop_stream = lambda prefix, channel: seen.append(
+        m._has_subscribers(channel)
+    )
+    conn = _Connection(_FakeWS(), 1)
+    m._connections.append(conn)
+    m._add_subscription(conn, "executors:srv")
+
+    m.disconnect(conn)
+
+    assert seen == [False]
+
+
+@pytest.mark.benchmark
+def test_benchmark_sds_poll_tick_200_connections_x_30_channels():
+    channels = [f"prices:srv{i % 3}:binance:PAIR{i}-USDT" for i in range(30)]
+    manager = WebSocketManager()
+    for user_id in range(200):
+        conn = _Connection(_FakeWS(), user_id)
+        manager._connections.append(conn)
+        # Each tab watches a handful of the channels.
+        for k in range(6):
+            manager._add_subscription(conn, channels[(user_id + k * 5) % 30])
+
+    # One poll tick writes every subscribed key plus as many nobody watches.
+    written = channels + [f"prices:srv9:kucoin:PAIR{i}-USDT" for i in range(30)]
+    connections = manager._connections
+
+    def scan_tick():
+        # The pre-index lookups: `_on_data_update`'s any() gate, then
+        # `broadcast`'s list comprehension over every connection.
+        n = 0
+        for ch in written:
+            if any(ch in c.channels for c in connections):
+                n += len([c for c in list(connections) if ch in c.channels])
+        return n
+
+    def index_tick():
+        n = 0
+        for ch in written:
+            if manager._has_subscribers(ch):
+                n += len(list(manager._subscribers.get(ch, ())))
+        return n
+
+    assert scan_tick() == index_tick()
+
+    def per_tick(fn, rounds=50):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds
+
+    before, after = per_tick(scan_tick), per_tick(index_tick)
+    print(
+        f"\nSDS poll tick, 200 conns x 30 channels: "
+        f"scan {before * 1e6:.0f}us -> index {after * 1e6:.0f}us"
+    )
+    assert after * 3 < before